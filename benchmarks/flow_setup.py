@@ -0,0 +1,70 @@
+"""
+Benchmarks the graph work a FlowRunner performs before any task runs: building the
+flow, sorting its tasks, collecting the upstream edges of every task and computing the
+terminal and reference tasks.
+
+Usage:
+
+    python benchmarks/flow_setup.py [n_tasks ...]
+"""
+import random
+import sys
+import time
+
+from prefect import Flow, Task
+
+
+def build_flow(n_tasks: int, max_upstream: int = 3, seed: int = 42) -> Flow:
+    """
+    Builds a random DAG with `n_tasks` tasks, each of which depends on up to
+    `max_upstream` of the tasks created before it.
+    """
+    rng = random.Random(seed)
+    flow = Flow("benchmark")
+    tasks = []
+    for i in range(n_tasks):
+        task = Task(name=str(i))
+        flow.add_task(task)
+        for upstream in rng.sample(tasks[-100:], min(len(tasks[-100:]), max_upstream)):
+            flow.add_edge(upstream, task, validate=False)
+        tasks.append(task)
+    return flow
+
+
+def sort_tasks(flow: Flow) -> tuple:
+    return flow.sorted_tasks()
+
+
+def query_edges(flow: Flow, tasks: tuple) -> None:
+    """
+    Performs the remaining graph queries of `FlowRunner.get_flow_run_state`.
+    """
+    for task in tasks:
+        for edge in flow.edges_to(task):
+            edge.upstream_task
+    flow.terminal_tasks()
+    flow.reference_tasks()
+
+
+def timed(fn, *args):  # type: ignore
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1000, 10000, 50000]
+    print(
+        "{:>8} {:>12} {:>12} {:>12}".format(
+            "tasks", "build (s)", "sort (s)", "edges (s)"
+        )
+    )
+    for n in sizes:
+        flow, build_time = timed(build_flow, n)
+        tasks, sort_time = timed(sort_tasks, flow)
+        _, edges_time = timed(query_edges, flow, tasks)
+        print(
+            "{:>8} {:>12.3f} {:>12.3f} {:>12.3f}".format(
+                n, build_time, sort_time, edges_time
+            )
+        )
@@ -0,0 +1,88 @@
+"""
+Benchmarks generating the dates of schedules:
+
+- large `UnionSchedule`s: a union of daily cron schedules, each at a different minute
+    and in one of several timezones, is asked for a year of dates, both all at once
+    with `next` and lazily with `iter`
+- backfills of `IntervalSchedule`s: minute-level schedules in a DST-observing timezone
+    are asked for every date in windows of several years with `backfill`
+
+Usage:
+
+    python benchmarks/schedules.py [n_schedules ...]
+"""
+import itertools
+import sys
+import time
+
+import pendulum
+
+from prefect.schedules import CronSchedule, IntervalSchedule, UnionSchedule
+
+TIMEZONES = ["UTC", "US/Eastern", "US/Pacific", "Europe/London", "Asia/Tokyo"]
+START_DATE = pendulum.datetime(2019, 1, 1)
+
+
+def build_union(n_schedules: int) -> UnionSchedule:
+    """
+    Builds a union of `n_schedules` daily cron schedules and one hourly interval
+    schedule.
+    """
+    schedules = [
+        CronSchedule(
+            "{} {} * * *".format(i % 60, (i // 60) % 24),
+            start_date=START_DATE.in_tz(TIMEZONES[i % len(TIMEZONES)]),
+        )
+        for i in range(n_schedules)
+    ]
+    schedules.append(
+        IntervalSchedule(START_DATE, pendulum.duration(hours=1))  # type: ignore
+    )
+    return UnionSchedule(schedules)
+
+
+def next_year(union: UnionSchedule) -> list:
+    n = (len(union.schedules) - 1 + 24) * 365
+    return union.next(n, after=START_DATE)
+
+
+def iter_year(union: UnionSchedule) -> list:
+    end = START_DATE.add(years=1)
+    return list(itertools.takewhile(lambda d: d <= end, union.iter(after=START_DATE)))
+
+
+def backfill_years(years: int) -> list:
+    schedule = IntervalSchedule(
+        START_DATE.in_tz("US/Eastern"), pendulum.duration(minutes=1)  # type: ignore
+    )
+    return schedule.backfill(START_DATE, START_DATE.add(years=years))
+
+
+def timed(fn, *args):  # type: ignore
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10, 50, 200]
+    print(
+        "{:>10} {:>10} {:>12} {:>12}".format(
+            "schedules", "dates", "next (s)", "iter (s)"
+        )
+    )
+    for n in sizes:
+        union = build_union(n)
+        dates, next_time = timed(next_year, union)
+        _, iter_time = timed(iter_year, union)
+        print(
+            "{:>10} {:>10} {:>12.3f} {:>12.3f}".format(
+                n, len(dates), next_time, iter_time
+            )
+        )
+
+    print()
+    print("{:>10} {:>10} {:>12}".format("years", "dates", "backfill (s)"))
+    for years in [1, 2]:
+        dates, backfill_time = timed(backfill_years, years)
+        print("{:>10} {:>10} {:>12.3f}".format(years, len(dates), backfill_time))
@@ -3,7 +3,19 @@ import datetime
 import json
 import logging
 import os
-from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Union
+import threading
+import urllib.parse
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import pendulum
 import requests
@@ -51,6 +63,89 @@ FlowRunInfoResult = NamedTuple(
 )
 
 
+class _PooledAdapter(HTTPAdapter):
+    """
+    An `HTTPAdapter` which counts the requests it sends and the connections it opens.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.requests = 0
+        self.connections = 0
+        self._count_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)  # type: ignore
+        adapter = self
+
+        def counting(pool_cls: type) -> type:
+            class CountingPool(pool_cls):  # type: ignore
+                def _new_conn(self) -> Any:
+                    with adapter._count_lock:
+                        adapter.connections += 1
+                    return super()._new_conn()
+
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting(pool_cls)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, *args: Any, **kwargs: Any) -> requests.Response:
+        with self._count_lock:
+            self.requests += 1
+        return super().send(*args, **kwargs)
+
+
+_sessions = {}  # type: Dict[str, Tuple[requests.Session, _PooledAdapter]]
+_sessions_lock = threading.Lock()
+_sessions_pid = os.getpid()
+
+
+def _get_session(server: str) -> requests.Session:
+    """
+    Returns the pooled session for the host of `server`, creating it if necessary.
+    Sessions are shared by every `Client` in the process.
+    """
+    global _sessions_pid
+    key = "{0.scheme}://{0.netloc}".format(urllib.parse.urlsplit(server))
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            # connections can't be shared with the parent of a forked process
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        if key not in _sessions:
+            pool_size = prefect.config.cloud.request_pool_size
+            adapter = _PooledAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=Retry(
+                    total=6,
+                    backoff_factor=1,
+                    status_forcelist=[500, 502, 503, 504],
+                    method_whitelist=["DELETE", "GET", "POST"],
+                ),
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[key] = (session, adapter)
+        return _sessions[key][0]
+
+
+def close_sessions() -> None:
+    """
+    Closes the pooled sessions shared by every `Client` in the process, along with their
+    connections. New sessions are created as needed.
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session, _ in sessions:
+        session.close()
+
+
 class Client:
     """
     Client for communication with Prefect Cloud
@@ -228,14 +323,7 @@ class Client:
 
         headers = headers or {}
         headers.update({"Authorization": "Bearer {}".format(self.token)})
-        session = requests.Session()
-        retries = Retry(
-            total=6,
-            backoff_factor=1,
-            status_forcelist=[500, 502, 503, 504],
-            method_whitelist=["DELETE", "GET", "POST"],
-        )
-        session.mount("https://", HTTPAdapter(max_retries=retries))
+        session = _get_session(server)
         if method == "GET":
             response = session.get(url, headers=headers, params=params)
         elif method == "POST":
@@ -250,6 +338,28 @@ class Client:
 
         return response
 
+    @staticmethod
+    def connection_stats() -> Dict[str, Dict[str, int]]:
+        """
+        Reports how well connections to each server are being reused. Connections are
+        pooled per host and shared by every `Client` in the process.
+
+        Returns:
+            - Dict[str, Dict[str, int]]: for each host (as `scheme://host:port`), the
+                number of `requests` sent (including retries), of `connections` opened and
+                of requests which `reused` an open connection
+        """
+        with _sessions_lock:
+            adapters = {key: adapter for key, (_, adapter) in _sessions.items()}
+        return {
+            key: dict(
+                requests=adapter.requests,
+                connections=adapter.connections,
+                reused=max(adapter.requests - adapter.connections, 0),
+            )
+            for key, adapter in adapters.items()
+        }
+
     # -------------------------------------------------------------------------
     # Auth
     # -------------------------------------------------------------------------
@@ -539,6 +649,36 @@ class Client:
         }
         self.graphql(mutation, raise_on_error=False)
 
+    def update_heartbeats(
+        self, flow_run_ids: Iterable[str] = None, task_run_ids: Iterable[str] = None
+    ) -> None:
+        """
+        Convenience method for heartbeating several flow and task runs in a single request.
+
+        Does NOT raise an error if the update fails.
+
+        Args:
+            - flow_run_ids (Iterable[str], optional): the flow run IDs to heartbeat
+            - task_run_ids (Iterable[str], optional): the task run IDs to heartbeat
+        """
+        fields = {}
+        for i, flow_run_id in enumerate(flow_run_ids or []):
+            fields[
+                with_args(
+                    "flow_run_{}: updateFlowRunHeartbeat".format(i),
+                    {"input": {"flowRunId": flow_run_id}},
+                )
+            ] = {"success"}
+        for i, task_run_id in enumerate(task_run_ids or []):
+            fields[
+                with_args(
+                    "task_run_{}: updateTaskRunHeartbeat".format(i),
+                    {"input": {"taskRunId": task_run_id}},
+                )
+            ] = {"success"}
+        if fields:
+            self.graphql({"mutation": fields}, raise_on_error=False)
+
     def set_flow_run_state(
         self, flow_run_id: str, version: int, state: "prefect.engine.state.State"
     ) -> None:
@@ -696,6 +836,54 @@ class Client:
 
         self.graphql(mutation, variables=dict(state=serialized_state))  # type: Any
 
+    def set_task_run_states(self, states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sets new states for several task runs in a single request. Each state is checked
+        against the version of its task run independently, so some updates can succeed
+        while others fail.
+
+        Args:
+            - states (List[Dict[str, Any]]): the updates to make; each one is a dictionary
+                with the `task_run_id` (str), current `version` (int) and new `state`
+                (State) of a task run
+
+        Returns:
+            - List[Dict[str, Any]]: the outcome of each update, in order; a dictionary with
+                the `id` of the task run, a `status` (`"SUCCESS"` if the state was set) and
+                a `message` explaining any failure
+
+        Raises:
+            - ClientError: if the GraphQL mutation is bad for any reason
+        """
+        mutation = {
+            "mutation($input: setTaskRunStatesInput!)": {
+                "setTaskRunStates(input: $input)": {
+                    "states": {"id", "status", "message"}
+                }
+            }
+        }
+
+        result = self.graphql(
+            mutation,
+            variables=dict(
+                input=dict(
+                    states=[
+                        dict(
+                            taskRunId=update["task_run_id"],
+                            version=update["version"],
+                            state=update["state"].serialize(),
+                        )
+                        for update in states
+                    ]
+                )
+            ),
+        )  # type: Any
+
+        return [
+            dict(id=s.id, status=s.status, message=s.get("message"))
+            for s in result.data.setTaskRunStates.states
+        ]
+
     def set_secret(self, name: str, value: Any) -> None:
         """
         Set a secret with the given name and value.
@@ -774,3 +962,29 @@ class Client:
 
         if not result.data.writeRunLog.success:
             raise ValueError("Writing log failed.")
+
+    def write_run_logs(self, logs: List[Dict[str, Any]]) -> None:
+        """
+        Writes a batch of logs to Cloud in a single request
+
+        Args:
+            - logs (List[Dict[str, Any]]): the logs to write; each one is a dictionary with
+                the keys of the `writeRunLog` input (`flowRunId`, `taskRunId`, `timestamp`,
+                `name`, `message`, `level` and `info`), with the timestamp formatted as an
+                ISO 8601 string
+
+        Raises:
+            - ValueError: if writing the logs fails
+        """
+        mutation = {
+            "mutation($input: writeRunLogsInput!)": {
+                "writeRunLogs(input: $input)": {"success"}
+            }
+        }
+
+        result = self.graphql(
+            mutation, variables=dict(input=dict(logs=logs))
+        )  # type: Any
+
+        if not result.data.writeRunLogs.success:
+            raise ValueError("Writing logs failed.")
@@ -1,7 +1,9 @@
 import collections
 import copy
 import functools
+import heapq
 import inspect
+import itertools
 import json
 import os
 import tempfile
@@ -42,29 +44,84 @@ from prefect.utilities.tasks import as_task, unmapped
 ParameterDetails = TypedDict("ParameterDetails", {"default": Any, "required": bool})
 
 
+# the versions of graph sets; every modification of any graph set takes a new version, so
+# that a version identifies the contents of one set. Versions are kept when sets are
+# pickled, so they are qualified by the process which created them (forked processes
+# share the random ID, but not the pid)
+_graph_set_versions = itertools.count()
+_graph_set_process = uuid.uuid4().hex
+
+
+def _new_graph_set_version() -> tuple:
+    return _graph_set_process, os.getpid(), next(_graph_set_versions)
+
+
+class _GraphSet(set):
+    """
+    A set of the tasks or edges of a flow, which takes a new `version` whenever it is
+    modified, so that the flow can tell when `flow.tasks` or `flow.edges` were modified
+    directly rather than through its methods.
+    """
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.version = _new_graph_set_version()
+
+    def copy(self) -> "_GraphSet":
+        return type(self)(self)
+
+
+def _modifies_graph_set(name: str) -> Callable:
+    method = getattr(set, name)
+
+    @functools.wraps(method)
+    def wrapper(self, *args):  # type: ignore
+        self.version = _new_graph_set_version()
+        return method(self, *args)
+
+    return wrapper
+
+
+for _name in [
+    "add",
+    "clear",
+    "discard",
+    "pop",
+    "remove",
+    "update",
+    "difference_update",
+    "intersection_update",
+    "symmetric_difference_update",
+    "__iand__",
+    "__ior__",
+    "__isub__",
+    "__ixor__",
+]:
+    setattr(_GraphSet, _name, _modifies_graph_set(_name))
+
+
 def cache(method: Callable) -> Callable:
     """
     Decorator for caching Flow methods.
 
-    Each Flow has a _cache dict that can be used to memoize expensive functions. This
-    decorator automatically compares a hash of the Flow's current tasks, edges, and reference_tasks
-    to a cached hash; if the hash is the same, it attempts to retrieve a value from the cache.
-    If the hash is different, it invalidates the cache.
+    Each Flow has a _cache dict that can be used to memoize expensive functions. Every
+    method that modifies the Flow's graph bumps its `_graph_version` counter; this decorator
+    compares the current version (along with the versions of `flow.tasks` and
+    `flow.edges`, to catch direct modifications of them) to the version the cache was built
+    with. If they match, it attempts to retrieve a value from the cache; otherwise it
+    invalidates the cache.
     """
+    signature = inspect.signature(method)
 
     @functools.wraps(method)
     def wrapper(self, *args, **kwargs):  # type: ignore
 
-        cache_check = dict(
-            tasks=self.tasks.copy(),
-            edges=self.edges.copy(),
-            reference_tasks=copy.copy(self._reference_tasks),
-        )
-        if any(self._cache.get(k) != v for k, v in cache_check.items()):
+        version = (self._graph_version,) + self._graph_set_versions()
+        if self._cache.get("graph_version") != version:
             self._cache.clear()
-            self._cache.update(cache_check)
+            self._cache["graph_version"] = version
 
-        callargs = inspect.signature(method).bind(self, *args, **kwargs).arguments
+        callargs = signature.bind(self, *args, **kwargs).arguments
         key = (method.__name__, tuple(callargs.items())[1:])
         if key not in self._cache:
             self._cache[key] = method(self, *args, **kwargs)
@@ -148,6 +205,7 @@ class Flow:
         result_handler: ResultHandler = None,
     ):
         self._cache = {}  # type: dict
+        self._graph_version = 0
 
         self.logger = logging.get_logger("Flow")
 
@@ -162,8 +220,15 @@ class Flow:
             result_handler or prefect.engine.get_default_result_handler_class()()
         )
 
-        self.tasks = set()  # type: Set[Task]
-        self.edges = set()  # type: Set[Edge]
+        self.tasks = set()
+        self.edges = set()
+
+        # graph indexes, maintained incrementally as tasks and edges are added
+        self._upstream_edges = {}  # type: Dict[Task, Set[Edge]]
+        self._downstream_edges = {}  # type: Dict[Task, Set[Edge]]
+        self._slugs = {}  # type: Dict[str, Task]
+        self._task_order = {}  # type: Dict[Task, int]
+        self._indexed_versions = self._graph_set_versions()
 
         for t in tasks or []:
             self.add_task(t)
@@ -190,6 +255,22 @@ class Flow:
 
         super().__init__()
 
+    @property
+    def tasks(self) -> Set[Task]:
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks: Iterable[Task]) -> None:
+        self._tasks = _GraphSet(tasks)
+
+    @property
+    def edges(self) -> Set[Edge]:
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges: Iterable[Edge]) -> None:
+        self._edges = _GraphSet(edges)
+
     def __eq__(self, other: Any) -> bool:
         if type(self) == type(other):
             s = (self.name, self.tasks, self.edges, self.reference_tasks())
@@ -208,11 +289,17 @@ class Flow:
         """
         Create and returns a copy of the current Flow.
         """
+        self._sync_graph_indexes()
         new = copy.copy(self)
         # create a new cache
         new._cache = dict()
         new.tasks = self.tasks.copy()
         new.edges = self.edges.copy()
+        new._upstream_edges = {t: e.copy() for t, e in self._upstream_edges.items()}
+        new._downstream_edges = {t: e.copy() for t, e in self._downstream_edges.items()}
+        new._slugs = self._slugs.copy()
+        new._task_order = self._task_order.copy()
+        new._indexed_versions = new._graph_set_versions()
         new.set_reference_tasks(self._reference_tasks)
         return new
 
@@ -274,17 +361,21 @@ class Flow:
 
         new = as_task(new, flow=self)
 
-        # update tasks
-        self.tasks.remove(old)
-        self.add_task(new)
-
-        self._cache.clear()
+        self._sync_graph_indexes()
+        affected_edges = self._upstream_edges.get(old, set()).union(
+            self._downstream_edges.get(old, set())
+        )
 
-        affected_edges = {e for e in self.edges if old in e.tasks}
+        # update tasks; the new task takes the old task's place in the sort order
+        position = self._task_order.get(old)
+        self._remove_task(old)
+        self.add_task(new)
+        if position is not None:
+            self._task_order[new] = position
 
         # remove old edges
         for edge in affected_edges:
-            self.edges.remove(edge)
+            self._remove_edge(edge)
 
         # replace with new edges
         for edge in affected_edges:
@@ -392,7 +483,7 @@ class Flow:
         Returns:
             - None
         """
-        self._cache.clear()
+        self._invalidate_cache()
         reference_tasks = set(tasks)
         if any(t not in self.tasks for t in reference_tasks):
             raise ValueError("reference tasks must be part of the flow.")
@@ -420,18 +511,86 @@ class Flow:
                 "Tasks must be Task instances (received {})".format(type(task))
             )
         elif task not in self.tasks:
-            if task.slug and any(task.slug == t.slug for t in self.tasks):
+            existing = self._slugs.get(task.slug) if task.slug else None
+            if (
+                existing is not None
+                and existing in self.tasks
+                and existing.slug == task.slug
+            ):
                 raise ValueError(
                     'A task with the slug "{}" already exists in this '
                     "flow.".format(task.slug)
                 )
 
         if task not in self.tasks:
+            self._sync_graph_indexes()
             self.tasks.add(task)
-            self._cache.clear()
+            self._upstream_edges.setdefault(task, set())
+            self._downstream_edges.setdefault(task, set())
+            if task.slug:
+                self._slugs[task.slug] = task
+            # the graph version increases monotonically, so it doubles as an
+            # insertion index for breaking ties when sorting
+            self._task_order[task] = self._graph_version
+            self._indexed_versions = self._graph_set_versions()
+            self._invalidate_cache()
 
         return task
 
+    def _remove_task(self, task: Task) -> None:
+        """
+        Removes a task from the flow and its graph indexes; any edges to or from the task
+        must be removed separately.
+        """
+        self._sync_graph_indexes()
+        self.tasks.remove(task)
+        self._upstream_edges.pop(task, None)
+        self._downstream_edges.pop(task, None)
+        self._task_order.pop(task, None)
+        if task.slug and self._slugs.get(task.slug) is task:
+            del self._slugs[task.slug]
+        self._indexed_versions = self._graph_set_versions()
+        self._invalidate_cache()
+
+    def _remove_edge(self, edge: Edge) -> None:
+        """
+        Removes an edge from the flow and its graph indexes.
+        """
+        self._sync_graph_indexes()
+        self.edges.remove(edge)
+        self._upstream_edges.get(edge.downstream_task, set()).discard(edge)
+        self._downstream_edges.get(edge.upstream_task, set()).discard(edge)
+        self._indexed_versions = self._graph_set_versions()
+        self._invalidate_cache()
+
+    def _graph_set_versions(self) -> Tuple[tuple, tuple]:
+        return self._tasks.version, self._edges.version
+
+    def _sync_graph_indexes(self) -> None:
+        """
+        Rebuilds the graph indexes if `flow.tasks` or `flow.edges` were modified directly
+        rather than through the flow's methods, which is detected by their versions.
+        """
+        if self._graph_set_versions() == self._indexed_versions:
+            return
+        self._upstream_edges = {t: set() for t in self.tasks}
+        self._downstream_edges = {t: set() for t in self.tasks}
+        for edge in self.edges:
+            self._upstream_edges.setdefault(edge.downstream_task, set()).add(edge)
+            self._downstream_edges.setdefault(edge.upstream_task, set()).add(edge)
+        self._slugs = {t.slug: t for t in self.tasks if t.slug}
+        self._task_order = {
+            t: i for t, i in self._task_order.items() if t in self.tasks
+        }
+        self._indexed_versions = self._graph_set_versions()
+
+    def _invalidate_cache(self) -> None:
+        """
+        Marks the flow's graph as modified, which invalidates any cached graph queries.
+        """
+        self._graph_version += 1
+        self._cache.clear()
+
     def add_edge(
         self,
         upstream_task: Task,
@@ -487,7 +646,11 @@ class Flow:
             key=key,
             mapped=mapped,
         )
+        self._sync_graph_indexes()
         self.edges.add(edge)
+        self._upstream_edges.setdefault(downstream_task, set()).add(edge)
+        self._downstream_edges.setdefault(upstream_task, set()).add(edge)
+        self._indexed_versions = self._graph_set_versions()
 
         # check that the edges are valid keywords by binding them
         if validate and key is not None:
@@ -496,7 +659,7 @@ class Flow:
             }
             inspect.signature(downstream_task.run).bind_partial(**edge_keys)
 
-        self._cache.clear()
+        self._invalidate_cache()
 
         # check for cycles
         if validate:
@@ -561,10 +724,8 @@ class Flow:
         Returns:
             - dict with the key as tasks and the value as a set of upstream edges
         """
-        edges = {t: set() for t in self.tasks}  # type: Dict[Task, Set[Edge]]
-        for edge in self.edges:
-            edges[edge.downstream_task].add(edge)
-        return edges
+        self._sync_graph_indexes()
+        return {t: set(self._upstream_edges.get(t, ())) for t in self.tasks}
 
     @cache
     def all_downstream_edges(self) -> Dict[Task, Set[Edge]]:
@@ -575,10 +736,8 @@ class Flow:
         Returns:
             - dict with the key as tasks and the value as a set of downstream edges
         """
-        edges = {t: set() for t in self.tasks}  # type: Dict[Task, Set[Edge]]
-        for edge in self.edges:
-            edges[edge.upstream_task].add(edge)
-        return edges
+        self._sync_graph_indexes()
+        return {t: set(self._downstream_edges.get(t, ())) for t in self.tasks}
 
     def edges_to(self, task: Task) -> Set[Edge]:
         """
@@ -598,7 +757,8 @@ class Flow:
             raise ValueError(
                 "Task {t} was not found in Flow {f}".format(t=task, f=self)
             )
-        return self.all_upstream_edges()[task]
+        self._sync_graph_indexes()
+        return set(self._upstream_edges.get(task, ()))
 
     def edges_from(self, task: Task) -> Set[Edge]:
         """
@@ -618,7 +778,8 @@ class Flow:
             raise ValueError(
                 "Task {t} was not found in Flow {f}".format(t=task, f=self)
             )
-        return self.all_downstream_edges()[task]
+        self._sync_graph_indexes()
+        return set(self._downstream_edges.get(task, ()))
 
     def upstream_tasks(self, task: Task) -> Set[Task]:
         """
@@ -672,7 +833,8 @@ class Flow:
     def sorted_tasks(self, root_tasks: Iterable[Task] = None) -> Tuple[Task, ...]:
         """
         Get the tasks in this flow in a sorted manner. This allows us to find if any
-        cycles exist in this flow's DAG.
+        cycles exist in this flow's DAG. Tasks that could be run in any order relative
+        to each other are sorted in the order they were added to the flow.
 
         Args:
             - root_tasks ([Tasks], optional): an `Iterable` of `Task` objects to
@@ -698,48 +860,91 @@ class Flow:
         # begin by getting all tasks under consideration (root tasks and all
         # downstream tasks)
         if root_tasks:
-            tasks = set(root_tasks)
-            seen = set()  # type: Set[Task]
-
-            # while the set of tasks is different from the seen tasks...
-            while tasks.difference(seen):
-                # iterate over the new tasks...
-                for t in list(tasks.difference(seen)):
-                    # add its downstream tasks to the task list
-                    tasks.update(self.downstream_tasks(t))
-                    # mark it as seen
-                    seen.add(t)
+            tasks = set()  # type: Set[Task]
+            stack = list(root_tasks)
+            while stack:
+                task = stack.pop()
+                if task not in tasks:
+                    tasks.add(task)
+                    stack.extend(e.downstream_task for e in self.edges_from(task))
         else:
             tasks = self.tasks
 
-        # build the list of sorted tasks
-        remaining_tasks = list(tasks)
+        # count the upstream edges of each task that come from within the sorted tasks
+        in_degree = dict.fromkeys(tasks, 0)
+        for task in tasks:
+            for edge in self.edges_from(task):
+                if edge.downstream_task in in_degree:
+                    in_degree[edge.downstream_task] += 1
+
+        # ties are broken by the order in which tasks were added to the flow, so
+        # that the sort is deterministic
+        position = {
+            t: (self._task_order.get(t, len(self._task_order)), i)
+            for i, t in enumerate(tasks)
+        }
+        ready = [(position[t], t) for t, degree in in_degree.items() if degree == 0]
+        heapq.heapify(ready)
+
+        # repeatedly sort the earliest task with no unsorted upstream tasks
         sorted_tasks = []
-        while remaining_tasks:
-            # mark the flow as cyclic unless we prove otherwise
-            cyclic = True
-
-            # iterate over each remaining task
-            for task in remaining_tasks.copy():
-                # check all the upstream tasks of that task
-                for upstream_task in self.upstream_tasks(task):
-                    # if the upstream task is also remaining, it means it
-                    # hasn't been sorted, so we can't sort this task either
-                    if upstream_task in remaining_tasks:
-                        break
-                else:
-                    # but if all upstream tasks have been sorted, we can sort
-                    # this one too. We note that we found no cycle this time.
-                    cyclic = False
-                    remaining_tasks.remove(task)
-                    sorted_tasks.append(task)
-
-            # if we were unable to match any upstream tasks, we have a cycle
-            if cyclic:
-                raise ValueError("Cycle found; flows must be acyclic!")
+        while ready:
+            _, task = heapq.heappop(ready)
+            sorted_tasks.append(task)
+            for edge in self.edges_from(task):
+                downstream = edge.downstream_task
+                if downstream in in_degree:
+                    in_degree[downstream] -= 1
+                    if in_degree[downstream] == 0:
+                        heapq.heappush(ready, (position[downstream], downstream))
+
+        # any task that couldn't be sorted is part of (or downstream of) a cycle
+        if len(sorted_tasks) < len(tasks):
+            cycle = self._find_cycle(
+                [t for t, degree in in_degree.items() if degree > 0], position
+            )
+            raise ValueError(
+                "Cycle found; flows must be acyclic! {}".format(
+                    " -> ".join(str(t) for t in cycle)
+                )
+            )
 
         return tuple(sorted_tasks)
 
+    def _find_cycle(
+        self, unsorted: List[Task], position: Dict[Task, Any]
+    ) -> List[Task]:
+        """
+        Finds a cycle among the tasks that could not be topologically sorted. Each of
+        those tasks has at least one upstream task that also could not be sorted, so
+        walking upstream from any of them must eventually revisit a task.
+
+        Args:
+            - unsorted ([Task]): the tasks that could not be sorted
+            - position (dict): the sort key of each task, used to make the walk deterministic
+
+        Returns:
+            - [Task]: the tasks making up the cycle, in upstream to downstream order, with the
+                first task repeated at the end
+        """
+        remaining = set(unsorted)
+        path = []  # type: List[Task]
+        visited = {}  # type: Dict[Task, int]
+        task = min(remaining, key=position.__getitem__)
+        while task not in visited:
+            visited[task] = len(path)
+            path.append(task)
+            task = min(
+                (
+                    e.upstream_task
+                    for e in self.edges_to(task)
+                    if e.upstream_task in remaining
+                ),
+                key=position.__getitem__,
+            )
+        cycle = path[visited[task] :] + [task]
+        return cycle[::-1]
+
     # Dependencies ------------------------------------------------------------
 
     def set_dependencies(
@@ -836,7 +1041,9 @@ class Flow:
             flow_state.result = {}
         task_states = kwargs.pop("task_states", {})
         flow_state.result.update(task_states)
-        prefect.context.setdefault("caches", {})
+        caches = prefect.context.setdefault("caches", {})
+        if not isinstance(caches, prefect.engine.cache_index.CacheIndex):
+            prefect.context.caches = prefect.engine.cache_index.CacheIndex(caches)
 
         ## run this flow indefinitely, so long as its schedule has future dates
         while True:
@@ -899,13 +1106,10 @@ class Flow:
                     else:
                         cached_sub_states = []
 
-                    fresh_states = [
-                        s
-                        for s in prefect.context.caches.get(t.cache_key or t.name, [])
-                        + cached_sub_states
-                        if s.cached_result_expiration > now
-                    ]
-                    prefect.context.caches[t.cache_key or t.name] = fresh_states
+                    prefect.context.caches.add(
+                        t.cache_key or t.name, *cached_sub_states
+                    )
+                prefect.context.caches.evict_expired()
                 if self.schedule is not None:
                     next_run_time = self.schedule.next(1)[0]
                 else:
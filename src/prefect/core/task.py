@@ -4,7 +4,18 @@ import inspect
 import uuid
 import warnings
 from datetime import timedelta
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import prefect
 import prefect.engine.cache_validators
@@ -33,7 +44,7 @@ def _validate_run_signature(run: Callable) -> None:
             "to *args."
         )
 
-    reserved_kwargs = ["upstream_tasks", "mapped", "task_args", "flow"]
+    reserved_kwargs = ["upstream_tasks", "mapped", "task_args", "flow", "map_chunksize"]
     violations = [kw for kw in reserved_kwargs if kw in run_sig.args]
     if violations:
         msg = "Tasks cannot have the following argument names: {}.".format(
@@ -229,6 +240,7 @@ class Task(metaclass=SignatureValidator):
                 callback_factory(on_failure, check=lambda s: s.is_failed())
             )
         self.auto_generated = False
+        self.map_chunksize = None  # type: Optional[int]
 
     def __repr__(self) -> str:
         return "<Task: {self.name}>".format(self=self)
@@ -264,6 +276,10 @@ class Task(metaclass=SignatureValidator):
                 <li> `SKIP` will skip the task and possibly propogate the skip state through the
                     flow, depending on whether downstream tasks have `skip_on_upstream_skip=True`. </li></ul>
         </li></ul>
+
+        `run()` may also be a coroutine function (`async def run(...)`). The coroutine is
+        run to completion by the executor; the `AsyncioExecutor` runs the coroutines of
+        many tasks concurrently on a single event loop.
         """
         pass
 
@@ -421,6 +437,7 @@ class Task(metaclass=SignatureValidator):
         *args: Any,
         upstream_tasks: Iterable[Any] = None,
         flow: "Flow" = None,
+        map_chunksize: int = None,
         **kwargs: Any
     ) -> "Task":
         """
@@ -440,11 +457,26 @@ class Task(metaclass=SignatureValidator):
                 to map over
             - flow (Flow, optional): The flow to set dependencies on, defaults to the current
                 flow in context if no flow is specified
+            - map_chunksize (int, optional): if provided, the mapped children are submitted
+                to the executor in chunks of this size, each of which runs its children one
+                after another and only generates their inputs as it runs them. Useful for
+                mapping over very large inputs, where submitting every child separately is
+                expensive. Each child still has its own state in the `Mapped` state's
+                `map_states`, and the mapped task run waits for all of its chunks to finish.
+                Defaults to `None`, which submits each child separately
             - **kwargs: keyword arguments to map over, which will elementwise be bound to the Task's `run` method
 
         Returns: - Task: a new Task instance
+
+        Raises:
+            - ValueError: if `map_chunksize` is not a positive integer
         """
+        if map_chunksize is not None and (
+            not isinstance(map_chunksize, int) or map_chunksize < 1
+        ):
+            raise ValueError("map_chunksize must be a positive integer.")
         new = self.copy()
+        new.map_chunksize = map_chunksize
         return new.bind(
             *args, mapped=True, upstream_tasks=upstream_tasks, flow=flow, **kwargs
         )
@@ -5,6 +5,8 @@ import prefect.engine.state
 import prefect.engine.signals
 import prefect.engine.result
 import prefect.engine.result_handlers
+import prefect.engine.cache_stores
+import prefect.engine.cache_index
 from prefect.engine.flow_runner import FlowRunner
 from prefect.engine.task_runner import TaskRunner
 import prefect.engine.cloud
@@ -0,0 +1,258 @@
+"""
+An index of the cached states of tasks, which `Flow.run` keeps in `prefect.context.caches`
+between scheduled runs.
+
+The index is a mapping from each cache key (a task's `cache_key`, or its name) to the list
+of its cached states, like the dictionary it replaces. In addition, the states of each key
+are indexed by a fingerprint of the inputs and parameters they were created with, so that
+a task whose `cache_validator` declares which of those values it compares (see
+`prefect.engine.cache_validators.validates_on`) only has to validate the states created
+with the same values.
+"""
+import datetime
+import heapq
+import itertools
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
+
+import pendulum
+
+import prefect
+from prefect.engine.cache_stores.cache_store import CacheStore, Components
+from prefect.engine.state import Cached
+
+
+class _Entry:
+    __slots__ = ("key", "state", "order", "fingerprints", "removed")
+
+    def __init__(self, key: str, state: Cached, order: int) -> None:
+        self.key = key
+        self.state = state
+        self.order = order
+        self.fingerprints = {}  # type: Dict[Components, Optional[str]]
+        self.removed = False
+
+
+class CacheIndex(MutableMapping, CacheStore):
+    """
+    An in-memory cache store, which is also a mapping from cache keys to lists of cached
+    states. The index evicts states once their `cached_result_expiration` has passed and
+    looks states up by a fingerprint of their inputs and parameters.
+
+    Once the index holds `max_entries` states, adding a state evicts the state which is
+    the first to expire. States without an expiration are evicted last.
+
+    Args:
+        - caches (Mapping[str, Iterable[Cached]], optional): states to add to the index,
+            for example an existing `prefect.context.caches` dictionary
+        - max_entries (int, optional): the maximum number of states in the index;
+            defaults to `engine.cache.max_entries` in your Prefect configuration, where
+            `false` means no limit
+    """
+
+    def __init__(
+        self, caches: Mapping[str, Iterable[Cached]] = None, max_entries: int = None
+    ) -> None:
+        if max_entries is None:
+            max_entries = prefect.config.engine.cache.max_entries or None
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._entries = {}  # type: Dict[str, Dict[int, _Entry]]
+        self._views = (
+            {}
+        )  # type: Dict[Tuple[str, Components], Dict[Optional[str], Dict[int, _Entry]]]
+        self._expirations = []  # type: List[Tuple[float, int, _Entry]]
+        self._counter = itertools.count()
+        self._size = 0
+        for key, states in (caches or {}).items():
+            self.add(key, *states)
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (dict(self), self.max_entries))
+
+    def __repr__(self) -> str:
+        return "<CacheIndex: {} states>".format(self.size)
+
+    @property
+    def size(self) -> int:
+        """
+        The number of states in the index.
+        """
+        return self._size
+
+    def __getitem__(self, key: str) -> List[Cached]:
+        with self._lock:
+            return [entry.state for entry in self._entries[key].values()]
+
+    def __setitem__(self, key: str, states: Iterable[Cached]) -> None:
+        with self._lock:
+            if key in self._entries:
+                del self[key]
+            self.add(key, *states)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            for entry in list(self._entries[key].values()):
+                self._remove(entry)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, *states: Cached) -> None:
+        """
+        Adds cached states to the index. States which are already in the index under the
+        same key are ignored.
+
+        Args:
+            - key (str): the cache key of the states
+            - *states (Cached): the states to add
+        """
+        with self._lock:
+            for state in states:
+                entries = self._entries.setdefault(key, {})
+                if id(state) in entries:
+                    continue
+                entry = _Entry(key, state, next(self._counter))
+                entries[id(state)] = entry
+                for (view_key, components), view in self._views.items():
+                    if view_key == key:
+                        self._add_to_view(view, components, entry)
+                expiration = state.cached_result_expiration
+                timestamp = (
+                    expiration.timestamp() if expiration is not None else float("inf")
+                )
+                heapq.heappush(self._expirations, (timestamp, entry.order, entry))
+                self._size += 1
+
+            while self.max_entries is not None and self._size > self.max_entries:
+                _, _, entry = heapq.heappop(self._expirations)
+                if not entry.removed:
+                    self._remove(entry)
+
+    def put(self, key: str, state: Cached, validator: Callable = None) -> None:
+        """
+        Adds a cached state to the index. States are indexed by the fingerprint components
+        of every validator they are looked up with, so `validator` isn't needed.
+
+        Args:
+            - key (str): the cache key of the state
+            - state (Cached): the state to add
+            - validator (Callable, optional): the cache validator of the task
+        """
+        self.add(key, state)
+
+    def evict_expired(self, now: datetime.datetime = None) -> int:
+        """
+        Removes every state whose `cached_result_expiration` has passed.
+
+        Args:
+            - now (datetime.datetime, optional): the current time; defaults to
+                `pendulum.now("utc")`
+
+        Returns:
+            - int: the number of states removed
+        """
+        timestamp = (now or pendulum.now("utc")).timestamp()
+        evicted = 0
+        with self._lock:
+            while self._expirations and self._expirations[0][0] <= timestamp:
+                _, _, entry = heapq.heappop(self._expirations)
+                if not entry.removed:
+                    self._remove(entry)
+                    evicted += 1
+        return evicted
+
+    def candidates(
+        self,
+        key: str,
+        validator: Callable,
+        inputs: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]],
+    ) -> List[Cached]:
+        """
+        Returns the unexpired states under a cache key which `validator` could accept for
+        the given inputs and parameters, in the order in which they were added.
+
+        If the validator declares its `fingerprint_components`, only the states whose
+        fingerprint of those components matches `inputs` and `parameters` are returned;
+        otherwise, every state under the key is returned. The states still have to be
+        checked with the validator.
+
+        Args:
+            - key (str): the cache key
+            - validator (Callable): the cache validator of the task
+            - inputs (Dict[str, Any]): the values of the task's inputs
+            - parameters (Dict[str, Any]): the values of the flow's parameters
+
+        Returns:
+            - List[Cached]: the candidate states
+        """
+        self.evict_expired()
+        components = getattr(validator, "fingerprint_components", None)
+        with self._lock:
+            if key not in self._entries:
+                return []
+            fp = None
+            if components is not None:
+                fp = self.fingerprint(components, inputs, parameters)
+            if fp is None:
+                return self[key]
+
+            view = self._views.get((key, components))
+            if view is None:
+                view = {}
+                for entry in self._entries[key].values():
+                    self._add_to_view(view, components, entry)
+                self._views[(key, components)] = view
+
+            matches = list(view.get(fp, {}).values())
+            # states whose fingerprint couldn't be computed always have to be validated
+            unknown = list(view.get(None, {}).values())
+            if unknown:
+                matches = sorted(matches + unknown, key=lambda entry: entry.order)
+            return [entry.state for entry in matches]
+
+    @staticmethod
+    def _add_to_view(
+        view: Dict[Optional[str], Dict[int, _Entry]],
+        components: Components,
+        entry: _Entry,
+    ) -> None:
+        fp = CacheStore.state_fingerprint(entry.state, components)
+        entry.fingerprints[components] = fp
+        view.setdefault(fp, {})[id(entry.state)] = entry
+
+    def _remove(self, entry: _Entry) -> None:
+        entry.removed = True
+        self._size -= 1
+        entries = self._entries[entry.key]
+        del entries[id(entry.state)]
+        for components, fp in entry.fingerprints.items():
+            view = self._views[(entry.key, components)]
+            bucket = view[fp]
+            del bucket[id(entry.state)]
+            if not bucket:
+                del view[fp]
+        if not entries:
+            del self._entries[entry.key]
+            for components in entry.fingerprints:
+                del self._views[(entry.key, components)]
+        # removed entries stay in the heap until they reach the top; rebuild it once
+        # they make up most of it
+        if len(self._expirations) > 2 * self._size + 100:
+            self._expirations = [e for e in self._expirations if not e[2].removed]
+            heapq.heapify(self._expirations)
@@ -0,0 +1,7 @@
+"""
+Cache stores keep the `Cached` states of tasks, so that later runs of the same tasks can
+use them. A task runner reads from and writes to the store returned by `get_cache_store`,
+in addition to the in-memory caches `flow.run` keeps between scheduled runs.
+"""
+from prefect.engine.cache_stores.cache_store import CacheStore, get_cache_store
+from prefect.engine.cache_stores.sqlite_cache_store import SQLiteCacheStore
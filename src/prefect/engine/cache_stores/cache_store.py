@@ -0,0 +1,172 @@
+"""
+Cache stores keep the `Cached` states of tasks, so that later runs of the same tasks can
+look them up.
+"""
+import os
+import threading
+from abc import ABCMeta, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import prefect
+from prefect import config
+from prefect.engine import cache_validators
+from prefect.engine.state import Cached
+from prefect.utilities.hashing import fingerprint
+from prefect.utilities.serialization import from_qualified_name
+
+Components = Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...]
+
+
+class CacheStore(metaclass=ABCMeta):
+    """
+    Base class for cache stores, which store the `Cached` states of tasks by cache key
+    (a task's `cache_key`, or its name).
+
+    Stores can look states up by a fingerprint of the inputs and parameters they were
+    created with: when a task's `cache_validator` declares which of those values it
+    compares (see `prefect.engine.cache_validators.validates_on`), only the states created
+    with the same values need to be returned.
+    """
+
+    def __repr__(self) -> str:
+        return "<CacheStore: {}>".format(type(self).__name__)
+
+    @abstractmethod
+    def candidates(
+        self,
+        key: str,
+        validator: Callable,
+        inputs: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]],
+    ) -> List[Cached]:
+        """
+        Returns the unexpired states under a cache key which `validator` could accept for
+        the given inputs and parameters, in the order in which they were stored. The
+        states still have to be checked with the validator.
+
+        Args:
+            - key (str): the cache key
+            - validator (Callable): the cache validator of the task
+            - inputs (Dict[str, Any]): the values of the task's inputs
+            - parameters (Dict[str, Any]): the values of the flow's parameters
+
+        Returns:
+            - List[Cached]: the candidate states
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def put(self, key: str, state: Cached, validator: Callable = None) -> None:
+        """
+        Stores a cached state.
+
+        Args:
+            - key (str): the cache key of the state
+            - state (Cached): the state to store
+            - validator (Callable, optional): the cache validator of the task, whose
+                `fingerprint_components` the state can be indexed by
+        """
+        raise NotImplementedError()
+
+    def evict_expired(self) -> int:
+        """
+        Removes every state whose `cached_result_expiration` has passed.
+
+        Returns:
+            - int: the number of states removed
+        """
+        return 0
+
+    @staticmethod
+    def fingerprint(
+        components: Components,
+        inputs: Optional[Dict[str, Any]],
+        parameters: Optional[Dict[str, Any]],
+        input_fingerprints: Dict[str, str] = None,
+    ) -> Optional[str]:
+        """
+        Computes the fingerprint of the given components of a task's inputs and
+        parameters. Inputs are included by the fingerprints of their values, so only the
+        inputs named by `components` are hashed.
+
+        Args:
+            - components (tuple): the `fingerprint_components` of a cache validator
+            - inputs (Dict[str, Any]): the values of the task's inputs
+            - parameters (Dict[str, Any]): the values of the flow's parameters
+            - input_fingerprints (Dict[str, str], optional): the fingerprints of the
+                task's inputs, if they are already known; `inputs` is ignored if provided
+
+        Returns:
+            - Optional[str]: the fingerprint, or `None` if it can't be computed
+        """
+        try:
+            parts = []
+            for name, names in components:
+                if name == "inputs":
+                    if input_fingerprints is not None:
+                        values = input_fingerprints  # type: Optional[Dict[str, Any]]
+                    else:
+                        values = cache_validators.input_fingerprints(inputs, names)
+                        if values is None:
+                            return None
+                else:
+                    values = parameters
+                if names is not None:
+                    values = {k: v for k, v in (values or {}).items() if k in names}
+                parts.append((name, values))
+            return fingerprint(parts)
+        except Exception:
+            return None
+
+    @classmethod
+    def state_fingerprint(cls, state: Cached, components: Components) -> Optional[str]:
+        """
+        Computes the fingerprint of the given components of the inputs and parameters a
+        cached state was created with.
+
+        Args:
+            - state (Cached): the cached state
+            - components (tuple): the `fingerprint_components` of a cache validator
+
+        Returns:
+            - Optional[str]: the fingerprint, or `None` if it can't be computed
+        """
+        input_fingerprints = getattr(state, "cached_input_fingerprints", None)
+        try:
+            inputs = None
+            if input_fingerprints is None:
+                inputs = {
+                    k: res.value for k, res in (state.cached_inputs or {}).items()
+                }
+        except Exception:
+            return None
+        return cls.fingerprint(
+            components, inputs, state.cached_parameters, input_fingerprints
+        )
+
+
+_stores = {}  # type: Dict[Tuple[str, int], CacheStore]
+_stores_lock = threading.Lock()
+
+
+def get_cache_store() -> Optional[CacheStore]:
+    """
+    Returns the cache store that task runners read cached states from and write them to:
+    the `cache_store` in `prefect.context` if there is one, or else an instance of the
+    class named by `engine.cache.store` in your Prefect configuration, which is shared by
+    the whole process.
+
+    Returns:
+        - Optional[CacheStore]: the cache store, or `None` if none is configured
+    """
+    store = prefect.context.get("cache_store")
+    if store is not None:
+        return store
+    name = config.engine.cache.store
+    if not name:
+        return None
+    with _stores_lock:
+        key = (name, os.getpid())
+        if key not in _stores:
+            _stores[key] = from_qualified_name(name)()
+        return _stores[key]
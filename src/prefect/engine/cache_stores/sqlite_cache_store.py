@@ -0,0 +1,215 @@
+import copy
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import cloudpickle
+
+from prefect import config
+from prefect.engine.cache_stores.cache_store import CacheStore
+from prefect.engine.result import Result
+from prefect.engine.state import Cached
+from prefect.utilities import logging
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cached_states (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cache_key TEXT NOT NULL,
+    components TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    expiration REAL NOT NULL,
+    state BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cached_states_lookup
+    ON cached_states (cache_key, components, fingerprint);
+CREATE INDEX IF NOT EXISTS cached_states_expiration ON cached_states (expiration);
+"""
+
+# states stored with the same fingerprint components are matched by fingerprint; states
+# whose fingerprint couldn't be computed, and states stored with other components, are
+# always candidates
+_LOOKUP = """
+SELECT id, state FROM cached_states
+    WHERE cache_key = :key AND components = :components
+    AND fingerprint IN (:fingerprint, '') AND expiration > :now
+UNION ALL
+SELECT id, state FROM cached_states
+    WHERE cache_key = :key AND components < :components AND expiration > :now
+UNION ALL
+SELECT id, state FROM cached_states
+    WHERE cache_key = :key AND components > :components AND expiration > :now
+ORDER BY id
+"""
+
+
+class SQLiteCacheStore(CacheStore):
+    """
+    A cache store which keeps cached states in a local SQLite database, so that they
+    outlive the process which created them. The database can be shared by several
+    processes at once.
+
+    Results with a result handler are written with it, and only their location is kept
+    in the database; other results (and the inputs the state was created with) are
+    serialized into the database with `cloudpickle`. Expired states are removed whenever
+    a new state is stored.
+
+    To have every task runner read from and write to a `SQLiteCacheStore`, set
+    `engine.cache.store` in your Prefect configuration to
+    `"prefect.engine.cache_stores.SQLiteCacheStore"`.
+
+    Args:
+        - path (str, optional): the path of the database file, which is created if it
+            doesn't exist; defaults to `engine.cache.sqlite_path` in your Prefect
+            configuration
+        - timeout (float, optional): the number of seconds to wait for another process
+            to release a lock on the database before raising an error; defaults to 30
+    """
+
+    def __init__(self, path: str = None, timeout: float = 30.0) -> None:
+        self.path = os.path.expanduser(path or config.engine.cache.sqlite_path)
+        self.timeout = timeout
+        self.logger = logging.get_logger(type(self).__name__)
+        self._local = threading.local()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # connections can't be shared across threads or forked processes
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.DatabaseError:
+            pass
+        conn.executescript(_SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def candidates(
+        self,
+        key: str,
+        validator: Callable,
+        inputs: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]],
+    ) -> List[Cached]:
+        """
+        Returns the unexpired states under a cache key which `validator` could accept for
+        the given inputs and parameters, in the order in which they were stored. The
+        states still have to be checked with the validator.
+
+        Args:
+            - key (str): the cache key
+            - validator (Callable): the cache validator of the task
+            - inputs (Dict[str, Any]): the values of the task's inputs
+            - parameters (Dict[str, Any]): the values of the flow's parameters
+
+        Returns:
+            - List[Cached]: the candidate states
+        """
+        components = getattr(validator, "fingerprint_components", None)
+        fp = None
+        if components is not None:
+            fp = self.fingerprint(components, inputs, parameters)
+
+        if fp is None:
+            rows = self._connect().execute(
+                "SELECT id, state FROM cached_states "
+                "WHERE cache_key = ? AND expiration > ? ORDER BY id",
+                (key, time.time()),
+            )
+        else:
+            rows = self._connect().execute(
+                _LOOKUP,
+                dict(
+                    key=key,
+                    components=repr(components),
+                    fingerprint=fp,
+                    now=time.time(),
+                ),
+            )
+
+        states = []
+        for id_, blob in rows.fetchall():
+            try:
+                states.append(cloudpickle.loads(blob))
+            except Exception as exc:
+                self.logger.debug(
+                    "Skipping cached state {} which can't be loaded: {}".format(
+                        id_, repr(exc)
+                    )
+                )
+        return states
+
+    def put(self, key: str, state: Cached, validator: Callable = None) -> None:
+        """
+        Stores a cached state, and removes every state whose expiration has passed.
+
+        Args:
+            - key (str): the cache key of the state
+            - state (Cached): the state to store; states without a
+                `cached_result_expiration` are not stored
+            - validator (Callable, optional): the cache validator of the task, whose
+                `fingerprint_components` the state is indexed by
+        """
+        if state.cached_result_expiration is None:
+            return
+        components = getattr(validator, "fingerprint_components", None)
+        fp = None
+        if components is not None:
+            fp = self.state_fingerprint(state, components)
+
+        stored = copy.copy(state)
+        result = state._result
+        if isinstance(result, Result) and result.result_handler is not None:
+            result.store_safe_value()
+            stored._result = result.safe_value
+        blob = cloudpickle.dumps(stored)
+
+        now = time.time()
+        conn = self._connect()
+        conn.execute("DELETE FROM cached_states WHERE expiration <= ?", (now,))
+        conn.execute(
+            "INSERT INTO cached_states "
+            "(cache_key, components, fingerprint, expiration, state) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                key,
+                repr(components) if components is not None else "",
+                fp or "",
+                state.cached_result_expiration.timestamp(),
+                blob,
+            ),
+        )
+
+    def evict_expired(self) -> int:
+        """
+        Removes every state whose `cached_result_expiration` has passed.
+
+        Returns:
+            - int: the number of states removed
+        """
+        cursor = self._connect().execute(
+            "DELETE FROM cached_states WHERE expiration <= ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """
+        Removes every state from the store.
+        """
+        self._connect().execute("DELETE FROM cached_states")
@@ -12,12 +12,130 @@ and are used to determine whether to re-run the Task or use the cache.
 Note that _all_ validators take into account cache expiration.
 
 A cache validator returns `True` if the cache is still valid, and `False` otherwise.
+
+Cached states created by a task runner hold a fingerprint of each of their inputs (see
+`prefect.utilities.hashing`) instead of the inputs themselves, so validators which
+compare inputs compare their fingerprints, with `input_fingerprints`.
+
+Validators which only accept caches created with the same inputs or parameters can
+declare so with the `validates_on` decorator. When running a flow locally, the cached
+states of a task are then looked up by a fingerprint of those values, instead of being
+passed to the validator one at a time.
 """
-from typing import Any, Callable, Dict, Iterable
+from typing import Any, Callable, Dict, Iterable, Optional, TypeVar, Union
 
 import pendulum
 
 import prefect
+from prefect.utilities.hashing import fingerprint
+
+F = TypeVar("F", bound=Callable)
+
+
+class FingerprintedInputs(dict):
+    """
+    A dictionary of task inputs which remembers the fingerprint of each of its values,
+    so that however many cached states the inputs are compared with, each of them is
+    fingerprinted at most once. Task runners pass their inputs to cache validators in
+    one of these.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._fingerprints = {}  # type: Dict[str, Optional[str]]
+
+    def fingerprint(self, key: str) -> Optional[str]:
+        """
+        Returns the fingerprint of the value of an input.
+
+        Args:
+            - key (str): the name of the input
+
+        Returns:
+            - Optional[str]: the fingerprint of the input's value, or `None` if it has
+                none
+
+        Raises:
+            - KeyError: if there is no such input
+        """
+        if key not in self._fingerprints:
+            self._fingerprints[key] = fingerprint(self[key])
+        return self._fingerprints[key]
+
+
+def input_fingerprints(
+    inputs: Optional[Dict[str, Any]], names: Iterable[str] = None
+) -> Optional[Dict[str, str]]:
+    """
+    Fingerprints the inputs passed to a cache validator, for comparing them with the
+    `cached_input_fingerprints` of a cached state.
+
+    Args:
+        - inputs (Dict[str, Any]): the inputs passed to the validator
+        - names (Iterable[str], optional): the names of the inputs to fingerprint;
+            defaults to all of them
+
+    Returns:
+        - Optional[Dict[str, str]]: the fingerprint of each input, or `None` if one of
+            them can't be fingerprinted
+    """
+    if not isinstance(inputs, FingerprintedInputs):
+        inputs = FingerprintedInputs(inputs or {})
+    keys = list(inputs) if names is None else [k for k in inputs if k in set(names)]
+    fingerprints = {key: inputs.fingerprint(key) for key in keys}
+    if any(fp is None for fp in fingerprints.values()):
+        return None
+    return fingerprints  # type: ignore
+
+
+def validates_on(
+    inputs: Union[bool, Iterable[str]] = False,
+    parameters: Union[bool, Iterable[str]] = False,
+) -> Callable[[F], F]:
+    """
+    Decorator which declares that a cache validator only accepts a cached state if the
+    given inputs and parameters are equal to those the state was created with. The
+    declaration is stored on the validator as its `fingerprint_components` attribute.
+
+    Args:
+        - inputs (Union[bool, Iterable[str]], optional): `True` if the validator compares
+            all inputs, or the names of the inputs it compares; defaults to `False`
+        - parameters (Union[bool, Iterable[str]], optional): `True` if the validator
+            compares all parameters, or the names of the parameters it compares; defaults
+            to `False`
+
+    Returns:
+        - Callable: a decorator for cache validators
+
+    Example:
+    ```python
+    from prefect.engine.cache_validators import (
+        duration_only,
+        input_fingerprints,
+        validates_on,
+    )
+
+    @validates_on(inputs=["x"])
+    def same_x(state, inputs, parameters):
+        # cached states created by task runners hold the fingerprints of their inputs
+        cached = state.cached_input_fingerprints or {}
+        return duration_only(state, inputs, parameters) and (
+            input_fingerprints(inputs, ["x"]) == {"x": cached.get("x")}
+        )
+    ```
+    """
+    components = []
+    for name, names in [("inputs", inputs), ("parameters", parameters)]:
+        if names is True:
+            components.append((name, None))
+        elif names is not False:
+            components.append((name, tuple(sorted(set(names)))))  # type: ignore
+
+    def decorator(validator: F) -> F:
+        validator.fingerprint_components = tuple(components)  # type: ignore
+        return validator
+
+    return decorator
 
 
 def never_use(
@@ -41,6 +159,7 @@ def never_use(
     return False
 
 
+@validates_on()
 def duration_only(
     state: "prefect.engine.state.Cached",
     inputs: Dict[str, Any],
@@ -67,6 +186,7 @@ def duration_only(
         return False
 
 
+@validates_on(inputs=True)
 def all_inputs(
     state: "prefect.engine.state.Cached",
     inputs: Dict[str, Any],
@@ -88,12 +208,15 @@ def all_inputs(
     """
     if duration_only(state, inputs, parameters) is False:
         return False
+    elif getattr(state, "cached_input_fingerprints", None) is not None:
+        return input_fingerprints(inputs) == state.cached_input_fingerprints
     elif {key: res.value for key, res in (state.cached_inputs or {}).items()} == inputs:
         return True
     else:
         return False
 
 
+@validates_on(parameters=True)
 def all_parameters(
     state: "prefect.engine.state.Cached",
     inputs: Dict[str, Any],
@@ -159,6 +282,7 @@ def partial_parameters_only(validate_on: Iterable[str] = None,) -> Callable:
     ```
     """
 
+    @validates_on(parameters=validate_on if validate_on is not None else False)
     def _partial_parameters_only(
         state: "prefect.engine.state.Cached",
         inputs: Dict[str, Any],
@@ -237,6 +361,7 @@ def partial_inputs_only(validate_on: Iterable[str] = None,) -> Callable:
     ```
     """
 
+    @validates_on(inputs=validate_on if validate_on is not None else False)
     def _partial_inputs_only(
         state: "prefect.engine.state.Cached",
         inputs: Dict[str, Any],
@@ -262,6 +387,14 @@ def partial_inputs_only(validate_on: Iterable[str] = None,) -> Callable:
             return (
                 True
             )  # if you dont want to validate on anything, then the cache is valid
+        elif getattr(state, "cached_input_fingerprints", None) is not None:
+            partial_provided = input_fingerprints(inputs, validate_on)
+            partial_needed = {
+                key: fp
+                for key, fp in (state.cached_input_fingerprints or {}).items()
+                if key in validate_on
+            }
+            return partial_provided == partial_needed
         else:
             cached = {
                 key: res.value for key, res in (state.cached_inputs or {}).items()
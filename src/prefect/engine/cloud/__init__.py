@@ -1,2 +1,3 @@
 from prefect.engine.cloud.task_runner import CloudTaskRunner
 from prefect.engine.cloud.flow_runner import CloudFlowRunner
+from prefect.engine.cloud.state_reporter import TaskRunStateReporter
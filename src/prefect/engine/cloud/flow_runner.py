@@ -9,6 +9,7 @@ from prefect.engine.cloud.utilities import prepare_state_for_cloud
 from prefect.engine.flow_runner import FlowRunner, FlowRunnerInitializeResult
 from prefect.engine.runner import ENDRUN
 from prefect.engine.state import Failed, State
+from prefect.utilities.executors import defer_heartbeat
 
 
 class CloudFlowRunner(FlowRunner):
@@ -64,7 +65,8 @@ class CloudFlowRunner(FlowRunner):
     def _heartbeat(self) -> None:
         try:
             flow_run_id = prefect.context.get("flow_run_id")
-            self.client.update_flow_run_heartbeat(flow_run_id)
+            if not defer_heartbeat(self.client, "flow_run", flow_run_id):
+                self.client.update_flow_run_heartbeat(flow_run_id)
         except:
             warnings.warn("Heartbeat failed for Flow '{}'".format(self.flow.name))
 
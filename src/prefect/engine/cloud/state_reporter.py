@@ -0,0 +1,248 @@
+import collections
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import prefect
+from prefect.client import Client
+from prefect.engine.state import State
+from prefect.utilities.exceptions import ClientError
+
+
+class _Update:
+    def __init__(self, state: State, final: bool) -> None:
+        self.state = state
+        self.final = final
+        self.created = time.monotonic()
+        self.done = threading.Event()
+        self.error = None  # type: Optional[Exception]
+        self.next_version = None  # type: Optional[int]
+
+
+class TaskRunStateReporter:
+    """
+    Sends task run states to Prefect Cloud in batches, from a background thread, with
+    `Client.set_task_run_states`.
+
+    `Running` states are queued: a batch is sent once it has `batch_size` updates, or once
+    its oldest update has waited `flush_interval` seconds. Every other state ends (or
+    pauses) a task run, so reporting one blocks until it has been sent, along with
+    everything queued before it. A queued state which is superseded by a newer state of
+    the same task run before it is sent is never sent at all.
+
+    The reporter keeps track of the version of each task run with states in flight, so
+    that every update is checked against the version that Cloud expects. If an update is
+    rejected, the next state reported for the same task run raises the error.
+
+    Args:
+        - client (Client, optional): the client to send states with; defaults to a new
+            `Client`
+        - batch_size (int, optional): the maximum number of updates sent at once;
+            defaults to `cloud.task_run_state_batch_size` in your Prefect configuration
+        - flush_interval (float, optional): the maximum number of seconds a queued state
+            waits before being sent; defaults to `cloud.task_run_state_flush_interval` in
+            your Prefect configuration
+    """
+
+    def __init__(
+        self,
+        client: Client = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+    ) -> None:
+        self.client = client or Client()
+        self.batch_size = batch_size or prefect.config.cloud.task_run_state_batch_size
+        if flush_interval is None:
+            flush_interval = prefect.config.cloud.task_run_state_flush_interval
+        self.flush_interval = flush_interval
+        self._pending = (
+            collections.OrderedDict()
+        )  # type: collections.OrderedDict[str, _Update]
+        self._versions = {}  # type: Dict[str, Optional[int]]
+        self._errors = {}  # type: Dict[str, Exception]
+        self._condition = threading.Condition()
+        self._flush_requested = False
+        self._sending = False
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def report(self, task_run_id: str, version: int, state: State) -> Optional[int]:
+        """
+        Reports a new state for a task run.
+
+        Args:
+            - task_run_id (str): the id of the task run
+            - version (int): the current version of the task run, as known to the caller;
+                only used if the reporter isn't already tracking the task run
+            - state (State): the new state
+
+        Returns:
+            - Optional[int]: the version of the task run after the update, if the state
+                was sent before returning; `None` if it was queued
+
+        Raises:
+            - ClientError: if Cloud rejected this update or an earlier queued update of
+                the same task run
+        """
+        final = not state.is_running()
+        with self._condition:
+            error = self._errors.pop(task_run_id, None)
+            if error is not None:
+                self._versions.pop(task_run_id, None)
+                self._pending.pop(task_run_id, None)
+                raise error
+
+            if self._versions.get(task_run_id) is None:
+                self._versions[task_run_id] = version
+            update = _Update(state, final)
+            superseded = self._pending.pop(task_run_id, None)
+            if superseded is not None:
+                update.created = superseded.created
+            self._pending[task_run_id] = update
+            self._start()
+            self._condition.notify_all()
+
+        if not final:
+            return None
+        update.done.wait()
+        if update.error is not None:
+            raise update.error
+        return update.next_version
+
+    def flush(self) -> None:
+        """
+        Blocks until every queued state has been sent.
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending or self._sending:
+                self._condition.wait()
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._send_states, name="PrefectStateReporter", daemon=True
+            )
+            self._thread.start()
+
+    def _next_batch(self) -> List[tuple]:
+        with self._condition:
+            while True:
+                if self._pending:
+                    oldest = next(iter(self._pending.values()))
+                    wait = oldest.created + self.flush_interval - time.monotonic()
+                    if (
+                        wait <= 0
+                        or self._flush_requested
+                        or len(self._pending) >= self.batch_size
+                        or any(u.final for u in self._pending.values())
+                    ):
+                        break
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+
+            batch = []  # type: List[tuple]
+            while self._pending and len(batch) < self.batch_size:
+                task_run_id, update = self._pending.popitem(last=False)
+                batch.append((task_run_id, self._versions[task_run_id], update))
+            if not self._pending:
+                self._flush_requested = False
+            self._sending = True
+            return batch
+
+    def _send_states(self) -> None:
+        batch = []  # type: List[tuple]
+        try:
+            while True:
+                batch = self._next_batch()
+                self._record_results(batch, self._send_batch(batch))
+        except Exception as exc:
+            # don't leave anyone waiting on a thread which is about to die; the next
+            # report starts a new one
+            with self._condition:
+                unsent = [(i, u) for i, _, u in batch if not u.done.is_set()]
+                unsent.extend(self._pending.items())
+                self._pending.clear()
+                for task_run_id, update in unsent:
+                    self._versions.pop(task_run_id, None)
+                    update.error = exc
+                    if not update.final:
+                        self._errors[task_run_id] = exc
+                    update.done.set()
+                self._sending = False
+                self._condition.notify_all()
+            raise
+
+    def _send_batch(self, batch: List[tuple]) -> List[Optional[Exception]]:
+        try:
+            results = self.client.set_task_run_states(
+                [
+                    dict(task_run_id=task_run_id, version=version, state=u.state)
+                    for task_run_id, version, u in batch
+                ]
+            )
+            if len(results) != len(batch):
+                raise ClientError(
+                    "Expected {} task run state results, got {}".format(
+                        len(batch), len(results)
+                    )
+                )
+            return [
+                None
+                if r["status"] == "SUCCESS"
+                else ClientError(
+                    "Failed to set task run state: {}".format(r.get("message"))
+                )
+                for r in results
+            ]
+        except Exception as exc:
+            return [exc] * len(batch)
+
+    def _record_results(
+        self, batch: List[tuple], errors: List[Optional[Exception]]
+    ) -> None:
+        with self._condition:
+            for (task_run_id, version, update), error in zip(batch, errors):
+                update.error = error
+                if error is None:
+                    # unversioned updates leave the task run unversioned
+                    update.next_version = None if version is None else version + 1
+                    if update.final and task_run_id not in self._pending:
+                        # the runner carries on from the version returned to it
+                        del self._versions[task_run_id]
+                    else:
+                        self._versions[task_run_id] = update.next_version
+                else:
+                    del self._versions[task_run_id]
+                    newer = self._pending.pop(task_run_id, None)
+                    if newer is not None:
+                        newer.error = error
+                        newer.done.set()
+                    elif not update.final:
+                        self._errors[task_run_id] = error
+                update.done.set()
+            self._sending = False
+            self._condition.notify_all()
+
+
+_reporter = None  # type: Optional[TaskRunStateReporter]
+_reporter_pid = None  # type: Optional[int]
+_reporter_lock = threading.Lock()
+
+
+def get_state_reporter() -> TaskRunStateReporter:
+    """
+    Returns the `TaskRunStateReporter` shared by every `CloudTaskRunner` in the current
+    process, creating it if necessary.
+
+    Returns:
+        - TaskRunStateReporter: the shared reporter
+    """
+    global _reporter, _reporter_pid
+    with _reporter_lock:
+        if _reporter is None or _reporter_pid != os.getpid():
+            _reporter = TaskRunStateReporter()
+            _reporter_pid = os.getpid()
+        return _reporter
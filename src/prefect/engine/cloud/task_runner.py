@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import datetime
 import time
@@ -9,12 +10,15 @@ import pendulum
 import prefect
 from prefect.client import Client
 from prefect.core import Edge, Task
+from prefect.engine.cache_validators import FingerprintedInputs
+from prefect.engine.cloud.state_reporter import get_state_reporter
 from prefect.engine.cloud.utilities import prepare_state_for_cloud
 from prefect.engine.result import NoResult, Result
 from prefect.engine.result_handlers import ResultHandler
 from prefect.engine.runner import ENDRUN, call_state_handlers
 from prefect.engine.state import Cached, ClientFailed, Failed, Mapped, Retrying, State
 from prefect.engine.task_runner import TaskRunner, TaskRunnerInitializeResult
+from prefect.utilities.executors import defer_heartbeat
 from prefect.utilities.graphql import with_args
 
 
@@ -54,7 +58,8 @@ class CloudTaskRunner(TaskRunner):
     def _heartbeat(self) -> None:
         try:
             task_run_id = self.task_run_id  # type: ignore
-            self.client.update_task_run_heartbeat(task_run_id)  # type: ignore
+            if not defer_heartbeat(self.client, "task_run", task_run_id):
+                self.client.update_task_run_heartbeat(task_run_id)  # type: ignore
         except:
             warnings.warn("Heartbeat failed for Task '{}'".format(self.task.name))
 
@@ -88,20 +93,26 @@ class CloudTaskRunner(TaskRunner):
 
         try:
             cloud_state = prepare_state_for_cloud(new_state)
-            self.client.set_task_run_state(
-                task_run_id=task_run_id,
-                version=version,
-                state=cloud_state,
-                cache_for=self.task.cache_for,
-            )
+            if prefect.config.cloud.batch_task_run_states:
+                next_version = get_state_reporter().report(
+                    task_run_id=task_run_id, version=version, state=cloud_state
+                )
+            else:
+                self.client.set_task_run_state(
+                    task_run_id=task_run_id,
+                    version=version,
+                    state=cloud_state,
+                    cache_for=self.task.cache_for,
+                )
+                next_version = None if version is None else version + 1
         except Exception as exc:
             self.logger.debug(
                 "Failed to set task state with error: {}".format(repr(exc))
             )
             raise ENDRUN(state=ClientFailed(state=new_state))
 
-        if version is not None:
-            prefect.context.update(task_run_version=version + 1)  # type: ignore
+        if next_version is not None:
+            prefect.context.update(task_run_version=next_version)  # type: ignore
 
         return new_state
 
@@ -191,13 +202,15 @@ class CloudTaskRunner(TaskRunner):
                     )
                 )
 
+            sanitized_inputs = FingerprintedInputs(
+                (key, res.value) for key, res in inputs.items()
+            )
             for candidate_state in cached_states:
                 assert isinstance(candidate_state, Cached)  # mypy assert
                 candidate_state.cached_inputs = {  # type: ignore
                     key: res.to_result()
                     for key, res in (candidate_state.cached_inputs or {}).items()
                 }
-                sanitized_inputs = {key: res.value for key, res in inputs.items()}
                 if self.task.cache_validator(
                     candidate_state, sanitized_inputs, prefect.context.get("parameters")
                 ):
@@ -245,13 +258,8 @@ class CloudTaskRunner(TaskRunner):
             context=context,
             executor=executor,
         )
-        if end_state.is_retrying() and (
-            end_state.start_time <= pendulum.now("utc").add(minutes=1)  # type: ignore
-        ):
-            assert isinstance(end_state, Retrying)
-            naptime = max(
-                (end_state.start_time - pendulum.now("utc")).total_seconds(), 0
-            )
+        naptime = self._time_until_retry(end_state)
+        if naptime is not None:
             time.sleep(naptime)
             return self.run(
                 state=end_state,
@@ -261,3 +269,57 @@ class CloudTaskRunner(TaskRunner):
             )
         else:
             return end_state
+
+    async def run_async(
+        self,
+        state: State = None,
+        upstream_states: Dict[Edge, State] = None,
+        context: Dict[str, Any] = None,
+        executor: "prefect.engine.executors.AsyncioExecutor" = None,
+    ) -> State:
+        """
+        Like `run()`, for tasks with an `async def run` method, run on a started
+        `AsyncioExecutor`; see `TaskRunner.run_async`. Task retries which are scheduled
+        for <= 1 minute in the future are waited for on the event loop.
+
+        Args:
+            - state (State, optional): initial `State` to begin task run from;
+                defaults to `Pending()`
+            - upstream_states (Dict[Edge, State]): a dictionary
+                representing the states of any tasks upstream of this one. The keys of the
+                dictionary should correspond to the edges leading to the task.
+            - context (dict, optional): prefect Context to use for execution
+            - executor (AsyncioExecutor): the executor running the task
+
+        Returns:
+            - `State` object representing the final post-run state of the Task
+        """
+        end_state = await super().run_async(
+            state=state,
+            upstream_states=upstream_states,
+            context=context,
+            executor=executor,
+        )
+        naptime = self._time_until_retry(end_state)
+        if naptime is not None:
+            await asyncio.sleep(naptime)
+            return await self.run_async(
+                state=end_state,
+                upstream_states=upstream_states,
+                context=context,
+                executor=executor,
+            )
+        else:
+            return end_state
+
+    def _time_until_retry(self, state: State) -> Optional[float]:
+        """
+        The number of seconds until a `Retrying` state is due, if it is due in one minute
+        or less; `None` otherwise.
+        """
+        if state.is_retrying() and (
+            state.start_time <= pendulum.now("utc").add(minutes=1)  # type: ignore
+        ):
+            assert isinstance(state, Retrying)
+            return max((state.start_time - pendulum.now("utc")).total_seconds(), 0)
+        return None
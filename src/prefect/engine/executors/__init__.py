@@ -8,6 +8,8 @@ for an Executor consists of the following methods:
     has completed running
 - `wait(object)`: resolves any objects returned by `executor.submit` to
     their values; this function _will_ block until execution of `object` is complete
+- `as_completed(futures)`: yields the objects returned by `executor.submit` as their
+    computations complete; more futures can be added to the iterator with its `add` method
 - `map(fn, *args, upstream_states, **kwargs)`: submit function to be mapped
     over based on the edge information contained in `upstream_states`.  Any "mapped" Edge
     will be converted into multiple function submissions, one for each value of the upstream mapped tasks.
@@ -21,12 +23,20 @@ Currently, the available executor options are:
     synchronous dask scheduler; currently the default executor
 - `DaskExecutor`: the most feature-rich of the executors, this executor runs
     on `dask.distributed` and has support for multiprocessing, multithreading, and distributed execution.
+- `ThreadPoolExecutor`: an executor that runs tasks in a local pool of threads, using
+    `concurrent.futures`; a lightweight option for flows whose tasks are I/O bound
+- `ProcessPoolExecutor`: an executor that runs tasks in a local pool of processes, using
+    `concurrent.futures`
+- `AsyncioExecutor`: an executor that runs the coroutines of tasks with an `async def run`
+    method concurrently on a single event loop, with optional per-tag concurrency limits
 
 Which executor you choose depends on whether you intend to use things like parallelism
 of task execution.
 """
 import prefect
+from prefect.engine.executors.asyncio import AsyncioExecutor
 from prefect.engine.executors.base import Executor
 from prefect.engine.executors.dask import DaskExecutor
 from prefect.engine.executors.local import LocalExecutor
+from prefect.engine.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
 from prefect.engine.executors.sync import SynchronousExecutor
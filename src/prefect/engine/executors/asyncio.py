@@ -0,0 +1,273 @@
+import asyncio
+import threading
+import types
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+import prefect
+from prefect import config
+from prefect.engine.executors.pool import (
+    PoolExecutor,
+    ThreadPoolExecutor,
+    _find_futures,
+    _resolve,
+)
+from prefect.utilities.executors import timeout_handler
+
+
+@types.coroutine
+def _with_context(coro: Any, context: dict) -> Any:
+    """
+    Drives `coro` with the Prefect context set to `context` each time it resumes, so that
+    coroutines sharing the event loop thread each see their own context.
+    """
+    value, error = None, None  # type: Any, Any
+    while True:
+        with prefect.context(context):
+            try:
+                if error is not None:
+                    signal = coro.throw(error)
+                else:
+                    signal = coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+        try:
+            value, error = (yield signal), None
+        except GeneratorExit:
+            coro.close()
+            raise
+        except BaseException as exc:
+            value, error = None, exc
+
+
+class AsyncioExecutor(ThreadPoolExecutor):
+    """
+    An executor that runs task coroutines (tasks with an `async def run` method) on a
+    single event loop, which runs in a background thread for the duration of `start()`.
+
+    Coroutine functions submitted to the executor are scheduled directly on the event
+    loop, and the flow and task runners submit runs of coroutine tasks that way (see
+    `TaskRunner.run_async`): the synchronous parts of those task runs (state handlers,
+    triggers, result handling) run in a pool of threads, as in the `ThreadPoolExecutor`,
+    but no thread is held while the task's coroutine is awaited. Tasks with a regular
+    `run` method run in the pool threads.
+
+    Per-tag concurrency limits cap the number of running tasks (coroutine or not)
+    carrying a tag, for example to limit the load on a downstream service:
+
+    ```python
+    executor = AsyncioExecutor(tag_limits={"slack": 5})
+    ```
+
+    Args:
+        - max_workers (int, optional): the maximum number of threads running the
+            synchronous parts of task runs; defaults to the value of
+            `engine.executor.asyncio.max_workers` in your Prefect configuration
+        - tag_limits (Dict[str, int], optional): the maximum number of concurrently
+            running tasks for each tag; defaults to the values of
+            `engine.executor.asyncio.tag_limits` in your Prefect configuration
+    """
+
+    def __init__(self, max_workers: int = None, tag_limits: Dict[str, int] = None):
+        if max_workers is None:
+            max_workers = config.engine.executor.asyncio.max_workers or None
+        if tag_limits is None:
+            tag_limits = dict(config.engine.executor.asyncio.get("tag_limits", {}))
+        self.tag_limits = tag_limits
+        self._loop = None  # type: Any
+        self._semaphores = {}  # type: Dict[str, asyncio.Semaphore]
+        PoolExecutor.__init__(self, max_workers=max_workers)
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state.update(_loop=None, _semaphores={})
+        return state
+
+    @contextmanager
+    def start(self) -> Iterator[None]:
+        """
+        Context manager for initializing execution.
+
+        Starts the event loop in a background thread and creates the thread pool; both
+        are shut down on exit.
+        """
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="PrefectAsyncioExecutor", daemon=True
+        )
+        thread.start()
+        self._loop = loop
+        try:
+            with super().start():
+                yield
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            self._loop = None
+            self._semaphores = {}
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Submit a function to the executor for execution. Returns a
+        `concurrent.futures.Future`.
+
+        Once the executor has started, coroutine functions are scheduled directly on the
+        event loop, with the Prefect context of the caller, and don't use a thread;
+        other functions run in the thread pool.
+
+        Args:
+            - fn (Callable): function that is being submitted for execution
+            - *args (Any): arguments to be passed to `fn`
+            - **kwargs (Any): keyword arguments to be passed to `fn`
+
+        Returns:
+            - Future: a `concurrent.futures.Future` representing the result of `fn(*args, **kwargs)`
+        """
+        loop = self._loop
+        if loop is None or not asyncio.iscoroutinefunction(fn):
+            return super().submit(fn, *args, **kwargs)
+        return asyncio.run_coroutine_threadsafe(
+            self._run_submitted(fn, args, kwargs, prefect.context.to_dict()), loop
+        )
+
+    def is_async(self, task: "prefect.Task") -> bool:
+        """
+        Whether runs of `task` should be awaited on the executor's event loop, with
+        `TaskRunner.run_async`: true for tasks with an `async def run` method, once the
+        executor has started.
+
+        Args:
+            - task (Task): the task
+
+        Returns:
+            - bool: whether the task's runs should be awaited on the event loop
+        """
+        return self._loop is not None and asyncio.iscoroutinefunction(task.run)
+
+    async def run_sync(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs `fn(*args, **kwargs)` in the thread pool, with the Prefect context of the
+        calling coroutine, without blocking the event loop.
+
+        Args:
+            - fn (callable): the function to execute
+            - *args (Any): arguments to pass to the function
+            - **kwargs (Any): keyword arguments to pass to the function
+
+        Returns:
+            - the result of `fn(*args, **kwargs)`
+        """
+        context = prefect.context.to_dict()
+
+        def call() -> Any:
+            with prefect.context(context):
+                return fn(*args, **kwargs)
+
+        return await asyncio.wrap_future(self._pool.submit(call))
+
+    async def run_coroutine(self, coro: Any, context: dict, timeout: int = None) -> Any:
+        """
+        Awaits `coro` with the Prefect context set to `context`, within the concurrency
+        limits of the context's task tags.
+
+        Args:
+            - coro (coroutine): the coroutine to await
+            - context (dict): the Prefect context to run the coroutine with
+            - timeout (int): the length of time to allow for
+                execution before raising a `TimeoutError`, represented as an integer in seconds
+
+        Returns:
+            - the result of the coroutine
+
+        Raises:
+            - TimeoutError: if the coroutine exceeds the allowed timeout
+        """
+        tags = self._limited_tags(context.get("task_tags", []))
+        return await self._run_limited(coro, context, tags, timeout)
+
+    def timeout_handler(  # type: ignore
+        self, fn: Callable, *args: Any, timeout: int = None, **kwargs: Any
+    ) -> Any:
+        """
+        Runs `fn(*args, **kwargs)` in the current thread within the concurrency limits of
+        the current task's tags, with `prefect.utilities.executors.timeout_handler`.
+
+        Coroutine functions are run on the executor's event loop, and the current thread
+        waits for them; this only happens for coroutine tasks which are run with
+        `TaskRunner.run`, rather than awaited with `TaskRunner.run_async`.
+
+        Args:
+            - fn (callable): the function to execute
+            - *args (Any): arguments to pass to the function
+            - timeout (int): the length of time to allow for
+                execution before raising a `TimeoutError`, represented as an integer in seconds
+            - **kwargs (Any): keyword arguments to pass to the function
+
+        Returns:
+            - the result of `f(*args, **kwargs)`
+
+        Raises:
+            - TimeoutError: if function execution exceeds the allowed timeout
+        """
+        loop = self._loop
+        if loop is None:
+            return timeout_handler(fn, *args, timeout=timeout, **kwargs)
+
+        tags = self._limited_tags(prefect.context.get("task_tags", []))
+
+        if asyncio.iscoroutinefunction(fn):
+            return asyncio.run_coroutine_threadsafe(
+                self._run_limited(
+                    fn(*args, **kwargs), prefect.context.to_dict(), tags, timeout
+                ),
+                loop,
+            ).result()
+
+        asyncio.run_coroutine_threadsafe(self._acquire(tags), loop).result()
+        try:
+            return timeout_handler(fn, *args, timeout=timeout, **kwargs)
+        finally:
+            loop.call_soon_threadsafe(self._release, tags)
+
+    def _limited_tags(self, tags: Iterable[str]) -> List[str]:
+        return sorted(set(t for t in tags if t in self.tag_limits))
+
+    async def _run_submitted(
+        self, fn: Callable, args: tuple, kwargs: dict, context: dict
+    ) -> Any:
+        # wait for the futures nested in the arguments, and in their results, without
+        # blocking the loop; resolving them afterwards never waits
+        futures = _find_futures((args, kwargs), [])
+        while futures:
+            await asyncio.wait([asyncio.wrap_future(f) for f in futures])
+            futures = _find_futures(
+                [f.result() for f in futures if f.exception() is None], []
+            )
+        args, kwargs = _resolve((args, kwargs), Future.result)
+        return await _with_context(fn(*args, **kwargs), context)
+
+    async def _acquire(self, tags: List[str]) -> None:
+        for tag in tags:
+            if tag not in self._semaphores:
+                self._semaphores[tag] = asyncio.Semaphore(self.tag_limits[tag])
+            await self._semaphores[tag].acquire()
+
+    def _release(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._semaphores[tag].release()
+
+    async def _run_limited(
+        self, coro: Any, context: dict, tags: List[str], timeout: int = None
+    ) -> Any:
+        async def run() -> Any:
+            return await _with_context(coro, context)
+
+        await self._acquire(tags)
+        try:
+            return await asyncio.wait_for(run(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Execution timed out.")
+        finally:
+            self._release(tags)
@@ -1,12 +1,42 @@
+import collections
 import datetime
 import uuid
 from contextlib import contextmanager
-from typing import Any, Callable, Dict, Iterator, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List
 
 import prefect
 from prefect.utilities.executors import timeout_handler
 
 
+class CompletionIterator:
+    """
+    An iterator over futures in the order in which they complete, to which more futures
+    can be added while it is being consumed; it stops once every future added so far has
+    been yielded. This base version, for executors which don't run futures concurrently,
+    yields futures in the order they were added.
+
+    Args:
+        - futures (Iterable[Any], optional): the initial futures
+    """
+
+    def __init__(self, futures: Iterable[Any] = ()) -> None:
+        self._futures = collections.deque(futures)
+
+    def add(self, future: Any) -> None:
+        """
+        Adds a future to be yielded once it completes.
+        """
+        self._futures.append(future)
+
+    def __iter__(self) -> "CompletionIterator":
+        return self
+
+    def __next__(self) -> Any:
+        if not self._futures:
+            raise StopIteration
+        return self._futures.popleft()
+
+
 class Executor:
     """
     Base Executor class that all other executors inherit from.
@@ -58,6 +88,20 @@ class Executor:
         """
         raise NotImplementedError()
 
+    def as_completed(self, futures: Iterable[Any]) -> CompletionIterator:
+        """
+        Yields the provided futures as they complete. Executors which don't run futures
+        concurrently yield them in the order they were provided.
+
+        Args:
+            - futures (Iterable[Any]): future-like objects returned by `executor.submit`
+
+        Returns:
+            - CompletionIterator: an iterator over the provided futures, in the order in
+                which they completed; more futures can be added to it with its `add` method
+        """
+        return CompletionIterator(futures)
+
     def wait(self, futures: Any) -> Any:
         """
         Resolves futures to their values. Blocks until the future is complete.
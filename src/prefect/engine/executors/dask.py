@@ -6,7 +6,14 @@ import warnings
 from contextlib import contextmanager
 from typing import Any, Callable, Iterable, Iterator, List
 
-from distributed import Client, Future, Queue, fire_and_forget, worker_client
+from distributed import (
+    Client,
+    Future,
+    Queue,
+    as_completed,
+    fire_and_forget,
+    worker_client,
+)
 
 from prefect import config, context
 from prefect.engine.executors.base import Executor
@@ -184,6 +191,21 @@ class DaskExecutor(Executor):
         fire_and_forget(futures)
         return futures
 
+    def as_completed(self, futures: Iterable[Future]) -> Any:
+        """
+        Yields the provided Future objects as they complete.
+
+        Args:
+            - futures (Iterable[Future]): Future objects returned by `executor.submit`
+
+        Returns:
+            - distributed.as_completed: an iterator over the provided futures, in the order
+                in which they completed; more futures can be added to it with its `add` method
+        """
+        if not self.is_started:
+            raise ValueError("This executor has not been started.")
+        return as_completed(futures)
+
     def wait(self, futures: Any) -> Any:
         """
         Resolves the Future objects to their values. Blocks until the computation is complete.
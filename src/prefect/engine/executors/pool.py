@@ -0,0 +1,368 @@
+import concurrent.futures
+import copy
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List
+
+import cloudpickle
+
+from prefect import config
+from prefect.engine.executors.base import CompletionIterator, Executor
+from prefect.engine.state import Mapped
+
+
+class _Job(Future):
+    """
+    A future for a single `executor.submit` call. Futures nested in the arguments are
+    resolved right before the function runs, and whichever thread claims the job first
+    (a pool worker or a caller blocked in `executor.wait`) is the one that runs it.
+    """
+
+    def __init__(
+        self, executor: "PoolExecutor", fn: Callable, args: tuple, kwargs: dict
+    ) -> None:
+        super().__init__()
+        self._executor = executor
+        self._call = (fn, args, kwargs)
+        self._claimed = False
+        self._claim_lock = threading.Lock()
+
+    def run(self) -> None:
+        with self._claim_lock:
+            if self._claimed:
+                return
+            self._claimed = True
+
+        if not self.set_running_or_notify_cancel():
+            return
+
+        fn, args, kwargs = self._call
+        self._call = None  # type: ignore
+        try:
+            args, kwargs = self._executor.wait((args, kwargs))
+            self._executor._execute(self, fn, args, kwargs)
+        except BaseException as exc:
+            self.set_exception(exc)
+
+
+class _CompletionQueue(CompletionIterator):
+    """
+    Yields futures in the order in which they complete; each future puts itself on a
+    queue when it finishes, so waiting for the next one doesn't depend on how many
+    futures are still running.
+    """
+
+    def __init__(self, futures: Iterable[Future] = ()) -> None:
+        self._pending = 0
+        self._done = queue.Queue()  # type: queue.Queue
+        for future in futures:
+            self.add(future)
+
+    def add(self, future: Future) -> None:
+        self._pending += 1
+        future.add_done_callback(self._done.put)
+
+    def __next__(self) -> Future:
+        if not self._pending:
+            raise StopIteration
+        self._pending -= 1
+        return self._done.get()
+
+
+def _find_futures(obj: Any, found: List[Future]) -> List[Future]:
+    if isinstance(obj, Future):
+        found.append(obj)
+    elif isinstance(obj, Mapped):
+        _find_futures(obj.map_states, found)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            _find_futures(value, found)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            _find_futures(value, found)
+    return found
+
+
+def _resolve(obj: Any, result: Callable[[Future], Any]) -> Any:
+    if isinstance(obj, Future):
+        return _resolve(result(obj), result)
+    elif isinstance(obj, Mapped):
+        obj.map_states = _resolve(obj.map_states, result)
+    elif isinstance(obj, dict):
+        obj = copy.copy(obj)
+        for key, value in obj.items():
+            obj[key] = _resolve(value, result)
+    elif type(obj) in (list, tuple):
+        obj = type(obj)(_resolve(value, result) for value in obj)
+    return obj
+
+
+def _run_pickled(payload: bytes) -> bytes:
+    """
+    Runs a cloudpickled `(fn, args, kwargs)` call inside a worker process, returning
+    a cloudpickled `(succeeded, result_or_exception)` pair.
+    """
+    fn, args, kwargs = cloudpickle.loads(payload)
+    try:
+        return cloudpickle.dumps((True, fn(*args, **kwargs)))
+    except Exception as exc:
+        return cloudpickle.dumps((False, exc))
+
+
+class PoolExecutor(Executor):
+    """
+    Base class for executors backed by a `concurrent.futures` pool.
+
+    Futures nested in the arguments of a submitted function (including those inside
+    dictionaries of upstream states and the `map_states` of `Mapped` states) are resolved
+    before the function is called. Outside of the `start()` context manager, submitted
+    functions are run immediately in the current thread.
+
+    Args:
+        - max_workers (int, optional): the maximum number of workers in the pool;
+            defaults to the `concurrent.futures` default
+    """
+
+    def __init__(self, max_workers: int = None) -> None:
+        self.max_workers = max_workers
+        self._pool = None  # type: Any
+        super().__init__()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def _create_pool(self) -> concurrent.futures.Executor:
+        raise NotImplementedError()
+
+    def _schedule(self, job: _Job) -> None:
+        raise NotImplementedError()
+
+    def _execute(self, job: _Job, fn: Callable, args: tuple, kwargs: dict) -> None:
+        job.set_result(fn(*args, **kwargs))
+
+    def _result(self, future: Future) -> Any:
+        if isinstance(future, _Job):
+            future.run()
+        return future.result()
+
+    @contextmanager
+    def start(self) -> Iterator[None]:
+        """
+        Context manager for initializing execution.
+
+        Creates the worker pool and shuts it down (waiting on any running work) on exit.
+        """
+        try:
+            with self._create_pool() as pool:
+                self._pool = pool
+                yield
+        finally:
+            self._pool = None
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Submit a function to the executor for execution. Returns a
+        `concurrent.futures.Future`.
+
+        Args:
+            - fn (Callable): function that is being submitted for execution
+            - *args (Any): arguments to be passed to `fn`
+            - **kwargs (Any): keyword arguments to be passed to `fn`
+
+        Returns:
+            - Future: a `concurrent.futures.Future` representing the result of `fn(*args, **kwargs)`
+        """
+        job = _Job(self, fn, args, kwargs)
+        if self._pool is None:
+            job.run()
+        else:
+            self._schedule(job)
+        return job
+
+    def map(self, fn: Callable, *args: Any) -> List[Future]:
+        """
+        Submit a function to be mapped over its iterable arguments.
+
+        Args:
+            - fn (Callable): function that is being submitted for execution
+            - *args (Any): arguments that the function will be mapped over
+
+        Returns:
+            - List[Future]: a list of `concurrent.futures.Future` objects, one for each
+                set of arguments
+        """
+        return [self.submit(fn, *args_i) for args_i in zip(*args)]
+
+    def as_completed(self, futures: Iterable[Any]) -> CompletionIterator:
+        """
+        Yields the provided futures as they complete.
+
+        Args:
+            - futures (Iterable[Any]): futures returned by `executor.submit`
+
+        Returns:
+            - CompletionIterator: an iterator over the provided futures, in the order in
+                which they completed; more futures can be added to it with its `add` method
+        """
+        return _CompletionQueue(futures)
+
+    def wait(self, futures: Any) -> Any:
+        """
+        Resolves the futures in `futures` (which may be nested in lists, tuples,
+        dictionaries and the `map_states` of `Mapped` states) to their values. Blocks
+        until every future is complete; futures which have not started running yet are
+        run in the calling thread.
+
+        Args:
+            - futures (Any): the futures to resolve
+
+        Returns:
+            - Any: `futures`, with every future replaced by its result
+        """
+        if not _find_futures(futures, []):
+            return futures
+        return _resolve(futures, self._result)
+
+
+class ThreadPoolExecutor(PoolExecutor):
+    """
+    An executor that runs functions in a `concurrent.futures.ThreadPoolExecutor`. Well
+    suited to flows whose tasks spend most of their time waiting on I/O.
+
+    Tasks which wait on other tasks from inside a worker thread (for example, mapped
+    tasks waiting on their children) run those tasks themselves if no worker has picked
+    them up yet, so a small pool can't deadlock.
+
+    Args:
+        - max_workers (int, optional): the maximum number of threads in the pool;
+            defaults to the value of `engine.executor.threads.max_workers` in your
+            Prefect configuration, or the `concurrent.futures` default if unset
+    """
+
+    def __init__(self, max_workers: int = None) -> None:
+        if max_workers is None:
+            max_workers = config.engine.executor.threads.max_workers or None
+        super().__init__(max_workers=max_workers)
+
+    def _create_pool(self) -> concurrent.futures.Executor:
+        return concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def _schedule(self, job: _Job) -> None:
+        self._pool.submit(job.run)
+
+    def queue(self, maxsize: int = 0) -> queue.Queue:
+        """
+        Creates an executor-compatible Queue object that can share state across tasks.
+
+        Args:
+            - maxsize (int): maxsize of the queue; defaults to 0 (infinite)
+
+        Returns:
+            - queue.Queue: a thread-safe queue
+        """
+        return queue.Queue(maxsize=maxsize)
+
+
+class ProcessPoolExecutor(PoolExecutor):
+    """
+    An executor that runs functions in a `concurrent.futures.ProcessPoolExecutor`.
+    Functions, their arguments and their results are serialized with `cloudpickle`.
+
+    A function is only sent to a worker process once every future in its arguments is
+    complete. Functions submitted from inside a worker process (for example, the
+    children of a mapped task) run in that process.
+
+    Args:
+        - max_workers (int, optional): the maximum number of processes in the pool;
+            defaults to the value of `engine.executor.processes.max_workers` in your
+            Prefect configuration, or the number of CPUs if unset
+    """
+
+    def __init__(self, max_workers: int = None) -> None:
+        if max_workers is None:
+            max_workers = config.engine.executor.processes.max_workers or None
+        self._manager = None  # type: Any
+        super().__init__(max_workers=max_workers)
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state["_manager"] = None
+        return state
+
+    @contextmanager
+    def start(self) -> Iterator[None]:
+        """
+        Context manager for initializing execution.
+
+        Creates the worker pool and shuts it down (waiting on any running work) on exit,
+        along with the manager process behind any queues created with `queue()`.
+        """
+        try:
+            with super().start():
+                yield
+        finally:
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+
+    def _create_pool(self) -> concurrent.futures.Executor:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _schedule(self, job: _Job) -> None:
+        fn, args, kwargs = job._call
+        pending = [f for f in _find_futures((args, kwargs), []) if not f.done()]
+        if not pending:
+            job.run()
+            return
+
+        remaining = [len(pending)]
+        lock = threading.Lock()
+
+        def on_done(future: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                job.run()
+
+        for future in pending:
+            future.add_done_callback(on_done)
+
+    def _execute(self, job: _Job, fn: Callable, args: tuple, kwargs: dict) -> None:
+        pool = self._pool
+        if pool is None:
+            return super()._execute(job, fn, args, kwargs)
+
+        def on_done(future: Future) -> None:
+            try:
+                succeeded, result = cloudpickle.loads(future.result())
+            except BaseException as exc:
+                job.set_exception(exc)
+                return
+            if succeeded:
+                job.set_result(result)
+            else:
+                job.set_exception(result)
+
+        payload = cloudpickle.dumps((fn, args, kwargs))
+        pool.submit(_run_pickled, payload).add_done_callback(on_done)
+
+    def queue(self, maxsize: int = 0) -> Any:
+        """
+        Creates an executor-compatible Queue object that can share state across tasks.
+
+        Args:
+            - maxsize (int): maxsize of the queue; defaults to 0 (infinite)
+
+        Returns:
+            - Queue: a `multiprocessing.Manager` queue that can be shared with worker
+                processes
+        """
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        return self._manager.Queue(maxsize=maxsize)
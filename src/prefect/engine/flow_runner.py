@@ -1,3 +1,4 @@
+import heapq
 from typing import (
     Any,
     Callable,
@@ -17,10 +18,12 @@ import prefect
 from prefect import config
 from prefect.core import Edge, Flow, Task
 from prefect.engine import signals
+from prefect.engine.executors import AsyncioExecutor
 from prefect.engine.runner import ENDRUN, Runner, call_state_handlers
 from prefect.engine.state import (
     Failed,
     Mapped,
+    MappedStates,
     Pending,
     Retrying,
     Running,
@@ -270,6 +273,7 @@ class FlowRunner(Runner):
             )
             state = self.handle_state_change(state or Pending(), new_state)
 
+        prefect.utilities.logging.flush_cloud_logs()
         return state
 
     @call_state_handlers
@@ -389,43 +393,28 @@ class FlowRunner(Runner):
         if set(return_tasks).difference(self.flow.tasks):
             raise ValueError("Some tasks in return_tasks were not found in the flow.")
 
-        # -- process each task in order
-
         with executor.start():
 
-            for task in self.flow.sorted_tasks():
-
-                task_state = task_states.get(task)
-
-                # if the state is finished, don't run the task, just use the provided state
-                if (
-                    isinstance(task_state, State)
-                    and task_state.is_finished()
-                    and not task_state.is_cached()
-                    and not task_state.is_mapped()
-                ):
-                    continue
-
-                upstream_states = {}  # type: Dict[Edge, Union[State, Iterable]]
-
-                # -- process each edge to the task
-                for edge in self.flow.edges_to(task):
-                    upstream_states[edge] = task_states.get(
-                        edge.upstream_task, Pending(message="Task state not available.")
-                    )
-
-                # -- run the task
+            if config.engine.flow_runner.submit_when_ready:
+                self.submit_tasks_when_ready(
+                    task_states=task_states,
+                    task_contexts=task_contexts,
+                    task_runner_state_handlers=task_runner_state_handlers,
+                    executor=executor,
+                )
 
-                with prefect.context(task_full_name=task.name, task_tags=task.tags):
-                    task_states[task] = executor.submit(
-                        self.run_task,
+            else:
+                # -- process each task in order
+                for task in self.flow.sorted_tasks():
+                    future = self.submit_task(
                         task=task,
-                        state=task_state,
-                        upstream_states=upstream_states,
-                        context=dict(prefect.context, **task_contexts.get(task, {})),
+                        task_states=task_states,
+                        task_contexts=task_contexts,
                         task_runner_state_handlers=task_runner_state_handlers,
                         executor=executor,
                     )
+                    if future is not None:
+                        task_states[task] = future
 
             # ---------------------------------------------
             # Collect results
@@ -452,8 +441,14 @@ class FlowRunner(Runner):
             for t, s in list(final_states.items()):
                 if s.is_mapped():
                     s.map_states = executor.wait(s.map_states)
-                    s.result = [ms.result for ms in s.map_states]
-                    all_final_states[t] = s.map_states
+                    # the final state only depends on the types of the children's states,
+                    # so compactly stored children are represented by one state per type
+                    if isinstance(s.map_states, MappedStates):
+                        s.result = s.map_states.results()
+                        all_final_states[t] = s.map_states.representative_states()
+                    else:
+                        s.result = [ms.result for ms in s.map_states]
+                        all_final_states[t] = s.map_states
 
             assert isinstance(final_states, dict)
 
@@ -472,6 +467,153 @@ class FlowRunner(Runner):
 
         return state
 
+    def submit_task(
+        self,
+        task: Task,
+        task_states: Dict[Task, State],
+        task_contexts: Dict[Task, Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.base.Executor",
+        **context: Any
+    ) -> Any:
+        """
+        Submits a single task run to the executor, using the states currently recorded
+        for its upstream tasks.
+
+        Args:
+            - task (Task): the task to submit
+            - task_states (dict): dictionary of the task states (or futures) known so far,
+                with keys being Tasks and values their corresponding state
+            - task_contexts (Dict[Task, Dict[str, Any]]): contexts that will be provided to each task
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing computation
+            - **context (Any): additional context for the task run
+
+        Returns:
+            - Any: a future-like object representing the task run, or `None` if the task
+                already has a finished state and doesn't need to run
+        """
+        task_state = task_states.get(task)
+
+        # if the state is finished, don't run the task, just use the provided state
+        if (
+            isinstance(task_state, State)
+            and task_state.is_finished()
+            and not task_state.is_cached()
+            and not task_state.is_mapped()
+        ):
+            return None
+
+        upstream_states = {}  # type: Dict[Edge, Union[State, Iterable]]
+
+        # -- process each edge to the task
+        for edge in self.flow.edges_to(task):
+            upstream_states[edge] = task_states.get(
+                edge.upstream_task, Pending(message="Task state not available.")
+            )
+
+        # -- run the task
+
+        task_context = dict(prefect.context, **task_contexts.get(task, {}))
+        task_context.update(context)
+
+        # coroutine tasks are awaited on the executor's event loop
+        if isinstance(executor, AsyncioExecutor) and executor.is_async(task):
+            run_task = self.run_task_async  # type: Callable
+        else:
+            run_task = self.run_task
+
+        with prefect.context(task_full_name=task.name, task_tags=task.tags):
+            return executor.submit(
+                run_task,
+                task=task,
+                state=task_state,
+                upstream_states=upstream_states,
+                context=task_context,
+                task_runner_state_handlers=task_runner_state_handlers,
+                executor=executor,
+            )
+
+    def submit_tasks_when_ready(
+        self,
+        task_states: Dict[Task, State],
+        task_contexts: Dict[Task, Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.base.Executor",
+    ) -> None:
+        """
+        Submits each task to the executor as soon as all of its upstream tasks have
+        finished, rather than submitting every task up front in topological order. This
+        lets independent branches of the flow overlap on executors that support
+        parallelism, and keeps dependency resolution in the FlowRunner.
+
+        Tasks that become ready at the same time are submitted in the order given by
+        `flow.sorted_tasks()`. The time each task became ready is provided to its task
+        run as `task_ready_time` in context, and the time it spent waiting to start
+        as `task_queue_wait`, which is also included in the message of its `Running` state.
+
+        Args:
+            - task_states (dict): dictionary of task states to begin computation with;
+                it will be updated in place with the future for each submitted task
+            - task_contexts (Dict[Task, Dict[str, Any]]): contexts that will be provided to each task
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing computation
+
+        Returns:
+            - None
+        """
+        position = {t: i for i, t in enumerate(self.flow.sorted_tasks())}
+        unfinished_upstream = {t: len(self.flow.edges_to(t)) for t in position}
+        ready_times = {}  # type: Dict[Task, pendulum.DateTime]
+        ready = []  # type: List[Tuple[int, Task]]
+        running = {}  # type: Dict[int, Task]
+
+        def mark_ready(task: Task) -> None:
+            ready_times[task] = pendulum.now("utc")
+            heapq.heappush(ready, (position[task], task))
+
+        def mark_finished(task: Task) -> None:
+            for edge in self.flow.edges_from(task):
+                unfinished_upstream[edge.downstream_task] -= 1
+                if unfinished_upstream[edge.downstream_task] == 0:
+                    mark_ready(edge.downstream_task)
+
+        for task, count in unfinished_upstream.items():
+            if count == 0:
+                mark_ready(task)
+
+        # a single completion iterator is kept for the whole run, so that each
+        # completion costs the same however many tasks are running
+        completed = executor.as_completed([])
+
+        while ready or running:
+
+            # -- submit every task whose upstream tasks have all finished
+            while ready:
+                _, task = heapq.heappop(ready)
+                future = self.submit_task(
+                    task=task,
+                    task_states=task_states,
+                    task_contexts=task_contexts,
+                    task_runner_state_handlers=task_runner_state_handlers,
+                    executor=executor,
+                    task_ready_time=ready_times.pop(task),
+                )
+                if future is None:
+                    mark_finished(task)
+                else:
+                    task_states[task] = future
+                    running[id(future)] = task
+                    completed.add(future)
+
+            # -- wait for the next running task to finish
+            if running:
+                mark_finished(running.pop(id(next(completed))))
+
     def determine_final_state(
         self,
         state: State,
@@ -545,6 +687,84 @@ class FlowRunner(Runner):
             - State: `State` representing the final post-run state of the `Flow`.
 
         """
+        with prefect.context(self.context):
+            task_runner = self._get_task_runner(
+                task, upstream_states, context, task_runner_state_handlers, executor
+            )
+            return task_runner.run(
+                state=state,
+                upstream_states=upstream_states,
+                context=context,
+                executor=executor,
+            )
+
+    async def run_task_async(
+        self,
+        task: Task,
+        state: State,
+        upstream_states: Dict[Edge, State],
+        context: Dict[str, Any],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.AsyncioExecutor",
+    ) -> State:
+        """
+        Like `run_task`, for tasks which are awaited on the event loop of an
+        `AsyncioExecutor` (see `AsyncioExecutor.is_async`): the task is run with
+        `TaskRunner.run_async`, and any waiting on upstream states happens in the
+        executor's thread pool.
+
+        Args:
+            - task (Task): the task to run
+            - state (State): starting state for the Flow. Defaults to
+                `Pending`
+            - upstream_states (Dict[Edge, State]): dictionary of upstream states
+            - context (Dict[str, Any]): a context dictionary for the task run
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (AsyncioExecutor): the executor running the task
+
+        Returns:
+            - State: `State` representing the final post-run state of the task.
+        """
+        task_runner = await executor.run_sync(
+            self._get_task_runner,
+            task,
+            upstream_states,
+            context,
+            task_runner_state_handlers,
+            executor,
+        )
+        return await task_runner.run_async(
+            state=state,
+            upstream_states=upstream_states,
+            context=context,
+            executor=executor,
+        )
+
+    def _get_task_runner(
+        self,
+        task: Task,
+        upstream_states: Dict[Edge, State],
+        context: Dict[str, Any],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.Executor",
+    ) -> TaskRunner:
+        """
+        Creates the task runner for a run of `task`, once the mapped upstream states
+        the task reduces over have finished.
+        """
+        ready_time = context.get("task_ready_time")
+        if ready_time is not None:
+            context["task_queue_wait"] = (
+                pendulum.now("utc") - ready_time
+            ).total_seconds()
+            self.logger.debug(
+                "Task '{name}': waited {wait:.3f}s in the queue".format(
+                    name=task.name, wait=context["task_queue_wait"]
+                )
+            )
+
         with prefect.context(self.context):
             default_handler = task.result_handler or self.flow.result_handler
             task_runner = self.task_runner_cls(
@@ -559,14 +779,11 @@ class FlowRunner(Runner):
                 # if the upstream state is Mapped, wait until its results are all available
                 if not edge.mapped and upstream_state.is_mapped():
                     assert isinstance(upstream_state, Mapped)  # mypy assert
-                    upstream_state.map_states = executor.wait(upstream_state.map_states)
-                    upstream_state.result = [
-                        s.result for s in upstream_state.map_states
-                    ]
-
-            return task_runner.run(
-                state=state,
-                upstream_states=upstream_states,
-                context=context,
-                executor=executor,
-            )
+                    map_states = executor.wait(upstream_state.map_states)
+                    upstream_state.map_states = map_states
+                    if isinstance(map_states, MappedStates):
+                        upstream_state.result = map_states.results()
+                    else:
+                        upstream_state.result = [s.result for s in map_states]
+
+        return task_runner
@@ -19,6 +19,7 @@ whose value is `None`.
 
 from typing import Any, Union
 
+from prefect.engine.result_cache import get_result_cache
 from prefect.engine.result_handlers import ResultHandler
 
 
@@ -103,8 +104,11 @@ class SafeResult(ResultInterface):
     def to_result(self) -> "ResultInterface":
         """
         Read the value of this result using the result handler and return a fully hydrated Result.
+
+        Values are read through the process's result cache (see `prefect.engine.result_cache`),
+        so that a result which was read before isn't read again.
         """
-        value = self.result_handler.read(self.value)
+        value = get_result_cache().read(self.result_handler, self.value)
         res = Result(value=value, result_handler=self.result_handler)
         res.safe_value = self
         return res
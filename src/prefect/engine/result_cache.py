@@ -0,0 +1,219 @@
+"""
+The result cache keeps the values which result handlers read, so that hydrating the same
+`SafeResult` again (for example, for the cached inputs of a retried task, or in many
+mapped children which read the same upstream result) doesn't read and deserialize it
+again. The cache is shared by every runner in a process, and is bounded by the
+estimated size of the values it holds, evicting the least recently used values first.
+
+Only the results of handlers whose `cache_reads` attribute is true are cached, which are
+handlers that never write two results to the same location. Hydrated values are shared
+by everything which reads them, including mapped children and the cached inputs of
+retried tasks, so a task which modifies its inputs in place changes them for every other
+reader. The cache is therefore disabled by default; set `engine.result_cache.max_bytes`
+to enable it for flows whose tasks don't modify their inputs.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from prefect import config
+from prefect.engine.result_handlers import ResultHandler
+
+
+def _sizeof(obj: Any, depth: int = 0) -> int:
+    np = sys.modules.get("numpy")  # type: Any
+    if np is not None and isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is not None else 0)
+    pd = sys.modules.get("pandas")  # type: Any
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(getattr(usage, "sum", lambda: usage)())
+    pa = sys.modules.get("pyarrow")  # type: Any
+    if pa is not None and isinstance(obj, pa.Table):
+        return obj.nbytes
+
+    size = sys.getsizeof(obj)
+    # the contents of deeply nested containers aren't counted
+    if depth < 32:
+        if isinstance(obj, dict):
+            size += sum(
+                _sizeof(k, depth + 1) + _sizeof(v, depth + 1) for k, v in obj.items()
+            )
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            size += sum(_sizeof(item, depth + 1) for item in obj)
+    return size
+
+
+class ResultCache:
+    """
+    A thread-safe, size-bounded LRU cache of the values read by result handlers, keyed by
+    the type of the handler and the location of the value.
+
+    When several threads read the same uncached location at once, only one of them reads
+    it, and the others wait for its value.
+
+    Args:
+        - max_bytes (int, optional): the maximum total estimated size of the cached
+            values; values larger than this are never cached. Defaults to
+            `engine.result_cache.max_bytes` in your Prefect configuration
+    """
+
+    def __init__(self, max_bytes: int = None) -> None:
+        if max_bytes is None:
+            max_bytes = config.engine.result_cache.max_bytes
+        self.max_bytes = max_bytes or 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._reading = {}  # type: Dict[Hashable, threading.Event]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def key(result_handler: ResultHandler, loc: Any) -> Tuple[type, Any]:
+        """
+        Returns the key a value is cached under.
+
+        Args:
+            - result_handler (ResultHandler): the handler which reads the value
+            - loc (Any): the location of the value
+
+        Returns:
+            - tuple: the cache key
+        """
+        return (type(result_handler), loc)
+
+    def read(self, result_handler: ResultHandler, loc: Any) -> Any:
+        """
+        Reads the value at a location with a result handler, or returns it from the cache
+        if it was read before.
+
+        Args:
+            - result_handler (ResultHandler): the handler to read the value with
+            - loc (Any): the location of the value
+
+        Returns:
+            - Any: the value
+        """
+        if not self.max_bytes or not getattr(result_handler, "cache_reads", False):
+            return result_handler.read(loc)
+        try:
+            key = self.key(result_handler, loc)
+            hash(key)
+        except TypeError:
+            return result_handler.read(loc)
+        return self.get_or_read(key, lambda: result_handler.read(loc))
+
+    def get_or_read(self, key: Hashable, read: Callable[[], Any]) -> Any:
+        """
+        Returns the value cached under a key, or calls `read` and caches the value it
+        returns.
+
+        Args:
+            - key (Hashable): the cache key
+            - read (Callable): a function which reads the value
+
+        Returns:
+            - Any: the value
+        """
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                event = self._reading.get(key)
+                if event is None:
+                    self.misses += 1
+                    event = self._reading[key] = threading.Event()
+                    break
+            # another thread is reading the value; if it fails, the value is read again
+            event.wait()
+
+        try:
+            value = read()
+            self.put(key, value)
+            return value
+        finally:
+            with self._lock:
+                del self._reading[key]
+            event.set()
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Caches a value, evicting the least recently used values until the cache is within
+        its size. `None` values, which result handlers also return for failed reads, and
+        values larger than the cache aren't cached.
+
+        Args:
+            - key (Hashable): the cache key
+            - value (Any): the value
+        """
+        if value is None:
+            return
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Removes every value from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns statistics of the cache's use.
+
+        Returns:
+            - Dict[str, int]: the number of `hits`, `misses` and `evictions`, the number
+                of cached `entries`, and their estimated `size` in bytes
+        """
+        with self._lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._entries),
+                size=self.size,
+            )
+
+
+_caches = {}  # type: Dict[Tuple[int, int], ResultCache]
+_caches_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Returns the result cache shared by every runner in this process, whose size is set by
+    `engine.result_cache.max_bytes` in your Prefect configuration.
+
+    Returns:
+        - ResultCache: the result cache
+    """
+    max_bytes = config.engine.result_cache.max_bytes or 0
+    with _caches_lock:
+        key = (max_bytes, os.getpid())
+        if key not in _caches:
+            _caches[key] = ResultCache(max_bytes=max_bytes)
+        return _caches[key]
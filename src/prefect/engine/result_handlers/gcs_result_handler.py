@@ -1,6 +1,7 @@
 import base64
 import uuid
-from typing import TYPE_CHECKING, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, List
 
 import cloudpickle
 import pendulum
@@ -11,6 +12,8 @@ from prefect.engine.result_handlers import ResultHandler
 if TYPE_CHECKING:
     import google.cloud
 
+_CHUNK_ALIGNMENT = 256 * 1024
+
 
 class GCSResultHandler(ResultHandler):
     """
@@ -21,19 +24,39 @@ class GCSResultHandler(ResultHandler):
         - credentials_secret (str, optional): the name of the Prefect Secret
             which stores a JSON representation of your Google Cloud credentials.
             Defaults to `GOOGLE_APPLICATION_CREDENTIALS`.
+        - serializers (List[str], optional): the names of the serializers to write
+            results with; each result is written with the first one which can handle it
+            (see `prefect.engine.serializers`), or with `cloudpickle` if none can
+        - part_size (int, optional): the size in bytes of the chunks results are
+            uploaded and downloaded in; defaults to 8 MiB, and is rounded up to a
+            multiple of 256 KiB
+        - max_concurrency (int, optional): the number of chunks to download at once;
+            defaults to 10
+
+    Results are written with the serializer's name as the suffix of their URI. Results
+    written by earlier versions of Prefect, whose URIs end in `.prefect_result`, are
+    base64-encoded pickles, and can still be read.
 
     Note that for this result handler to work properly, your Google Application Credentials
     must be made available.
     """
 
+    cache_reads = True
+
     def __init__(
         self,
         bucket: str = None,
         credentials_secret: str = "GOOGLE_APPLICATION_CREDENTIALS",
+        serializers: List[str] = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 10,
     ) -> None:
         self.bucket = bucket
         self.credentials_secret = credentials_secret
-        super().__init__()
+        # GCS requires chunks of resumable uploads to be multiples of 256 KiB
+        self.part_size = -(-part_size // _CHUNK_ALIGNMENT) * _CHUNK_ALIGNMENT
+        self.max_concurrency = max_concurrency
+        super().__init__(serializers=serializers)
 
     def initialize_client(self) -> None:
         """
@@ -72,6 +95,10 @@ class GCSResultHandler(ResultHandler):
         Given a result, writes the result to a location in GCS
         and returns the resulting URI.
 
+        The result is serialized as it is uploaded with a resumable upload, in chunks of
+        `part_size` bytes, so that the serialized result is never held in memory as a
+        whole.
+
         Args:
             - result (Any): the written result
 
@@ -79,10 +106,14 @@ class GCSResultHandler(ResultHandler):
             - str: the GCS URI
         """
         date = pendulum.now("utc").format("Y/M/D")
-        uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
+        serializer = self.serializer_for(result)
+        uri = "{date}/{uuid}.{suffix}".format(
+            date=date, uuid=uuid.uuid4(), suffix=serializer.name
+        )
         self.logger.debug("Starting to upload result to {}...".format(uri))
-        binary_data = base64.b64encode(cloudpickle.dumps(result)).decode()
-        self.gcs_bucket.blob(uri).upload_from_string(binary_data)
+        blob = self.gcs_bucket.blob(uri, chunk_size=self.part_size)
+        with serializer.stream(result) as stream:
+            blob.upload_from_file(stream)
         self.logger.debug("Finished uploading result to {}.".format(uri))
         return uri
 
@@ -90,6 +121,9 @@ class GCSResultHandler(ResultHandler):
         """
         Given a uri, reads a result from GCS, reads it and returns it
 
+        Results larger than `part_size` bytes are downloaded with concurrent ranged
+        requests, directly into a buffer of the size of the result.
+
         Args:
             - uri (str): the GCS URI
 
@@ -98,9 +132,15 @@ class GCSResultHandler(ResultHandler):
         """
         try:
             self.logger.debug("Starting to download result from {}...".format(uri))
-            result = self.gcs_bucket.blob(uri).download_as_string()
+            serializer = self.serializer_for_location(uri)
             try:
-                return_val = cloudpickle.loads(base64.b64decode(result))
+                if serializer is None:
+                    # results written before serializers were introduced are
+                    # base64-encoded pickles
+                    result = self.gcs_bucket.blob(uri).download_as_string()
+                    return_val = cloudpickle.loads(base64.b64decode(result))
+                else:
+                    return_val = serializer.load(self._download(uri))
             except EOFError:
                 return_val = None
             self.logger.debug("Finished downloading result from {}.".format(uri))
@@ -108,3 +148,23 @@ class GCSResultHandler(ResultHandler):
             self.logger.error(exc)
             return_val = None
         return return_val
+
+    def _download(self, uri: str) -> Any:
+        blob = self.gcs_bucket.get_blob(uri)
+        if blob is None:
+            raise ValueError("No result found at {}".format(uri))
+        if blob.size <= self.part_size:
+            return blob.download_as_string()
+
+        data = bytearray(blob.size)
+        view = memoryview(data)
+
+        def download_range(start: int) -> None:
+            end = min(start + self.part_size, blob.size)
+            # the end of a range is inclusive
+            view[start:end] = blob.download_as_string(start=start, end=end - 1)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            starts = range(0, blob.size, self.part_size)
+            list(executor.map(download_range, starts))
+        return data
@@ -3,13 +3,57 @@ Result Handlers provide the hooks that Prefect uses to store task results in pro
 
 Anytime a task needs its output or inputs stored, a result handler is used to determine where this data should be stored (and how it can be retrieved).
 """
-import base64
+import datetime
+import gzip
+import hashlib
+import mmap
+import os
 import tempfile
-from typing import Any
-
-import cloudpickle
+import time
+from typing import Any, Iterable, List, Set
 
 from prefect.engine.result_handlers import ResultHandler
+from prefect.engine.serializers import get_serializer
+
+# the frame headers which identify each compression format, so that results can be read
+# regardless of the compression they were written with
+_MAGIC = {"gzip": b"\x1f\x8b", "zstd": b"\x28\xb5\x2f\xfd", "lz4": b"\x04\x22\x4d\x18"}
+
+
+def _codec(compression: str) -> Any:
+    if compression == "gzip":
+        return gzip
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard
+    if compression == "lz4":
+        import lz4.frame
+
+        return lz4.frame
+    raise ValueError(
+        "Unknown compression {!r}; expected one of {}".format(
+            compression, ", ".join(sorted(_MAGIC))
+        )
+    )
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    codec = _codec(compression)
+    if compression == "zstd":
+        return codec.ZstdCompressor().compress(data)
+    return codec.compress(data)
+
+
+def _decompress(data: Any) -> Any:
+    head = bytes(memoryview(data)[:4])
+    for compression, magic in _MAGIC.items():
+        if head.startswith(magic):
+            codec = _codec(compression)
+            if compression == "zstd":
+                return codec.ZstdDecompressor().decompress(data)
+            return codec.decompress(data)
+    return data
 
 
 class LocalResultHandler(ResultHandler):
@@ -18,16 +62,56 @@ class LocalResultHandler(ResultHandler):
     for local testing and development. Task results are written using `cloudpickle` and stored in the
     provided location for use in future runs.
 
-    **NOTE**: Stored results will _not_ be automatically cleaned up after execution.
+    In content-addressed mode, each result is stored in a file named by the hash of its
+    serialized value, so that identical results (for example, from retries or mapped
+    children) are written only once: writing a result which is already stored just returns
+    its location. Files are written to a temporary name and atomically renamed into place,
+    so readers never see a partially written result.
+
+    Results are read through a memory map of their file, so that a result isn't copied
+    into memory before it is deserialized; arrays and tables read by the `"pickle5"`,
+    `"npy"` and `"arrow"` serializers are views of the mapped file, and pages of the file
+    are shared by every process which reads it.
+
+    **NOTE**: Stored results will _not_ be automatically cleaned up after execution; use
+    `collect_garbage` to remove the results which are no longer referenced.
 
     Args:
         - dir (str, optional): the _absolute_ path to a directory for storing
             all results; defaults to `$TMPDIR`
+        - content_addressed (bool, optional): whether to name results by the hash of
+            their contents and skip writing results which are already stored; defaults to
+            `False`
+        - compression (str, optional): the compression to write results with, one of
+            `"gzip"`, `"zstd"` (requires `zstandard`) or `"lz4"` (requires `lz4`); defaults
+            to no compression. Results are read with whatever compression they were
+            written with.
+        - serializers (List[str], optional): the names of the serializers to write
+            results with, such as `["npy", "arrow", "pickle5"]`; each result is written
+            with the first one which can handle it (see `prefect.engine.serializers`), or
+            with `cloudpickle` if none can
+
+    Raises:
+        - ValueError: if the compression is unknown
+        - ImportError: if the library for the compression isn't installed
+        - ValueError: if a serializer is unknown
     """
 
-    def __init__(self, dir: str = None):
+    cache_reads = True
+
+    def __init__(
+        self,
+        dir: str = None,
+        content_addressed: bool = False,
+        compression: str = None,
+        serializers: List[str] = None,
+    ):
         self.dir = dir
-        super().__init__()
+        self.content_addressed = content_addressed
+        if compression is not None:
+            _codec(compression)
+        self.compression = compression
+        super().__init__(serializers=serializers)
 
     def read(self, fpath: str) -> Any:
         """
@@ -40,8 +124,17 @@ class LocalResultHandler(ResultHandler):
             - the read result from the provided file
         """
         self.logger.debug("Starting to read result from {}...".format(fpath))
+        serializer = self.serializer_for_location(fpath) or get_serializer("pickle")
         with open(fpath, "rb") as f:
-            val = cloudpickle.loads(f.read())
+            try:
+                # a private, copy-on-write mapping shares the page cache with other
+                # readers of the file, and lets serializers return writeable arrays which
+                # are views of it; the mapping is closed once nothing references it
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)  # type: Any
+            except (OSError, ValueError):
+                # empty files, and file systems which don't support memory maps
+                data = f.read()
+        val = serializer.load(_decompress(data))
         self.logger.debug("Finished reading result from {}...".format(fpath))
         return val
 
@@ -55,9 +148,128 @@ class LocalResultHandler(ResultHandler):
         Returns:
             - str: the _absolute_ path to the written result on disk
         """
-        fd, loc = tempfile.mkstemp(prefix="prefect-", dir=self.dir)
+        serializer = self.serializer_for(result)
+        # results written with cloudpickle keep the names they had before serializers
+        # were introduced
+        suffix = "" if serializer.name == "pickle" else "." + serializer.name
+        if not self.content_addressed:
+            fd, loc = tempfile.mkstemp(prefix="prefect-", suffix=suffix, dir=self.dir)
+            self.logger.debug("Starting to upload result to {}...".format(loc))
+            with open(fd, "wb") as f:
+                if self.compression is None:
+                    serializer.dump(result, f)
+                else:
+                    f.write(self._compress(serializer.dumps(result)))
+            self.logger.debug("Finished uploading result to {}...".format(loc))
+            return loc
+
+        data = serializer.dumps(result)
+        digest = hashlib.blake2b(data, digest_size=32).hexdigest()
+        loc = os.path.join(
+            self.dir or tempfile.gettempdir(), "prefect-" + digest + suffix
+        )
+        try:
+            # refresh the modification time, so that `collect_garbage` treats the result
+            # as recently written
+            os.utime(loc)
+            self.logger.debug("Result already stored at {}".format(loc))
+            return loc
+        except OSError:
+            pass
+
         self.logger.debug("Starting to upload result to {}...".format(loc))
-        with open(fd, "wb") as f:
-            f.write(cloudpickle.dumps(result))
+        fd, tmp = tempfile.mkstemp(prefix=".prefect-", dir=os.path.dirname(loc))
+        try:
+            with open(fd, "wb") as f:
+                f.write(self._compress(data))
+            os.replace(tmp, loc)
+        except BaseException:
+            os.unlink(tmp)
+            raise
         self.logger.debug("Finished uploading result to {}...".format(loc))
         return loc
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression is None:
+            return data
+        return _compress(data, self.compression)
+
+    def collect_garbage(
+        self, keep: Iterable[Any], grace_period: datetime.timedelta = None
+    ) -> List[str]:
+        """
+        Removes every result in this handler's directory which isn't referenced by `keep`.
+        Only files written by a `LocalResultHandler` are considered.
+
+        Args:
+            - keep (Iterable): the results to keep; each item can be the location of a
+                result, a `Result` or `SafeResult`, a `State` (whose result, cached inputs
+                and mapped children are kept), or a dictionary or iterable of any of these,
+                such as the `result` of a flow run's state
+            - grace_period (timedelta, optional): results written more recently than this
+                are kept, so that results of runs which are still in progress aren't
+                removed; defaults to keeping no unreferenced result
+
+        Returns:
+            - List[str]: the locations of the removed results
+
+        Raises:
+            - ValueError: if the handler has no `dir`
+        """
+        if self.dir is None:
+            raise ValueError(
+                "collect_garbage requires a LocalResultHandler with a dir, to avoid "
+                "removing results stored by other handlers in $TMPDIR"
+            )
+        referenced = set()  # type: Set[str]
+        _collect_locations(keep, referenced)
+        cutoff = time.time() - (grace_period or datetime.timedelta(0)).total_seconds()
+
+        removed = []
+        for entry in os.scandir(self.dir):
+            if not entry.name.startswith(("prefect-", ".prefect-")):
+                continue
+            if os.path.realpath(entry.path) in referenced:
+                continue
+            try:
+                if not entry.is_file() or entry.stat().st_mtime > cutoff:
+                    continue
+                os.unlink(entry.path)
+            except OSError:
+                continue
+            removed.append(entry.path)
+        self.logger.debug(
+            "Removed {} unreferenced results from {}".format(len(removed), self.dir)
+        )
+        return removed
+
+
+def _collect_locations(obj: Any, locations: Set[str]) -> None:
+    from prefect.engine.result import Result, SafeResult
+    from prefect.engine.state import State
+
+    if isinstance(obj, str):
+        locations.add(os.path.realpath(obj))
+    elif isinstance(obj, SafeResult):
+        if isinstance(obj.value, str) and isinstance(
+            obj.result_handler, LocalResultHandler
+        ):
+            locations.add(os.path.realpath(obj.value))
+    elif isinstance(obj, Result):
+        _collect_locations(obj.safe_value, locations)
+    elif isinstance(obj, State):
+        _collect_locations(obj._result, locations)
+        # the result of a flow run is a dictionary of the states of its tasks
+        value = getattr(obj._result, "value", None)
+        if isinstance(value, dict):
+            _collect_locations(
+                [s for s in value.values() if isinstance(s, State)], locations
+            )
+        cached_inputs = getattr(obj, "cached_inputs", None) or {}
+        _collect_locations(list(cached_inputs.values()), locations)
+        _collect_locations(getattr(obj, "map_states", None) or [], locations)
+    elif isinstance(obj, dict):
+        _collect_locations(list(obj.values()), locations)
+    elif isinstance(obj, Iterable):
+        for item in obj:
+            _collect_locations(item, locations)
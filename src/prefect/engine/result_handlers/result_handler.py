@@ -6,18 +6,40 @@ Anytime a task needs its output or inputs stored, a result handler is used to de
 import base64
 import tempfile
 from abc import ABCMeta, abstractmethod
-from typing import Any
+from typing import Any, List, Optional
 
 import cloudpickle
 
 from prefect import config
 from prefect.client.client import Client
+from prefect.engine.serializers import Serializer, get_serializer
 from prefect.utilities import logging
 
 
 class ResultHandler(metaclass=ABCMeta):
-    def __init__(self) -> None:
+    """
+    Base class for result handlers.
+
+    Handlers which write results as bytes can be configured with a list of serializers
+    (see `prefect.engine.serializers`): each result is written with the first serializer
+    which can handle it, or with `cloudpickle` if none can, and the name of the serializer
+    is recorded as the suffix of the result's location.
+
+    Handlers which never write two results to the same location set `cache_reads` to
+    `True`, so that the values they read are kept in the process's result cache (see
+    `prefect.engine.result_cache`).
+
+    Args:
+        - serializers (List[str], optional): the names of the serializers to try, in order
+    """
+
+    cache_reads = False
+
+    def __init__(self, serializers: List[str] = None) -> None:
         self.logger = logging.get_logger(type(self).__name__)
+        for name in serializers or []:
+            get_serializer(name)
+        self.serializers = serializers
 
     def __repr__(self) -> str:
         return "<ResultHandler: {}>".format(type(self).__name__)
@@ -30,6 +52,42 @@ class ResultHandler(metaclass=ABCMeta):
     def read(self, loc: str) -> Any:
         raise NotImplementedError()
 
+    def serializer_for(self, result: Any) -> Serializer:
+        """
+        Returns the serializer to write a result with.
+
+        Args:
+            - result (Any): the result to write
+
+        Returns:
+            - Serializer: the first of the handler's serializers which can write the
+                result, or the `"pickle"` serializer
+        """
+        # handlers pickled before serializers were introduced don't have the attribute
+        for name in getattr(self, "serializers", None) or []:
+            serializer = get_serializer(name)
+            if serializer.can_serialize(result):
+                return serializer
+        return get_serializer("pickle")
+
+    def serializer_for_location(self, loc: str) -> Optional[Serializer]:
+        """
+        Returns the serializer which wrote the result at a location, by the suffix of the
+        location.
+
+        Args:
+            - loc (str): the location of the result
+
+        Returns:
+            - Optional[Serializer]: the serializer, or `None` if the location has no
+                serializer suffix
+        """
+        suffix = loc.rsplit(".", 1)[-1] if "." in loc else ""
+        try:
+            return get_serializer(suffix)
+        except ValueError:
+            return None
+
     def __eq__(self, other: object) -> bool:
         """
         Equality depends on result handler type and any public attributes
@@ -2,7 +2,7 @@ import base64
 import io
 import json
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, List
 
 import cloudpickle
 import pendulum
@@ -23,17 +23,42 @@ class S3ResultHandler(ResultHandler):
         - aws_credentials_secret (str, optional): the name of the Prefect Secret
             which stores your AWS credentials; this Secret must be a JSON string
             with two keys: `ACCESS_KEY` and `SECRET_ACCESS_KEY`
+        - serializers (List[str], optional): the names of the serializers to write
+            results with; each result is written with the first one which can handle it
+            (see `prefect.engine.serializers`), or with `cloudpickle` if none can
+        - part_size (int, optional): the size in bytes of the parts results are uploaded
+            and downloaded in; defaults to 8 MiB, and can't be less than 5 MiB
+        - max_concurrency (int, optional): the number of parts to upload or download at
+            once; defaults to 10
+
+    Results are written with the serializer's name as the suffix of their URI. Results
+    written by earlier versions of Prefect, whose URIs end in `.prefect_result`, are
+    base64-encoded pickles, and can still be read.
 
     Note that for this result handler to work properly, your AWS Credentials must
     be made available in the `"AWS_CREDENTIALS"` Prefect Secret.
+
+    Raises:
+        - ValueError: if `part_size` is less than 5 MiB
     """
 
+    cache_reads = True
+
     def __init__(
-        self, bucket: str = None, aws_credentials_secret: str = "AWS_CREDENTIALS"
+        self,
+        bucket: str = None,
+        aws_credentials_secret: str = "AWS_CREDENTIALS",
+        serializers: List[str] = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 10,
     ) -> None:
+        if part_size < 5 * 1024 * 1024:
+            raise ValueError("S3 multipart uploads require parts of at least 5 MiB")
         self.bucket = bucket
         self.aws_credentials_secret = aws_credentials_secret
-        super().__init__()
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        super().__init__(serializers=serializers)
 
     def initialize_client(self) -> None:
         """
@@ -73,11 +98,23 @@ class S3ResultHandler(ResultHandler):
     def __setstate__(self, state: dict) -> None:
         self.__dict__.update(state)
 
+    def _transfer_config(self) -> "boto3.s3.transfer.TransferConfig":
+        from boto3.s3.transfer import TransferConfig
+
+        return TransferConfig(
+            multipart_threshold=self.part_size,
+            multipart_chunksize=self.part_size,
+            max_concurrency=self.max_concurrency,
+        )
+
     def write(self, result: Any) -> str:
         """
         Given a result, writes the result to a location in S3
         and returns the resulting URI.
 
+        The result is serialized as it is uploaded, in parts of `part_size` bytes, so
+        that the serialized result is never held in memory as a whole.
+
         Args:
             - result (Any): the written result
 
@@ -85,15 +122,15 @@ class S3ResultHandler(ResultHandler):
             - str: the S3 URI
         """
         date = pendulum.now("utc").format("Y/M/D")
-        uri = "{date}/{uuid}.prefect_result".format(date=date, uuid=uuid.uuid4())
+        serializer = self.serializer_for(result)
+        uri = "{date}/{uuid}.{suffix}".format(
+            date=date, uuid=uuid.uuid4(), suffix=serializer.name
+        )
         self.logger.debug("Starting to upload result to {}...".format(uri))
-
-        ## prepare data
-        binary_data = base64.b64encode(cloudpickle.dumps(result))
-        stream = io.BytesIO(binary_data)
-
-        ## upload
-        self.client.upload_fileobj(stream, Bucket=self.bucket, Key=uri)
+        with serializer.stream(result) as stream:
+            self.client.upload_fileobj(
+                stream, Bucket=self.bucket, Key=uri, Config=self._transfer_config()
+            )
         self.logger.debug("Finished uploading result to {}.".format(uri))
         return uri
 
@@ -101,6 +138,9 @@ class S3ResultHandler(ResultHandler):
         """
         Given a uri, reads a result from S3, reads it and returns it
 
+        Results larger than `part_size` bytes are downloaded with concurrent ranged
+        requests, directly into a buffer of the size of the result.
+
         Args:
             - uri (str): the S3 URI
 
@@ -109,14 +149,25 @@ class S3ResultHandler(ResultHandler):
         """
         try:
             self.logger.debug("Starting to download result from {}...".format(uri))
-            stream = io.BytesIO()
+            size = self.client.head_object(Bucket=self.bucket, Key=uri)["ContentLength"]
+            data = bytearray(size)
 
             ## download
-            self.client.download_fileobj(Bucket=self.bucket, Key=uri, Fileobj=stream)
-            stream.seek(0)
-
+            self.client.download_fileobj(
+                Bucket=self.bucket,
+                Key=uri,
+                Fileobj=_BufferWriter(data),
+                Config=self._transfer_config(),
+            )
+
+            serializer = self.serializer_for_location(uri)
             try:
-                return_val = cloudpickle.loads(base64.b64decode(stream.read()))
+                if serializer is None:
+                    # results written before serializers were introduced are
+                    # base64-encoded pickles
+                    return_val = cloudpickle.loads(base64.b64decode(data))
+                else:
+                    return_val = serializer.load(data)
             except EOFError:
                 return_val = None
             self.logger.debug("Finished downloading result from {}.".format(uri))
@@ -126,3 +177,41 @@ class S3ResultHandler(ResultHandler):
             return_val = None
 
         return return_val
+
+
+class _BufferWriter(io.RawIOBase):
+    """
+    A seekable file object which writes into a preallocated buffer, so that concurrent
+    ranged downloads can fill it in place.
+    """
+
+    def __init__(self, buffer: bytearray) -> None:
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data: Any) -> int:
+        data = memoryview(data).cast("B")  # type: ignore
+        end = self._position + len(data)
+        if end > len(self._view):
+            raise ValueError("The object is larger than its reported size")
+        self._view[self._position : end] = data
+        self._position = end
+        return len(data)
@@ -0,0 +1,436 @@
+"""
+Serializers convert task results to and from bytes for result handlers. A result handler
+can be given a list of serializer names, and writes each result with the first serializer
+which can handle it; the name of that serializer is recorded in the location the handler
+returns, so that the result can be read back with the same format.
+
+The following serializers are available:
+
+- `"pickle"`: `cloudpickle`, which can serialize almost any object; results are written
+    with it when no other serializer applies
+- `"pickle5"`: pickle protocol 5, which writes the buffers of objects such as NumPy
+    arrays and pandas objects out-of-band, without copying them into the pickle; requires
+    Python 3.8 or the `pickle5` package, and falls back to `cloudpickle` for objects which
+    the standard `pickle` module can't serialize
+- `"npy"`: NumPy's `.npy` format, for arrays which don't hold Python objects
+- `"arrow"`: the Arrow IPC stream format, for pandas `DataFrame`s and `pyarrow.Table`s;
+    requires `pyarrow`
+- `"parquet"`: Parquet, for pandas `DataFrame`s and `pyarrow.Table`s; requires `pyarrow`
+
+Serializers read from any bytes-like object, and the `"pickle5"` and `"npy"` serializers
+return arrays which are views of it rather than copies.
+"""
+import functools
+import importlib
+import io
+import os
+import pickle
+import struct
+import sys
+import threading
+from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+import cloudpickle
+
+
+@functools.lru_cache(maxsize=None)
+def _optional_import(name: str) -> Any:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _pickle5() -> Any:
+    if sys.version_info >= (3, 8):
+        return pickle
+    return _optional_import("pickle5")
+
+
+class Serializer(metaclass=ABCMeta):
+    """
+    Base class for serializers, which write results to binary streams and read them back
+    from bytes-like objects.
+
+    Serializers are looked up by their `name`, which is recorded in the locations of the
+    results they write; use `register_serializer` to make a new serializer available to
+    result handlers.
+    """
+
+    name = None  # type: str
+
+    def __repr__(self) -> str:
+        return "<Serializer: {}>".format(self.name)
+
+    def can_serialize(self, value: Any) -> bool:
+        """
+        Whether this serializer can write the given value.
+
+        Args:
+            - value (Any): the value to write
+
+        Returns:
+            - bool: whether the value can be written
+        """
+        return True
+
+    @abstractmethod
+    def dump(self, value: Any, stream: BinaryIO) -> None:
+        """
+        Writes a value to a binary stream.
+
+        Args:
+            - value (Any): the value to write
+            - stream (BinaryIO): the stream to write to
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def load(self, data: Any) -> Any:
+        """
+        Reads a value from a bytes-like object.
+
+        Args:
+            - data (bytes-like): the serialized value, such as `bytes`, a `memoryview` or
+                an `mmap`
+
+        Returns:
+            - Any: the value
+        """
+        raise NotImplementedError()
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serializes a value to bytes.
+
+        Args:
+            - value (Any): the value to serialize
+
+        Returns:
+            - bytes: the serialized value
+        """
+        stream = io.BytesIO()
+        self.dump(value, stream)
+        return stream.getvalue()
+
+    @contextmanager
+    def stream(self, value: Any) -> Iterator[BinaryIO]:
+        """
+        Serializes a value into a readable stream, without holding the serialized value in
+        memory: the value is written to a pipe by a background thread as the stream is
+        read. Reads return as many bytes as requested unless the stream is exhausted,
+        and raise any error raised while serializing the value.
+
+        Args:
+            - value (Any): the value to serialize
+
+        Yields:
+            - BinaryIO: the stream of the serialized value
+        """
+        read_fd, write_fd = os.pipe()
+        reader = _SerializedStream(read_fd)
+
+        def produce() -> None:
+            writer = open(write_fd, "wb")
+            try:
+                self.dump(value, writer)
+                writer.flush()
+            except BaseException as exc:
+                # the error has to be set before the pipe is closed, so that the reader
+                # raises it instead of ending the stream
+                reader.error = exc
+            finally:
+                try:
+                    writer.close()
+                except OSError:
+                    pass
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            yield reader  # type: ignore
+        finally:
+            # closing the pipe stops a thread blocked on a reader which gave up early
+            reader.close()
+            thread.join()
+
+
+class _SerializedStream(io.RawIOBase):
+    def __init__(self, fd: int) -> None:
+        super().__init__()
+        self._pipe = open(fd, "rb", buffering=0)  # type: Any
+        self._position = 0
+        self.error = None  # type: Optional[BaseException]
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        # fill the buffer, so that uploads which treat a short read as the end of the
+        # stream see every byte
+        view = memoryview(buffer).cast("B")  # type: ignore
+        filled = 0
+        while filled < len(view):
+            count = self._pipe.readinto(view[filled:])
+            if not count:
+                break
+            filled += count
+        if not filled and self.error is not None:
+            raise self.error
+        self._position += filled
+        return filled
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        self._pipe.close()
+        super().close()
+
+
+class PickleSerializer(Serializer):
+    """
+    Serializes values with `cloudpickle`.
+    """
+
+    name = "pickle"
+
+    def dump(self, value: Any, stream: BinaryIO) -> None:
+        cloudpickle.dump(value, stream)
+
+    def load(self, data: Any) -> Any:
+        return cloudpickle.loads(data)
+
+
+class Pickle5Serializer(Serializer):
+    """
+    Serializes values with pickle protocol 5, writing their buffers out-of-band after the
+    pickle, each aligned to 64 bytes. Values are read back with their buffers as views
+    of the data, so that NumPy arrays and the like aren't copied.
+    """
+
+    name = "pickle5"
+    _magic = b"PFP5"
+    _alignment = 64
+
+    def dump(self, value: Any, stream: BinaryIO) -> None:
+        buffers = []  # type: List[Any]
+
+        def buffer_callback(buffer: Any) -> bool:
+            try:
+                buffers.append(buffer.raw())
+                return False
+            except BufferError:
+                # non-contiguous buffers are serialized in-band
+                return True
+
+        pickle5 = _pickle5()
+        try:
+            if pickle5 is None:
+                raise pickle.PicklingError("pickle protocol 5 is unavailable")
+            data = pickle5.dumps(value, protocol=5, buffer_callback=buffer_callback)
+        except Exception:
+            # objects which only cloudpickle can serialize, such as lambdas
+            del buffers[:]
+            data = cloudpickle.dumps(value)
+
+        stream.write(self._magic)
+        stream.write(struct.pack("<QQ", len(data), len(buffers)))
+        stream.write(struct.pack("<{}Q".format(len(buffers)), *map(len, buffers)))
+        stream.write(data)
+        offset = len(self._magic) + 8 * (2 + len(buffers)) + len(data)
+        for buffer in buffers:
+            padding = -offset % self._alignment
+            stream.write(b"\x00" * padding)
+            stream.write(buffer)
+            offset += padding + len(buffer)
+
+    def load(self, data: Any) -> Any:
+        view = memoryview(data)
+        if view[: len(self._magic)] != self._magic:
+            raise ValueError("Not a pickle5 result")
+        offset = len(self._magic)
+        size, count = struct.unpack_from("<QQ", view, offset)
+        offset += 16
+        lengths = struct.unpack_from("<{}Q".format(count), view, offset)
+        offset += 8 * count
+        payload = view[offset : offset + size]
+        offset += size
+
+        buffers = []
+        for length in lengths:
+            offset += -offset % self._alignment
+            buffers.append(view[offset : offset + length])
+            offset += length
+        pickle5 = _pickle5()
+        if pickle5 is not None:
+            return pickle5.loads(payload, buffers=buffers)
+        if buffers:
+            raise ImportError(
+                "Reading pickle5 results requires Python 3.8 or the pickle5 package"
+            )
+        # results written by cloudpickle, where protocol 5 is unavailable
+        return cloudpickle.loads(payload)
+
+
+class NumpySerializer(Serializer):
+    """
+    Serializes NumPy arrays which don't hold Python objects in the `.npy` format. Arrays
+    are read back as views of the data.
+    """
+
+    name = "npy"
+
+    def can_serialize(self, value: Any) -> bool:
+        np = sys.modules.get("numpy")  # type: Any
+        return (
+            np is not None
+            and isinstance(value, np.ndarray)
+            and not value.dtype.hasobject
+        )
+
+    def dump(self, value: Any, stream: BinaryIO) -> None:
+        import numpy as np
+
+        np.save(stream, value, allow_pickle=False)
+
+    def load(self, data: Any) -> Any:
+        import numpy as np
+
+        view = memoryview(data).cast("B")  # type: ignore
+        major = view[6]
+        if major == 1:
+            (header_length,) = struct.unpack_from("<H", view, 8)
+            start = 10 + header_length
+        elif major == 2:
+            (header_length,) = struct.unpack_from("<I", view, 8)
+            start = 12 + header_length
+        else:
+            return np.load(io.BytesIO(view), allow_pickle=False)
+
+        header = io.BytesIO(view[:start].tobytes())
+        version = np.lib.format.read_magic(header)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+        count = 1
+        for dim in shape:
+            count *= dim
+        if count == 0:
+            return np.empty(shape, dtype=dtype)
+        array = np.frombuffer(view, dtype=dtype, count=count, offset=start)
+        return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+class _TableSerializer(Serializer):
+    def can_serialize(self, value: Any) -> bool:
+        pd = sys.modules.get("pandas")  # type: Any
+        if pd is not None and isinstance(value, pd.DataFrame):
+            return _optional_import("pyarrow") is not None
+        pa = sys.modules.get("pyarrow")  # type: Any
+        return pa is not None and isinstance(value, pa.Table)
+
+    def _to_table(self, value: Any) -> Any:
+        import pyarrow as pa
+
+        if isinstance(value, pa.Table):
+            table, kind = value, b"arrow"
+        else:
+            table, kind = pa.Table.from_pandas(value), b"pandas"
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"prefect.type"] = kind
+        return table.replace_schema_metadata(metadata)
+
+    def _from_table(self, table: Any) -> Any:
+        if (table.schema.metadata or {}).get(b"prefect.type") == b"pandas":
+            return table.to_pandas()
+        return table
+
+
+class ArrowSerializer(_TableSerializer):
+    """
+    Serializes pandas `DataFrame`s and `pyarrow.Table`s in the Arrow IPC stream format.
+    """
+
+    name = "arrow"
+
+    def dump(self, value: Any, stream: BinaryIO) -> None:
+        import pyarrow as pa
+
+        table = self._to_table(value)
+        writer = pa.RecordBatchStreamWriter(stream, table.schema)
+        writer.write_table(table)
+        writer.close()
+
+    def load(self, data: Any) -> Any:
+        import pyarrow as pa
+
+        return self._from_table(pa.ipc.open_stream(pa.py_buffer(data)).read_all())
+
+
+class ParquetSerializer(_TableSerializer):
+    """
+    Serializes pandas `DataFrame`s and `pyarrow.Table`s in the Parquet format.
+    """
+
+    name = "parquet"
+
+    def dump(self, value: Any, stream: BinaryIO) -> None:
+        import pyarrow.parquet as pq
+
+        pq.write_table(self._to_table(value), stream)
+
+    def load(self, data: Any) -> Any:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        return self._from_table(pq.read_table(pa.BufferReader(pa.py_buffer(data))))
+
+
+_serializers = {}  # type: Dict[str, Serializer]
+
+
+def register_serializer(serializer: Serializer) -> None:
+    """
+    Makes a serializer available to result handlers under its `name`.
+
+    Args:
+        - serializer (Serializer): the serializer to register
+    """
+    _serializers[serializer.name] = serializer
+
+
+def get_serializer(name: str) -> Serializer:
+    """
+    Returns the serializer registered under a name.
+
+    Args:
+        - name (str): the name of the serializer
+
+    Returns:
+        - Serializer: the serializer
+
+    Raises:
+        - ValueError: if no serializer is registered under the name
+    """
+    try:
+        return _serializers[name]
+    except KeyError:
+        raise ValueError(
+            "Unknown serializer {!r}; expected one of {}".format(
+                name, ", ".join(sorted(_serializers))
+            )
+        )
+
+
+for _serializer in [
+    PickleSerializer(),
+    Pickle5Serializer(),
+    NumpySerializer(),
+    ArrowSerializer(),
+    ParquetSerializer(),
+]:
+    register_serializer(_serializer)
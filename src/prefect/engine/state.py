@@ -11,7 +11,8 @@ execution. During execution a run will enter a `Running` state. Finally, runs be
 """
 import datetime
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union
+from collections.abc import MutableSequence
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import pendulum
 
@@ -494,6 +495,9 @@ class Cached(Success):
         - cached_parameters (dict): Defaults to `None`
         - cached_result_expiration (datetime): The time at which this cache
             expires and can no longer be used. Defaults to `None`
+        - cached_input_fingerprints (dict): Defaults to `None`. A dictionary of input
+            keys to fingerprints of their values (see `prefect.utilities.hashing`), which
+            cache validators compare instead of `cached_inputs`
     """
 
     color = "#34d058"
@@ -505,9 +509,11 @@ class Cached(Success):
         cached_inputs: Dict[str, Result] = None,
         cached_parameters: Dict[str, Any] = None,
         cached_result_expiration: datetime.datetime = None,
+        cached_input_fingerprints: Dict[str, str] = None,
     ):
         super().__init__(message=message, result=result)
         self.cached_inputs = cached_inputs
+        self.cached_input_fingerprints = cached_input_fingerprints
         self.cached_parameters = cached_parameters  # type: Optional[Dict[str, Any]]
         if cached_result_expiration is not None:
             cached_result_expiration = pendulum.instance(cached_result_expiration)
@@ -532,6 +538,8 @@ class Mapped(Success):
         - map_states (List): A list containing the states of any "children" of this task. When
             a task enters a Mapped state, it indicates that it has dynamically created copies
             of itself to map its operation over its inputs. Those copies are the children.
+            Once the children of a wide map finish, they may be stored in a compact
+            `MappedStates` container instead of a list.
     """
 
     color = "#003ccb"
@@ -628,3 +636,271 @@ class Skipped(Success):
     # note: this does not allow setting "cached" as Success states do
     def __init__(self, message: str = None, result: Any = NoResult):
         super().__init__(message=message, result=result)
+
+
+class _NoValueType:
+    """
+    Marks the children of a `MappedStates` container which have no result; pickles by
+    reference, so the marker survives being sent to another process.
+    """
+
+    def __reduce__(self) -> str:  # type: ignore
+        return "_NO_VALUE"
+
+
+_NO_VALUE = _NoValueType()
+
+
+class MappedStates(MutableSequence):
+    """
+    A list-like container for the states of the children of a `Mapped` task, which stores
+    them in columns (state type, message, result value, safe value and result handler)
+    instead of as individual `State` and `Result` objects. A `State` is only created when
+    a child is accessed, so wide maps don't pay for one `State` and one `Result` object per
+    child.
+
+    Items that aren't plain `State`s (for example, futures or `None`) are stored as is.
+    Note that since states are recreated on access, changes made to a state retrieved
+    from the container are not saved unless it is assigned back.
+
+    Args:
+        - states (Iterable, optional): the initial contents of the container
+    """
+
+    def __init__(self, states: Iterable = None) -> None:
+        self._codes = bytearray()
+        self._types = []  # type: List[tuple]
+        self._messages = []  # type: List[Any]
+        self._values = []  # type: List[Any]
+        self._safe_values = []  # type: List[Any]
+        self._handlers = []  # type: List[Any]
+        self._extras = {}  # type: Dict[int, Dict[str, Any]]
+        self._objects = {}  # type: Dict[int, Any]
+        if states is not None:
+            self.extend(states)
+
+    def __repr__(self) -> str:
+        return "<MappedStates: {} states>".format(len(self))
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, MappedStates)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return False
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return MappedStates(self[i] for i in range(*index.indices(len(self))))
+        index = self._position(index)
+        code = self._codes[index]
+        if code == 0:
+            return self._objects[index]
+
+        cls, extra_attrs = self._types[code - 1]
+        state = cls.__new__(cls)
+        state.message = self._messages[index]
+        value = self._values[index]
+        if value is _NO_VALUE:
+            state._result = NoResult
+        else:
+            state._result = Result(value, result_handler=self._handlers[index])
+            state._result.safe_value = self._safe_values[index]
+        for attr in extra_attrs:
+            setattr(state, attr, None)
+        state.__dict__.update(self._extras.get(index, {}))
+        return state
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            values = list(value)
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                stop = max(start, stop)
+                self._splice(start, stop, len(values))
+                for offset, item in enumerate(values):
+                    self._store(start + offset, item)
+                return
+            positions = range(start, stop, step)
+            if len(positions) != len(values):
+                raise ValueError(
+                    "attempt to assign sequence of size {} to extended slice of "
+                    "size {}".format(len(values), len(positions))
+                )
+            for position, item in zip(positions, values):
+                self[position] = item
+            return
+        index = self._position(index)
+        self._objects.pop(index, None)
+        self._extras.pop(index, None)
+        self._store(index, value)
+
+    def __delitem__(self, index: Any) -> None:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                self._splice(start, max(start, stop), 0)
+            else:
+                for position in sorted(range(start, stop, step), reverse=True):
+                    self._splice(position, position + 1, 0)
+            return
+        index = self._position(index)
+        self._splice(index, index + 1, 0)
+
+    def insert(self, index: int, value: Any) -> None:
+        if index < 0:
+            index = max(index + len(self), 0)
+        index = min(index, len(self))
+        self._splice(index, index, 1)
+        self._store(index, value)
+
+    def extend(self, values: Iterable) -> None:
+        for value in values:
+            self._append(value)
+
+    def results(self) -> List[Any]:
+        """
+        Returns the results of the children, as `[s.result for s in map_states]` would,
+        without recreating the children which are stored compactly.
+
+        Returns:
+            - List: the result of each child
+        """
+        results = [NoResult if v is _NO_VALUE else v for v in self._values]
+        for index, obj in self._objects.items():
+            results[index] = obj.result
+        return results
+
+    def count_states(self, state_type: type) -> int:
+        """
+        Counts the children that are instances of the given `State` class; for example,
+        `map_states.count_states(Failed)` counts the failed children. Children which are
+        stored compactly are counted without being recreated.
+
+        Args:
+            - state_type (type): the `State` class to count
+
+        Returns:
+            - int: the number of matching children
+        """
+        total = sum(
+            self._codes.count(code)
+            for code, (cls, _) in enumerate(self._types, 1)
+            if issubclass(cls, state_type)
+        )
+        return total + sum(isinstance(s, state_type) for s in self._objects.values())
+
+    def state_counts(self) -> Dict[str, int]:
+        """
+        Counts the children of each state type, by class name. Children which aren't
+        `State`s (for example, futures) are not counted.
+
+        Returns:
+            - Dict[str, int]: the number of children of each state type
+        """
+        counts = defaultdict(int)  # type: Dict[str, int]
+        for code, (cls, _) in enumerate(self._types, 1):
+            counts[cls.__name__] += self._codes.count(code)
+        for obj in self._objects.values():
+            if isinstance(obj, State):
+                counts[type(obj).__name__] += 1
+        return {name: n for name, n in counts.items() if n}
+
+    def representative_states(self) -> List[Any]:
+        """
+        Returns one child for each distinct state type stored compactly, along with every
+        child stored as is. Checks which only depend on the type of each state (such as
+        `is_finished()` or `is_failed()`) give the same answer for these as for all of the
+        children.
+
+        Returns:
+            - List: the representative children
+        """
+        first = {}  # type: Dict[int, int]
+        for code in range(1, len(self._types) + 1):
+            index = self._codes.find(code)
+            if index >= 0:
+                first[code] = index
+        return [self[i] for i in sorted(first.values())] + list(self._objects.values())
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MappedStates index out of range")
+        return index
+
+    def _splice(self, start: int, stop: int, count: int) -> None:
+        # replaces the children in [start, stop) with `count` empty slots, moving the
+        # children after them
+        shift = count - (stop - start)
+        self._codes[start:stop] = bytes(count)
+        for column in (self._messages, self._values, self._safe_values, self._handlers):
+            column[start:stop] = [None] * count
+        for children in (self._extras, self._objects):
+            moved = {
+                (i + shift if i >= stop else i): child
+                for i, child in children.items()
+                if not start <= i < stop
+            }
+            children.clear()
+            children.update(moved)
+
+    def _append(self, value: Any) -> None:
+        self._codes.append(0)
+        self._messages.append(None)
+        self._values.append(None)
+        self._safe_values.append(None)
+        self._handlers.append(None)
+        self._store(len(self._codes) - 1, value)
+
+    def _code(self, state: Any) -> int:
+        if not isinstance(state, State) or isinstance(state, Mapped):
+            return 0
+        attrs = state.__dict__
+        if "message" not in attrs or "_result" not in attrs:
+            return 0
+        result = attrs["_result"]
+        if not (result is NoResult or type(result) is Result):
+            return 0
+        extra_attrs = tuple(sorted(a for a in attrs if a not in ("message", "_result")))
+        key = (type(state), extra_attrs)
+        try:
+            return self._types.index(key) + 1
+        except ValueError:
+            if len(self._types) >= 255:
+                return 0
+            self._types.append(key)
+            return len(self._types)
+
+    def _store(self, index: int, value: Any) -> None:
+        code = self._code(value)
+        self._codes[index] = code
+        if code == 0:
+            self._objects[index] = value
+            self._messages[index] = None
+            self._values[index] = None
+            self._safe_values[index] = None
+            self._handlers[index] = None
+            return
+
+        attrs = value.__dict__
+        result = attrs["_result"]
+        self._messages[index] = attrs["message"]
+        if result is NoResult:
+            self._values[index] = _NO_VALUE
+            self._safe_values[index] = None
+            self._handlers[index] = None
+        else:
+            self._values[index] = result.value
+            self._safe_values[index] = result.safe_value
+            self._handlers[index] = result.result_handler
+
+        extras = {
+            attr: attrs[attr]
+            for attr in self._types[code - 1][1]
+            if attrs[attr] is not None
+        }
+        if extras:
+            self._extras[index] = extras
@@ -8,6 +8,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Generator,
     Iterable,
     List,
     NamedTuple,
@@ -24,12 +25,16 @@ import prefect
 from prefect import config
 from prefect.core import Edge, Task
 from prefect.engine import signals
+from prefect.engine.cache_stores import CacheStore, get_cache_store
+from prefect.engine.cache_validators import FingerprintedInputs, input_fingerprints
+from prefect.engine.executors import AsyncioExecutor
 from prefect.engine.result import NoResult, Result
 from prefect.engine.runner import ENDRUN, Runner, call_state_handlers
 from prefect.engine.state import (
     Cached,
     Failed,
     Mapped,
+    MappedStates,
     Paused,
     Pending,
     Resume,
@@ -43,12 +48,36 @@ from prefect.engine.state import (
     TimedOut,
     TriggerFailed,
 )
-from prefect.utilities.executors import run_with_heartbeat
+from prefect.utilities.executors import get_heartbeat_registry, run_with_heartbeat
+from prefect.utilities.hashing import fingerprint
 
 if TYPE_CHECKING:
     from prefect.engine.result_handlers import ResultHandler
 
 
+def _resume(steps: Generator[Any, Any, State], value: Any = None) -> Tuple[bool, Any]:
+    """
+    Resumes the steps of a task run, returning whether they finished, and either the
+    final state or the value they yielded.
+    """
+    try:
+        return False, steps.send(value)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+def _replay(
+    result: Any, error: Optional[Exception], fn: Callable, *args: Any, **kwargs: Any
+) -> Any:
+    """
+    A `timeout_handler` which, rather than calling `fn`, returns the result or raises
+    the error of a task coroutine which was already awaited.
+    """
+    if error is not None:
+        raise error
+    return result
+
+
 TaskRunnerInitializeResult = NamedTuple(
     "TaskRunnerInitializeResult", [("state", State), ("context", Dict[str, Any])]
 )
@@ -179,6 +208,71 @@ class TaskRunner(Runner):
         Returns:
             - `State` object representing the final post-run state of the Task
         """
+        return _resume(self._run_steps(state, upstream_states, context, executor))[1]
+
+    async def run_async(
+        self,
+        state: State = None,
+        upstream_states: Dict[Edge, State] = None,
+        context: Dict[str, Any] = None,
+        executor: "prefect.engine.executors.AsyncioExecutor" = None,
+    ) -> State:
+        """
+        Like `run()`, for tasks with an `async def run` method, run on a started
+        `AsyncioExecutor`: the steps of the task run before and after `self.task.run`
+        are run in the executor's thread pool, and the task's coroutine is awaited on the
+        executor's event loop, so that no thread is held while it runs.
+
+        Args:
+            - state (State, optional): initial `State` to begin task run from;
+                defaults to `Pending()`
+            - upstream_states (Dict[Edge, State]): a dictionary
+                representing the states of any tasks upstream of this one. The keys of the
+                dictionary should correspond to the edges leading to the task.
+            - context (dict, optional): prefect Context to use for execution
+            - executor (AsyncioExecutor): the executor running the task
+
+        Returns:
+            - `State` object representing the final post-run state of the Task
+        """
+        assert executor is not None  # mypy assert
+        steps = self._run_steps(state, upstream_states, context, executor, True)
+        finished, value = await executor.run_sync(_resume, steps)
+        if finished:
+            return value
+
+        task_context, inputs = value
+        run_fn = self.task.run  # type: Callable
+        registry = get_heartbeat_registry()
+        registry.register(self, prefect.config.cloud.heartbeat_interval)
+        try:
+            result = await executor.run_coroutine(
+                run_fn(**{k: r.value for k, r in inputs.items()}),
+                dict(task_context, logger=self.task.logger),
+                timeout=self.task.timeout,
+            )
+            outcome = partial(_replay, result, None)
+        except Exception as exc:
+            outcome = partial(_replay, None, exc)
+        finally:
+            registry.unregister(self)
+
+        return (await executor.run_sync(_resume, steps, outcome))[1]
+
+    def _run_steps(
+        self,
+        state: Optional[State],
+        upstream_states: Optional[Dict[Edge, State]],
+        context: Optional[Dict[str, Any]],
+        executor: Optional["prefect.engine.executors.Executor"],
+        suspend: bool = False,
+    ) -> Generator[Tuple[Dict[str, Any], Dict[str, Result]], Callable, State]:
+        """
+        The steps of `run()`, as a generator which returns the final state of the task
+        run. If `suspend` is `True` and the task is ready to run, the generator suspends
+        instead of calling `self.task.run`, yielding the Prefect context and inputs of
+        the run, and expects to be sent the `timeout_handler` to call it with.
+        """
         upstream_states = upstream_states or {}
         context = context or {}
         map_index = context.setdefault("map_index", None)
@@ -258,10 +352,17 @@ class TaskRunner(Runner):
 
                 # set the task state to running
                 state = self.set_task_to_running(state)
+                context = dict(prefect.context)
+
+            timeout_handler = executor.timeout_handler
+            if suspend and state.is_running():
+                timeout_handler = yield context, task_inputs
+
+            with prefect.context(context):
 
                 # run the task
                 state = self.get_task_run_state(
-                    state, inputs=task_inputs, timeout_handler=executor.timeout_handler
+                    state, inputs=task_inputs, timeout_handler=timeout_handler
                 )
 
                 # cache the output, if appropriate
@@ -564,7 +665,9 @@ class TaskRunner(Runner):
     @call_state_handlers
     def check_task_is_cached(self, state: State, inputs: Dict[str, Result]) -> State:
         """
-        Checks if task is cached and whether the cache is still valid.
+        Checks if task is cached and whether the cache is still valid. If the current
+        state isn't a valid `Cached` state, the in-memory caches in `prefect.context.caches`
+        and then the configured cache store (if any) are searched for one.
 
         Args:
             - state (State): the current state of this task
@@ -577,9 +680,12 @@ class TaskRunner(Runner):
         Raises:
             - ENDRUN: if the task is not ready to run
         """
+        # the inputs are fingerprinted at most once, however many states they're checked against
+        sanitized_inputs = FingerprintedInputs(
+            (key, res.value) for key, res in inputs.items()
+        )
         if state.is_cached():
             assert isinstance(state, Cached)  # mypy assert
-            sanitized_inputs = {key: res.value for key, res in inputs.items()}
             if self.task.cache_validator(
                 state, sanitized_inputs, prefect.context.get("parameters")
             ):
@@ -589,16 +695,40 @@ class TaskRunner(Runner):
                 state = Pending("Cache was invalid; ready to run.")
 
         if self.task.cache_for is not None:
-            candidate_states = prefect.context.caches.get(
-                self.task.cache_key or self.task.name, []
-            )
-            sanitized_inputs = {key: res.value for key, res in inputs.items()}
-            for candidate in candidate_states:
-                if self.task.cache_validator(
-                    candidate, sanitized_inputs, prefect.context.get("parameters")
-                ):
-                    candidate._result = candidate._result.to_result()
-                    return candidate
+            cache_key = self.task.cache_key or self.task.name
+            parameters = prefect.context.get("parameters")
+            stores = [prefect.context.get("caches") or {}]  # type: List[Any]
+            cache_store = get_cache_store()
+            if cache_store is not None:
+                stores.append(cache_store)
+            for store in stores:
+                if isinstance(store, CacheStore):
+                    try:
+                        candidate_states = store.candidates(
+                            cache_key,
+                            self.task.cache_validator,
+                            sanitized_inputs,
+                            parameters,
+                        )
+                    except Exception as exc:
+                        self.logger.warning(
+                            "Task '{name}': failed to read from the cache "
+                            "store: {exc}".format(
+                                name=prefect.context.get(
+                                    "task_full_name", self.task.name
+                                ),
+                                exc=repr(exc),
+                            )
+                        )
+                        continue
+                else:
+                    candidate_states = store.get(cache_key, [])
+                for candidate in candidate_states:
+                    if self.task.cache_validator(
+                        candidate, sanitized_inputs, parameters
+                    ):
+                        candidate._result = candidate._result.to_result()
+                        return candidate
 
         if self.task.cache_for is not None:
             self.logger.warning(
@@ -619,6 +749,10 @@ class TaskRunner(Runner):
         """
         If the task is being mapped, submits children tasks for execution. Returns a `Mapped` state.
 
+        If the task has a `map_chunksize` (see `Task.map`), the children are submitted in
+        chunks: each chunk is a single executor call which generates the upstream states of
+        its children as it runs them, one after another.
+
         Args:
             - state (State): the current task state
             - upstream_states (Dict[Edge, State]): the upstream states
@@ -632,65 +766,32 @@ class TaskRunner(Runner):
             - ENDRUN: if the current state is not `Running`
         """
 
-        map_upstream_states = []
-
-        # we don't know how long the iterables are, but we want to iterate until we reach
-        # the end of the shortest one
-        counter = itertools.count()
-
-        # infinite loop, if upstream_states has any entries
-        while True and upstream_states:
-            i = next(counter)
-            states = {}
-
-            try:
-
-                for edge, upstream_state in upstream_states.items():
-
-                    # if the edge is not mapped over, then we simply take its state
-                    if not edge.mapped:
-                        states[edge] = upstream_state
-
-                    # if the edge is mapped and the upstream state is Mapped, then we are mapping
-                    # over a mapped task. In this case, we take the appropriately-indexed upstream
-                    # state from the upstream tasks's `Mapped.map_states` array.
-                    # Note that these "states" might actually be futures at this time; we aren't
-                    # blocking until they finish.
-                    elif edge.mapped and upstream_state.is_mapped():
-                        states[edge] = upstream_state.map_states[i]  # type: ignore
-
-                    # Otherwise, we are mapping over the result of a "vanilla" task. In this
-                    # case, we create a copy of the upstream state but set the result to the
-                    # appropriately-indexed item from the upstream task's `State.result`
-                    # array.
-                    else:
-                        states[edge] = copy.copy(upstream_state)
-
-                        # if the current state is already Mapped, then we might be executing
-                        # a re-run of the mapping pipeline. In that case, the upstream states
-                        # might not have `result` attributes (as any required results could be
-                        # in the `cached_inputs` attribute of one of the child states).
-                        # Therefore, we only try to get a result if EITHER this task's
-                        # state is not already mapped OR the upstream result is not None.
-                        if not state.is_mapped() or upstream_state.result != NoResult:
-                            upstream_result = Result(
-                                upstream_state.result[i],
-                                result_handler=upstream_state._result.result_handler,  # type: ignore
-                            )
-                            states[edge].result = upstream_result
-                        elif state.is_mapped():
-                            if i >= len(state.map_states):  # type: ignore
-                                raise IndexError()
+        chunksize = self.task.map_chunksize
+        map_upstream_states = []  # type: List[Dict[Edge, State]]
 
-                # only add this iteration if we made it through all iterables
-                map_upstream_states.append(states)
+        if chunksize:
+            n_children = self.get_map_length(state, upstream_states)
+        else:
+            # we don't know how long the iterables are, but we want to iterate until we reach
+            # the end of the shortest one
+            counter = itertools.count()
+
+            # infinite loop, if upstream_states has any entries
+            while True and upstream_states:
+                try:
+                    map_upstream_states.append(
+                        self.get_map_upstream_states(
+                            state, upstream_states, map_index=next(counter)
+                        )
+                    )
 
-            # index error means we reached the end of the shortest iterable
-            except IndexError:
-                break
+                # index error means we reached the end of the shortest iterable
+                except IndexError:
+                    break
+            n_children = len(map_upstream_states)
 
         def run_fn(
-            state: State, map_index: int, upstream_states: Dict[Edge, State]
+            state: Optional[State], map_index: int, upstream_states: Dict[Edge, State]
         ) -> State:
             map_context = context.copy()
             map_context.update(map_index=map_index)
@@ -703,12 +804,25 @@ class TaskRunner(Runner):
                     executor=executor,
                 )
 
+        async def run_fn_async(
+            state: Optional[State], map_index: int, upstream_states: Dict[Edge, State]
+        ) -> State:
+            assert isinstance(executor, AsyncioExecutor)  # mypy assert
+            map_context = context.copy()
+            map_context.update(map_index=map_index)
+            return await self.run_async(
+                upstream_states=upstream_states,
+                state=state,
+                context=map_context,
+                executor=executor,
+            )
+
         # generate initial states, if available
         if isinstance(state, Mapped):
             initial_states = list(state.map_states)  # type: List[Optional[State]]
         else:
             initial_states = []
-        initial_states.extend([None] * (len(map_upstream_states) - len(initial_states)))
+        initial_states.extend([None] * (n_children - len(initial_states)))
 
         current_state = Mapped(  # type: ignore
             message="Preparing to submit {} mapped tasks.".format(len(initial_states)),
@@ -718,25 +832,193 @@ class TaskRunner(Runner):
         if state is not current_state:
             return state
 
-        # map over the initial states, a counter representing the map_index, and also the mapped upstream states
-        map_states = executor.map(
-            run_fn, initial_states, range(len(map_upstream_states)), map_upstream_states
-        )
+        if chunksize:
+            # each chunk generates the upstream states of its children as it runs them,
+            # from upstream results that were sliced down to the chunk
+            def run_chunk(
+                initial_states: List[Optional[State]],
+                start: int,
+                upstream_states: Dict[Edge, State],
+                state: State,
+            ) -> List[State]:
+                return [
+                    run_fn(
+                        initial_state,
+                        start + i,
+                        self.get_map_upstream_states(state, upstream_states, i),
+                    )
+                    for i, initial_state in enumerate(initial_states)
+                ]
+
+            chunks = []
+            for start in range(0, n_children, chunksize):
+                stop = min(start + chunksize, n_children)
+                chunk_upstream_states, chunk_state = self.slice_map_upstream_states(
+                    state, upstream_states, start, stop
+                )
+                chunks.append(
+                    executor.submit(
+                        run_chunk,
+                        initial_states[start:stop],
+                        start,
+                        chunk_upstream_states,
+                        chunk_state,
+                    )
+                )
+            self.logger.debug(
+                "{} mapped tasks submitted for execution in {} chunks.".format(
+                    n_children, len(chunks)
+                )
+            )
+            map_states = [s for chunk in executor.wait(chunks) for s in chunk]
+        else:
+            # map over the initial states, a counter representing the map_index, and also the mapped upstream states
+            # coroutine children are awaited on the executor's event loop
+            if isinstance(executor, AsyncioExecutor) and executor.is_async(self.task):
+                map_fn = run_fn_async  # type: Callable
+            else:
+                map_fn = run_fn
+            map_states = executor.map(
+                map_fn, initial_states, range(n_children), map_upstream_states
+            )
 
-        self.logger.debug(
-            "{} mapped tasks submitted for execution.".format(len(map_states))
-        )
+            self.logger.debug(
+                "{} mapped tasks submitted for execution.".format(len(map_states))
+            )
         new_state = Mapped(
             message="Mapped tasks submitted for execution.", map_states=map_states
         )
         return self.handle_state_change(old_state=state, new_state=new_state)
 
+    def get_map_upstream_states(
+        self, state: State, upstream_states: Dict[Edge, State], map_index: int
+    ) -> Dict[Edge, State]:
+        """
+        Generates the upstream states of a single mapped child.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states of the mapped task
+            - map_index (int): the index of the child
+
+        Returns:
+            - Dict[Edge, State]: the upstream states of the child
+
+        Raises:
+            - IndexError: if `map_index` is past the end of the shortest mapped upstream
+        """
+        states = {}
+
+        for edge, upstream_state in upstream_states.items():
+
+            # if the edge is not mapped over, then we simply take its state
+            if not edge.mapped:
+                states[edge] = upstream_state
+
+            # if the edge is mapped and the upstream state is Mapped, then we are mapping
+            # over a mapped task. In this case, we take the appropriately-indexed upstream
+            # state from the upstream tasks's `Mapped.map_states` array.
+            # Note that these "states" might actually be futures at this time; we aren't
+            # blocking until they finish.
+            elif edge.mapped and upstream_state.is_mapped():
+                states[edge] = upstream_state.map_states[map_index]  # type: ignore
+
+            # Otherwise, we are mapping over the result of a "vanilla" task. In this
+            # case, we create a copy of the upstream state but set the result to the
+            # appropriately-indexed item from the upstream task's `State.result`
+            # array.
+            else:
+                states[edge] = copy.copy(upstream_state)
+
+                # if the current state is already Mapped, then we might be executing
+                # a re-run of the mapping pipeline. In that case, the upstream states
+                # might not have `result` attributes (as any required results could be
+                # in the `cached_inputs` attribute of one of the child states).
+                # Therefore, we only try to get a result if EITHER this task's
+                # state is not already mapped OR the upstream result is not None.
+                if not state.is_mapped() or upstream_state.result != NoResult:
+                    upstream_result = Result(
+                        upstream_state.result[map_index],
+                        result_handler=upstream_state._result.result_handler,  # type: ignore
+                    )
+                    states[edge].result = upstream_result
+                elif state.is_mapped():
+                    if map_index >= len(state.map_states):  # type: ignore
+                        raise IndexError()
+
+        return states
+
+    def get_map_length(self, state: State, upstream_states: Dict[Edge, State]) -> int:
+        """
+        Computes the number of mapped children: the length of the shortest mapped upstream.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states of the mapped task
+
+        Returns:
+            - int: the number of children
+        """
+        lengths = []
+        for edge, upstream_state in upstream_states.items():
+            if not edge.mapped:
+                continue
+            elif upstream_state.is_mapped():
+                lengths.append(len(upstream_state.map_states))  # type: ignore
+            elif not state.is_mapped() or upstream_state.result != NoResult:
+                lengths.append(len(upstream_state.result))
+            else:
+                lengths.append(len(state.map_states))  # type: ignore
+        return min(lengths) if lengths else 0
+
+    def slice_map_upstream_states(
+        self, state: State, upstream_states: Dict[Edge, State], start: int, stop: int
+    ) -> Tuple[Dict[Edge, State], State]:
+        """
+        Slices the mapped upstream states (and the current state, if it is `Mapped`) down
+        to the children with indices in `[start, stop)`, so that they can be passed to
+        `get_map_upstream_states` with indices relative to `start`.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states of the mapped task
+            - start (int): the index of the first child
+            - stop (int): one more than the index of the last child
+
+        Returns:
+            - Tuple[Dict[Edge, State], State]: the sliced upstream states and current state
+        """
+        sliced = {}  # type: Dict[Edge, State]
+        for edge, upstream_state in upstream_states.items():
+            if not edge.mapped:
+                sliced[edge] = upstream_state
+            elif upstream_state.is_mapped():
+                assert isinstance(upstream_state, Mapped)  # mypy assert
+                sliced_state = copy.copy(upstream_state)
+                sliced_state.map_states = upstream_state.map_states[start:stop]
+                sliced[edge] = sliced_state
+            elif not state.is_mapped() or upstream_state.result != NoResult:
+                sliced[edge] = copy.copy(upstream_state)
+                sliced[edge].result = Result(
+                    upstream_state.result[start:stop],
+                    result_handler=upstream_state._result.result_handler,  # type: ignore
+                )
+            else:
+                sliced[edge] = upstream_state
+
+        if isinstance(state, Mapped):
+            state = copy.copy(state)
+            state.map_states = state.map_states[start:stop]
+        return sliced, state
+
     @call_state_handlers
     def wait_for_mapped_task(
         self, state: State, executor: "prefect.engine.executors.Executor"
     ) -> State:
         """
-        Blocks until a mapped state's children have finished running.
+        Blocks until a mapped state's children have finished running. If there are at least
+        `engine.task_runner.compact_map_states_threshold` children, their states are then
+        stored in a `MappedStates` container.
 
         Args:
             - state (State): the current `Mapped` state
@@ -748,6 +1030,10 @@ class TaskRunner(Runner):
         if state.is_mapped():
             assert isinstance(state, Mapped)  # mypy assert
             state.map_states = executor.wait(state.map_states)
+
+            threshold = config.engine.task_runner.compact_map_states_threshold
+            if threshold and len(state.map_states) >= threshold:
+                state.map_states = MappedStates(state.map_states)  # type: ignore
         return state
 
     @call_state_handlers
@@ -773,6 +1059,13 @@ class TaskRunner(Runner):
             )
             raise ENDRUN(state)
 
+        queue_wait = prefect.context.get("task_queue_wait")
+        if queue_wait is not None:
+            return Running(
+                message="Starting task run after waiting {:.3f}s in the queue.".format(
+                    queue_wait
+                )
+            )
         return Running(message="Starting task run.")
 
     @run_with_heartbeat
@@ -859,6 +1152,9 @@ class TaskRunner(Runner):
             - the task state is Successful
             - the task state is not Skipped (which is a subclass of Successful)
 
+        The cached state holds a fingerprint of each input instead of its value, and is
+        also written to the configured cache store, if any.
+
         Args:
             - state (State): the current state of this task
             - inputs (Dict[str, Result], optional): a dictionary of inputs whose keys correspond
@@ -874,13 +1170,34 @@ class TaskRunner(Runner):
             and self.task.cache_for is not None
         ):
             expiration = pendulum.now("utc") + self.task.cache_for
+            fingerprints = input_fingerprints(
+                {key: res.value for key, res in (inputs or {}).items()}
+            )
             cached_state = Cached(
                 result=state._result,
-                cached_inputs=inputs,
+                # inputs which can't be fingerprinted are kept, to be compared by value
+                cached_inputs=inputs if fingerprints is None else None,
+                cached_input_fingerprints=fingerprints,
                 cached_result_expiration=expiration,
                 cached_parameters=prefect.context.get("parameters"),
                 message=state.message,
             )
+            cache_store = get_cache_store()
+            if cache_store is not None:
+                try:
+                    cache_store.put(
+                        self.task.cache_key or self.task.name,
+                        cached_state,
+                        self.task.cache_validator,
+                    )
+                except Exception as exc:
+                    self.logger.warning(
+                        "Task '{name}': failed to write its result to the cache "
+                        "store: {exc}".format(
+                            name=prefect.context.get("task_full_name", self.task.name),
+                            exc=repr(exc),
+                        )
+                    )
             return cached_state
 
         return state
@@ -1,11 +1,30 @@
+import heapq
 import itertools
 from datetime import datetime, timedelta
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Optional
 
 import pendulum
 import pytz
 from croniter import croniter
 
+_DAY = timedelta(days=1)
+
+# the longest span of dates over which IntervalSchedule assumes their UTC offset
+# changes at most once
+_RUN_SPAN = timedelta(days=7)
+
+
+def _naive(date: datetime) -> datetime:
+    return datetime(
+        date.year,
+        date.month,
+        date.day,
+        date.hour,
+        date.minute,
+        date.second,
+        date.microsecond,
+    )
+
 
 class Schedule:
     """
@@ -35,7 +54,56 @@ class Schedule:
         Returns:
             - list[datetime]: a list of datetimes
         """
-        raise NotImplementedError("Must be implemented on Schedule subclasses")
+        return list(itertools.islice(self.iter(after=after), max(n, 0)))
+
+    def iter(self, after: datetime = None) -> Iterator[datetime]:
+        """
+        Lazily generate scheduled dates, in order.
+
+        Dates are only computed as they are consumed, so callers can take as many as they
+        need (for example, with `itertools.islice` or `itertools.takewhile`) without
+        computing the rest of the schedule.
+
+        Args:
+            - after (datetime, optional): the first result will be after this date;
+                defaults to now
+
+        Returns:
+            - Iterator[datetime]: an iterator of the scheduled dates, which ends at the
+                schedule's `end_date`
+        """
+        if type(self).next is Schedule.next:
+            raise NotImplementedError("Must be implemented on Schedule subclasses")
+        return self._iter_from_next(after=after)
+
+    def backfill(self, start: datetime, end: datetime) -> List[datetime]:
+        """
+        Retrieve every scheduled date in a window, for example to plan the runs which
+        backfill it.
+
+        Args:
+            - start (datetime): the start of the window
+            - end (datetime): the end of the window
+
+        Returns:
+            - list[datetime]: the scheduled dates `d` with `start <= d <= end`
+        """
+        after = pendulum.instance(start) - timedelta(microseconds=1)
+        end = pendulum.instance(end).in_tz("UTC")
+        return list(itertools.takewhile(lambda d: d <= end, self.iter(after=after)))
+
+    def _iter_from_next(
+        self, after: datetime = None, batch_size: int = 100
+    ) -> Iterator[datetime]:
+        # schedules which only implement `next` are iterated over in batches
+        if after is None:
+            after = pendulum.now("utc")
+        while True:
+            dates = self.next(batch_size, after=after)
+            yield from dates
+            if len(dates) < batch_size:
+                return
+            after = dates[-1]
 
     def serialize(self) -> tuple:
         from prefect.serialization.schedule import ScheduleSchema
@@ -83,53 +151,152 @@ class IntervalSchedule(Schedule):
         self.interval = interval
         super().__init__(start_date=start_date, end_date=end_date)
 
-    def next(self, n: int, after: datetime = None) -> List[datetime]:
+    def iter(self, after: datetime = None) -> Iterator[datetime]:
         """
-        Retrieve next scheduled dates.
+        Lazily generate scheduled dates, in order.
 
         Args:
-            - n (int): the number of future scheduled dates to return
-            - after (datetime, optional): the first result will be after this date
+            - after (datetime, optional): the first result will be after this date;
+                defaults to now
 
         Returns:
-            - list: list of next scheduled dates
+            - Iterator[datetime]: an iterator of the scheduled dates
         """
-        if after is None:
-            after = pendulum.now("utc")
+        return self._iter(after=after)
 
-        assert isinstance(after, datetime)  # mypy assertion
+    def backfill(self, start: datetime, end: datetime) -> List[datetime]:
+        """
+        Retrieve every scheduled date in a window, for example to plan the runs which
+        backfill it.
+
+        Args:
+            - start (datetime): the start of the window
+            - end (datetime): the end of the window
+
+        Returns:
+            - list[datetime]: the scheduled dates `d` with `start <= d <= end`
+        """
+        after = pendulum.instance(start) - timedelta(microseconds=1)
+        return list(self._iter(after=after, until=end))
+
+    def _date(self, i: int) -> pendulum.DateTime:
+        """
+        Computes the `i`-th date of the schedule with Pendulum.
+        """
         assert isinstance(self.start_date, pendulum.DateTime)  # mypy assertion
+        interval = self.interval * i
+        if self.interval < _DAY:
+            # intervals shorter than a day are added in absolute time
+            return self.start_date.add(
+                seconds=interval.days * 24 * 60 * 60 + interval.seconds,
+                microseconds=interval.microseconds,
+            )
+        # in order to handle daylight saving time boundries, we consider the interval
+        # "days" separate from "seconds"; this allows Pendulum DST logic to work
+        days = interval.days
+        seconds = interval.total_seconds() - (days * 24 * 60 * 60)
+        return self.start_date.add(days=days, seconds=seconds)  # type: ignore
 
-        after = pendulum.instance(after)
+    def _first_index(self, after: pendulum.DateTime) -> int:
+        """
+        Computes the index of the first date after the given date.
+        """
+        assert isinstance(self.start_date, pendulum.DateTime)  # mypy assertion
+        # datetimes in the same timezone are compared by their wall-clock times, so
+        # compare them in UTC to order the dates of repeated hours correctly
+        after = after.in_tz("UTC")
+        if after < self.start_date:
+            return 0
+        # estimate the index from the elapsed time, then step over the dates which
+        # daylight saving time moved to the other side of `after`
+        i = (after - self.start_date).as_timedelta() // self.interval + 1
+        while i > 0 and self._date(i - 1) > after:
+            i -= 1
+        while self._date(i) <= after:
+            i += 1
+        return i
+
+    def _iter(
+        self, after: datetime = None, until: datetime = None
+    ) -> Iterator[datetime]:
+        """
+        Generates the dates after `after` and no later than `until` or the end date.
 
-        # Use the difference between the `after` date and the `start_date` to calc the
-        # number of intervals we can skip over
-        skip = (after - self.start_date).total_seconds() / self.interval.total_seconds()
-
-        # if the after date is before the start date, we jump to the start date
-        if skip < 0:
-            skip = 0
-        # if the `after` date falls exactly on an interval, jump to the next interval
-        elif int(skip) == skip:
-            skip += 1
-        # otherwise jump to the next integer interval
-        else:
-            skip = int(skip + 1)
+        Rather than computing each date with Pendulum's timezone arithmetic, the dates
+        are generated in runs of dates which share one UTC offset: only the bounds of each
+        run are computed with Pendulum, and the dates within it are built directly from
+        their wall-clock times. Dates within a run are exactly those Pendulum computes.
+        """
+        if after is None:
+            after = pendulum.now("utc")
 
-        dates = []  # type: List[datetime]
+        assert isinstance(after, datetime)  # mypy assertion
+        assert isinstance(self.start_date, pendulum.DateTime)  # mypy assertion
 
-        for i in range(n):
-            interval = self.interval * (skip + i)
-            # in order to handle daylight saving time boundries, we consider the interval
-            # "days" separate from "seconds"; this allows Pendulum DST logic to work
-            days = interval.days
-            seconds = interval.total_seconds() - (days * 24 * 60 * 60)
-            next_date = self.start_date.add(days=days, seconds=seconds)
-            if self.end_date and next_date > self.end_date:
-                break
-            dates.append(next_date)
+        i = self._first_index(pendulum.instance(after))
+        ends = [
+            _naive(pendulum.instance(d).in_tz("UTC"))
+            for d in (until, self.end_date)
+            if d is not None
+        ]
+        end = min(ends) if ends else None
+
+        tz = self.start_date.tz
+        absolute = self.interval < _DAY
+        start_wall = _naive(self.start_date)
+        run_length = max(_RUN_SPAN // self.interval, 1)
+
+        while True:
+            first = self._date(i)
+            offset = first.utcoffset()
+            assert offset is not None  # mypy assertion
+            if not absolute and _naive(first) != start_wall + self.interval * i:
+                # the wall-clock time was skipped by daylight saving time, and Pendulum
+                # moved it forward
+                last = i
+            else:
+                last = i + run_length
+                if self._date(last).utcoffset() != offset:
+                    # the offset changes within the run, so shorten it to the last date
+                    # before the change
+                    low, high = i, last
+                    while high - low > 1:
+                        middle = (low + high) // 2
+                        if self._date(middle).utcoffset() == offset:
+                            low = middle
+                        else:
+                            high = middle
+                    last = low
+
+            wall = _naive(first)
+            # wall-clock times which occur twice can only be at either end of a run
+            last_wall = wall + self.interval * (last - i)
+            fold = int(
+                any(
+                    w.replace(tzinfo=tz).utcoffset() != offset
+                    for w in (wall, last_wall)
+                )
+            )
 
-        return dates
+            if end is not None and wall - offset > end:
+                return
+            yield first
+            for _ in range(last - i):
+                wall += self.interval
+                if end is not None and wall - offset > end:
+                    return
+                yield pendulum.DateTime(  # type: ignore
+                    wall.year,
+                    wall.month,
+                    wall.day,
+                    wall.hour,
+                    wall.minute,
+                    wall.second,
+                    wall.microsecond,
+                    tzinfo=tz,
+                    fold=fold,
+                )
+            i = last + 1
 
 
 class CronSchedule(Schedule):
@@ -164,16 +331,16 @@ class CronSchedule(Schedule):
         self.cron = cron
         super().__init__(start_date=start_date, end_date=end_date)
 
-    def next(self, n: int, after: datetime = None) -> List[datetime]:
+    def iter(self, after: datetime = None) -> Iterator[datetime]:
         """
-        Retrieve next scheduled dates.
+        Lazily generate scheduled dates, in order.
 
         Args:
-            - n (int): the number of future scheduled dates to return
-            - after (datetime, optional): the first result will be after this date
+            - after (datetime, optional): the first result will be after this date;
+                defaults to now
 
         Returns:
-            - list: list of next scheduled dates
+            - Iterator[datetime]: an iterator of the scheduled dates
         """
         tz = getattr(self.start_date, "tz", "UTC")
         if after is None:
@@ -203,21 +370,20 @@ class CronSchedule(Schedule):
             )
         )
         cron = croniter(self.cron, after_localized)
-        dates = []  # type: List[datetime]
+        previous = None  # type: Optional[datetime]
 
-        for i in range(n):
+        while True:
             next_date = pendulum.instance(cron.get_next(datetime))
             # because of croniter's rounding behavior, we want to avoid
             # issuing the after date; we also want to avoid duplicates caused by
             # DST boundary issues
-            if next_date.in_tz("UTC") == after.in_tz("UTC") or next_date in dates:
+            if next_date == after or next_date == previous:
                 next_date = pendulum.instance(cron.get_next(datetime))
 
             if self.end_date and next_date > self.end_date:
-                break
-            dates.append(next_date)
-
-        return dates
+                return
+            yield next_date
+            previous = next_date
 
 
 class OneTimeSchedule(IntervalSchedule):
@@ -286,40 +452,33 @@ class UnionSchedule(Schedule):
         )
         super().__init__(start_date=start_date, end_date=end_date)
 
-    def next(self, n: int, after: datetime = None) -> List[datetime]:
+    def iter(self, after: datetime = None) -> Iterator[datetime]:
         """
-        Retrieve next scheduled dates.
+        Lazily generate scheduled dates, in order.
+
+        The dates of all schedules are merged with a heap, so that each schedule's
+        iterator is only advanced past the dates which have been emitted.
 
         Args:
-            - n (int): the number of future scheduled dates to return
-            - after (datetime, optional): the first result will be after this date
+            - after (datetime, optional): the first result will be after this date;
+                defaults to now
 
         Returns:
-            - list: list of next scheduled dates
+            - Iterator[datetime]: an iterator of the unique scheduled dates, which ends
+                once every schedule has ended
         """
         if after is None:
             after = pendulum.now("utc")
 
-        assert isinstance(after, datetime)  # mypy assertion
-        assert isinstance(self.start_date, pendulum.DateTime)  # mypy assertion
-
-        after = pendulum.instance(after)
-        dates = []  # type: List[pendulum.DateTime]
-        default = pendulum.instance(datetime.max)
-        candidates = {
-            idx: next(iter(s.next(1, after=after)), default)
-            for idx, s in enumerate(self.schedules)
-        }
-
-        while len(dates) < n:
-            dates.append(min(candidates.values()))
-
-            ## get next date for all dates whose current values agree with the current minimum
-            updates = {
-                i: next(iter(self.schedules[i].next(1, after=dates[-1])), default)
-                for i, val in candidates.items()
-                if val == dates[-1]
-            }
-            candidates.update(updates)
-
-        return dates
+        # dates are compared by their timestamps, which is much faster than comparing
+        # datetimes in different timezones
+        timestamped = [
+            ((date.timestamp(), date) for date in s.iter(after=after))
+            for s in self.schedules
+        ]
+        previous = None
+        for timestamp, date in heapq.merge(*timestamped, key=lambda item: item[0]):
+            # overlapping schedules may issue the same date
+            if timestamp != previous:
+                yield date
+                previous = timestamp
@@ -44,6 +44,9 @@ class GCSResultHandlerSchema(BaseResultHandlerSchema):
 
     bucket = fields.String(allow_none=False)
     credentials_secret = fields.String(allow_none=True)
+    serializers = fields.List(fields.String(), allow_none=True)
+    part_size = fields.Integer(allow_none=True)
+    max_concurrency = fields.Integer(allow_none=True)
 
 
 class JSONResultHandlerSchema(BaseResultHandlerSchema):
@@ -56,6 +59,9 @@ class LocalResultHandlerSchema(BaseResultHandlerSchema):
         object_class = LocalResultHandler
 
     dir = fields.String(allow_none=True)
+    content_addressed = fields.Boolean(allow_none=True)
+    compression = fields.String(allow_none=True)
+    serializers = fields.List(fields.String(), allow_none=True)
 
 
 class S3ResultHandlerSchema(BaseResultHandlerSchema):
@@ -64,6 +70,9 @@ class S3ResultHandlerSchema(BaseResultHandlerSchema):
 
     bucket = fields.String(allow_none=False)
     aws_credentials_secret = fields.String(allow_none=True)
+    serializers = fields.List(fields.String(), allow_none=True)
+    part_size = fields.Integer(allow_none=True)
+    max_concurrency = fields.Integer(allow_none=True)
 
 
 class ResultHandlerSchema(OneOfSchema):
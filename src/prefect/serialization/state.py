@@ -1,3 +1,4 @@
+import collections
 import json
 from typing import Any, Dict
 
@@ -123,6 +124,9 @@ class CachedSchema(SuccessSchema):
     )
     cached_parameters = JSONCompatible(allow_none=True)
     cached_result_expiration = fields.DateTime(allow_none=True)
+    cached_input_fingerprints = fields.Dict(
+        key=fields.Str(), values=fields.Str(), allow_none=True
+    )
 
 
 class MappedSchema(SuccessSchema):
@@ -133,6 +137,18 @@ class MappedSchema(SuccessSchema):
     # though this field is excluded from serialization, it must be present in the schema
     map_states = fields.Nested("StateSchema", many=True)
     n_map_states = fields.Integer()
+    map_state_counts = fields.Method("get_map_state_counts", dump_only=True)
+
+    def get_map_state_counts(self, obj: state.Mapped) -> Dict[str, int]:
+        """
+        Summarizes the children of a `Mapped` state as the number of children in each state
+        """
+        if isinstance(obj.map_states, state.MappedStates):
+            return obj.map_states.state_counts()
+        counts = collections.Counter(
+            type(s).__name__ for s in obj.map_states if isinstance(s, state.State)
+        )
+        return dict(counts)
 
     @post_load
     def create_object(self, data: dict, **kwargs: Any) -> state.Mapped:
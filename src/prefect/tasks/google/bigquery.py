@@ -1,8 +1,16 @@
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
 import uuid
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
+import requests
 from google.cloud import bigquery
-from google.cloud.exceptions import NotFound
+from google.cloud.exceptions import NotFound, ServerError, TooManyRequests
 from google.oauth2.service_account import Credentials
 
 from prefect import context
@@ -12,6 +20,141 @@ from prefect.engine.signals import SUCCESS
 from prefect.utilities.tasks import defaults_from_attrs
 
 
+# the reasons for row errors which may succeed when the row is sent again; "stopped"
+# rows were valid, but were rejected along with an invalid row in the same request
+_RETRYABLE_REASONS = {
+    "stopped",
+    "backendError",
+    "internalError",
+    "rateLimitExceeded",
+    "timeout",
+}
+# the number of seconds to wait before the first retry of rows with transient errors
+_RETRY_DELAY = 1
+# an allowance for the insert ID and envelope of each row in a streaming request
+_ROW_OVERHEAD = 64
+_LOAD_JOB_FORMATS = ("NEWLINE_DELIMITED_JSON", "PARQUET")
+
+_clients = {}  # type: Dict[Tuple[Optional[str], str, int], bigquery.Client]
+_clients_lock = threading.Lock()
+
+
+def _get_client(project: Optional[str], credentials_secret: str) -> bigquery.Client:
+    """
+    Returns the BigQuery client of this process for a project and credentials secret, so
+    that task runs reuse each other's credentials and HTTP connections, and the secret is
+    read only when the client is created.
+    """
+    key = (project, credentials_secret, os.getpid())
+    with _clients_lock:
+        client = _clients.get(key)
+    if client is None:
+        creds = Secret(credentials_secret).get()
+        credentials = Credentials.from_service_account_info(creds)
+        client = bigquery.Client(
+            project=project or credentials.project_id, credentials=credentials
+        )
+        with _clients_lock:
+            client = _clients.setdefault(key, client)
+    return client
+
+
+def _row_size(row: dict) -> int:
+    return len(json.dumps(row, default=str).encode("utf-8")) + _ROW_OVERHEAD
+
+
+def _row_ids(count: int) -> List[str]:
+    """
+    Returns insert IDs for the rows of a streaming insert, which are the same for every
+    run of the current task run, if it has an ID.
+    """
+    task_run_id = context.get("task_run_id")
+    if task_run_id is None:
+        return [str(uuid.uuid4()) for _ in range(count)]
+    return ["{}-{}".format(task_run_id, index) for index in range(count)]
+
+
+def _request_error_reason(exc: Exception) -> Optional[str]:
+    """
+    Returns the row error reason for the rows of a streaming insert request which
+    failed with a transient error, or `None` if the error isn't transient.
+    """
+    if isinstance(exc, TooManyRequests):
+        return "rateLimitExceeded"
+    if isinstance(exc, ServerError):
+        return "backendError"
+    if isinstance(exc, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        return "backendError"
+    return None
+
+
+def _chunk_rows(
+    indices: List[int], sizes: List[int], max_rows: int, max_bytes: int
+) -> List[List[int]]:
+    """
+    Splits the indices of rows into chunks of at most `max_rows` rows whose sizes add up to
+    at most `max_bytes`; rows larger than `max_bytes` are put in a chunk of their own.
+    """
+    chunks = []  # type: List[List[int]]
+    chunk = []  # type: List[int]
+    chunk_size = 0
+    for index in indices:
+        if chunk and (len(chunk) >= max_rows or chunk_size + sizes[index] > max_bytes):
+            chunks.append(chunk)
+            chunk, chunk_size = [], 0
+        chunk.append(index)
+        chunk_size += sizes[index]
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _load_records(
+    client: bigquery.Client,
+    table_ref: Any,
+    records: List[dict],
+    source_format: str,
+    location: str = None,
+    ignore_unknown_values: bool = None,
+) -> None:
+    """
+    Appends records to a table with a load job, uploading them as newline-delimited JSON or
+    Parquet, and waits for the job to finish.
+    """
+    job_config = bigquery.LoadJobConfig()
+    job_config.source_format = source_format
+    job_config.write_disposition = bigquery.WriteDisposition.WRITE_APPEND
+
+    with tempfile.TemporaryFile() as file:
+        if source_format == "PARQUET":
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError(
+                    "Loading records as Parquet requires `pyarrow` to be installed."
+                )
+            columns = {}  # type: Dict[str, None]
+            for row in records:
+                columns.update(dict.fromkeys(row))
+            arrow_table = pyarrow.Table.from_pydict(
+                {column: [row.get(column) for row in records] for column in columns}
+            )
+            pyarrow.parquet.write_table(arrow_table, file)
+        else:
+            for row in records:
+                file.write(json.dumps(row).encode("utf-8") + b"\n")
+            if ignore_unknown_values:
+                job_config.ignore_unknown_values = True
+
+        job = client.load_table_from_file(
+            file, table_ref, rewind=True, location=location, job_config=job_config
+        )
+        job.result()
+
+
 class BigQueryTask(Task):
     """
     Task for executing queries against a Google BigQuery table and (optionally) returning
@@ -132,10 +275,7 @@ class BigQueryTask(Task):
             )
 
         ## create client
-        creds = Secret(credentials_secret).get()
-        credentials = Credentials.from_service_account_info(creds)
-        project = project or credentials.project_id
-        client = bigquery.Client(project=project, credentials=credentials)
+        client = _get_client(project, credentials_secret)
 
         ## setup jobconfig
         job_config = bigquery.QueryJobConfig(**job_config)
@@ -177,6 +317,18 @@ class BigQueryStreamingInsert(Task):
     Task for insert records in a Google BigQuery table via [the streaming API](https://cloud.google.com/bigquery/streaming-data-into-bigquery).
     Note that all of these settings can optionally be provided or overwritten at runtime.
 
+    Records are split into requests of at most `max_rows_per_request` rows and
+    `max_bytes_per_request` bytes, which are sent concurrently.  Rows which fail with a
+    transient error, or which were only rejected because another row in their request
+    was invalid, are sent again up to `max_row_retries` times, and no other rows are sent
+    twice; requests which fail with a server error, a rate limit or a connection error
+    count as rows with transient errors.  Each row keeps its insert ID across retries, so
+    BigQuery can deduplicate them.  Insert IDs are derived from the task run ID and the
+    index of the row, so that the rows sent before a failed task run are also
+    deduplicated when the task run is retried; outside of a task run with an ID, they
+    are random.  Very large record sets can instead be written with a single load job by setting
+    `load_job_min_records`.
+
     Args:
         - dataset_id (str, optional): the id of a destination dataset to write the
             records to
@@ -187,6 +339,18 @@ class BigQueryStreamingInsert(Task):
         - location (str, optional): location of the dataset that will be queried; defaults to "US"
         - credentials_secret (str, optional): the name of the Prefect Secret containing a JSON representation
             of your Google Application credentials; defaults to `"GOOGLE_APPLICATION_CREDENTIALS"`
+        - max_rows_per_request (int, optional): the maximum number of rows sent in each request;
+            defaults to 500
+        - max_bytes_per_request (int, optional): the maximum size of the JSON-encoded rows sent in
+            each request; defaults to 5 MiB, half of the API's limit
+        - max_concurrency (int, optional): the maximum number of requests sent at once; defaults to 4
+        - max_row_retries (int, optional): the number of times rows which failed with a retryable error
+            are sent again; defaults to 3
+        - load_job_min_records (int, optional): if provided, record sets of at least this many records
+            are written with a load job instead of the streaming API
+        - load_job_format (str, optional): the format records are uploaded in for load jobs, either
+            `"NEWLINE_DELIMITED_JSON"` or `"PARQUET"` (which requires `pyarrow`);
+            defaults to `"NEWLINE_DELIMITED_JSON"`
         - **kwargs (optional): additional kwargs to pass to the `Task` constructor
     """
 
@@ -197,6 +361,12 @@ class BigQueryStreamingInsert(Task):
         project: str = None,
         location: str = "US",
         credentials_secret: str = None,
+        max_rows_per_request: int = 500,
+        max_bytes_per_request: int = 5 * 2 ** 20,
+        max_concurrency: int = 4,
+        max_row_retries: int = 3,
+        load_job_min_records: int = None,
+        load_job_format: str = "NEWLINE_DELIMITED_JSON",
         **kwargs
     ):
         self.dataset_id = dataset_id
@@ -204,10 +374,26 @@ class BigQueryStreamingInsert(Task):
         self.project = project
         self.location = location
         self.credentials_secret = credentials_secret or "GOOGLE_APPLICATION_CREDENTIALS"
+        self.max_rows_per_request = max_rows_per_request
+        self.max_bytes_per_request = max_bytes_per_request
+        self.max_concurrency = max_concurrency
+        self.max_row_retries = max_row_retries
+        self.load_job_min_records = load_job_min_records
+        self.load_job_format = load_job_format
         super().__init__(**kwargs)
 
     @defaults_from_attrs(
-        "dataset_id", "table", "project", "location", "credentials_secret"
+        "dataset_id",
+        "table",
+        "project",
+        "location",
+        "credentials_secret",
+        "max_rows_per_request",
+        "max_bytes_per_request",
+        "max_concurrency",
+        "max_row_retries",
+        "load_job_min_records",
+        "load_job_format",
     )
     def run(
         self,
@@ -217,6 +403,12 @@ class BigQueryStreamingInsert(Task):
         project: str = None,
         location: str = "US",
         credentials_secret: str = None,
+        max_rows_per_request: int = 500,
+        max_bytes_per_request: int = 5 * 2 ** 20,
+        max_concurrency: int = 4,
+        max_row_retries: int = 3,
+        load_job_min_records: int = None,
+        load_job_format: str = "NEWLINE_DELIMITED_JSON",
         **kwargs
     ):
         """
@@ -235,6 +427,18 @@ class BigQueryStreamingInsert(Task):
             - location (str, optional): location of the dataset that will be queried; defaults to "US"
             - credentials_secret (str, optional): the name of the Prefect Secret containing a JSON representation
                 of your Google Application credentials; defaults to `"GOOGLE_APPLICATION_CREDENTIALS"`
+            - max_rows_per_request (int, optional): the maximum number of rows sent in each request;
+                defaults to 500
+            - max_bytes_per_request (int, optional): the maximum size of the JSON-encoded rows sent in
+                each request; defaults to 5 MiB, half of the API's limit
+            - max_concurrency (int, optional): the maximum number of requests sent at once; defaults to 4
+            - max_row_retries (int, optional): the number of times rows which failed with a retryable error
+                are sent again; defaults to 3
+            - load_job_min_records (int, optional): if provided, record sets of at least this many records
+                are written with a load job instead of the streaming API
+            - load_job_format (str, optional): the format records are uploaded in for load jobs, either
+                `"NEWLINE_DELIMITED_JSON"` or `"PARQUET"` (which requires `pyarrow`);
+                defaults to `"NEWLINE_DELIMITED_JSON"`
             - **kwargs (optional): additional kwargs to pass to the
                 `insert_rows_json` method; see the documentation here:
                 https://googleapis.github.io/google-cloud-python/latest/bigquery/generated/google.cloud.bigquery.client.Client.html
@@ -244,35 +448,98 @@ class BigQueryStreamingInsert(Task):
             - ValueError: if any of the records result in errors
 
         Returns:
-            - the response from `insert_rows_json`
+            - the errors returned by `insert_rows_json`, which are empty as any errors are raised
         """
         ## check for any argument inconsistencies
         if dataset_id is None or table is None:
             raise ValueError("Both dataset_id and table must be provided.")
+        if load_job_format not in _LOAD_JOB_FORMATS:
+            raise ValueError(
+                "The 'load_job_format' parameter must be one of {}".format(
+                    _LOAD_JOB_FORMATS
+                )
+            )
 
         ## create client
-        creds = Secret(credentials_secret).get()
-        credentials = Credentials.from_service_account_info(creds)
-        project = project or credentials.project_id
-        client = bigquery.Client(project=project, credentials=credentials)
+        client = _get_client(project, credentials_secret)
 
         ## get table reference
         table_ref = client.dataset(dataset_id).table(table)
 
-        ## stream data in
-        response = client.insert_rows_json(table=table_ref, json_rows=records, **kwargs)
+        if load_job_min_records is not None and len(records) >= load_job_min_records:
+            self.logger.debug(
+                "Loading {} records with a load job...".format(len(records))
+            )
+            _load_records(
+                client,
+                table_ref,
+                records,
+                source_format=load_job_format,
+                location=location,
+                ignore_unknown_values=kwargs.get("ignore_unknown_values"),
+            )
+            return []
+
+        ## stream data in, giving each row an insert ID which is kept across retries
+        row_ids = kwargs.pop("row_ids", None) or _row_ids(len(records))
+        sizes = [_row_size(row) for row in records]
+
+        def insert(indices: List[int]) -> List[Tuple[int, list]]:
+            try:
+                response = client.insert_rows_json(
+                    table=table_ref,
+                    json_rows=[records[i] for i in indices],
+                    row_ids=[row_ids[i] for i in indices],
+                    **kwargs
+                )
+            except Exception as exc:
+                reason = _request_error_reason(exc)
+                if reason is None:
+                    raise
+                # the rows of a failed request are sent again with the other failed rows
+                error = dict(reason=reason, message=str(exc))
+                return [(index, [error]) for index in indices]
+            return [
+                (indices[row["index"]], row["errors"])
+                for row in response
+                if row.get("errors")
+            ]
 
-        errors = []
-        output = []
-        for row in response:
-            output.append(row)
-            if "errors" in row:
-                errors.append(row["errors"])
+        pending = list(range(len(records)))
+        errors = {}  # type: Dict[int, list]
+        for attempt in range(max_row_retries + 1):
+            if attempt:
+                self.logger.debug(
+                    "Retrying {} rows which failed to insert...".format(len(pending))
+                )
+            chunks = _chunk_rows(
+                pending, sizes, max_rows_per_request, max_bytes_per_request
+            )
+            if len(chunks) > 1 and max_concurrency > 1:
+                with ThreadPoolExecutor(min(max_concurrency, len(chunks))) as executor:
+                    results = list(executor.map(insert, chunks))
+            else:
+                results = [insert(chunk) for chunk in chunks]
+
+            pending = []
+            retry_after_delay = False
+            for index, row_errors in itertools.chain.from_iterable(results):
+                errors[index] = row_errors
+                reasons = {error.get("reason") for error in row_errors}
+                if reasons <= _RETRYABLE_REASONS:
+                    pending.append(index)
+                    retry_after_delay |= reasons != {"stopped"}
+            if not pending or attempt == max_row_retries:
+                break
+            for index in pending:
+                del errors[index]
+            if retry_after_delay:
+                time.sleep(_RETRY_DELAY * 2 ** attempt)
 
         if errors:
-            raise ValueError(errors)
+            raise ValueError([errors[index] for index in sorted(errors)])
 
-        return output
+        return []
 
 
 class CreateBigQueryTable(Task):
@@ -341,10 +608,7 @@ class CreateBigQueryTable(Task):
         Raises:
             - SUCCESS: a `SUCCESS` signal if the table already exists
         """
-        creds = Secret(credentials_secret).get()
-        credentials = Credentials.from_service_account_info(creds)
-        project = project or credentials.project_id
-        client = bigquery.Client(project=project, credentials=credentials)
+        client = _get_client(project, credentials_secret)
 
         try:
             dataset_ref = client.get_dataset(dataset)
@@ -1,13 +1,128 @@
+import io
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
 import psycopg2 as pg
+from psycopg2 import sql
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_UNKNOWN,
+    make_dsn,
+)
 
 from prefect import Task
 from prefect.utilities.tasks import defaults_from_attrs
 
 
+# the number of seconds after which idle connections are checked before they are reused
+_CHECK_AFTER_IDLE = 60
+
+
+class _ConnectionPool:
+    """
+    A thread-safe pool of connections to one database, which opens connections as they
+    are needed, keeps them open once they are returned, and blocks when all of its
+    connections are in use.
+    """
+
+    def __init__(self, dsn: str, max_connections: int) -> None:
+        self.dsn = dsn
+        self._idle = []  # type: List[Tuple[Any, float]]
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        with self._slots:
+            conn = self._checkout()
+            try:
+                yield conn
+            finally:
+                self._checkin(conn)
+
+    def _checkout(self) -> Any:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, returned = self._idle.pop()
+            # connections which were closed while in the pool are replaced, and those
+            # which were idle for a while are checked first, as the server or network
+            # may have dropped them
+            if conn.closed:
+                continue
+            if time.monotonic() - returned < _CHECK_AFTER_IDLE:
+                return conn
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+                return conn
+            except pg.Error:
+                conn.close()
+        return pg.connect(self.dsn)
+
+    def _checkin(self, conn: Any) -> None:
+        if conn.closed:
+            return
+        status = conn.info.transaction_status
+        if status == TRANSACTION_STATUS_UNKNOWN:
+            # the connection to the server was lost
+            conn.close()
+            return
+        if status != TRANSACTION_STATUS_IDLE:
+            conn.rollback()
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+
+    def close(self) -> None:
+        with self._lock:
+            for conn, _ in self._idle:
+                conn.close()
+            del self._idle[:]
+
+
+_pools = {}  # type: Dict[Tuple[str, int, int], _ConnectionPool]
+_pools_lock = threading.Lock()
+
+
+def _get_pool(dsn: str, max_connections: int) -> _ConnectionPool:
+    """
+    Returns the connection pool of this process for a DSN, so that task runs which
+    connect to the same database reuse each other's connections.
+    """
+    key = (dsn, max_connections, os.getpid())
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = _ConnectionPool(dsn, max_connections)
+        return _pools[key]
+
+
+def _dsn(task: Any) -> str:
+    return make_dsn(
+        dbname=task.db_name,
+        user=task.user,
+        password=task.password,
+        host=task.host,
+        port=task.port,
+    )
+
+
+def _connection(task: Any) -> Any:
+    return _get_pool(_dsn(task), task.max_connections).connection()
+
+
 class PostgresExecute(Task):
     """
     Task for executing a query against a Postgres database.
 
+    Connections are taken from a pool shared by all tasks in the process which connect
+    to the same database, and are kept open between task runs.
+
     Args:
         - db_name (str): name of Postgres database
         - user (str): user name used to authenticate
@@ -17,6 +132,9 @@ class PostgresExecute(Task):
         - query (str, optional): query to execute against database
         - data (tuple, optional): values to use in query, must be specified using placeholder is query string
         - commit (bool, optional): set to True to commit transaction, defaults to false
+        - max_connections (int, optional): the maximum number of connections the process
+            keeps open to the database; task runs wait for a connection when all of them
+            are in use. Defaults to 10
         - **kwargs (dict, optional): additional keyword arguments to pass to the
             Task constructor
     """
@@ -31,6 +149,7 @@ class PostgresExecute(Task):
         query: str = None,
         data: tuple = None,
         commit: bool = False,
+        max_connections: int = 10,
         **kwargs
     ):
         self.db_name = db_name
@@ -41,6 +160,7 @@ class PostgresExecute(Task):
         self.query = query
         self.data = data
         self.commit = commit
+        self.max_connections = max_connections
         super().__init__(**kwargs)
 
     @defaults_from_attrs("query", "data", "commit")
@@ -64,49 +184,41 @@ class PostgresExecute(Task):
         if not query:
             raise ValueError("A query string must be provided")
 
-        ## connect to database, open cursor
         ## allow psycopg2 to pass through any exceptions raised
-        conn = pg.connect(
-            dbname=self.db_name,
-            user=self.user,
-            password=self.password,
-            host=self.host,
-            port=self.port,
-        )
-
-        ## try to execute query
         ## context manager automatically rolls back failed transactions
-        try:
+        with _connection(self) as conn:
             with conn:
                 with conn.cursor() as cursor:
                     executed = cursor.execute(query=query, vars=data)
                     if commit:
                         conn.commit()
 
-            conn.close()
-            return executed
-
-        ## pass through error, and ensure connection is closed
-        except (Exception, pg.DatabaseError) as error:
-            conn.close()
-            raise error
+        return executed
 
 
 class PostgresFetch(Task):
     """
     Task for fetching results of query from Postgres database.
 
+    Connections are taken from a pool shared by all tasks in the process which connect
+    to the same database, and are kept open between task runs.
+
     Args:
         - db_name (str): name of Postgres database
         - user (str): user name used to authenticate
         - password (str): password used to authenticate
         - host (str): database host address
         - port (int, optional): port used to connect to Postgres database, defaults to 5432 if not provided
-        - fetch (str, optional): one of "one" "many" or "all", used to determine how many results to fetch from executed query
-        - fetch_count (int, optional): if fetch = 'many', determines the number of results to fetch, defaults to 10
+        - fetch (str, optional): one of "one" "many" "all" or "batches", used to determine how many results to fetch from executed query
+        - fetch_count (int, optional): if fetch = 'many', determines the number of results to fetch, defaults to 10;
+            if fetch = 'batches', the number of results in each batch
         - query (str, optional): query to execute against database
         - data (tuple, optional): values to use in query, must be specified using placeholder is query string
         - commit (bool, optional): set to True to commit transaction, defaults to false
+        - max_connections (int, optional): the maximum number of connections the process
+            keeps open to the database; task runs wait for a connection when all of them
+            are in use. Generators of batches open a connection of their own, which
+            isn't counted. Defaults to 10
         - **kwargs (dict, optional): additional keyword arguments to pass to the
             Task constructor
         """
@@ -123,6 +235,7 @@ class PostgresFetch(Task):
         query: str = None,
         data: tuple = None,
         commit: bool = False,
+        max_connections: int = 10,
         **kwargs
     ):
         self.db_name = db_name
@@ -135,6 +248,7 @@ class PostgresFetch(Task):
         self.query = query
         self.data = data
         self.commit = commit
+        self.max_connections = max_connections
         super().__init__(**kwargs)
 
     @defaults_from_attrs("fetch", "fetch_count", "query", "data", "commit")
@@ -149,15 +263,24 @@ class PostgresFetch(Task):
         """
         Task run method. Executes a query against Postgres database and fetches results.
 
+        With `fetch="batches"`, the results are read through a server-side cursor and
+        returned as a generator of lists of `fetch_count` records, so that they never
+        have to fit in memory at once. The generator opens a connection of its own,
+        outside of the pool, which it closes once it is exhausted or closed, so that
+        unconsumed generators don't keep other task runs waiting for a pooled
+        connection. It can't be serialized, so it should be consumed by downstream
+        tasks in the same process and the task shouldn't be checkpointed.
+
         Args:
-            - fetch (str, optional): one of "one" "many" or "all", used to determine how many results to fetch from executed query
-            - fetch_count (int, optional): if fetch = 'many', determines the number of results to fetch, defaults to 10
+            - fetch (str, optional): one of "one" "many" "all" or "batches", used to determine how many results to fetch from executed query
+            - fetch_count (int, optional): if fetch = 'many', determines the number of results to fetch, defaults to 10;
+                if fetch = 'batches', the number of results in each batch
             - query (str, optional): query to execute against database
             - data (tuple, optional): values to use in query, must be specified using placeholder is query string
             - commit (bool, optional): set to True to commit transaction, defaults to false
 
         Returns:
-            - records (tuple or list of tuples): records from provided query
+            - records (tuple, list of tuples or generator of lists of tuples): records from provided query
 
         Raises:
             - ValueError: if query parameter is None or a blank string
@@ -166,24 +289,20 @@ class PostgresFetch(Task):
         if not query:
             raise ValueError("A query string must be provided")
 
-        if fetch not in {"one", "many", "all"}:
+        if fetch not in {"one", "many", "all", "batches"}:
             raise ValueError(
-                "The 'fetch' parameter must be one of the following - ('one', 'many', 'all')"
+                "The 'fetch' parameter must be one of the following - ('one', 'many', 'all', 'batches')"
             )
 
-        ## connect to database, open cursor
-        ## allow psycopg2 to pass through any exceptions raised
-        conn = pg.connect(
-            dbname=self.db_name,
-            user=self.user,
-            password=self.password,
-            host=self.host,
-            port=self.port,
-        )
+        if fetch == "batches":
+            batches = self._fetch_batches(query, data, fetch_count, commit)
+            # run the query now, so that its errors are raised by this task
+            next(batches)
+            return batches
 
-        ## try to execute query
+        ## allow psycopg2 to pass through any exceptions raised
         ## context manager automatically rolls back failed transactions
-        try:
+        with _connection(self) as conn:
             with conn:
                 with conn.cursor() as cursor:
                     cursor.execute(query=query, vars=data)
@@ -199,10 +318,220 @@ class PostgresFetch(Task):
                     if commit:
                         conn.commit()
 
-            conn.close()
-            return records
+        return records
 
-        ## pass through error, and ensure connection is closed
-        except (Exception, pg.DatabaseError) as error:
+    def _fetch_batches(
+        self, query: str, data: tuple, batch_size: int, commit: bool
+    ) -> Iterator[List[tuple]]:
+        # the generator may outlive any number of other task runs, so it doesn't take a
+        # connection from the pool
+        conn = pg.connect(_dsn(self))
+        try:
+            with conn:
+                name = "prefect_{}".format(uuid.uuid4().hex)
+                with conn.cursor(name=name) as cursor:
+                    cursor.itersize = batch_size
+                    cursor.execute(query=query, vars=data)
+                    yield  # type: ignore
+                    while True:
+                        records = cursor.fetchmany(batch_size)
+                        if not records:
+                            break
+                        yield records
+                if commit:
+                    conn.commit()
+        finally:
             conn.close()
-            raise error
+
+
+class _RowReader:
+    """
+    A file-like object which reads rows in Postgres' text `COPY` format, writing them as
+    they are read.
+    """
+
+    def __init__(self, rows: Iterable[Iterable[Any]]) -> None:
+        self._rows = iter(rows)
+        self._buffer = ""
+
+    @staticmethod
+    def _field(value: Any) -> str:
+        if value is None:
+            return "\\N"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return "\\\\x" + bytes(value).hex()
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
+    def read(self, size: int = -1) -> str:
+        lines = [self._buffer]
+        length = len(self._buffer)
+        for row in self._rows:
+            line = "\t".join(map(self._field, row)) + "\n"
+            lines.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = "".join(lines)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size: int = -1) -> str:
+        return self.read(size)
+
+
+class PostgresCopy(Task):
+    """
+    Task for bulk loading data into, or exporting data from, a Postgres table with
+    `COPY`, which is much faster than inserting or selecting rows with queries.
+
+    Connections are taken from a pool shared by all tasks in the process which connect
+    to the same database, and are kept open between task runs.
+
+    Args:
+        - db_name (str): name of Postgres database
+        - user (str): user name used to authenticate
+        - password (str): password used to authenticate
+        - host (str): database host address
+        - port (int, optional): port used to connect to Postgres database, defaults to 5432 if not provided
+        - table (str, optional): the table to copy data into or out of, optionally
+            qualified with its schema
+        - columns (List[str], optional): the columns of the table to copy; defaults to
+            all of them
+        - direction (str, optional): "from" to load data into the table, or "to" to
+            export it; defaults to "from"
+        - format (str, optional): the format of the data, one of "csv", "text" or
+            "binary"; defaults to "csv"
+        - query (str, optional): when exporting data, a query whose results are exported
+            instead of a table
+        - max_connections (int, optional): the maximum number of connections the process
+            keeps open to the database; task runs wait for a connection when all of them
+            are in use. Defaults to 10
+        - **kwargs (dict, optional): additional keyword arguments to pass to the
+            Task constructor
+    """
+
+    def __init__(
+        self,
+        db_name: str,
+        user: str,
+        password: str,
+        host: str,
+        port: int = 5432,
+        table: str = None,
+        columns: List[str] = None,
+        direction: str = "from",
+        format: str = "csv",
+        query: str = None,
+        max_connections: int = 10,
+        **kwargs
+    ):
+        self.db_name = db_name
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.table = table
+        self.columns = columns
+        self.direction = direction
+        self.format = format
+        self.query = query
+        self.max_connections = max_connections
+        super().__init__(**kwargs)
+
+    @defaults_from_attrs("table", "columns", "direction", "format", "query")
+    def run(
+        self,
+        data: Any = None,
+        table: str = None,
+        columns: List[str] = None,
+        direction: str = "from",
+        format: str = "csv",
+        query: str = None,
+    ):
+        """
+        Task run method. Copies data into or out of a Postgres table.
+
+        Args:
+            - data (Any, optional): when loading data, the data to load: a file object,
+                `str` or `bytes` in the given format, or an iterable of rows, which are
+                streamed to the database in the text format regardless of `format`.
+                When exporting data, an optional file object to write it to
+            - table (str, optional): the table to copy data into or out of, optionally
+                qualified with its schema
+            - columns (List[str], optional): the columns of the table to copy; defaults
+                to all of them
+            - direction (str, optional): "from" to load data into the table, or "to" to
+                export it; defaults to "from"
+            - format (str, optional): the format of the data, one of "csv", "text" or
+                "binary"; defaults to "csv"
+            - query (str, optional): when exporting data, a query whose results are
+                exported instead of a table
+
+        Returns:
+            - int or bytes: the number of rows copied, or the exported data if no file
+                object was given to write it to
+
+        Raises:
+            - ValueError: if the parameters don't describe a copy
+            - DatabaseError: if exception occurs when copying the data
+        """
+        if direction not in {"from", "to"}:
+            raise ValueError(
+                "The 'direction' parameter must be one of the following - ('from', 'to')"
+            )
+        if format not in {"csv", "text", "binary"}:
+            raise ValueError(
+                "The 'format' parameter must be one of the following - ('csv', 'text', 'binary')"
+            )
+        if query and direction == "from":
+            raise ValueError("Data can only be copied from a query when exporting it")
+        if not table and not query:
+            raise ValueError("A table or query must be provided")
+        if direction == "from" and data is None:
+            raise ValueError("Data must be provided to copy into a table")
+
+        if direction == "from":
+            if isinstance(data, str):
+                data = io.StringIO(data)
+            elif isinstance(data, (bytes, bytearray, memoryview)):
+                data = io.BytesIO(data)
+            elif not hasattr(data, "read"):
+                data, format = _RowReader(data), "text"
+
+        if query:
+            target = sql.SQL("({})").format(sql.SQL(query))
+        else:
+            target = sql.Identifier(*table.split("."))  # type: ignore
+            if columns:
+                target = sql.SQL("{} ({})").format(
+                    target, sql.SQL(", ").join(map(sql.Identifier, columns))
+                )
+        statement = sql.SQL("COPY {} {} WITH (FORMAT {})").format(
+            target,
+            sql.SQL("FROM STDIN" if direction == "from" else "TO STDOUT"),
+            sql.SQL(format),
+        )
+
+        output = None
+        if direction == "to" and data is None:
+            data = output = io.BytesIO()
+
+        ## allow psycopg2 to pass through any exceptions raised
+        ## context manager automatically rolls back failed transactions
+        with _connection(self) as conn:
+            with conn:
+                with conn.cursor() as cursor:
+                    cursor.copy_expert(statement, data)
+                    rowcount = cursor.rowcount
+
+        if output is not None:
+            return output.getvalue()
+        return rowcount
@@ -4,7 +4,14 @@ the redis-py library.
 """
 
 try:
-    from prefect.tasks.redis.redis_tasks import RedisSet, RedisGet, RedisExecute
+    from prefect.tasks.redis.redis_tasks import (
+        RedisSet,
+        RedisGet,
+        RedisExecute,
+        RedisMSet,
+        RedisMGet,
+        RedisPipeline,
+    )
 except ImportError:
     raise ImportError(
         'Using `prefect.tasks.redis` requires Prefect to be installed with the "redis" extra.'
@@ -1,3 +1,8 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, List
+
 import redis
 
 from prefect import Task
@@ -5,10 +10,68 @@ from prefect.client import Secret
 from prefect.utilities.tasks import defaults_from_attrs
 
 
+_clients = {}  # type: Dict[Hashable, redis.Redis]
+_clients_lock = threading.Lock()
+
+
+def _get_client(task: Any) -> redis.Redis:
+    """
+    Returns the Redis client of this process for a task's host, database, password secret
+    and connection parameters. Each client keeps a pool of connections, so task runs
+    against the same database reuse each other's connections, and the secret is read
+    only when the client is created.
+    """
+    params = task.redis_connection_params
+    key = (
+        task.host,
+        task.port,
+        task.db,
+        task.password_secret,
+        tuple(sorted(params.items())),
+        os.getpid(),
+    )  # type: Hashable
+    try:
+        hash(key)
+    except TypeError:
+        key = None
+
+    with _clients_lock:
+        client = _clients.get(key)
+    if client is None:
+        client = redis.Redis(
+            host=task.host,
+            port=task.port,
+            db=task.db,
+            password=Secret(task.password_secret).get(),
+            **params
+        )
+        if key is not None:
+            with _clients_lock:
+                client = _clients.setdefault(key, client)
+    return client
+
+
+@contextmanager
+def _client(task: Any) -> Iterator[redis.Redis]:
+    client = _get_client(task)
+    try:
+        yield client
+    except redis.exceptions.AuthenticationError:
+        # the password may have changed, so the next run reads the secret again
+        with _clients_lock:
+            for key, cached in list(_clients.items()):
+                if cached is client:
+                    del _clients[key]
+        raise
+
+
 class RedisSet(Task):
     """
     Task for setting a Redis key-value pair.
 
+    Connections are taken from a pool shared by all Redis tasks in the process which
+    connect to the same database; to set many keys at once use `RedisMSet`.
+
     Args:
         - host (str, optional): name of Redis host, defaults to 'localhost'
         - port (int, optional): Redis port, defaults to 6379
@@ -92,19 +155,10 @@ class RedisSet(Task):
         if None in (redis_key, redis_val):
             raise ValueError("redis_key and redis_val must be provided")
 
-        ## connect to redis
-        password = Secret(self.password_secret).get()
-        connection = redis.Redis(
-            host=self.host,
-            port=self.port,
-            db=self.db,
-            password=password,
-            **self.redis_connection_params
-        )
-
-        result = connection.set(
-            name=redis_key, value=redis_val, ex=ex, px=px, nx=nx, xx=xx
-        )
+        with _client(self) as connection:
+            result = connection.set(
+                name=redis_key, value=redis_val, ex=ex, px=px, nx=nx, xx=xx
+            )
 
         return result
 
@@ -113,6 +167,9 @@ class RedisGet(Task):
     """
     Task for getting a value based on key from a Redis connection.
 
+    Connections are taken from a pool shared by all Redis tasks in the process which
+    connect to the same database; to get many keys at once use `RedisMGet`.
+
     Args:
         - host (str, optional): name of Redis host, defaults to 'localhost'
         - port (int, optional): Redis port, defaults to 6379
@@ -162,17 +219,8 @@ class RedisGet(Task):
         if not redis_key:
             raise ValueError("redis_key must be provided")
 
-        ## connect to redis
-        password = Secret(self.password_secret).get()
-        connection = redis.Redis(
-            host=self.host,
-            port=self.port,
-            db=self.db,
-            password=password,
-            **self.redis_connection_params
-        )
-
-        result = connection.get(name=redis_key)
+        with _client(self) as connection:
+            result = connection.get(name=redis_key)
 
         return result
 
@@ -181,6 +229,9 @@ class RedisExecute(Task):
     """
     Task for executing a command against a Redis connection
 
+    Connections are taken from a pool shared by all Redis tasks in the process which
+    connect to the same database; to send many commands at once use `RedisPipeline`.
+
     Args:
         - host (str, optional): name of Redis host, defaults to 'localhost'
         - port (int, optional): Redis port, defaults to 6379
@@ -229,16 +280,272 @@ class RedisExecute(Task):
         if not redis_cmd:
             raise ValueError("A redis command must be specified")
 
-        ## connect to redis
-        password = Secret(self.password_secret).get()
-        connection = redis.Redis(
-            host=self.host,
-            port=self.port,
-            db=self.db,
-            password=password,
-            **self.redis_connection_params
-        )
-
-        result = connection.execute_command(redis_cmd)
+        with _client(self) as connection:
+            result = connection.execute_command(redis_cmd)
 
         return result
+
+
+class RedisMSet(Task):
+    """
+    Task for setting many Redis key-value pairs in a single round trip.
+
+    Pairs are sent with `MSET` in batches of `batch_size`, or with one `SET` per pair if
+    any of `ex`, `px`, `nx` or `xx` is given, and all commands are sent together in a
+    pipeline.
+
+    Args:
+        - host (str, optional): name of Redis host, defaults to 'localhost'
+        - port (int, optional): Redis port, defaults to 6379
+        - db (int, optional): redis database index, defaults to 0
+        - password_secret (str, optional): the name of the Prefect Secret
+            that stores your Redis credentials
+        - redis_keys (list, optional): Redis keys to be set, can be provided at initialization or runtime
+        - redis_vals (list, optional): Redis vals to be set, one for each key, can be provided at
+            initialization or runtime
+        - redis_connection_params (dict, optional): key-value pairs passed to the redis.Redis connection
+            initializer
+        - ex (int, optional): if provided, sets an expire flag, in seconds, on each key set
+        - px (int, optional): if provided, sets an expire flag, in milliseconds, on each key set
+        - nx (int, optional): if set to True, set each key only if it does not exist, defaults to False
+        - xx (int, optional): if set to True, set each key only if it already exists, defaults to False
+        - batch_size (int, optional): the number of pairs sent in each `MSET` command,
+            defaults to 1000
+        - **kwargs (dict, optional): additional keyword arguments to pass to the
+            Task constructor
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password_secret: str = "REDIS_PASSWORD",
+        redis_keys: list = None,
+        redis_vals: list = None,
+        redis_connection_params: dict = None,
+        ex: int = None,
+        px: int = None,
+        nx: bool = False,
+        xx: bool = False,
+        batch_size: int = 1000,
+        **kwargs
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password_secret = password_secret
+        self.redis_connection_params = redis_connection_params or {}
+
+        self.redis_keys = redis_keys
+        self.redis_vals = redis_vals
+        self.ex = ex
+        self.px = px
+        self.nx = nx
+        self.xx = xx
+        self.batch_size = batch_size
+        super().__init__(**kwargs)
+
+    @defaults_from_attrs("redis_keys", "redis_vals", "ex", "px", "nx", "xx")
+    def run(
+        self,
+        redis_keys: list = None,
+        redis_vals: list = None,
+        ex: int = None,
+        px: int = None,
+        nx: bool = False,
+        xx: bool = False,
+    ) -> List[bool]:
+        """
+        Task run method. Sets many Redis key-value pairs.
+
+        Args:
+            - redis_keys (list, optional): Redis keys to be set, can be provided at initialization or runtime
+            - redis_vals (list, optional): Redis vals to be set, one for each key, can be provided at
+                initialization or runtime
+            - ex (int, optional): if provided, sets an expire flag, in seconds, on each key set
+            - px (int, optional): if provided, sets an expire flag, in milliseconds, on each key set
+            - nx (int, optional): if set to True, set each key only if it does not exist, defaults to False
+            - xx (int, optional): if set to True, set each key only if it already exists, defaults to False
+
+        Returns:
+            - list: the status of the set operation for each key
+
+        Raises:
+            - ValueError: if redis_keys or redis_vals is not provided, or if their lengths differ
+        """
+        if None in (redis_keys, redis_vals):
+            raise ValueError("redis_keys and redis_vals must be provided")
+        redis_keys, redis_vals = list(redis_keys), list(redis_vals)  # type: ignore
+        if len(redis_keys) != len(redis_vals):
+            raise ValueError("redis_keys and redis_vals must have the same length")
+        if not redis_keys:
+            return []
+
+        with _client(self) as connection:
+            pipeline = connection.pipeline(transaction=False)
+            if ex or px or nx or xx:
+                for key, val in zip(redis_keys, redis_vals):
+                    pipeline.set(name=key, value=val, ex=ex, px=px, nx=nx, xx=xx)
+                return [bool(result) for result in pipeline.execute()]
+
+            for start in range(0, len(redis_keys), self.batch_size):
+                end = start + self.batch_size
+                pipeline.mset(dict(zip(redis_keys[start:end], redis_vals[start:end])))
+            pipeline.execute()
+        return [True] * len(redis_keys)
+
+
+class RedisMGet(Task):
+    """
+    Task for getting the values of many keys from a Redis connection in a single round trip.
+
+    Keys are sent with `MGET` in batches of `batch_size`, and all batches are sent
+    together in a pipeline.
+
+    Args:
+        - host (str, optional): name of Redis host, defaults to 'localhost'
+        - port (int, optional): Redis port, defaults to 6379
+        - db (int, optional): redis database index, defaults to 0
+        - password_secret (str, optional): the name of the Prefect Secret
+            that stores your Redis password
+        - redis_connection_params (dict, optional): key-value pairs passed to the redis.Redis connection
+            initializer
+        - redis_keys (list, optional): Redis keys to get values, can be provided at initialization or runtime
+        - batch_size (int, optional): the number of keys sent in each `MGET` command,
+            defaults to 1000
+        - **kwargs (dict, optional): additional keyword arguments to pass to the
+            Task constructor
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password_secret: str = "REDIS_PASSWORD",
+        redis_connection_params: dict = None,
+        redis_keys: list = None,
+        batch_size: int = 1000,
+        **kwargs
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password_secret = password_secret
+        self.redis_connection_params = redis_connection_params or {}
+
+        self.redis_keys = redis_keys
+        self.batch_size = batch_size
+        super().__init__(**kwargs)
+
+    @defaults_from_attrs("redis_keys")
+    def run(self, redis_keys: list = None) -> list:
+        """
+        Task run method.
+
+        Args:
+            - redis_keys (list, optional): Redis keys to get values, can be provided at initialization or runtime
+
+        Returns:
+            - list: the value associated with each key, or None for keys which do not exist
+
+        Raises:
+            - ValueError: if redis_keys is not provided
+        """
+        if redis_keys is None:
+            raise ValueError("redis_keys must be provided")
+        redis_keys = list(redis_keys)
+        if not redis_keys:
+            return []
+
+        with _client(self) as connection:
+            pipeline = connection.pipeline(transaction=False)
+            for start in range(0, len(redis_keys), self.batch_size):
+                pipeline.mget(redis_keys[start : start + self.batch_size])
+            batches = pipeline.execute()
+        return [value for batch in batches for value in batch]
+
+
+class RedisPipeline(Task):
+    """
+    Task for executing many commands against a Redis connection in a single round trip.
+
+    Args:
+        - host (str, optional): name of Redis host, defaults to 'localhost'
+        - port (int, optional): Redis port, defaults to 6379
+        - db (int, optional): redis database index, defaults to 0
+        - password_secret (str, optional): the name of the Prefect Secret
+            that stores your Redis credentials
+        - redis_connection_params (dict, optional): key-value pairs passed to the redis.Redis connection
+            initializer
+        - redis_cmds (list, optional): Redis commands to execute, each either a string such as
+            `"GET foo"` or a list of the command name and its arguments, must be provided at
+            initialization or runtime
+        - transaction (bool, optional): whether to wrap the commands in `MULTI` / `EXEC`
+            so that they are executed atomically, defaults to False
+        - raise_on_error (bool, optional): whether to raise the first error returned by a
+            command; if False, errors are returned in place of results. Defaults to True
+        - **kwargs (dict, optional): additional keyword arguments to pass to the
+            Task constructor
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password_secret: str = "REDIS_PASSWORD",
+        redis_connection_params: dict = None,
+        redis_cmds: list = None,
+        transaction: bool = False,
+        raise_on_error: bool = True,
+        **kwargs
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password_secret = password_secret
+        self.redis_connection_params = redis_connection_params or {}
+
+        self.redis_cmds = redis_cmds
+        self.transaction = transaction
+        self.raise_on_error = raise_on_error
+        super().__init__(**kwargs)
+
+    @defaults_from_attrs("redis_cmds", "transaction", "raise_on_error")
+    def run(
+        self,
+        redis_cmds: list = None,
+        transaction: bool = False,
+        raise_on_error: bool = True,
+    ) -> list:
+        """
+        Task run method. Executes many commands against a Redis connection.
+
+        Args:
+            - redis_cmds (list, optional): Redis commands to execute, each either a string such as
+                `"GET foo"` or a list of the command name and its arguments, must be provided at
+                initialization or runtime
+            - transaction (bool, optional): whether to wrap the commands in `MULTI` / `EXEC`
+                so that they are executed atomically, defaults to False
+            - raise_on_error (bool, optional): whether to raise the first error returned by a
+                command; if False, errors are returned in place of results. Defaults to True
+
+        Returns:
+            - list: the result of each command
+
+        Raises:
+            - ValueError: if redis_cmds is not provided
+        """
+        if not redis_cmds:
+            raise ValueError("A list of redis commands must be specified")
+
+        with _client(self) as connection:
+            pipeline = connection.pipeline(transaction=transaction)
+            for cmd in redis_cmds:
+                if isinstance(cmd, str):
+                    pipeline.execute_command(cmd)
+                else:
+                    pipeline.execute_command(*cmd)
+            return pipeline.execute(raise_on_error=raise_on_error)
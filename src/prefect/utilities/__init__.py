@@ -4,6 +4,7 @@ import prefect.utilities.configuration
 import prefect.utilities.datetimes
 import prefect.utilities.exceptions
 import prefect.utilities.graphql
+import prefect.utilities.hashing
 import prefect.utilities.notifications
 import prefect.utilities.serialization
 import prefect.utilities.tasks
@@ -1,11 +1,19 @@
+import asyncio
+import atexit
 import datetime
+import math
+import multiprocessing
+import os
 import signal
 import threading
+import time
+import warnings
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeout
 from functools import wraps
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
 
+import cloudpickle
 import dask
 import dask.bag
 
@@ -19,12 +27,152 @@ if TYPE_CHECKING:
 StateList = Union["State", List["State"]]
 
 
-class Heartbeat(threading.Timer):
-    def run(self) -> None:
-        self.finished.wait(self.interval)  # type: ignore
-        while not self.finished.is_set():  # type: ignore
-            self.function(*self.args, **self.kwargs)  # type: ignore
-            self.finished.wait(self.interval)  # type: ignore
+class HeartbeatRegistry:
+    """
+    Calls the `_heartbeat` method of every registered runner on the runner's interval,
+    from a single background thread per process, instead of one timer thread per runner.
+
+    Runners which heartbeat through Prefect Cloud can defer their heartbeat with
+    `defer_heartbeat` when called from the registry's thread; deferred heartbeats are sent
+    together, with one `Client.update_heartbeats` request, once every due runner has been
+    called.
+    """
+
+    def __init__(self) -> None:
+        self._runners = {}  # type: Dict[int, list]
+        self._condition = threading.Condition()
+        self._thread = None  # type: Optional[threading.Thread]
+        self._pid = os.getpid()
+        self._deferred = None  # type: Optional[Dict[tuple, Dict[str, Any]]]
+
+    def register(self, runner: Any, interval: float) -> None:
+        """
+        Starts heartbeating a runner every `interval` seconds. The first heartbeat is sent
+        between a half and one and a half intervals from now.
+
+        Args:
+            - runner (Runner): the runner
+            - interval (float): the number of seconds between heartbeats
+        """
+        # heartbeats are due on a grid of multiples of the interval, so that runners
+        # registered at different times are still heartbeat together
+        first = math.ceil((time.monotonic() + interval / 2) / interval) * interval
+        with self._condition:
+            self._runners[id(runner)] = [runner, interval, first]
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="PrefectHeartbeat", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def unregister(self, runner: Any) -> None:
+        """
+        Stops heartbeating a runner. Doesn't wait for a heartbeat of the runner which is
+        already being called, so one may still finish after this returns.
+
+        Args:
+            - runner (Runner): the runner
+        """
+        with self._condition:
+            self._runners.pop(id(runner), None)
+
+    def defer(self, client: Any, kind: str, run_id: Optional[str]) -> bool:
+        """
+        Adds a heartbeat to the batch being collected by the registry's thread.
+
+        Args:
+            - client (Client): the client to send the heartbeat with
+            - kind (str): either `"flow_run"` or `"task_run"`
+            - run_id (str): the id of the flow or task run
+
+        Returns:
+            - bool: `True` if the heartbeat was deferred; `False` if it wasn't called from
+                the registry's thread (or has no run id) and should be sent right away
+        """
+        if (
+            run_id is None
+            or self._deferred is None
+            or threading.current_thread() is not self._thread
+        ):
+            return False
+        key = (client.graphql_server, client.token)
+        batch = self._deferred.setdefault(
+            key, dict(client=client, flow_run=[], task_run=[])
+        )
+        batch[kind].append(run_id)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                due = [entry for entry in self._runners.values() if entry[2] <= now]
+                if not due:
+                    next_due = min((e[2] for e in self._runners.values()), default=None)
+                    self._condition.wait(None if next_due is None else next_due - now)
+                    continue
+
+                for entry in due:
+                    while entry[2] <= now:
+                        entry[2] += entry[1]
+
+            # heartbeats are called without the lock, so that a slow heartbeat doesn't
+            # block runners registering and unregistering
+            self._deferred = {}
+            for runner, _, _ in due:
+                try:
+                    runner._heartbeat()
+                except Exception:
+                    pass
+            batches, self._deferred = self._deferred, None
+
+            for batch in batches.values():
+                try:
+                    batch["client"].update_heartbeats(
+                        flow_run_ids=batch["flow_run"], task_run_ids=batch["task_run"]
+                    )
+                except Exception:
+                    warnings.warn(
+                        "Heartbeat failed for {} runs".format(
+                            len(batch["flow_run"]) + len(batch["task_run"])
+                        )
+                    )
+
+
+_heartbeat_registry = None  # type: Optional[HeartbeatRegistry]
+_heartbeat_registry_lock = threading.Lock()
+
+
+def get_heartbeat_registry() -> HeartbeatRegistry:
+    """
+    Returns the process-wide `HeartbeatRegistry`, creating it on first use (or in a new
+    process, after a fork).
+
+    Returns:
+        - HeartbeatRegistry: the shared registry
+    """
+    global _heartbeat_registry
+    with _heartbeat_registry_lock:
+        if _heartbeat_registry is None or _heartbeat_registry._pid != os.getpid():
+            _heartbeat_registry = HeartbeatRegistry()
+        return _heartbeat_registry
+
+
+def defer_heartbeat(client: Any, kind: str, run_id: Optional[str]) -> bool:
+    """
+    Defers a heartbeat to the batch sent by the process-wide `HeartbeatRegistry`, when
+    called from the registry's thread. See `HeartbeatRegistry.defer`.
+
+    Args:
+        - client (Client): the client to send the heartbeat with
+        - kind (str): either `"flow_run"` or `"task_run"`
+        - run_id (str): the id of the flow or task run
+
+    Returns:
+        - bool: whether the heartbeat was deferred
+    """
+    return get_heartbeat_registry().defer(client, kind, run_id)
 
 
 def run_with_heartbeat(
@@ -32,35 +180,260 @@ def run_with_heartbeat(
 ) -> Callable[..., "prefect.engine.state.State"]:
     """
     Utility decorator for running class methods with a heartbeat.  The class should implement
-    `self._heartbeat` with no arguments.
+    `self._heartbeat` with no arguments, which is called once right away and then every
+    `cloud.heartbeat_interval` seconds by the process-wide `HeartbeatRegistry`.
     """
 
     @wraps(runner_method)
     def inner(
         self: "prefect.engine.runner.Runner", *args: Any, **kwargs: Any
     ) -> "prefect.engine.state.State":
+        registry = get_heartbeat_registry()
         try:
-            timer = Heartbeat(prefect.config.cloud.heartbeat_interval, self._heartbeat)
-            timer.daemon = True
             try:
                 self._heartbeat()
             except:
                 pass
-            timer.start()
+            registry.register(self, prefect.config.cloud.heartbeat_interval)
             return runner_method(self, *args, **kwargs)
         finally:
-            timer.cancel()
-            timer.join()
+            registry.unregister(self)
 
     return inner
 
 
+class TimeoutPool:
+    """
+    A bounded pool of threads, shared by every call to `timeout_handler` in a process,
+    for running functions with a timeout. Also keeps track of how busy the pool is; see
+    `stats()`.
+
+    Since a thread can't be stopped, a function which times out keeps its thread until it
+    returns; functions which may never return should be run with the `"process"` timeout
+    mode instead. The timeout of a call includes any time spent waiting for a free thread,
+    and a call which times out before it starts is never run.
+
+    Args:
+        - max_workers (int): the maximum number of threads in the pool
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="PrefectTimeout"
+        )
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._counts = dict(
+            active=0,
+            queued=0,
+            peak_active=0,
+            submitted=0,
+            saturated=0,
+            timed_out=0,
+            active_processes=0,
+        )
+        self._warned = False
+
+    def run(self, fn: Callable, timeout: float = None) -> Any:
+        """
+        Runs `fn()` in one of the pool's threads, waiting up to `timeout` seconds for it
+        to finish.
+
+        Args:
+            - fn (callable): the function to run
+            - timeout (float, optional): the number of seconds to wait for `fn` to finish
+
+        Returns:
+            - the result of `fn()`
+
+        Raises:
+            - TimeoutError: if `fn` doesn't finish within the allowed timeout
+        """
+
+        def job() -> Any:
+            with self._lock:
+                self._counts["queued"] -= 1
+                self._counts["active"] += 1
+                self._counts["peak_active"] = max(
+                    self._counts["peak_active"], self._counts["active"]
+                )
+            try:
+                return fn()
+            finally:
+                with self._lock:
+                    self._counts["active"] -= 1
+
+        with self._lock:
+            saturated = (
+                self._counts["active"] + self._counts["queued"] >= self.max_workers
+            )
+            self._counts["submitted"] += 1
+            self._counts["queued"] += 1
+            warn = saturated and not self._warned
+            if saturated:
+                self._counts["saturated"] += 1
+                self._warned = True
+
+        if warn:
+            prefect.utilities.logging.get_logger("TimeoutPool").warning(
+                "All {} threads for running functions with a timeout are busy; "
+                "consider raising `engine.timeouts.max_workers`.".format(
+                    self.max_workers
+                )
+            )
+
+        fut = self._executor.submit(job)
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._counts["timed_out"] += 1
+                if fut.cancel():
+                    self._counts["queued"] -= 1
+            raise TimeoutError("Execution timed out.")
+
+    def run_in_process(self, fn: Callable, timeout: float = None) -> Any:
+        """
+        Runs `fn()` in a new process, which is killed if it doesn't finish within
+        `timeout` seconds. `fn` and its result are serialized with `cloudpickle`.
+
+        Args:
+            - fn (callable): the function to run
+            - timeout (float, optional): the number of seconds to wait for `fn` to finish
+
+        Returns:
+            - the result of `fn()`
+
+        Raises:
+            - TimeoutError: if `fn` doesn't finish within the allowed timeout
+        """
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_run_in_child, args=(cloudpickle.dumps(fn), sender)
+        )
+        with self._lock:
+            self._counts["submitted"] += 1
+            self._counts["active_processes"] += 1
+        try:
+            process.start()
+            sender.close()
+            if not receiver.poll(timeout):
+                with self._lock:
+                    self._counts["timed_out"] += 1
+                process.terminate()
+                raise TimeoutError("Execution timed out.")
+            try:
+                succeeded, value = cloudpickle.loads(receiver.recv_bytes())
+            except EOFError:
+                process.join()
+                raise RuntimeError(
+                    "Process running {} exited with code {}".format(
+                        getattr(fn, "__name__", fn), process.exitcode
+                    )
+                )
+        finally:
+            receiver.close()
+            process.join()
+            with self._lock:
+                self._counts["active_processes"] -= 1
+
+        if not succeeded:
+            raise value
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Reports how busy the pool is.
+
+        Returns:
+            - Dict[str, int]: `max_workers`; the number of `active` (running) and `queued`
+                (waiting for a thread) calls; `peak_active`, the most calls ever running
+                at once; the number of calls `submitted`, of calls which found the pool
+                `saturated` (every thread busy or spoken for) and of calls which
+                `timed_out`; and the number of `active_processes` in process mode
+        """
+        with self._lock:
+            return dict(self._counts, max_workers=self.max_workers)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shuts the pool down, cancelling queued calls.
+
+        Args:
+            - wait (bool, optional): whether to wait for running calls to finish;
+                defaults to `True`
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_timeout_pool = None  # type: Optional[TimeoutPool]
+_timeout_pool_lock = threading.Lock()
+
+
+def get_timeout_pool() -> TimeoutPool:
+    """
+    Returns the process-wide `TimeoutPool` used by `timeout_handler`, creating it with
+    `engine.timeouts.max_workers` threads on first use (or in a new process, after a fork).
+
+    Returns:
+        - TimeoutPool: the shared pool
+    """
+    global _timeout_pool
+    with _timeout_pool_lock:
+        if _timeout_pool is None or _timeout_pool._pid != os.getpid():
+            _timeout_pool = TimeoutPool(
+                max_workers=prefect.config.engine.timeouts.max_workers
+            )
+        return _timeout_pool
+
+
+@atexit.register
+def shutdown_timeout_pool(wait: bool = False) -> None:
+    """
+    Shuts down the process-wide `TimeoutPool`, if one was created. A new pool is created
+    the next time one is needed. Called automatically when the interpreter exits.
+
+    Args:
+        - wait (bool, optional): whether to wait for running calls to finish; defaults
+            to `False`
+    """
+    global _timeout_pool
+    with _timeout_pool_lock:
+        pool, _timeout_pool = _timeout_pool, None
+    if pool is not None and pool._pid == os.getpid():
+        pool.shutdown(wait=wait)
+
+
+def _run_in_child(payload: bytes, conn: Any) -> None:
+    fn = cloudpickle.loads(payload)
+    try:
+        result = (True, fn())
+    except Exception as exc:
+        result = (False, exc)
+    try:
+        data = cloudpickle.dumps(result)
+    except Exception as exc:
+        data = cloudpickle.dumps((False, exc))
+    conn.send_bytes(data)
+    conn.close()
+
+
 def timeout_handler(
     fn: Callable, *args: Any, timeout: int = None, **kwargs: Any
 ) -> Any:
     """
     Helper function for implementing timeouts on function executions.
-    Implemented via `concurrent.futures.ThreadPoolExecutor`.
+
+    Depending on `engine.timeouts.mode`, functions with a timeout are either run in the
+    process-wide pool of threads returned by `get_timeout_pool` (`"thread"`, the
+    default) or in a new process which is killed if the function times out
+    (`"process"`). A thread can't be stopped, so only the `"process"` mode can interrupt
+    a runaway function; it requires the function, its arguments and its result to be
+    serializable with `cloudpickle`.
+
+    Coroutine functions (`async def`) are run to completion on a new event loop in the
+    current thread, and timed out with `asyncio.wait_for`.
 
     Args:
         - fn (callable): the function to execute
@@ -75,20 +448,43 @@ def timeout_handler(
     Raises:
         - TimeoutError: if function execution exceeds the allowed timeout
     """
+    if asyncio.iscoroutinefunction(fn):
+        return run_coroutine(fn(*args, **kwargs), timeout=timeout)
+
     if timeout is None:
         return fn(*args, **kwargs)
 
-    executor = ThreadPoolExecutor()
+    ctx_dict = prefect.context.to_dict()
 
-    def run_with_ctx(*args: Any, _ctx_dict: dict, **kwargs: Any) -> Any:
-        with prefect.context(_ctx_dict):
+    def run_with_ctx() -> Any:
+        with prefect.context(ctx_dict):
             return fn(*args, **kwargs)
 
-    fut = executor.submit(
-        run_with_ctx, *args, _ctx_dict=prefect.context.to_dict(), **kwargs
-    )
+    pool = get_timeout_pool()
+    if prefect.config.engine.timeouts.mode == "process":
+        return pool.run_in_process(run_with_ctx, timeout=timeout)
+    return pool.run(run_with_ctx, timeout=timeout)
+
 
+def run_coroutine(coro: Any, timeout: int = None) -> Any:
+    """
+    Runs a coroutine to completion on a new event loop in the current thread.
+
+    Args:
+        - coro (Coroutine): the coroutine to run
+        - timeout (int, optional): the length of time to allow for execution before
+            raising a `TimeoutError`, represented as an integer in seconds
+
+    Returns:
+        - the result of the coroutine
+
+    Raises:
+        - TimeoutError: if the coroutine doesn't finish within the allowed timeout
+    """
+    loop = asyncio.new_event_loop()
     try:
-        return fut.result(timeout=timeout)
-    except FutureTimeout:
+        return loop.run_until_complete(asyncio.wait_for(coro, timeout))
+    except asyncio.TimeoutError:
         raise TimeoutError("Execution timed out.")
+    finally:
+        loop.close()
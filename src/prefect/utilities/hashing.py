@@ -0,0 +1,163 @@
+"""
+Utilities for computing stable fingerprints of Python objects, for example to look up the
+cached results of a task by the values of its inputs.
+
+Fingerprints are computed by streaming a canonical representation of an object into a
+BLAKE2 hash, without building the representation in memory first, so that they are the
+same in every process and across library versions. Only objects with such a
+representation have a fingerprint: `None`, booleans, numbers, strings, `bytes`-like
+objects, builtin containers of these, NumPy arrays and scalars which don't hold Python
+objects, and pandas objects whose object columns only hold strings. Other objects have
+no fingerprint, and should be compared by equality instead.
+"""
+import hashlib
+import sys
+from typing import Any, Optional
+
+
+class _NoFingerprint(Exception):
+    """
+    Raised while hashing an object which has no canonical representation.
+    """
+
+
+def _new_hasher() -> Any:
+    return hashlib.blake2b(digest_size=32)
+
+
+def _digest(obj: Any) -> bytes:
+    hasher = _new_hasher()
+    _update(hasher, obj)
+    return hasher.digest()
+
+
+def _update_numpy(hasher: Any, obj: Any, np: Any) -> bool:
+    if isinstance(obj, np.generic) and not isinstance(obj, np.object_):
+        item = obj.item()
+        if not isinstance(item, np.generic):
+            # NumPy scalars compare equal to the Python scalars they hold
+            _update(hasher, item)
+            return True
+    if isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+        header = "a{}:{}:".format(obj.dtype.str, obj.shape).encode()
+        hasher.update(header)
+        if obj.size:
+            data = np.ascontiguousarray(obj).reshape(-1).view(np.uint8)
+            hasher.update(memoryview(data))
+        return True
+    return False
+
+
+def _has_canonical_values(values: Any, pd: Any) -> bool:
+    # pandas hashes the cells of object columns by their `str`, which only identifies
+    # strings
+    if isinstance(values, pd.MultiIndex):
+        return all(_has_canonical_values(level, pd) for level in values.levels)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return _has_canonical_values(values.dtype.categories, pd)
+    if values.dtype == object:
+        return pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty")
+    return True
+
+
+def _update_pandas(hasher: Any, obj: Any, pd: Any) -> bool:
+    if not isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        return False
+    if isinstance(obj, pd.DataFrame):
+        columns = [obj.iloc[:, i] for i in range(obj.shape[1])] + [obj.index]
+    elif isinstance(obj, pd.Series):
+        columns = [obj, obj.index]
+    else:
+        columns = [obj]
+    if not all(_has_canonical_values(c, pd) for c in columns):
+        raise _NoFingerprint()
+    try:
+        rows = pd.util.hash_pandas_object(obj, index=not isinstance(obj, pd.Index))
+    except TypeError:
+        raise _NoFingerprint()
+    if isinstance(obj, pd.DataFrame):
+        hasher.update(b"pd:frame:")
+        _update(hasher, [str(t) for t in obj.dtypes])
+        _update(hasher, list(obj.columns))
+    elif isinstance(obj, pd.Series):
+        hasher.update(b"pd:series:")
+        _update(hasher, [str(obj.dtype), obj.name])
+    else:
+        hasher.update(b"pd:index:")
+        _update(hasher, [str(obj.dtype), obj.name])
+    _update(hasher, rows.values)
+    return True
+
+
+def _update(hasher: Any, obj: Any) -> None:
+    if obj is None or isinstance(obj, (bool, int)):
+        # booleans and integers compare equal to each other, so they share a fingerprint
+        hasher.update(b"n" + repr(int(obj) if obj is not None else None).encode())
+    elif isinstance(obj, float):
+        if obj.is_integer():
+            hasher.update(b"n" + repr(int(obj)).encode())
+        else:
+            hasher.update(b"f" + repr(float(obj)).encode())
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8", "surrogatepass")
+        hasher.update(b"s%d:" % len(data))
+        hasher.update(data)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        try:
+            view = memoryview(obj)  # type: Any
+            if not view.c_contiguous:
+                # only contiguous buffers can be cast, so strided views are copied
+                view = memoryview(view.tobytes())
+            view = view.cast("B")
+        except (TypeError, ValueError, NotImplementedError):
+            raise _NoFingerprint()
+        hasher.update(b"b%d:" % view.nbytes)
+        hasher.update(view)
+    elif isinstance(obj, dict):
+        items = sorted(_digest(k) + _digest(v) for k, v in obj.items())
+        hasher.update(b"d%d:" % len(items))
+        for item in items:
+            hasher.update(item)
+    elif isinstance(obj, (list, tuple)):
+        hasher.update((b"l%d:" if isinstance(obj, list) else b"t%d:") % len(obj))
+        for item in obj:
+            _update(hasher, item)
+    elif isinstance(obj, (set, frozenset)):
+        elements = sorted(_digest(e) for e in obj)
+        hasher.update(b"e%d:" % len(elements))
+        for element in elements:
+            hasher.update(element)
+    else:
+        # objects of a library which hasn't been imported can't be instances of its types
+        np, pd = sys.modules.get("numpy"), sys.modules.get("pandas")
+        if np is not None and _update_numpy(hasher, obj, np):
+            return
+        if pd is not None and _update_pandas(hasher, obj, pd):
+            return
+        raise _NoFingerprint()
+
+
+def fingerprint(obj: Any) -> Optional[str]:
+    """
+    Computes a fingerprint of an object: a hex digest of a canonical representation of
+    its value, which is the same in every process.
+
+    Dictionaries and sets are fingerprinted independently of their order, and numbers
+    which compare equal (such as `1`, `1.0`, `True` and `numpy.int64(1)`) share a
+    fingerprint. NumPy arrays are fingerprinted by their dtype, shape and data, and
+    pandas objects by their dtypes, labels and `pandas.util.hash_pandas_object`.
+
+    Objects of other types, containers holding them and containers which hold
+    themselves have no fingerprint, since their value has no canonical representation;
+    compare them by equality instead.
+
+    Args:
+        - obj (Any): the object to fingerprint
+
+    Returns:
+        - Optional[str]: the fingerprint of the object, or `None` if it has none
+    """
+    try:
+        return _digest(obj).hex()
+    except (_NoFingerprint, RecursionError):
+        return None
@@ -8,9 +8,12 @@ Note that Prefect Tasks come equipped with their own loggers.  These can be acce
 
 When running locally, log levels and message formatting are set via your Prefect configuration file.
 """
+import json
 import logging
+import queue
+import threading
 import time
-from typing import Any
+from typing import Any, Optional
 
 import pendulum
 
@@ -18,7 +21,22 @@ import prefect
 from prefect.configuration import config
 
 
+_FLUSH = object()
+
+
 class CloudHandler(logging.StreamHandler):
+    """
+    A handler which sends log records to Prefect Cloud.
+
+    Records are put on a bounded queue and sent in batches, with `Client.write_run_logs`,
+    by a background thread: a batch is sent once it has `logging.cloud_batch_size`
+    records, or once its oldest record has waited `logging.cloud_flush_interval` seconds.
+    When the queue is full (`logging.cloud_max_queue_size` records), new records are
+    either dropped (the default) or the logging thread waits for space, depending on
+    `logging.cloud_queue_full_policy`. Pending records are sent when `flush()` is
+    called, which happens at the end of every flow run and when the interpreter exits.
+    """
+
     def __init__(self) -> None:
         super().__init__()
         self.client = None
@@ -29,6 +47,15 @@ class CloudHandler(logging.StreamHandler):
         handler.setFormatter(formatter)
         self.logger.addHandler(handler)
         self.logger.setLevel(config.logging.level)
+        self.batch_size = config.logging.cloud_batch_size
+        self.flush_interval = config.logging.cloud_flush_interval
+        self.block_when_full = config.logging.cloud_queue_full_policy == "block"
+        self.dropped = 0
+        self._queue = queue.Queue(
+            maxsize=config.logging.cloud_max_queue_size
+        )  # type: Any
+        self._thread = None  # type: Optional[threading.Thread]
+        self._thread_lock = threading.Lock()
 
     def emit(self, record) -> None:  # type: ignore
         try:
@@ -37,29 +64,120 @@ class CloudHandler(logging.StreamHandler):
             if self.client is None:
                 self.client = Client()  # type: ignore
 
-            assert isinstance(self.client, Client)  # mypy asser
-
             record_dict = record.__dict__.copy()
-            flow_run_id = prefect.context.get("flow_run_id", None)
-            task_run_id = prefect.context.get("task_run_id", None)
-            timestamp = pendulum.from_timestamp(record_dict.get("created", time.time()))
-            name = record_dict.get("name", None)
-            message = record_dict.get("message", None)
-            level = record_dict.get("levelname", None)
-
-            self.client.write_run_log(
-                flow_run_id=flow_run_id,
-                task_run_id=task_run_id,
-                timestamp=timestamp,
-                name=name,
-                message=message,
-                level=level,
+            if record.exc_info:
+                record_dict["exc_info"] = logging.Formatter().formatException(
+                    record.exc_info
+                )
+            # records may hold arbitrary objects, such as their arguments, which are sent
+            # as their string representations
+            record_dict = json.loads(json.dumps(record_dict, default=str))
+            log = dict(
+                flowRunId=prefect.context.get("flow_run_id", None),
+                taskRunId=prefect.context.get("task_run_id", None),
+                timestamp=pendulum.from_timestamp(
+                    record_dict.get("created", time.time())
+                ).isoformat(),
+                name=record_dict.get("name", None),
+                message=record.getMessage(),
+                level=record_dict.get("levelname", None),
                 info=record_dict,
             )
+            self._start()
+            if self.block_when_full:
+                self._queue.put(log)
+            else:
+                self._queue.put_nowait(log)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                self.logger.warning(
+                    "The queue of logs waiting to be sent to Prefect Cloud is full; "
+                    "new logs are being dropped."
+                )
+        except Exception as exc:
+            self.logger.critical("Failed to write log with error: {}".format(str(exc)))
+
+    def flush(self, timeout: float = None) -> None:
+        """
+        Sends every queued record to Prefect Cloud, blocking until they have been sent
+        (or failed to send).
+
+        Args:
+            - timeout (float, optional): the maximum number of seconds to wait
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_FLUSH, timeout=timeout)
+        except queue.Full:
+            return
+        with self._queue.all_tasks_done:
+            self._queue.all_tasks_done.wait_for(
+                lambda: not self._queue.unfinished_tasks, timeout=timeout
+            )
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+    def _start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._send_logs, name="PrefectCloudHandler", daemon=True
+                )
+                self._thread.start()
+
+    def _send_logs(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not _FLUSH and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            logs = [log for log in batch if log is not _FLUSH]
+            try:
+                if logs:
+                    self._write_logs(logs)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_logs(self, logs: list) -> None:
+        if len(logs) > 1:
+            try:
+                json.dumps(logs)
+            except (TypeError, ValueError):
+                # a log which can't be serialized fails its whole batch, so the logs are
+                # sent one at a time to only lose that one
+                for log in logs:
+                    self._write_logs([log])
+                return
+        try:
+            self.client.write_run_logs(logs)  # type: ignore
         except Exception as exc:
             self.logger.critical("Failed to write log with error: {}".format(str(exc)))
 
 
+def flush_cloud_logs() -> None:
+    """
+    Sends every log record waiting to be sent to Prefect Cloud by the `CloudHandler`s of
+    the "prefect" logger.
+    """
+    for handler in prefect_logger.handlers:
+        if isinstance(handler, CloudHandler):
+            handler.flush()
+
+
 def configure_logging(testing: bool = False) -> logging.Logger:
     """
     Creates a "prefect" root logger with a `StreamHandler` that has level and formatting
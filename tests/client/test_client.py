@@ -1,7 +1,9 @@
 import tempfile
 import datetime
+import http.server
 import json
 import os
+import threading
 from unittest.mock import MagicMock, mock_open
 
 import marshmallow
@@ -217,6 +219,59 @@ def test_client_posts_graphql_to_graphql_server(monkeypatch):
     assert post.call_args[0][0] == "http://my-cloud.foo"
 
 
+def test_clients_share_a_session_per_host(monkeypatch):
+    session = MagicMock()
+    monkeypatch.setattr("requests.Session", session)
+    with set_temporary_config({"cloud.auth_token": "secret_token"}):
+        Client(graphql_server="http://my-cloud.foo").post("/foo")
+        Client(graphql_server="http://my-cloud.foo/graphql").get("/bar")
+        Client(graphql_server="http://other-cloud.foo").post("/foo")
+    assert session.call_count == 2
+
+
+@pytest.fixture()
+def keep_alive_server():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = b'{"data": {"success": true}}'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def test_clients_reuse_connections(keep_alive_server):
+    with set_temporary_config({"cloud.auth_token": "secret_token"}):
+        for _ in range(3):
+            assert Client(graphql_server=keep_alive_server).graphql("{x}").data
+        stats = Client.connection_stats()
+
+    assert stats == {keep_alive_server: dict(requests=3, connections=1, reused=2)}
+
+
+def test_client_connection_pool_size_is_configurable(keep_alive_server):
+    with set_temporary_config(
+        {"cloud.auth_token": "secret_token", "cloud.request_pool_size": 3}
+    ):
+        Client(graphql_server=keep_alive_server).graphql("{x}")
+    session, adapter = prefect.client.client._sessions[keep_alive_server]
+    assert session.get_adapter(keep_alive_server) is adapter
+    assert adapter._pool_maxsize == 3
+
+
 ## test actual mutation and query handling
 def test_graphql_errors_get_raised(monkeypatch):
     post = MagicMock(
@@ -645,6 +700,63 @@ def test_set_task_run_state_serializes(monkeypatch):
         )
 
 
+def test_update_heartbeats_sends_one_request(monkeypatch):
+    post = MagicMock(return_value=MagicMock(json=MagicMock(return_value={"data": {}})))
+    session = MagicMock()
+    session.return_value.post = post
+    monkeypatch.setattr("requests.Session", session)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    client.update_heartbeats(flow_run_ids=["f"], task_run_ids=["t1", "t2"])
+
+    assert post.call_count == 1
+    query = post.call_args[1]["json"]["query"]
+    assert 'flow_run_0: updateFlowRunHeartbeat(input: { flowRunId: "f" })' in query
+    assert 'task_run_0: updateTaskRunHeartbeat(input: { taskRunId: "t1" })' in query
+    assert 'task_run_1: updateTaskRunHeartbeat(input: { taskRunId: "t2" })' in query
+
+
+def test_set_task_run_states(monkeypatch):
+    response = {
+        "data": {
+            "setTaskRunStates": {
+                "states": [
+                    {"id": "1", "status": "SUCCESS", "message": None},
+                    {"id": "2", "status": "VERSION_MISMATCH", "message": "bad version"},
+                ]
+            }
+        }
+    }
+    post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
+
+    session = MagicMock()
+    session.return_value.post = post
+    monkeypatch.setattr("requests.Session", session)
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    result = client.set_task_run_states(
+        [
+            dict(task_run_id="1", version=0, state=Pending()),
+            dict(task_run_id="2", version=3, state=Pending()),
+        ]
+    )
+
+    assert result == [
+        dict(id="1", status="SUCCESS", message=None),
+        dict(id="2", status="VERSION_MISMATCH", message="bad version"),
+    ]
+    variables = json.loads(post.call_args[1]["json"]["variables"])
+    assert [(s["taskRunId"], s["version"]) for s in variables["input"]["states"]] == [
+        ("1", 0),
+        ("2", 3),
+    ]
+    assert variables["input"]["states"][0]["state"]["type"] == "Pending"
+
+
 def test_set_task_run_state_with_error(monkeypatch):
     response = {
         "data": {"setTaskRunState": None},
@@ -680,6 +792,24 @@ def test_write_log_successfully(monkeypatch):
     assert client.write_run_log(flow_run_id="1") is None
 
 
+def test_write_logs_successfully(monkeypatch):
+    response = {"data": {"writeRunLogs": {"success": True}}}
+    post = MagicMock(return_value=MagicMock(json=MagicMock(return_value=response)))
+    session = MagicMock()
+    session.return_value.post = post
+    monkeypatch.setattr("requests.Session", session)
+
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+
+    logs = [dict(flowRunId="1", message="a"), dict(flowRunId="1", message="b")]
+    assert client.write_run_logs(logs) is None
+    variables = json.loads(post.call_args[1]["json"]["variables"])
+    assert variables["input"]["logs"] == logs
+
+
 def test_write_log_with_error(monkeypatch):
     response = {
         "data": {"writeRunLog": None},
@@ -4,10 +4,25 @@ import pytest
 from distributed import Client
 
 import prefect
-from prefect.engine.executors import DaskExecutor, LocalExecutor, SynchronousExecutor
+from prefect.engine.executors import (
+    AsyncioExecutor,
+    DaskExecutor,
+    LocalExecutor,
+    ProcessPoolExecutor,
+    SynchronousExecutor,
+    ThreadPoolExecutor,
+)
 from prefect.utilities import debug
 
 
+@pytest.fixture(autouse=True)
+def close_client_sessions():
+    "Tests replace `requests.Session` with mocks, so pooled sessions can't be shared"
+    prefect.client.client.close_sessions()
+    yield
+    prefect.client.client.close_sessions()
+
+
 # ----------------
 # set up executor fixtures
 # so that we don't have to spin up / tear down a dask cluster
@@ -40,14 +55,40 @@ def mproc():
 
 
 @pytest.fixture()
-def _switch(mthread, local, sync, mproc):
+def threads():
+    "concurrent.futures thread pool executor"
+    yield ThreadPoolExecutor(max_workers=2)
+
+
+@pytest.fixture()
+def processes():
+    "concurrent.futures process pool executor"
+    yield ProcessPoolExecutor(max_workers=2)
+
+
+@pytest.fixture()
+def aio():
+    "asyncio event loop executor"
+    yield AsyncioExecutor(max_workers=10)
+
+
+@pytest.fixture()
+def _switch(mthread, local, sync, mproc, threads, processes, aio):
     """
     A construct needed so we can parametrize the executor fixture.
 
     This isn't straightforward since each executor needs to be initialized
     in slightly different ways.
     """
-    execs = dict(mthread=mthread, local=local, sync=sync, mproc=mproc)
+    execs = dict(
+        mthread=mthread,
+        local=local,
+        sync=sync,
+        mproc=mproc,
+        threads=threads,
+        processes=processes,
+        aio=aio,
+    )
     return lambda e: execs[e]
 
 
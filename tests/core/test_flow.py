@@ -802,6 +802,36 @@ def test_sorted_tasks_with_ambiguous_sort():
     assert set(tasks[4:]) == set([t4, t5, t6])
 
 
+def test_sorted_tasks_breaks_ties_by_insertion_order():
+    """
+    t1 -> t4
+    t2 -> t4
+    t3
+    """
+    f = Flow(name="test")
+    t1, t2, t3, t4 = Task("1"), Task("2"), Task("3"), Task("4")
+    f.add_task(t3)
+    f.add_edge(t2, t4)
+    f.add_edge(t1, t4)
+    assert f.sorted_tasks() == (t3, t2, t1, t4)
+
+
+def test_replaced_tasks_keep_their_sort_position():
+    f = Flow(name="test")
+    t1, t2, t3 = Task("1"), Task("2"), Task("3")
+    f.add_task(t1)
+    f.add_task(t2)
+    f.replace(t1, t3)
+    assert f.sorted_tasks() == (t3, t2)
+
+
+def test_sorted_tasks_handles_large_flows():
+    f = Flow(name="test")
+    tasks = [Task(str(i)) for i in range(10000)]
+    f.chain(*tasks)
+    assert f.sorted_tasks() == tuple(tasks)
+
+
 def test_sorted_tasks_with_start_task():
     """
     t1 -> t2 -> t3 -> t4
@@ -819,6 +849,7 @@ def test_sorted_tasks_with_start_task():
     f.add_edge(t3, t5)
     assert set(f.sorted_tasks(root_tasks=[])) == set([t1, t2, t3, t4, t5])
     assert set(f.sorted_tasks(root_tasks=[t3])) == set([t3, t4, t5])
+    assert f.sorted_tasks(root_tasks=[t3])[0] is t3
 
 
 def test_sorted_tasks_with_invalid_start_task():
@@ -904,6 +935,21 @@ def test_validate_cycles():
     assert "cycle found" in str(exc.value).lower()
 
 
+def test_validate_cycles_reports_the_cycle():
+    f = Flow(name="test")
+    t1 = Task("1")
+    t2 = Task("2")
+    t3 = Task("3")
+    t4 = Task("4")
+    f.add_edge(t1, t2)
+    f.add_edge(t2, t3)
+    f.add_edge(t3, t4)
+    f.add_edge(t4, t2)
+    with pytest.raises(ValueError) as exc:
+        f.validate()
+    assert "<Task: 2> -> <Task: 3> -> <Task: 4> -> <Task: 2>" in str(exc.value)
+
+
 def test_validate_missing_edge_downstream_tasks():
     f = Flow(name="test")
     t1 = Task()
@@ -1282,6 +1328,90 @@ class TestCache:
         f.set_reference_tasks([t1])
         assert 1 not in f._cache
 
+    def test_modifying_graph_increments_graph_version(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        version = f._graph_version
+        f.add_task(t1)
+        assert f._graph_version > version
+
+        version = f._graph_version
+        f.add_edge(t1, t2)
+        assert f._graph_version > version
+
+        version = f._graph_version
+        f.replace(t2, Task())
+        assert f._graph_version > version
+
+    def test_directly_modifying_tasks_invalidates_cache(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        f.add_task(t1)
+        assert f.root_tasks() == {t1}
+        f.tasks.add(t2)
+        assert f.root_tasks() == {t1, t2}
+
+    def test_directly_modifying_edges_updates_graph_indexes(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        f.add_task(t3)
+        f.edges.add(Edge(t2, t3))
+        assert f.upstream_tasks(t3) == {t2}
+        assert f.downstream_tasks(t2) == {t3}
+        f.edges.clear()
+        assert f.edges_to(t2) == set()
+        assert f.all_downstream_edges()[t1] == set()
+
+    def test_adding_edges_after_directly_adding_tasks(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        f.tasks.add(t3)
+        f.add_edge(t2, t3)
+        assert f.upstream_tasks(t3) == {t2}
+        assert f.sorted_tasks() == (t1, t2, t3)
+
+    def test_directly_replacing_edges_updates_graph_indexes(self):
+        f = Flow(name="test")
+        a, b, c = Task(), Task(), Task()
+        f.add_edge(a, b)
+        f.add_edge(b, c)
+        assert f.sorted_tasks() == (a, b, c)
+        f.edges.discard(Edge(b, c))
+        f.edges.add(Edge(c, b))
+        assert f.sorted_tasks() == (a, c, b)
+        assert f.upstream_tasks(b) == {a, c}
+        assert f.downstream_tasks(c) == {b}
+
+    def test_directly_modified_graph_sets_survive_copies_and_pickling(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        f.add_edge(t1, t2)
+        for new in [f.copy(), cloudpickle.loads(cloudpickle.dumps(f))]:
+            new.edges.clear()
+            assert new.upstream_tasks(new.sorted_tasks()[-1]) == set()
+        assert f.upstream_tasks(t2) == {t1}
+
+    def test_edge_queries_return_copies(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        edge = f.add_edge(t1, t2)
+        f.edges_to(t2).clear()
+        f.edges_from(t1).clear()
+        f.all_upstream_edges()[t2].clear()
+        f.all_downstream_edges()[t1].clear()
+        assert f.edges_to(t2) == f.edges_from(t1) == {edge}
+
+    def test_copy_has_independent_graph_indexes(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        f2 = f.copy()
+        f2.add_edge(t2, t3)
+        assert f.downstream_tasks(t2) == set()
+        assert f2.downstream_tasks(t2) == {t3}
+
 
 class TestReplace:
     def test_replace_replaces_all_the_things(self):
@@ -1297,6 +1427,8 @@ class TestReplace:
         assert {e.downstream_task for e in f.edges} == {t2}
         assert f.reference_tasks() == {t3}
         assert f.terminal_tasks() == {t2}
+        assert f.upstream_tasks(t2) == {t3}
+        assert f.downstream_tasks(t3) == {t2}
 
         with pytest.raises(ValueError):
             f.edges_to(t1)
@@ -213,6 +213,19 @@ class TestCreateTask:
             def run(x, task_args=None):
                 pass
 
+    def test_class_instantiation_rejects_map_chunksize_kwarg(self):
+        with pytest.raises(ValueError):
+
+            class ChunkedTask(Task):
+                def run(self, x, map_chunksize=None):
+                    pass
+
+        with pytest.raises(ValueError):
+
+            @task
+            def run(x, map_chunksize):
+                pass
+
     def test_create_task_with_and_without_cache_for(self):
         t1 = Task()
         assert t1.cache_validator is never_use
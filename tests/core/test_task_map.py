@@ -8,7 +8,8 @@ import prefect
 from prefect.core import Edge, Flow, Parameter, Task
 from prefect.engine.flow_runner import FlowRunner
 from prefect.engine.result import NoResult, Result
-from prefect.engine.state import Mapped, Pending, Retrying, Success
+from prefect.engine.state import Mapped, MappedStates, Pending, Retrying, Success
+from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.debug import raise_on_exception
 from prefect.utilities.tasks import task, unmapped
 
@@ -66,7 +67,9 @@ def test_calling_map_with_bind_returns_self():
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_spawns_new_tasks(executor):
     ll = ListTask()
@@ -86,7 +89,9 @@ def test_map_spawns_new_tasks(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_over_parameters(executor):
     a = AddTask()
@@ -106,7 +111,9 @@ def test_map_over_parameters(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_composition(executor):
     ll = ListTask()
@@ -136,7 +143,9 @@ def test_map_composition(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_deep_map_composition(executor):
     ll = ListTask()
@@ -157,7 +166,9 @@ def test_deep_map_composition(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_multiple_map_arguments(executor):
     ll = ListTask()
@@ -175,7 +186,9 @@ def test_multiple_map_arguments(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_failures_dont_leak_out(executor):
     ii = IdTask()
@@ -197,7 +210,9 @@ def test_map_failures_dont_leak_out(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_skips_return_exception_as_result(executor):
     ll = ListTask()
@@ -223,7 +238,9 @@ def test_map_skips_return_exception_as_result(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_upstream_skip_signals_are_handled_properly(executor):
     @task
@@ -244,7 +261,9 @@ def test_upstream_skip_signals_are_handled_properly(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_upstream_skipped_states_are_handled_properly(executor):
     @task
@@ -267,7 +286,9 @@ def test_upstream_skipped_states_are_handled_properly(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_skips_dont_leak_out(executor):
     ll = ListTask()
@@ -292,7 +313,9 @@ def test_map_skips_dont_leak_out(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_handles_upstream_empty(executor):
     @task
@@ -316,7 +339,9 @@ def test_map_handles_upstream_empty(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_handles_non_keyed_upstream_empty(executor):
     @task
@@ -338,7 +363,9 @@ def test_map_handles_non_keyed_upstream_empty(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_can_handle_fixed_kwargs(executor):
     ll = ListTask()
@@ -356,7 +383,9 @@ def test_map_can_handle_fixed_kwargs(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_can_handle_nonkeyed_upstreams(executor):
     ll = ListTask()
@@ -373,7 +402,9 @@ def test_map_can_handle_nonkeyed_upstreams(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_can_handle_nonkeyed_mapped_upstreams(executor):
     ii = IdTask()
@@ -392,7 +423,9 @@ def test_map_can_handle_nonkeyed_mapped_upstreams(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_can_handle_nonkeyed_nonmapped_upstreams_and_mapped_args(executor):
     ii = IdTask()
@@ -410,7 +443,9 @@ def test_map_can_handle_nonkeyed_nonmapped_upstreams_and_mapped_args(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_tracks_non_mapped_upstream_tasks(executor):
     div = DivTask()
@@ -438,7 +473,9 @@ def test_map_tracks_non_mapped_upstream_tasks(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_preserves_flowrunners_initial_context(executor):
     @task
@@ -457,7 +494,9 @@ def test_map_preserves_flowrunners_initial_context(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_allows_for_retries(executor):
     ii = IdTask()
@@ -488,7 +527,9 @@ def test_map_allows_for_retries(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_can_handle_nonkeyed_mapped_upstreams_and_mapped_args(executor):
     ii = IdTask()
@@ -531,7 +572,9 @@ def test_map_behaves_like_zip_with_differing_length_results(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_allows_retries_2(executor):
     """
@@ -564,7 +607,9 @@ def test_map_allows_retries_2(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_reduce_task_honors_trigger_across_all_mapped_states(executor):
     """
@@ -595,7 +640,9 @@ def test_reduce_task_honors_trigger_across_all_mapped_states(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_task_map_downstreams_handle_single_failures(executor):
     @prefect.task
@@ -626,7 +673,9 @@ def test_task_map_downstreams_handle_single_failures(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_task_map_can_be_passed_to_upstream_with_and_without_map(executor):
     @prefect.task
@@ -655,7 +704,9 @@ def test_task_map_can_be_passed_to_upstream_with_and_without_map(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_task_map_doesnt_assume_purity_of_functions(executor):
     @prefect.task
@@ -675,7 +726,9 @@ def test_task_map_doesnt_assume_purity_of_functions(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_reduce(executor):
     @prefect.task
@@ -699,7 +752,9 @@ def test_map_reduce(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_map_over_map_and_unmapped(executor):
     @prefect.task
@@ -739,7 +794,9 @@ def test_task_map_with_all_inputs_unmapped(x, y, out):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_task_map_with_no_upstream_results_and_a_mapped_state(executor):
     """
@@ -822,7 +879,9 @@ def test_task_map_with_no_upstream_results_and_a_mapped_state(executor):
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_all_tasks_only_called_once(capsys, executor):
     """
@@ -849,3 +908,137 @@ def test_all_tasks_only_called_once(capsys, executor):
     printed_lines = [line for line in captured.out.split("\n") if line != ""]
 
     assert len(printed_lines) == 15
+
+
+def test_map_rejects_bad_map_chunksizes():
+    with Flow(name="test"):
+        with pytest.raises(ValueError):
+            AddTask().map(ListTask(), map_chunksize=0)
+        with pytest.raises(ValueError):
+            AddTask().map(ListTask(), map_chunksize=1.5)
+
+
+def test_map_sets_map_chunksize_on_the_copy_only():
+    a = AddTask()
+    with Flow(name="test"):
+        res = a.map(ListTask(), map_chunksize=2)
+    assert res.map_chunksize == 2
+    assert a.map_chunksize is None
+
+
+def test_tasks_can_map_over_a_chunksize_argument():
+    @prefect.task
+    def split(x, chunksize):
+        return x * chunksize
+
+    with Flow(name="test") as f:
+        res = split.map([1, 2], chunksize=[3, 4])
+
+    state = f.run()
+    assert res.map_chunksize is None
+    assert state.result[res].result == [3, 8]
+
+
+@pytest.mark.parametrize(
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
+)
+def test_chunked_map_matches_unchunked_map(executor):
+    @prefect.task
+    def numbers():
+        return list(range(10))
+
+    @prefect.task
+    def index(x):
+        return (x, prefect.context.get("map_index"))
+
+    add = AddTask()
+
+    with Flow(name="test") as f:
+        n = numbers()
+        x = add.map(n, map_chunksize=3)
+        y = add.map(x, unmapped(10), map_chunksize=4)
+        z = index.map(y, map_chunksize=20)
+
+    state = f.run(executor=executor)
+    assert state.is_successful()
+    assert [s.result for s in state.result[x].map_states] == list(range(1, 11))
+    assert state.result[y].result == list(range(11, 21))
+    assert state.result[z].result == [(i + 11, i) for i in range(10)]
+
+
+def test_chunked_map_submits_one_call_per_chunk():
+    from prefect.engine.executors import LocalExecutor
+
+    class CountingExecutor(LocalExecutor):
+        submitted = 0
+
+        def submit(self, fn, *args, **kwargs):
+            CountingExecutor.submitted += 1
+            return super().submit(fn, *args, **kwargs)
+
+    @prefect.task
+    def numbers():
+        return list(range(10))
+
+    with Flow(name="test") as f:
+        res = AddTask().map(numbers, map_chunksize=4)
+
+    state = f.run(executor=CountingExecutor())
+    assert state.result[res].result == list(range(1, 11))
+    # one call for each of the two tasks, plus one for each of the three chunks
+    assert CountingExecutor.submitted == 5
+
+
+@pytest.mark.parametrize("executor", ["local", "sync", "threads"], indirect=True)
+def test_chunked_map_with_no_upstream_results_and_a_mapped_state(executor):
+    @prefect.task
+    def numbers():
+        return [1, 2, 3]
+
+    @prefect.task
+    def plus_one(x):
+        return x + 1
+
+    with Flow(name="test") as f:
+        n = numbers()
+        x = plus_one.map(n, map_chunksize=2)
+
+    state = FlowRunner(flow=f).run(
+        executor=executor,
+        task_states={
+            n: Success(),
+            x: Mapped(
+                map_states=[
+                    Success(result=2),
+                    Pending(cached_inputs={"x": Result(2)}),
+                    Retrying(cached_inputs={"x": Result(3)}),
+                ]
+            ),
+        },
+        return_tasks=f.tasks,
+    )
+
+    assert state.is_successful()
+    assert state.result[x].result == [2, 3, 4]
+
+
+@pytest.mark.parametrize(
+    "executor", ["local", "sync", "mthread", "threads"], indirect=True
+)
+def test_wide_maps_compact_their_map_states(executor):
+    ll = ListTask()
+    div = DivTask()
+
+    with Flow(name="test") as f:
+        res = IdTask().map(div.map(AddTask().map(ll(start=-1))))
+
+    with set_temporary_config({"engine.task_runner.compact_map_states_threshold": 2}):
+        state = f.run(executor=executor)
+
+    assert state.is_failed()
+    map_states = state.result[res].map_states
+    assert isinstance(map_states, MappedStates)
+    assert map_states.state_counts() == {"TriggerFailed": 1, "Success": 2}
+    assert [s.result for s in map_states][1:] == [1, 0.5]
@@ -0,0 +1,255 @@
+import multiprocessing
+import os
+import threading
+from datetime import timedelta
+
+import cloudpickle
+import pendulum
+import pytest
+
+import prefect
+from prefect.core import Task
+from prefect.engine import TaskRunner
+from prefect.engine.cache_index import CacheIndex
+from prefect.engine.cache_stores import CacheStore, SQLiteCacheStore, get_cache_store
+from prefect.engine.cache_validators import (
+    all_inputs,
+    duration_only,
+    partial_inputs_only,
+)
+from prefect.engine.result import Result, SafeResult
+from prefect.engine.result_handlers import LocalResultHandler
+from prefect.engine.state import Cached, Pending, Success
+from prefect.utilities.configuration import set_temporary_config
+
+
+def cached(minutes=10, value=None, inputs=None, parameters=None):
+    return Cached(
+        result=Result(value),
+        cached_result_expiration=pendulum.now("utc") + timedelta(minutes=minutes),
+        cached_inputs={k: Result(v) for k, v in (inputs or {}).items()},
+        cached_parameters=parameters,
+    )
+
+
+@pytest.fixture
+def store(tmpdir):
+    return SQLiteCacheStore(path=str(tmpdir.join("cache.db")))
+
+
+class TestGetCacheStore:
+    def test_no_store_by_default(self):
+        assert get_cache_store() is None
+
+    def test_store_from_config_is_shared(self, tmpdir):
+        with set_temporary_config(
+            {
+                "engine.cache.store": "prefect.engine.cache_stores.SQLiteCacheStore",
+                "engine.cache.sqlite_path": str(tmpdir.join("shared.db")),
+            }
+        ):
+            store = get_cache_store()
+            assert isinstance(store, SQLiteCacheStore)
+            assert store is get_cache_store()
+
+    def test_store_from_context_is_prioritized(self, store):
+        with set_temporary_config(
+            {"engine.cache.store": "prefect.engine.cache_stores.SQLiteCacheStore"}
+        ):
+            with prefect.context(cache_store=store):
+                assert get_cache_store() is store
+
+    def test_cache_index_is_a_cache_store(self):
+        assert isinstance(CacheIndex(), CacheStore)
+
+
+class TestSQLiteCacheStore:
+    def test_creates_database(self, tmpdir):
+        path = str(tmpdir.join("nested", "cache.db"))
+        store = SQLiteCacheStore(path=path)
+        assert store.candidates("t", duration_only, {}, None) == []
+        assert os.path.exists(path)
+
+    def test_path_defaults_to_config(self, tmpdir):
+        with set_temporary_config({"engine.cache.sqlite_path": str(tmpdir)}):
+            assert SQLiteCacheStore().path == str(tmpdir)
+
+    def test_put_and_look_up_states(self, store):
+        store.put("t", cached(value=1, inputs=dict(x=1)), all_inputs)
+        store.put("t", cached(value=2, inputs=dict(x=2)), all_inputs)
+        [state] = store.candidates("t", all_inputs, dict(x=2), None)
+        assert isinstance(state, Cached)
+        assert state.result == 2
+        assert state.cached_inputs["x"].value == 2
+        assert store.candidates("t", all_inputs, dict(x=3), None) == []
+        assert store.candidates("other", all_inputs, dict(x=2), None) == []
+
+    def test_states_are_returned_in_order(self, store):
+        for i in range(3):
+            store.put("t", cached(value=i), duration_only)
+        states = store.candidates("t", duration_only, {}, None)
+        assert [s.result for s in states] == [0, 1, 2]
+
+    def test_validators_without_components_see_every_state(self, store):
+        store.put("t", cached(value=1, inputs=dict(x=1)), all_inputs)
+        store.put("t", cached(value=2, inputs=dict(x=2)), all_inputs)
+        states = store.candidates("t", lambda *args: True, dict(x=3), None)
+        assert [s.result for s in states] == [1, 2]
+
+    def test_states_stored_with_other_components_are_candidates(self, store):
+        store.put("t", cached(value=1, inputs=dict(x=1, y=1)), all_inputs)
+        store.put("t", cached(value=2, inputs=dict(x=2, y=1)), None)
+        validator = partial_inputs_only(["y"])
+        states = store.candidates("t", validator, dict(x=3, y=1), None)
+        assert [s.result for s in states] == [1, 2]
+
+    def test_states_stored_without_a_validator_are_candidates(self, store):
+        store.put("t", cached(value=1, inputs=dict(x=1)))
+        store.put("t", cached(value=2, inputs=dict(x=2)), all_inputs)
+        states = store.candidates("t", all_inputs, dict(x=2), None)
+        assert [s.result for s in states] == [1, 2]
+
+    def test_expired_states_are_not_returned(self, store):
+        store.put("t", cached(minutes=-1, value=1), duration_only)
+        assert store.candidates("t", duration_only, {}, None) == []
+
+    def test_expired_states_are_evicted(self, store):
+        store.put("t", cached(minutes=-1), duration_only)
+        assert store.evict_expired() == 1
+        assert store.evict_expired() == 0
+
+    def test_put_evicts_expired_states(self, store):
+        store.put("t", cached(minutes=-1), duration_only)
+        store.put("t", cached(), duration_only)
+        assert store.evict_expired() == 0
+
+    def test_states_without_expiration_are_not_stored(self, store):
+        store.put("t", Cached(result=Result(1)), duration_only)
+        assert store.candidates("t", duration_only, {}, None) == []
+
+    def test_results_with_result_handlers_are_stored_by_location(self, store, tmpdir):
+        state = cached(value=42)
+        state._result.result_handler = LocalResultHandler(dir=str(tmpdir))
+        store.put("t", state, duration_only)
+        [loaded] = store.candidates("t", duration_only, {}, None)
+        assert isinstance(loaded._result, SafeResult)
+        assert os.path.exists(loaded._result.value)
+        assert loaded._result.to_result().value == 42
+
+    def test_clear(self, store):
+        store.put("t", cached(), duration_only)
+        store.clear()
+        assert store.candidates("t", duration_only, {}, None) == []
+
+    def test_survives_pickling(self, store):
+        store.put("t", cached(value=1), duration_only)
+        new = cloudpickle.loads(cloudpickle.dumps(store))
+        assert [s.result for s in new.candidates("t", duration_only, {}, None)] == [1]
+
+    def test_is_shared_across_threads(self, store):
+        def put(i):
+            store.put("t", cached(value=i), duration_only)
+
+        threads = [threading.Thread(target=put, args=(i,)) for i in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        states = store.candidates("t", duration_only, {}, None)
+        assert sorted(s.result for s in states) == list(range(10))
+
+    def test_is_shared_across_processes(self, store):
+        store.put("t", cached(value=0), duration_only)
+        procs = [
+            multiprocessing.Process(
+                target=store.put, args=("t", cached(value=i), duration_only)
+            )
+            for i in range(1, 5)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        states = store.candidates("t", duration_only, {}, None)
+        assert sorted(s.result for s in states) == list(range(5))
+
+
+class TestTaskRunnerWithCacheStore:
+    def test_cache_result_writes_to_store(self, store):
+        task = Task(
+            name="t", cache_for=timedelta(minutes=1), cache_validator=all_inputs
+        )
+        with prefect.context(cache_store=store):
+            state = TaskRunner(task).cache_result(
+                Success(result=Result(5)), inputs=dict(x=Result(1))
+            )
+        assert state.is_cached()
+        [stored] = store.candidates("t", all_inputs, dict(x=1), None)
+        assert stored.result == 5
+        assert stored.cached_result_expiration == state.cached_result_expiration
+
+    def test_check_task_is_cached_reads_from_store(self, store):
+        task = Task(
+            name="t", cache_for=timedelta(minutes=1), cache_validator=all_inputs
+        )
+        store.put("t", cached(value=5, inputs=dict(x=1)), all_inputs)
+        with prefect.context(cache_store=store, caches={}):
+            hit = TaskRunner(task).check_task_is_cached(
+                Pending(), inputs=dict(x=Result(1))
+            )
+            miss = TaskRunner(task).check_task_is_cached(
+                Pending(), inputs=dict(x=Result(2))
+            )
+        assert hit.is_cached()
+        assert hit.result == 5
+        assert miss.is_pending()
+
+    def test_failed_writes_are_logged(self, store, caplog):
+        task = Task(name="t", cache_for=timedelta(minutes=1))
+        with prefect.context(cache_store=store):
+            state = TaskRunner(task).cache_result(
+                Success(result=Result(threading.Lock())), inputs={}
+            )
+        assert state.is_cached()
+        assert "failed to write its result to the cache store" in caplog.text
+
+    def test_failed_reads_are_logged_and_the_task_runs(self, store, caplog):
+        def fail(*args, **kwargs):
+            raise OSError("cache store unavailable")
+
+        store.candidates = fail
+        task = Task(name="t", cache_for=timedelta(minutes=1))
+        with prefect.context(cache_store=store, caches={}):
+            state = TaskRunner(task).check_task_is_cached(
+                Pending(), inputs=dict(x=Result(1))
+            )
+        assert state.is_pending()
+        assert "failed to read from the cache store" in caplog.text
+
+    def test_results_outlive_the_flow_run(self, tmpdir):
+        calls = []
+
+        @prefect.task(cache_for=timedelta(minutes=10), cache_validator=all_inputs)
+        def add_one(x):
+            calls.append(x)
+            return x + 1
+
+        with prefect.Flow("cached") as flow:
+            y = add_one(1)
+
+        with set_temporary_config(
+            {
+                "engine.cache.store": "prefect.engine.cache_stores.SQLiteCacheStore",
+                "engine.cache.sqlite_path": str(tmpdir.join("flow.db")),
+            }
+        ):
+            # each run starts without any in-memory caches, like a new process
+            with prefect.context(caches={}):
+                first = flow.run()
+            with prefect.context(caches={}):
+                second = flow.run()
+
+        assert calls == [1]
+        assert first.result[y].result == 2
+        assert second.result[y].is_cached()
+        assert second.result[y].result == 2
@@ -13,6 +13,7 @@ from prefect.client import Client
 from prefect.core import Edge, Task
 from prefect.engine.cache_validators import all_inputs
 from prefect.engine.cloud import CloudTaskRunner
+from prefect.engine.cloud.state_reporter import TaskRunStateReporter
 from prefect.engine.result import NoResult, Result, SafeResult
 from prefect.engine.result_handlers import (
     JSONResultHandler,
@@ -37,6 +38,7 @@ from prefect.engine.state import (
 )
 from prefect.serialization.result_handlers import ResultHandlerSchema
 from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.hashing import fingerprint
 
 
 @pytest.fixture(autouse=True)
@@ -97,6 +99,30 @@ def test_task_runner_doesnt_call_client_if_map_index_is_none(client):
     assert res.is_successful()
 
 
+def test_task_runner_batches_states_when_configured(client, monkeypatch):
+    client.set_task_run_states = MagicMock(
+        side_effect=lambda states: [dict(status="SUCCESS") for _ in states]
+    )
+    reporter = TaskRunStateReporter(client=client, flush_interval=10)
+    monkeypatch.setattr("prefect.engine.cloud.state_reporter._reporter", reporter)
+    monkeypatch.setattr(
+        "prefect.engine.cloud.state_reporter._reporter_pid", os.getpid()
+    )
+
+    with set_temporary_config({"cloud.batch_task_run_states": True}):
+        res = CloudTaskRunner(task=Task(name="test")).run(
+            context={"task_run_id": "id", "task_run_version": 1}
+        )
+
+    assert res.is_successful()
+    assert client.set_task_run_state.call_count == 0
+    # the Running state was superseded before it was sent
+    ((states,), _), = client.set_task_run_states.call_args_list
+    assert [(s["version"], type(s["state"]).__name__) for s in states] == [
+        (1, "Success")
+    ]
+
+
 def test_task_runner_calls_get_task_run_info_if_map_index_is_not_none(client):
     task = Task(name="test")
 
@@ -510,7 +536,8 @@ class TestStateResultHandling:
         }
 
         res = CloudTaskRunner(task=add).run(upstream_states=upstream_states)
-        assert result.safe_value != NoResult  # proves was handled
+        # cached states only hold fingerprints of their inputs, which aren't written
+        assert result.safe_value is NoResult
 
         ## assertions
         assert client.get_task_run_info.call_count == 0  # never called
@@ -522,7 +549,10 @@ class TestStateResultHandling:
         assert states[0].is_running()
         assert states[1].is_successful()
         assert isinstance(states[2], Cached)
-        assert states[2].cached_inputs == dict(x=result, y=result)
+        assert states[2].cached_inputs is None
+        assert states[2].cached_input_fingerprints == dict(
+            x=fingerprint(1), y=fingerprint(1)
+        )
         assert states[2].result == 2
 
     def test_task_runner_sends_checkpointed_success_states_to_cloud(self, client):
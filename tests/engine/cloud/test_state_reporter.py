@@ -0,0 +1,137 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from prefect.engine.cloud.state_reporter import TaskRunStateReporter, get_state_reporter
+from prefect.engine.state import Failed, Retrying, Running, Success
+from prefect.utilities.exceptions import ClientError
+
+
+def succeed(states):
+    return [dict(id=s["task_run_id"], status="SUCCESS") for s in states]
+
+
+@pytest.fixture()
+def client():
+    return MagicMock(set_task_run_states=MagicMock(side_effect=succeed))
+
+
+def sent(client):
+    return [
+        [(s["task_run_id"], s["version"], type(s["state"]).__name__) for s in states]
+        for ((states,), _) in client.set_task_run_states.call_args_list
+    ]
+
+
+def test_running_states_are_queued_and_superseded(client):
+    reporter = TaskRunStateReporter(client=client, flush_interval=10)
+    assert reporter.report("a", 1, Running()) is None
+    assert reporter.report("a", 1, Success()) == 2
+    assert sent(client) == [[("a", 1, "Success")]]
+
+
+def test_final_states_are_sent_with_everything_queued_before_them(client):
+    reporter = TaskRunStateReporter(client=client, flush_interval=10)
+    reporter.report("a", 1, Running())
+    reporter.report("b", 5, Running())
+    assert reporter.report("c", 3, Failed()) == 4
+    assert sent(client) == [
+        [("a", 1, "Running"), ("b", 5, "Running"), ("c", 3, "Failed")]
+    ]
+
+
+def test_versions_are_tracked_across_batches(client):
+    reporter = TaskRunStateReporter(client=client, flush_interval=10)
+    reporter.report("a", 1, Running())
+    reporter.flush()
+    assert reporter.report("a", 1, Retrying()) == 3
+    # the run is no longer tracked once it reaches a final state
+    assert reporter.report("a", 3, Running()) is None
+    reporter.flush()
+    assert sent(client) == [
+        [("a", 1, "Running")],
+        [("a", 2, "Retrying")],
+        [("a", 3, "Running")],
+    ]
+
+
+def test_batches_are_sent_when_full_or_after_flush_interval(client):
+    reporter = TaskRunStateReporter(client=client, batch_size=2, flush_interval=0.1)
+    done = threading.Event()
+    client.set_task_run_states.side_effect = lambda states: (
+        done.set() or succeed(states)
+    )
+    for task_run_id in "abc":
+        reporter.report(task_run_id, 1, Running())
+    assert done.wait(2)
+    reporter.flush()
+    assert [len(batch) for batch in sent(client)] == [2, 1]
+
+
+def test_rejected_final_states_raise(client):
+    client.set_task_run_states.side_effect = lambda states: [
+        dict(id="a", status="VERSION_MISMATCH", message="version mismatch")
+    ]
+    reporter = TaskRunStateReporter(client=client)
+    with pytest.raises(ClientError, match="version mismatch"):
+        reporter.report("a", 1, Success())
+
+
+def test_rejected_queued_states_raise_on_the_next_report(client):
+    client.set_task_run_states.side_effect = lambda states: [
+        dict(id="a", status="VERSION_MISMATCH", message="version mismatch")
+    ]
+    reporter = TaskRunStateReporter(client=client, flush_interval=10)
+    reporter.report("a", 1, Running())
+    reporter.flush()
+    with pytest.raises(ClientError, match="version mismatch"):
+        reporter.report("a", 2, Success())
+    assert client.set_task_run_states.call_count == 1
+
+
+def test_client_errors_are_raised_for_final_states(client):
+    client.set_task_run_states.side_effect = ValueError("boom")
+    reporter = TaskRunStateReporter(client=client)
+    with pytest.raises(ValueError, match="boom"):
+        reporter.report("a", 1, Success())
+
+
+def test_unversioned_task_runs_stay_unversioned(client):
+    reporter = TaskRunStateReporter(client=client, flush_interval=10)
+    reporter.report("a", None, Running())
+    reporter.flush()
+    assert reporter.report("a", None, Success()) is None
+    assert reporter.report("b", None, Running()) is None
+    assert reporter.report("b", 4, Success()) == 5
+    assert sent(client) == [
+        [("a", None, "Running")],
+        [("a", None, "Success")],
+        [("b", 4, "Success")],
+    ]
+
+
+def test_missing_results_are_errors(client):
+    client.set_task_run_states.side_effect = lambda states: []
+    reporter = TaskRunStateReporter(client=client)
+    with pytest.raises(ClientError, match="Expected 1"):
+        reporter.report("a", 1, Success())
+
+
+def test_pending_updates_fail_if_the_thread_dies(client, monkeypatch):
+    reporter = TaskRunStateReporter(client=client, flush_interval=10)
+    monkeypatch.setattr(
+        reporter, "_record_results", MagicMock(side_effect=RuntimeError("boom"))
+    )
+    reporter.report("a", 1, Running())
+    with pytest.raises(RuntimeError, match="boom"):
+        reporter.report("b", 1, Success())
+    reporter.flush()
+    with pytest.raises(RuntimeError, match="boom"):
+        reporter.report("a", 2, Success())
+
+
+def test_get_state_reporter_is_shared(monkeypatch):
+    monkeypatch.setattr("prefect.engine.cloud.state_reporter.Client", MagicMock())
+    monkeypatch.setattr("prefect.engine.cloud.state_reporter._reporter", None)
+    assert get_state_reporter() is get_state_reporter()
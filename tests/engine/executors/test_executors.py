@@ -1,8 +1,10 @@
+import asyncio
 import datetime
 import logging
 import random
 import sys
 import tempfile
+import threading
 import time
 from unittest.mock import MagicMock
 
@@ -12,11 +14,16 @@ import pytest
 
 import prefect
 from prefect.engine.executors import (
+    AsyncioExecutor,
     DaskExecutor,
     Executor,
     LocalExecutor,
+    ProcessPoolExecutor,
     SynchronousExecutor,
+    ThreadPoolExecutor,
 )
+from prefect.engine.state import Mapped, Success
+from prefect.utilities.configuration import set_temporary_config
 
 
 class TestBaseExecutor:
@@ -36,6 +43,15 @@ class TestBaseExecutor:
         with pytest.raises(NotImplementedError):
             Executor().queue(2)
 
+    def test_as_completed_yields_futures_in_order(self):
+        assert list(Executor().as_completed([3, 1, 2])) == [3, 1, 2]
+
+    def test_futures_can_be_added_to_as_completed(self):
+        completed = Executor().as_completed([1])
+        assert next(completed) == 1
+        completed.add(2)
+        assert list(completed) == [2]
+
     def test_start_doesnt_do_anything(self):
         with Executor().start():
             assert True
@@ -162,7 +178,11 @@ def test_submit_does_not_assume_pure_functions(executor):
     assert one != two
 
 
-@pytest.mark.parametrize("executor", ["local", "mthread", "sync"], indirect=True)
+@pytest.mark.parametrize(
+    "executor",
+    ["local", "mthread", "sync", "threads", "processes", "aio"],
+    indirect=True,
+)
 def test_executor_has_compatible_timeout_handler(executor):
     slow_fn = lambda: time.sleep(3)
     with executor.start():
@@ -199,6 +219,18 @@ class TestDaskExecutor:
         assert x == 3
         assert y == 4
 
+    @pytest.mark.parametrize("executor", ["mproc", "mthread"], indirect=True)
+    def test_as_completed_yields_every_future_once_finished(self, executor):
+        with executor.start():
+            futures = [executor.submit(lambda x: x, i) for i in range(5)]
+            completed = list(executor.as_completed(futures))
+            assert all(f.done() for f in completed)
+            assert sorted(executor.wait(completed)) == [0, 1, 2, 3, 4]
+
+    def test_as_completed_raises_if_not_started(self):
+        with pytest.raises(ValueError):
+            list(DaskExecutor().as_completed([]))
+
     @pytest.mark.parametrize("executor", ["mproc", "mthread"], indirect=True)
     def test_runs_in_parallel(self, executor):
         """This test is designed to have two tasks record and return their multiple execution times;
@@ -322,3 +354,270 @@ class TestDaskExecutor:
         with executor.start():
             res = executor.wait(executor.map(map_fn))
         assert res == []
+
+
+class TestPoolExecutors:
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_submit_and_wait(self, executor):
+        with executor.start():
+            future = executor.submit(lambda x: x + 1, 1)
+            assert executor.wait(future) == 2
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_submit_runs_immediately_if_not_started(self, executor):
+        future = executor.submit(lambda x: x + 1, 1)
+        assert future.done()
+        assert executor.wait(future) == 2
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_map_iterates_over_multiple_args(self, executor):
+        def map_fn(x, y):
+            return x + y
+
+        with executor.start():
+            res = executor.wait(executor.map(map_fn, [1, 2], [1, 3]))
+        assert res == [2, 5]
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_map_doesnt_do_anything_for_empty_list_input(self, executor):
+        def map_fn(*args):
+            raise ValueError("map_fn was called")
+
+        with executor.start():
+            res = executor.wait(executor.map(map_fn))
+        assert res == []
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_futures_in_arguments_are_resolved(self, executor):
+        with executor.start():
+            one = executor.submit(lambda: 1)
+            two = executor.submit(lambda x: x + 1, one)
+            res = executor.submit(lambda d, l: (d, l), dict(x=two), [one, (two,)])
+            assert executor.wait(res) == (dict(x=2), [1, (2,)])
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_wait_resolves_mapped_states(self, executor):
+        with executor.start():
+            state = Mapped(map_states=executor.map(lambda x: Success(result=x), [1, 2]))
+            res = executor.wait(dict(a=executor.submit(lambda s: s, state)))
+        assert [s.result for s in res["a"].map_states] == [1, 2]
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_wait_raises_errors_from_submitted_functions(self, executor):
+        def fail():
+            raise ZeroDivisionError("bad")
+
+        with executor.start():
+            with pytest.raises(ZeroDivisionError):
+                executor.wait(executor.submit(fail))
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_as_completed_yields_every_future_once_finished(self, executor):
+        with executor.start():
+            futures = executor.map(lambda x: x * 2, [1, 2, 3])
+            completed = list(executor.as_completed(futures))
+            assert all(f.done() for f in completed)
+            assert sorted(executor.wait(completed)) == [2, 4, 6]
+
+    @pytest.mark.parametrize("executor", ["threads", "aio"], indirect=True)
+    def test_futures_can_be_added_to_as_completed(self, executor):
+        with executor.start():
+            event = threading.Event()
+            slow = executor.submit(event.wait)
+            completed = executor.as_completed([slow])
+            completed.add(executor.submit(lambda: 1))
+            assert executor.wait(next(completed)) == 1
+            event.set()
+            assert next(completed) is slow
+            with pytest.raises(StopIteration):
+                next(completed)
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_queue_shares_values_across_tasks(self, executor):
+        with executor.start():
+            q = executor.queue()
+            executor.wait(executor.submit(lambda q: q.put(1), q))
+            assert q.get(timeout=5) == 1
+
+    @pytest.mark.parametrize("executor", ["threads", "processes", "aio"], indirect=True)
+    def test_is_pickleable_after_start(self, executor):
+        with executor.start():
+            executor.queue()
+            post = cloudpickle.loads(cloudpickle.dumps(executor))
+        assert isinstance(post, type(executor))
+        assert post.max_workers == executor.max_workers
+
+    def test_thread_pool_doesnt_deadlock_when_workers_wait_on_work(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        def parent():
+            return sum(executor.wait(executor.map(lambda x: x + 1, [1, 2, 3])))
+
+        with executor.start():
+            assert executor.wait(executor.submit(parent)) == 9
+
+    def test_process_pool_runs_work_in_other_processes(self):
+        import os
+
+        executor = ProcessPoolExecutor(max_workers=1)
+        with executor.start():
+            pid = executor.wait(executor.submit(os.getpid))
+        assert pid != os.getpid()
+
+    @pytest.mark.parametrize(
+        "cls,key",
+        [
+            (ThreadPoolExecutor, "engine.executor.threads.max_workers"),
+            (ProcessPoolExecutor, "engine.executor.processes.max_workers"),
+        ],
+    )
+    def test_max_workers_is_read_from_config(self, cls, key):
+        assert cls().max_workers is None
+        with set_temporary_config({key: 3}):
+            assert cls().max_workers == 3
+            assert cls(max_workers=1).max_workers == 1
+
+
+class TestAsyncioExecutor:
+    def test_submitted_coroutine_functions_are_run_on_the_event_loop(self, aio):
+        async def get_thread():
+            await asyncio.sleep(0)
+            return threading.current_thread().name
+
+        with aio.start():
+            assert aio.wait(aio.submit(get_thread)) == "PrefectAsyncioExecutor"
+
+    def test_coroutines_run_concurrently(self):
+        executor = AsyncioExecutor(max_workers=50)
+
+        async def nap(x):
+            await asyncio.sleep(0.5)
+            return x
+
+        start = time.time()
+        with executor.start():
+            res = executor.wait(executor.map(nap, range(50)))
+        assert res == list(range(50))
+        assert time.time() - start < 10
+
+    def test_coroutines_see_their_own_context(self, aio):
+        async def get_key():
+            await asyncio.sleep(0.1)
+            return prefect.context.get("key")
+
+        def run(x):
+            with prefect.context(key=x):
+                return aio.timeout_handler(get_key)
+
+        with aio.start():
+            assert aio.wait(aio.map(run, range(5))) == list(range(5))
+
+    def test_timeout_handler_times_out_coroutines(self, aio):
+        async def slow():
+            await asyncio.sleep(10)
+
+        with aio.start():
+            with pytest.raises(TimeoutError):
+                aio.wait(aio.submit(aio.timeout_handler, slow, timeout=1))
+
+    def test_timeout_handler_works_without_start(self, aio):
+        async def fn(x):
+            return x
+
+        assert aio.timeout_handler(fn, 1) == 1
+
+    @pytest.mark.parametrize("is_coroutine", [True, False])
+    def test_tag_limits_cap_concurrency(self, is_coroutine):
+        executor = AsyncioExecutor(max_workers=10, tag_limits={"svc": 2})
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def enter():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+
+        def leave():
+            with lock:
+                running[0] -= 1
+
+        async def async_call():
+            enter()
+            await asyncio.sleep(0.1)
+            leave()
+
+        def sync_call():
+            enter()
+            time.sleep(0.1)
+            leave()
+
+        def run(tags):
+            with prefect.context(task_tags=tags):
+                executor.timeout_handler(async_call if is_coroutine else sync_call)
+
+        with executor.start():
+            executor.wait(executor.map(run, [["svc", "other"]] * 8))
+        assert peak[0] == 2
+
+    def test_tag_limits_are_read_from_config(self):
+        with set_temporary_config({"engine.executor.asyncio.tag_limits.svc": 3}):
+            assert AsyncioExecutor().tag_limits == dict(svc=3)
+        assert AsyncioExecutor(tag_limits=dict(x=1)).tag_limits == dict(x=1)
+
+    def test_runs_flows_with_async_tasks(self, aio):
+        @prefect.task
+        async def inc(x):
+            await asyncio.sleep(0)
+            return x + 1
+
+        @prefect.task
+        def total(xs):
+            return sum(xs)
+
+        with prefect.Flow("async") as flow:
+            res = total(inc.map(inc.map([1, 2, 3])))
+
+        state = flow.run(executor=aio)
+        assert state.is_successful()
+        assert state.result[res].result == 12
+
+    def test_coroutine_task_runs_dont_hold_threads(self):
+        executor = AsyncioExecutor(max_workers=2)
+
+        @prefect.task
+        async def nap(x):
+            await asyncio.sleep(1)
+            return prefect.context.get("map_index")
+
+        with prefect.Flow("naps") as flow:
+            res = nap.map(list(range(20)))
+
+        start = time.time()
+        state = flow.run(executor=executor)
+        assert state.is_successful()
+        assert state.result[res].result == list(range(20))
+        # with a thread per run, two threads would take at least ten seconds
+        assert time.time() - start < 8
+
+    def test_task_runner_run_async(self, aio):
+        @prefect.task(timeout=1)
+        async def slow(x):
+            await asyncio.sleep(x)
+            return x
+
+        edge = prefect.core.Edge(prefect.Task(), slow, key="x")
+        runner = prefect.engine.TaskRunner(task=slow)
+        with aio.start():
+            fast, timed_out = aio.wait(
+                [
+                    aio.submit(
+                        runner.run_async,
+                        upstream_states={edge: Success(result=x)},
+                        executor=aio,
+                    )
+                    for x in [0, 10]
+                ]
+            )
+        assert fast.is_successful() and fast.result == 0
+        assert isinstance(timed_out, prefect.engine.state.TimedOut)
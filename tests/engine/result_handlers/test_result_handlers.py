@@ -1,6 +1,10 @@
+import base64
 import json
+import mmap
 import os
+import sys
 import tempfile
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import cloudpickle
@@ -16,6 +20,7 @@ from prefect.engine.result_handlers import (
     ResultHandler,
     S3ResultHandler,
 )
+from prefect.engine.serializers import get_serializer
 from prefect.utilities.configuration import set_temporary_config
 
 
@@ -81,6 +86,168 @@ class TestLocalHandler:
         new = cloudpickle.loads(cloudpickle.dumps(handler))
         assert isinstance(new, LocalResultHandler)
 
+    @pytest.mark.parametrize("compression", ["gzip", "zstd", "lz4"])
+    def test_local_handler_compresses(self, tmp_dir, compression):
+        if compression == "zstd":
+            pytest.importorskip("zstandard")
+        elif compression == "lz4":
+            pytest.importorskip("lz4.frame")
+        handler = LocalResultHandler(dir=tmp_dir, compression=compression)
+        fpath = handler.write("a" * 10000)
+        assert os.path.getsize(fpath) < 1000
+        assert handler.read(fpath) == "a" * 10000
+
+    def test_local_handler_reads_results_of_any_compression(self, tmp_dir):
+        fpath = LocalResultHandler(dir=tmp_dir, compression="gzip").write(42)
+        assert LocalResultHandler(dir=tmp_dir).read(fpath) == 42
+
+    def test_local_handler_rejects_unknown_compression(self):
+        with pytest.raises(ValueError, match="Unknown compression"):
+            LocalResultHandler(compression="rar")
+
+    def test_local_handler_records_serializer_in_location(self, tmp_dir):
+        handler = LocalResultHandler(dir=tmp_dir, serializers=["pickle5"])
+        fpath = handler.write({"x": 1})
+        assert fpath.endswith(".pickle5")
+        assert handler.read(fpath) == {"x": 1}
+        # results are read by their location, whatever the reader's serializers
+        assert LocalResultHandler(dir=tmp_dir).read(fpath) == {"x": 1}
+
+    def test_local_handler_falls_back_to_cloudpickle(self, tmp_dir):
+        handler = LocalResultHandler(dir=tmp_dir, serializers=["npy"])
+        fpath = handler.write(lambda: 42)
+        assert "." not in os.path.basename(fpath)
+        assert handler.read(fpath)() == 42
+
+    def test_local_handler_serializes_arrays_with_npy(self, tmp_dir):
+        np = pytest.importorskip("numpy")
+        handler = LocalResultHandler(dir=tmp_dir, serializers=["npy"])
+        fpath = handler.write(np.arange(10))
+        assert fpath.endswith(".npy")
+        assert (handler.read(fpath) == np.arange(10)).all()
+
+    def test_local_handler_reads_through_memory_map(self, tmp_dir, monkeypatch):
+        serializer = get_serializer("pickle")
+        load, loaded_from = serializer.load, []
+
+        def record_load(data):
+            loaded_from.append(type(data))
+            return load(data)
+
+        monkeypatch.setattr(serializer, "load", record_load)
+        handler = LocalResultHandler(dir=tmp_dir)
+        assert handler.read(handler.write([1, 2, 3])) == [1, 2, 3]
+        assert loaded_from == [mmap.mmap]
+
+    def test_local_handler_reads_empty_files(self, tmp_dir):
+        fd, fpath = tempfile.mkstemp(prefix="prefect-", dir=tmp_dir)
+        os.close(fd)
+        with pytest.raises(EOFError):
+            LocalResultHandler(dir=tmp_dir).read(fpath)
+
+    @pytest.mark.parametrize("serializer", ["npy", "pickle5"])
+    def test_local_handler_reads_arrays_as_views_of_the_file(self, tmp_dir, serializer):
+        np = pytest.importorskip("numpy")
+        if serializer == "pickle5" and sys.version_info < (3, 8):
+            pytest.importorskip("pickle5")
+        handler = LocalResultHandler(dir=tmp_dir, serializers=[serializer])
+        fpath = handler.write(np.arange(1000))
+        array = handler.read(fpath)
+        assert (array == np.arange(1000)).all()
+        assert not array.flags.owndata
+
+        # the mapping is copy-on-write
+        array[0] = 42
+        assert handler.read(fpath)[0] == 0
+
+    def test_local_handler_rejects_unknown_serializers(self):
+        with pytest.raises(ValueError, match="Unknown serializer"):
+            LocalResultHandler(serializers=["xml"])
+
+
+class TestContentAddressedLocalHandler:
+    @pytest.fixture
+    def handler(self, tmpdir):
+        return LocalResultHandler(dir=str(tmpdir), content_addressed=True)
+
+    def test_names_results_by_their_contents(self, handler):
+        loc = handler.write([1, 2, 3])
+        assert os.path.basename(loc).startswith("prefect-")
+        assert handler.write([1, 2, 3]) == loc
+        assert handler.write([1, 2, 4]) != loc
+        assert handler.read(loc) == [1, 2, 3]
+
+    def test_skips_writing_stored_results(self, handler):
+        loc = handler.write(42)
+        with patch("os.replace") as replace:
+            assert handler.write(42) == loc
+        assert not replace.called
+
+    def test_leaves_no_temporary_files(self, handler):
+        handler.write(42)
+        assert len(os.listdir(handler.dir)) == 1
+
+    def test_failed_writes_leave_no_files(self, handler):
+        with patch("os.replace", side_effect=OSError):
+            with pytest.raises(OSError):
+                handler.write(42)
+        assert os.listdir(handler.dir) == []
+
+    def test_compressed_results_are_deduplicated(self, handler):
+        compressed = LocalResultHandler(
+            dir=handler.dir, content_addressed=True, compression="gzip"
+        )
+        loc = compressed.write("a" * 10000)
+        assert handler.write("a" * 10000) == loc
+        assert handler.read(loc) == "a" * 10000
+
+
+class TestCollectGarbage:
+    @pytest.fixture
+    def handler(self, tmpdir):
+        return LocalResultHandler(dir=str(tmpdir), content_addressed=True)
+
+    def test_removes_unreferenced_results(self, handler):
+        keep, drop = handler.write(1), handler.write(2)
+        assert handler.collect_garbage([keep]) == [drop]
+        assert os.path.exists(keep)
+        assert not os.path.exists(drop)
+
+    def test_keeps_results_referenced_by_states(self, handler):
+        from prefect.engine.result import Result, SafeResult
+        from prefect.engine.state import Cached, Mapped, Success
+
+        result = Result(1, result_handler=handler)
+        result.store_safe_value()
+        cached = Cached(
+            result=SafeResult(handler.write(2), handler),
+            cached_inputs=dict(x=SafeResult(handler.write(3), handler)),
+        )
+        mapped = Mapped(map_states=[Success(result=result), cached])
+        flow_state = Success(result={"task": mapped})
+        drop = handler.write(4)
+
+        assert handler.collect_garbage([flow_state]) == [drop]
+        assert sorted(os.listdir(handler.dir)) == sorted(
+            os.path.basename(handler.write(v)) for v in [1, 2, 3]
+        )
+
+    def test_keeps_recent_results_within_grace_period(self, handler):
+        loc = handler.write(1)
+        assert handler.collect_garbage([], grace_period=timedelta(hours=1)) == []
+        os.utime(loc, (0, 0))
+        assert handler.collect_garbage([], grace_period=timedelta(hours=1)) == [loc]
+
+    def test_ignores_other_files(self, handler):
+        other = os.path.join(handler.dir, "notes.txt")
+        open(other, "w").close()
+        handler.collect_garbage([])
+        assert os.path.exists(other)
+
+    def test_requires_a_dir(self):
+        with pytest.raises(ValueError):
+            LocalResultHandler().collect_garbage([])
+
 
 def test_result_handlers_must_implement_read_and_write_to_work():
     class MyHandler(ResultHandler):
@@ -148,7 +315,7 @@ class TestGCSResultHandler:
         assert bucket.blob.call_args[0][0].startswith(
             pendulum.now("utc").format("Y/M/D")
         )
-        assert bucket.blob.call_args[0][0].endswith("prefect_result")
+        assert bucket.blob.call_args[0][0].endswith(".pickle")
 
     def test_gcs_uses_custom_secret_name(self):
         auth = MagicMock()
@@ -167,15 +334,77 @@ class TestGCSResultHandler:
 
         assert auth.Credentials.from_service_account_info.call_args[0][0] == 94611
 
-    def test_gcs_writes_binary_string(self, google_client):
-        blob = MagicMock()
-        google_client.return_value.bucket = MagicMock(
-            return_value=MagicMock(blob=MagicMock(return_value=blob))
-        )
+    @pytest.fixture
+    def bucket(self, google_client):
+        class Blob:
+            def __init__(self, name, chunk_size=None):
+                self.name, self.chunk_size, self.data = name, chunk_size, b""
+                self.ranges = []
+
+            @property
+            def size(self):
+                return len(self.data)
+
+            def upload_from_file(self, stream):
+                # resumable uploads read a chunk at a time, and end at a short read
+                assert stream.tell() == 0
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    self.data += chunk
+                    if len(chunk) < self.chunk_size:
+                        break
+
+            def download_as_string(self, start=None, end=None):
+                self.ranges.append((start, end))
+                if start is None:
+                    return self.data
+                return self.data[start : end + 1]
+
+        class Bucket:
+            def __init__(self):
+                self.blobs = {}
+
+            def blob(self, name, chunk_size=None):
+                return self.blobs.setdefault(name, Blob(name, chunk_size))
+
+            def get_blob(self, name):
+                return self.blobs.get(name)
+
+        bucket = Bucket()
+        google_client.return_value.bucket = MagicMock(return_value=bucket)
+        return bucket
+
+    def test_gcs_writes_raw_bytes(self, bucket):
         handler = GCSResultHandler(bucket="foo")
-        handler.write(None)
-        assert blob.upload_from_string.called
-        assert isinstance(blob.upload_from_string.call_args[0][0], str)
+        uri = handler.write(None)
+        assert bucket.blobs[uri].data == cloudpickle.dumps(None)
+
+    def test_gcs_part_size_is_a_multiple_of_256_kib(self):
+        assert GCSResultHandler(part_size=1).part_size == 256 * 1024
+        assert GCSResultHandler(part_size=512 * 1024).part_size == 512 * 1024
+
+    def test_gcs_writes_and_reads_with_serializers(self, bucket):
+        handler = GCSResultHandler(bucket="foo", serializers=["pickle5"])
+        uri = handler.write({"x": 1})
+        assert uri.endswith(".pickle5")
+        assert handler.read(uri) == {"x": 1}
+
+    def test_gcs_streams_large_results_in_parts(self, bucket):
+        handler = GCSResultHandler(bucket="foo", part_size=256 * 1024)
+        value = os.urandom(1024 * 1024 + 7)
+        uri = handler.write(value)
+        assert bucket.blobs[uri].chunk_size == 256 * 1024
+
+        assert handler.read(uri) == value
+        ranges = bucket.blobs[uri].ranges
+        assert len(ranges) == 5
+        assert sorted(ranges)[0] == (0, 256 * 1024 - 1)
+
+    def test_gcs_reads_base64_results(self, bucket):
+        uri = "2019/10/1/old.prefect_result"
+        blob = bucket.blob(uri)
+        blob.data = base64.b64encode(cloudpickle.dumps(42))
+        assert GCSResultHandler(bucket="foo").read(uri) == 42
 
     def test_gcs_handler_is_pickleable(self, google_client, monkeypatch):
         class gcs_bucket:
@@ -197,7 +426,10 @@ class TestS3ResultHandler:
         import boto3
 
         client = MagicMock()
-        with patch.dict("sys.modules", {"boto3": MagicMock(client=client)}):
+        with patch.dict(
+            "sys.modules",
+            {"boto3": MagicMock(client=client), "boto3.s3.transfer": MagicMock()},
+        ):
             yield client
 
     def test_s3_client_init_uses_secrets(self, s3_client):
@@ -244,7 +476,71 @@ class TestS3ResultHandler:
 
         assert used_uri == uri
         assert used_uri.startswith(pendulum.now("utc").format("Y/M/D"))
-        assert used_uri.endswith("prefect_result")
+        assert used_uri.endswith(".pickle")
+
+    @pytest.fixture
+    def objects(self, s3_client):
+        objects = {}
+
+        def upload_fileobj(stream, Bucket, Key, Config):
+            objects[Key] = stream.read()
+
+        def head_object(Bucket, Key):
+            return {"ContentLength": len(objects[Key])}
+
+        def download_fileobj(Bucket, Key, Fileobj, Config):
+            # ranged downloads write their parts in any order
+            data = objects[Key]
+            half = len(data) // 2
+            Fileobj.seek(half)
+            Fileobj.write(data[half:])
+            Fileobj.seek(0)
+            Fileobj.write(data[:half])
+
+        s3_client.return_value.upload_fileobj = upload_fileobj
+        s3_client.return_value.head_object = head_object
+        s3_client.return_value.download_fileobj = download_fileobj
+        with prefect.context(
+            secrets=dict(AWS_CREDENTIALS=dict(ACCESS_KEY=1, SECRET_ACCESS_KEY=42))
+        ):
+            with set_temporary_config({"cloud.use_local_secrets": True}):
+                yield objects
+
+    def test_s3_writes_raw_bytes(self, objects):
+        uri = S3ResultHandler(bucket="foo").write("so-much-data")
+        assert objects[uri] == cloudpickle.dumps("so-much-data")
+
+    def test_s3_writes_and_reads_with_serializers(self, objects):
+        handler = S3ResultHandler(bucket="foo", serializers=["pickle5"])
+        uri = handler.write({"x": 1})
+        assert uri.endswith(".pickle5")
+        assert handler.read(uri) == {"x": 1}
+
+    def test_s3_reads_large_results(self, objects):
+        handler = S3ResultHandler(bucket="foo")
+        value = os.urandom(1024 * 1024 + 7)
+        assert handler.read(handler.write(value)) == value
+
+    def test_s3_reads_base64_results(self, objects):
+        uri = "2019/10/1/old.prefect_result"
+        objects[uri] = base64.b64encode(cloudpickle.dumps(42))
+        assert S3ResultHandler(bucket="foo").read(uri) == 42
+
+    def test_s3_configures_transfers(self, s3_client, objects):
+        handler = S3ResultHandler(
+            bucket="foo", part_size=16 * 1024 * 1024, max_concurrency=4
+        )
+        handler.write(1)
+        transfer = sys.modules["boto3.s3.transfer"]
+        assert transfer.TransferConfig.call_args[1] == dict(
+            multipart_threshold=16 * 1024 * 1024,
+            multipart_chunksize=16 * 1024 * 1024,
+            max_concurrency=4,
+        )
+
+    def test_s3_part_size_must_be_at_least_5_mib(self):
+        with pytest.raises(ValueError):
+            S3ResultHandler(bucket="foo", part_size=1024)
 
     def test_s3_handler_is_pickleable(self, monkeypatch):
         class client:
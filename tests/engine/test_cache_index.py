@@ -0,0 +1,190 @@
+import threading
+from datetime import timedelta
+
+import cloudpickle
+import pendulum
+import pytest
+
+import prefect
+from prefect.engine.cache_index import CacheIndex
+from prefect.engine.cache_validators import (
+    all_inputs,
+    all_parameters,
+    duration_only,
+    never_use,
+    partial_inputs_only,
+)
+from prefect.engine.result import Result
+from prefect.engine.state import Cached
+from prefect.utilities.configuration import set_temporary_config
+
+
+def cached(minutes=10, inputs=None, parameters=None):
+    return Cached(
+        cached_result_expiration=pendulum.now("utc") + timedelta(minutes=minutes),
+        cached_inputs={k: Result(v) for k, v in (inputs or {}).items()},
+        cached_parameters=parameters,
+    )
+
+
+class TestMapping:
+    def test_behaves_like_a_dict_of_lists(self):
+        a, b = cached(), cached()
+        index = CacheIndex({"x": [a, b]})
+        assert list(index) == ["x"]
+        assert len(index) == 1
+        assert index.size == 2
+        assert index["x"] == [a, b]
+        assert index.get("y", []) == []
+
+    def test_setting_a_key_replaces_its_states(self):
+        a, b = cached(), cached()
+        index = CacheIndex({"x": [a]})
+        index["x"] = [b]
+        assert index["x"] == [b]
+        assert index.size == 1
+
+    def test_deleting_a_key_removes_its_states(self):
+        index = CacheIndex({"x": [cached()], "y": [cached()]})
+        del index["x"]
+        assert "x" not in index
+        assert index.size == 1
+
+    def test_adding_the_same_state_twice_is_ignored(self):
+        a = cached()
+        index = CacheIndex()
+        index.add("x", a, a)
+        index.add("x", a)
+        assert index["x"] == [a]
+
+    def test_survives_pickling(self):
+        a = cached(inputs=dict(x=1))
+        index = cloudpickle.loads(cloudpickle.dumps(CacheIndex({"x": [a]})))
+        assert isinstance(index, CacheIndex)
+        assert index.size == 1
+        assert index["x"][0].cached_inputs["x"].value == 1
+
+
+class TestEviction:
+    def test_evict_expired(self):
+        old, new = cached(minutes=1), cached(minutes=10)
+        index = CacheIndex({"x": [old, new]})
+        assert index.evict_expired(pendulum.now("utc") + timedelta(minutes=5)) == 1
+        assert index["x"] == [new]
+
+    def test_evicting_every_state_of_a_key_removes_it(self):
+        index = CacheIndex({"x": [cached(minutes=1)]})
+        index.evict_expired(pendulum.now("utc") + timedelta(minutes=5))
+        assert "x" not in index
+        assert index.size == 0
+
+    def test_max_entries_evicts_first_to_expire(self):
+        index = CacheIndex(max_entries=2)
+        a, b, c = cached(minutes=30), cached(minutes=10), cached(minutes=20)
+        index.add("x", a, b)
+        index.add("y", c)
+        assert index.size == 2
+        assert index["x"] == [a]
+        assert index["y"] == [c]
+
+    def test_max_entries_defaults_to_config(self):
+        with set_temporary_config({"engine.cache.max_entries": 3}):
+            assert CacheIndex().max_entries == 3
+        with set_temporary_config({"engine.cache.max_entries": False}):
+            assert CacheIndex().max_entries is None
+
+    def test_states_without_expiration_are_evicted_last(self):
+        forever = Cached()
+        index = CacheIndex({"x": [forever, cached()]}, max_entries=1)
+        assert index["x"] == [forever]
+
+    def test_evicted_states_are_removed_from_lookups(self):
+        a = cached(minutes=1, inputs=dict(x=1))
+        index = CacheIndex({"t": [a]})
+        assert index.candidates("t", all_inputs, dict(x=1), None) == [a]
+        index.evict_expired(pendulum.now("utc") + timedelta(minutes=5))
+        assert index.candidates("t", all_inputs, dict(x=1), None) == []
+
+    def test_heap_is_compacted(self):
+        index = CacheIndex()
+        for _ in range(500):
+            index["x"] = [cached()]
+        assert index.size == 1
+        assert len(index._expirations) <= 102
+
+
+class TestCandidates:
+    def test_matches_states_by_inputs(self):
+        states = [cached(inputs=dict(x=i)) for i in range(100)]
+        index = CacheIndex({"t": states})
+        assert index.candidates("t", all_inputs, dict(x=42), None) == [states[42]]
+        assert index.candidates("t", all_inputs, dict(x=100), None) == []
+
+    def test_matches_states_by_parameters(self):
+        a, b = cached(parameters=dict(p=1)), cached(parameters=dict(p=2))
+        index = CacheIndex({"t": [a, b]})
+        assert index.candidates("t", all_parameters, {}, dict(p=2)) == [b]
+        assert index.candidates("t", all_parameters, {}, None) == []
+
+    def test_matches_states_by_some_inputs(self):
+        a = cached(inputs=dict(x=1, y=1))
+        b = cached(inputs=dict(x=1, y=2))
+        c = cached(inputs=dict(x=2, y=1))
+        index = CacheIndex({"t": [a, b, c]})
+        validator = partial_inputs_only(["x"])
+        assert index.candidates("t", validator, dict(x=1, y=3), None) == [a, b]
+
+    def test_states_added_later_are_indexed(self):
+        index = CacheIndex({"t": [cached(inputs=dict(x=1))]})
+        assert len(index.candidates("t", all_inputs, dict(x=2), None)) == 0
+        b = cached(inputs=dict(x=2))
+        index.add("t", b)
+        assert index.candidates("t", all_inputs, dict(x=2), None) == [b]
+
+    @pytest.mark.parametrize("validator", [duration_only, never_use])
+    def test_returns_every_state_without_fingerprint_components(self, validator):
+        states = [cached(inputs=dict(x=i)) for i in range(3)]
+        index = CacheIndex({"t": states})
+        assert index.candidates("t", validator, dict(x=7), None) == states
+
+    def test_unfingerprintable_states_are_always_candidates(self):
+        a = cached(inputs=dict(x=threading.Lock()))  # locks can't be pickled
+        b = cached(inputs=dict(x=1))
+        c = cached(inputs=dict(x=2))
+        index = CacheIndex({"t": [a, b, c]})
+        assert index.candidates("t", all_inputs, dict(x=2), None) == [a, c]
+
+    def test_unfingerprintable_inputs_return_every_state(self):
+        states = [cached(inputs=dict(x=i)) for i in range(3)]
+        index = CacheIndex({"t": states})
+        assert (
+            index.candidates("t", all_inputs, dict(x=threading.Lock()), None) == states
+        )
+
+    def test_unknown_key(self):
+        assert CacheIndex().candidates("t", all_inputs, {}, None) == []
+
+
+class TestTaskRunnerLookups:
+    def test_task_runner_uses_index(self):
+        task = prefect.Task(
+            cache_for=timedelta(minutes=1), cache_validator=all_inputs, name="t"
+        )
+        states = [cached(inputs=dict(x=i)) for i in range(10)]
+        for i, state in enumerate(states):
+            state._result = Result(i)
+        calls = []
+
+        def validator(state, inputs, parameters):
+            calls.append(state)
+            return all_inputs(state, inputs, parameters)
+
+        validator.fingerprint_components = all_inputs.fingerprint_components
+        task.cache_validator = validator
+        with prefect.context(caches=CacheIndex({"t": states})):
+            new = prefect.engine.TaskRunner(task).check_task_is_cached(
+                state=prefect.engine.state.Pending(), inputs=dict(x=Result(7))
+            )
+        assert new is states[7]
+        assert new.result == 7
+        assert calls == [states[7]]
@@ -1,18 +1,24 @@
+import threading
 from datetime import timedelta
 
 import pendulum
 import pytest
 
+import prefect.engine.cache_validators as cache_validators
 from prefect.engine.cache_validators import (
+    FingerprintedInputs,
     all_inputs,
     all_parameters,
     duration_only,
+    input_fingerprints,
     never_use,
     partial_inputs_only,
     partial_parameters_only,
+    validates_on,
 )
 from prefect.engine.result import Result
 from prefect.engine.state import Cached
+from prefect.utilities.hashing import fingerprint
 
 all_validators = [all_inputs, all_parameters, never_use, duration_only]
 stateful_validators = [partial_inputs_only, partial_parameters_only]
@@ -57,6 +63,64 @@ class TestAllInputs:
         state = Cached(cached_inputs=dict(x=Result(1), s=Result("str")))
         assert all_inputs(state, dict(x=1, s="str", noise="e"), None) is False
 
+    def test_fingerprints_validate(self):
+        state = Cached(
+            cached_input_fingerprints=dict(x=fingerprint(1), s=fingerprint("str"))
+        )
+        assert all_inputs(state, dict(x=1, s="str"), None) is True
+        assert all_inputs(state, dict(x=1, s="strs"), None) is False
+        assert all_inputs(state, dict(x=1), None) is False
+        assert all_inputs(state, dict(x=1, s="str", noise="e"), None) is False
+
+    def test_fingerprints_of_unfingerprintable_inputs_invalidate(self):
+        state = Cached(cached_input_fingerprints=dict(x=fingerprint(1)))
+        assert all_inputs(state, dict(x=threading.Lock()), None) is False
+
+    def test_fingerprints_are_not_compared_with_unfingerprintable_inputs(self):
+        class NoEquality:
+            def __eq__(self, other):
+                raise ValueError("The truth value of an array is ambiguous")
+
+        state = Cached(cached_input_fingerprints=dict(x=fingerprint(1)))
+        assert all_inputs(state, dict(x=NoEquality()), None) is False
+
+    def test_inputs_are_fingerprinted_once_per_lookup(self, monkeypatch):
+        calls = []
+
+        def counting_fingerprint(value):
+            calls.append(value)
+            return fingerprint(value)
+
+        monkeypatch.setattr(cache_validators, "fingerprint", counting_fingerprint)
+        states = [
+            Cached(cached_input_fingerprints=dict(x=fingerprint(i), s=fingerprint("s")))
+            for i in range(3)
+        ]
+        inputs = FingerprintedInputs(x=2, s="s")
+        assert [all_inputs(state, inputs, None) for state in states] == [
+            False,
+            False,
+            True,
+        ]
+        assert sorted(calls, key=str) == [2, "s"]
+
+
+class TestInputFingerprints:
+    def test_fingerprints_all_or_named_inputs(self):
+        assert input_fingerprints(dict(x=1, s="str")) == dict(
+            x=fingerprint(1), s=fingerprint("str")
+        )
+        assert input_fingerprints(dict(x=1, s="str"), ["x", "y"]) == dict(
+            x=fingerprint(1)
+        )
+        assert input_fingerprints(None) == {}
+
+    def test_unfingerprintable_inputs_return_none(self):
+        assert input_fingerprints(dict(x=threading.Lock())) is None
+        assert input_fingerprints(dict(x=threading.Lock(), y=1), ["y"]) == dict(
+            y=fingerprint(1)
+        )
+
 
 class TestAllParameters:
     def test_parameters_invalidate(self):
@@ -101,6 +165,15 @@ class TestPartialInputsOnly:
             is False
         )
 
+    def test_validate_on_fingerprints(self):
+        state = Cached(
+            cached_input_fingerprints=dict(x=fingerprint(1), s=fingerprint("str"))
+        )
+        validator = partial_inputs_only(validate_on=["x"])
+        assert validator(state, dict(x=1, s="strs"), None) is True
+        assert validator(state, dict(x=2, s="str"), None) is False
+        assert validator(state, dict(s="str"), None) is False
+
     def test_handles_none(self):
         state = Cached(cached_parameters=dict(x=5))
         assert partial_inputs_only(validate_on=["x"])(state, dict(x=5), None) is False
@@ -158,3 +231,53 @@ class TestPartialParametersOnly:
         validator = partial_parameters_only(validate_on=["x"])
         assert validator(state, None, dict(x=1)) is True
         assert validator(state, None, dict(x=2, s="str")) is False
+
+
+class TestValidatesOn:
+    def test_declares_no_components_by_default(self):
+        @validates_on()
+        def validator(state, inputs, parameters):
+            return True
+
+        assert validator.fingerprint_components == ()
+
+    def test_declares_all_or_named_components(self):
+        @validates_on(inputs=True, parameters=["b", "a", "b"])
+        def validator(state, inputs, parameters):
+            return True
+
+        assert validator.fingerprint_components == (
+            ("inputs", None),
+            ("parameters", ("a", "b")),
+        )
+
+    def test_builtin_validators_declare_components(self):
+        assert duration_only.fingerprint_components == ()
+        assert all_inputs.fingerprint_components == (("inputs", None),)
+        assert all_parameters.fingerprint_components == (("parameters", None),)
+        assert not hasattr(never_use, "fingerprint_components")
+
+    def test_partial_validators_declare_components(self):
+        assert partial_inputs_only(["y", "x"]).fingerprint_components == (
+            ("inputs", ("x", "y")),
+        )
+        assert partial_parameters_only(["p"]).fingerprint_components == (
+            ("parameters", ("p",)),
+        )
+        assert partial_inputs_only().fingerprint_components == ()
+
+    def test_docstring_example_validates_runner_cached_states(self):
+        @validates_on(inputs=["x"])
+        def same_x(state, inputs, parameters):
+            cached = state.cached_input_fingerprints or {}
+            return duration_only(state, inputs, parameters) and (
+                input_fingerprints(inputs, ["x"]) == {"x": cached.get("x")}
+            )
+
+        # task runners cache states with the fingerprints of their inputs only
+        state = Cached(
+            cached_inputs=None,
+            cached_input_fingerprints=input_fingerprints(dict(x=1, y=2)),
+        )
+        assert same_x(state, dict(x=1, y=3), None) is True
+        assert same_x(state, dict(x=2, y=2), None) is False
@@ -526,7 +526,9 @@ class TestRunFlowStep:
 
 class TestInputCaching:
     @pytest.mark.parametrize(
-        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+        "executor",
+        ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+        indirect=True,
     )
     def test_retries_use_cached_inputs(self, executor):
         with Flow(name="test") as f:
@@ -553,7 +555,9 @@ class TestInputCaching:
         assert second_state.result[b_res].result == 1
 
     @pytest.mark.parametrize(
-        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+        "executor",
+        ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+        indirect=True,
     )
     def test_retries_cache_parameters_as_well(self, executor):
         with Flow(name="test") as f:
@@ -582,7 +586,9 @@ class TestInputCaching:
         assert second_state.result[b_res].result == 1
 
     @pytest.mark.parametrize(
-        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+        "executor",
+        ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+        indirect=True,
     )
     def test_retries_ignore_cached_inputs_if_upstream_results_are_available(
         self, executor
@@ -609,7 +615,9 @@ class TestInputCaching:
         assert second_state.result[b_res].result == 1 / 99
 
     @pytest.mark.parametrize(
-        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+        "executor",
+        ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+        indirect=True,
     )
     def test_manual_only_trigger_caches_inputs(self, executor):
         with Flow(name="test") as f:
@@ -638,7 +646,9 @@ class TestInputCaching:
 
 class TestOutputCaching:
     @pytest.mark.parametrize(
-        "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+        "executor",
+        ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+        indirect=True,
     )
     def test_providing_cachedstate_with_simple_example(self, executor):
         class TestTask(Task):
@@ -1186,6 +1196,103 @@ def test_parameters_overwrite_context_only_if_key_matches():
     assert state.result[y].result == 6
 
 
+class TestSubmitWhenReady:
+    @pytest.fixture(autouse=True)
+    def submit_when_ready(self):
+        with prefect.utilities.configuration.set_temporary_config(
+            {"engine.flow_runner.submit_when_ready": True}
+        ):
+            yield
+
+    @pytest.mark.parametrize(
+        "executor", ["local", "mthread", "mproc", "sync"], indirect=True
+    )
+    def test_runs_dependent_tasks(self, executor):
+        with Flow(name="test") as flow:
+            x = AddTask()(1, 1)
+            y = AddTask()(x, 2)
+            z = AddTask()(x, y)
+
+        state = FlowRunner(flow=flow).run(return_tasks=[x, y, z], executor=executor)
+        assert state.is_successful()
+        assert state.result[x].result == 2
+        assert state.result[y].result == 4
+        assert state.result[z].result == 6
+
+    @pytest.mark.parametrize(
+        "executor", ["local", "mthread", "mproc", "sync"], indirect=True
+    )
+    def test_failures_are_propagated(self, executor):
+        with Flow(name="test") as flow:
+            x = ErrorTask()
+            y = AddTask()(x, 2)
+
+        state = FlowRunner(flow=flow).run(return_tasks=[x, y], executor=executor)
+        assert state.is_failed()
+        assert state.result[x].is_failed()
+        assert isinstance(state.result[y], TriggerFailed)
+
+    @pytest.mark.parametrize("executor", ["local", "mthread", "sync"], indirect=True)
+    def test_mapped_tasks_run(self, executor):
+        with Flow(name="test") as flow:
+            x = AddTask().map([1, 2, 3], [1, 1, 1])
+            y = AddTask().map(x, x)
+
+        state = FlowRunner(flow=flow).run(return_tasks=[y], executor=executor)
+        assert state.is_successful()
+        assert state.result[y].result == [4, 6, 8]
+
+    def test_finished_tasks_are_not_rerun(self):
+        with Flow(name="test") as flow:
+            x = CountTask()
+            y = AddTask()(x, 1)
+
+        state = FlowRunner(flow=flow).run(
+            return_tasks=[y], task_states={x: Success(result=10)}
+        )
+        assert state.result[y].result == 11
+
+    @pytest.mark.parametrize("executor", ["local", "mthread"], indirect=True)
+    def test_queue_wait_is_provided_in_context(self, executor):
+        @prefect.task
+        def queue_wait():
+            return prefect.context.get("task_queue_wait")
+
+        flow = Flow(name="test", tasks=[queue_wait])
+        state = FlowRunner(flow=flow).run(return_tasks=[queue_wait], executor=executor)
+        assert state.result[queue_wait].result >= 0
+
+    def test_queue_wait_is_provided_in_running_state(self):
+        messages = []
+
+        def record(task_runner, old, new):
+            if new.is_running():
+                messages.append(new.message)
+
+        flow = Flow(name="test", tasks=[SuccessTask(state_handlers=[record])])
+        FlowRunner(flow=flow).run()
+        (message,) = messages
+        assert message.startswith("Starting task run after waiting")
+
+    def test_tasks_are_submitted_once_their_upstream_tasks_finish(self):
+        submitted = []
+
+        class RecordingExecutor(LocalExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.append(kwargs["task"])
+                return super().submit(fn, *args, **kwargs)
+
+        a, b, c = SuccessTask(), SuccessTask(), SuccessTask()
+        flow = Flow(name="test")
+        flow.add_edge(a, b)
+        flow.add_task(c)
+
+        # in topological order b would be submitted before c
+        assert flow.sorted_tasks() == (a, b, c)
+        FlowRunner(flow=flow).run(executor=RecordingExecutor())
+        assert submitted == [a, c, b]
+
+
 class TestMapping:
     @pytest.mark.parametrize(
         "executor", ["local", "mthread", "mproc", "sync"], indirect=True
@@ -1452,7 +1559,9 @@ class TestContext:
 
 
 @pytest.mark.parametrize(
-    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+    "executor",
+    ["local", "sync", "mproc", "mthread", "threads", "processes", "aio"],
+    indirect=True,
 )
 def test_task_logs_survive_if_timeout_is_used(caplog, executor):
     @prefect.task(timeout=2)
@@ -0,0 +1,176 @@
+import threading
+import time
+
+import pytest
+
+from prefect.engine.result import SafeResult
+from prefect.engine.result_cache import ResultCache, get_result_cache
+from prefect.engine.result_handlers import (
+    JSONResultHandler,
+    LocalResultHandler,
+    ResultHandler,
+)
+from prefect.utilities.configuration import set_temporary_config
+
+
+class CountingHandler(ResultHandler):
+    cache_reads = True
+
+    def __init__(self, delay=0):
+        self.reads = []
+        self.delay = delay
+        super().__init__()
+
+    def read(self, loc):
+        self.reads.append(loc)
+        time.sleep(self.delay)
+        return "value of {}".format(loc)
+
+    def write(self, result):
+        pass
+
+
+class TestResultCache:
+    def test_caches_reads_by_handler_type_and_location(self):
+        cache = ResultCache(max_bytes=10000)
+        handler = CountingHandler()
+        assert cache.read(handler, "a") == "value of a"
+        assert cache.read(handler, "a") == "value of a"
+        assert cache.read(CountingHandler(), "a") == "value of a"
+        assert cache.read(handler, "b") == "value of b"
+        assert handler.reads == ["a", "b"]
+        assert cache.stats() == dict(
+            hits=2, misses=2, evictions=0, entries=2, size=cache.size
+        )
+
+    def test_handlers_without_cache_reads_are_not_cached(self):
+        cache = ResultCache(max_bytes=10000)
+        assert cache.read(JSONResultHandler(), "[1, 2]") == [1, 2]
+        assert len(cache) == 0
+
+    def test_unhashable_locations_are_not_cached(self):
+        cache = ResultCache(max_bytes=10000)
+        handler = CountingHandler()
+        cache.read(handler, ["a"])
+        cache.read(handler, ["a"])
+        assert len(handler.reads) == 2
+
+    def test_evicts_least_recently_used_values_by_size(self):
+        cache = ResultCache(max_bytes=2500)
+        cache.put("a", b"a" * 1000)
+        cache.put("b", b"b" * 1000)
+        cache.get_or_read("a", lambda: None)  # "a" is now the most recently used
+        cache.put("c", b"c" * 1000)
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.evictions == 1
+        assert cache.size <= 2500
+
+    def test_values_larger_than_the_cache_are_not_cached(self):
+        cache = ResultCache(max_bytes=100)
+        cache.put("a", b"a" * 1000)
+        assert len(cache) == 0
+
+    def test_none_is_not_cached(self):
+        cache = ResultCache(max_bytes=100)
+        cache.put("a", None)
+        assert len(cache) == 0
+
+    def test_size_of_containers_includes_their_contents(self):
+        cache = ResultCache(max_bytes=100000)
+        cache.put("a", [b"x" * 1000, {"y": b"y" * 1000}])
+        assert cache.size > 2000
+
+    def test_size_of_arrays(self):
+        np = pytest.importorskip("numpy")
+        cache = ResultCache(max_bytes=10 ** 7)
+        array = np.zeros(10 ** 5)
+        cache.put("a", array)
+        cache.put("b", array[::2])
+        assert cache.size > 8 * 10 ** 5 + 4 * 10 ** 5
+
+    def test_disabled_cache_always_reads(self):
+        cache = ResultCache(max_bytes=0)
+        handler = CountingHandler()
+        cache.read(handler, "a")
+        cache.read(handler, "a")
+        assert handler.reads == ["a", "a"]
+
+    def test_concurrent_reads_of_a_location_read_it_once(self):
+        cache = ResultCache(max_bytes=10000)
+        handler = CountingHandler(delay=0.2)
+        values = []
+        threads = [
+            threading.Thread(target=lambda: values.append(cache.read(handler, "a")))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert values == ["value of a"] * 5
+        assert handler.reads == ["a"]
+
+    def test_failed_reads_are_not_cached(self):
+        cache = ResultCache(max_bytes=10000)
+        calls = []
+
+        def read():
+            calls.append(1)
+            raise OSError()
+
+        with pytest.raises(OSError):
+            cache.get_or_read("a", read)
+        with pytest.raises(OSError):
+            cache.get_or_read("a", read)
+        assert len(calls) == 2
+
+    def test_clear(self):
+        cache = ResultCache(max_bytes=10000)
+        cache.put("a", "x")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    def test_max_bytes_defaults_to_config(self):
+        with set_temporary_config({"engine.result_cache.max_bytes": 123}):
+            assert ResultCache().max_bytes == 123
+        with set_temporary_config({"engine.result_cache.max_bytes": False}):
+            assert ResultCache().max_bytes == 0
+
+
+class TestGetResultCache:
+    def test_is_disabled_by_default(self):
+        assert get_result_cache().max_bytes == 0
+
+    def test_is_shared(self):
+        assert get_result_cache() is get_result_cache()
+
+    def test_follows_config(self):
+        with set_temporary_config({"engine.result_cache.max_bytes": 4321}):
+            assert get_result_cache().max_bytes == 4321
+
+
+class TestToResult:
+    def test_to_result_reads_through_the_cache(self, tmpdir, monkeypatch):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        loc = handler.write([1, 2, 3])
+        reads = []
+        monkeypatch.setattr(handler, "read", lambda loc: reads.append(loc) or [1, 2, 3])
+
+        with set_temporary_config({"engine.result_cache.max_bytes": 10000}):
+            first = SafeResult(loc, handler).to_result()
+            second = SafeResult(loc, handler).to_result()
+        assert first.value == second.value == [1, 2, 3]
+        assert first.safe_value.value == loc
+        assert reads == [loc]
+
+    def test_to_result_without_cache(self, tmpdir, monkeypatch):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        loc = handler.write(1)
+        reads = []
+        monkeypatch.setattr(handler, "read", lambda loc: reads.append(loc) or 1)
+        with set_temporary_config({"engine.result_cache.max_bytes": False}):
+            SafeResult(loc, handler).to_result()
+            SafeResult(loc, handler).to_result()
+        assert len(reads) == 2
@@ -0,0 +1,171 @@
+import io
+import sys
+
+import pytest
+
+import prefect
+from prefect.engine.serializers import (
+    Pickle5Serializer,
+    PickleSerializer,
+    Serializer,
+    get_serializer,
+    register_serializer,
+)
+
+
+class TestRegistry:
+    @pytest.mark.parametrize("name", ["pickle", "pickle5", "npy", "arrow", "parquet"])
+    def test_builtin_serializers_are_registered(self, name):
+        serializer = get_serializer(name)
+        assert isinstance(serializer, Serializer)
+        assert serializer.name == name
+
+    def test_unknown_serializer(self):
+        with pytest.raises(ValueError, match="Unknown serializer"):
+            get_serializer("xml")
+
+    def test_register_serializer(self, monkeypatch):
+        class TextSerializer(Serializer):
+            name = "test-text"
+
+            def dump(self, value, stream):
+                stream.write(value.encode())
+
+            def load(self, data):
+                return bytes(data).decode()
+
+        monkeypatch.setattr(prefect.engine.serializers, "_serializers", {})
+        register_serializer(TextSerializer())
+        serializer = get_serializer("test-text")
+        assert serializer.load(serializer.dumps("hi")) == "hi"
+
+
+class TestStream:
+    def test_streams_the_serialized_value(self):
+        serializer = get_serializer("pickle")
+        value = list(range(100000))
+        with serializer.stream(value) as stream:
+            assert stream.tell() == 0
+            data = stream.read(1000)
+            assert len(data) == 1000
+            assert stream.tell() == 1000
+            data += stream.read()
+        assert data == serializer.dumps(value)
+
+    def test_raises_errors_from_serializing(self):
+        class Unpicklable:
+            def __reduce__(self):
+                raise RuntimeError("can't pickle")
+
+        serializer = get_serializer("pickle")
+        with pytest.raises(RuntimeError, match="can't pickle"):
+            with serializer.stream([b"x" * 1000000, Unpicklable()]) as stream:
+                while stream.read(65536):
+                    pass
+
+    def test_readers_can_stop_early(self):
+        serializer = get_serializer("pickle")
+        with serializer.stream(b"x" * 10000000) as stream:
+            stream.read(10)
+
+
+class TestPickleSerializer:
+    def test_roundtrip(self):
+        serializer = PickleSerializer()
+        fn = serializer.load(serializer.dumps(lambda x: x + 1))
+        assert fn(1) == 2
+
+    def test_loads_from_memoryview(self):
+        serializer = PickleSerializer()
+        assert serializer.load(memoryview(serializer.dumps([1, 2]))) == [1, 2]
+
+
+class TestPickle5Serializer:
+    @pytest.mark.parametrize("value", [42, {"a": [1, 2]}, None, b"bytes"])
+    def test_roundtrip(self, value):
+        serializer = Pickle5Serializer()
+        assert serializer.load(serializer.dumps(value)) == value
+
+    def test_falls_back_to_cloudpickle(self):
+        serializer = Pickle5Serializer()
+        fn = serializer.load(serializer.dumps(lambda x: x + 1))
+        assert fn(1) == 2
+
+    def test_rejects_other_data(self):
+        with pytest.raises(ValueError):
+            Pickle5Serializer().load(PickleSerializer().dumps(42))
+
+    def test_arrays_are_aligned_views_of_the_data(self):
+        np = pytest.importorskip("numpy")
+        if sys.version_info < (3, 8):
+            pytest.importorskip("pickle5")
+        serializer = Pickle5Serializer()
+        data = bytearray(serializer.dumps([np.arange(3, dtype="int8"), np.arange(5)]))
+        small, large = serializer.load(data)
+        assert (small == np.arange(3)).all()
+        assert (large == np.arange(5)).all()
+        base = np.frombuffer(data, dtype="uint8").ctypes.data
+        for array in (small, large):
+            assert not array.flags.owndata
+            assert (array.ctypes.data - base) % 64 == 0
+
+
+class TestNumpySerializer:
+    @pytest.fixture
+    def np(self):
+        return pytest.importorskip("numpy")
+
+    def test_can_serialize_arrays_only(self, np):
+        serializer = get_serializer("npy")
+        assert serializer.can_serialize(np.arange(3))
+        assert not serializer.can_serialize(np.array([object()]))
+        assert not serializer.can_serialize([1, 2, 3])
+
+    @pytest.mark.parametrize("order", ["C", "F"])
+    def test_roundtrip(self, np, order):
+        serializer = get_serializer("npy")
+        array = np.asarray(np.arange(12).reshape(3, 4), order=order)
+        loaded = serializer.load(bytearray(serializer.dumps(array)))
+        assert loaded.shape == (3, 4)
+        assert (loaded == array).all()
+        assert not loaded.flags.owndata
+
+    def test_empty_arrays(self, np):
+        serializer = get_serializer("npy")
+        loaded = serializer.load(serializer.dumps(np.zeros((0, 3))))
+        assert loaded.shape == (0, 3)
+
+    def test_matches_numpy(self, np):
+        array = np.arange(5, dtype="float32")
+        stream = io.BytesIO()
+        np.save(stream, array)
+        assert get_serializer("npy").dumps(array) == stream.getvalue()
+
+
+class TestTableSerializers:
+    @pytest.fixture
+    def pd(self):
+        pytest.importorskip("pyarrow")
+        return pytest.importorskip("pandas")
+
+    @pytest.mark.parametrize("name", ["arrow", "parquet"])
+    def test_dataframe_roundtrip(self, pd, name):
+        serializer = get_serializer(name)
+        df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+        assert serializer.can_serialize(df)
+        loaded = serializer.load(serializer.dumps(df))
+        assert isinstance(loaded, pd.DataFrame)
+        assert loaded.equals(df)
+
+    @pytest.mark.parametrize("name", ["arrow", "parquet"])
+    def test_table_roundtrip(self, pd, name):
+        import pyarrow as pa
+
+        serializer = get_serializer(name)
+        table = pa.table({"a": [1, 2, 3]})
+        loaded = serializer.load(serializer.dumps(table))
+        assert isinstance(loaded, pa.Table)
+        assert loaded.column("a").to_pylist() == [1, 2, 3]
+
+    def test_can_not_serialize_other_values(self):
+        assert not get_serializer("arrow").can_serialize([1, 2, 3])
@@ -17,6 +17,7 @@ from prefect.engine.state import (
     Failed,
     Finished,
     Mapped,
+    MappedStates,
     Paused,
     Pending,
     Queued,
@@ -209,6 +210,16 @@ def test_serialize_and_deserialize_on_safe_cached_state():
     assert new_state.cached_inputs == state.cached_inputs
 
 
+def test_serialize_and_deserialize_cached_input_fingerprints():
+    state = Cached(
+        result=SafeResult("1", result_handler=JSONResultHandler()),
+        cached_input_fingerprints=dict(x="abc", y="def"),
+    )
+    new_state = State.deserialize(state.serialize())
+    assert new_state.cached_input_fingerprints == dict(x="abc", y="def")
+    assert new_state.cached_inputs is None
+
+
 def test_serialization_of_cached_inputs():
     safe5 = SafeResult(5, result_handler=JSONResultHandler())
     state = Pending(cached_inputs=dict(hi=safe5, bye=safe5))
@@ -349,3 +360,120 @@ def test_state_is_methods(state_check):
                 assert getattr(state, attr)()
             else:
                 assert not getattr(state, attr)()
+
+
+class TestMappedStates:
+    def test_round_trips_states(self):
+        states = [
+            Success(message="1", result=1),
+            Failed(message="2", result=ValueError("2")),
+            Retrying(start_time=pendulum.now("utc"), run_count=2),
+            Pending(cached_inputs=dict(x=Result(1))),
+            None,
+        ]
+        map_states = MappedStates(states)
+        assert len(map_states) == 5
+        assert list(map_states) == states
+        for original, stored in zip(states[:3], map_states):
+            assert type(stored) is type(original)
+            assert stored.__dict__ == original.__dict__
+
+    def test_recreates_results(self):
+        handler = JSONResultHandler()
+        result = Result(1, result_handler=handler)
+        result.safe_value = SafeResult("1", result_handler=handler)
+        state = MappedStates([Success(result=result)])[0]
+        assert state.result == 1
+        assert state._result.result_handler is handler
+        assert state._result.safe_value == result.safe_value
+
+    def test_items_without_compact_form_are_stored_as_is(self):
+        mapped, obj = Mapped(map_states=[Success()]), object()
+        map_states = MappedStates([mapped, obj])
+        assert map_states[0] is mapped
+        assert map_states[1] is obj
+
+    def test_mutation(self):
+        map_states = MappedStates([Success(), Failed(), Pending()])
+        map_states[0] = Failed(message="x")
+        map_states.append(Success())
+        map_states.insert(1, Skipped())
+        del map_states[-2]
+        assert [type(s) for s in map_states] == [Failed, Skipped, Failed, Success]
+        assert map_states[0].message == "x"
+        assert map_states[-1] == Success()
+        with pytest.raises(IndexError):
+            map_states[4]
+
+    @pytest.mark.parametrize(
+        "mutate",
+        [
+            lambda l: l.insert(0, Skipped(message="a")),
+            lambda l: l.insert(-2, None),
+            lambda l: l.insert(100, Success(result=9)),
+            lambda l: l.__delitem__(1),
+            lambda l: l.__delitem__(slice(1, 4)),
+            lambda l: l.__delitem__(slice(None, None, 2)),
+            lambda l: l.__setitem__(slice(1, 3), [None, Success(result=7), Failed()]),
+            lambda l: l.__setitem__(slice(4, 1), [Skipped()]),
+            lambda l: l.__setitem__(slice(None, None, -2), [None, None, None]),
+        ],
+    )
+    def test_mutation_matches_lists(self, mutate):
+        states = [
+            Success(result=0),
+            Pending(cached_inputs=dict(x=Result(1))),
+            None,
+            Failed(message="3"),
+            Success(result=4),
+        ]
+        expected, map_states = list(states), MappedStates(states)
+        mutate(expected)
+        mutate(map_states)
+        assert map_states == expected
+        assert [s.__dict__ if s else s for s in map_states] == [
+            s.__dict__ if s else s for s in expected
+        ]
+
+    def test_extended_slice_assignment_checks_lengths(self):
+        map_states = MappedStates([Success()] * 4)
+        with pytest.raises(ValueError):
+            map_states[::2] = [Failed()]
+
+    def test_results(self):
+        map_states = MappedStates(
+            [Success(result=1), Pending(), Mapped(map_states=[]), Failed(result=2)]
+        )
+        assert map_states.results() == [s.result for s in map_states]
+        assert map_states.results()[1] is NoResult
+
+    def test_slicing_returns_mapped_states(self):
+        map_states = MappedStates([Success(result=i) for i in range(5)])
+        sliced = map_states[1:3]
+        assert isinstance(sliced, MappedStates)
+        assert [s.result for s in sliced] == [1, 2]
+
+    def test_counts(self):
+        map_states = MappedStates(
+            [Success(), Success(), Failed(), TimedOut(), Mapped(), None]
+        )
+        assert map_states.count_states(Success) == 3
+        assert map_states.count_states(Failed) == 2
+        assert map_states.state_counts() == {
+            "Success": 2,
+            "Failed": 1,
+            "TimedOut": 1,
+            "Mapped": 1,
+        }
+
+    def test_representative_states(self):
+        map_states = MappedStates([Success(result=i) for i in range(100)] + [Failed()])
+        representatives = map_states.representative_states()
+        assert [type(s) for s in representatives] == [Success, Failed]
+        assert any(s.is_failed() for s in representatives)
+
+    def test_pickles(self):
+        map_states = MappedStates([Success(result=1), Failed(message="x")])
+        new = cloudpickle.loads(cloudpickle.dumps(map_states))
+        assert isinstance(new, MappedStates)
+        assert new == map_states
@@ -1,4 +1,6 @@
+import asyncio
 import collections
+import threading
 from datetime import datetime, timedelta
 from time import sleep
 from unittest.mock import MagicMock
@@ -43,6 +45,7 @@ from prefect.engine.state import (
 from prefect.engine.task_runner import ENDRUN, TaskRunner
 from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.debug import raise_on_exception
+from prefect.utilities.hashing import fingerprint
 from prefect.utilities.tasks import pause_task
 
 
@@ -1008,6 +1011,38 @@ class TestRunTaskStep:
         assert new_state.is_successful()
         assert new_state.result == 2
 
+    def test_coroutine_run_methods_are_awaited(self):
+        @prefect.task
+        async def fn(x):
+            await asyncio.sleep(0)
+            return x + 1
+
+        new_state = TaskRunner(task=fn).get_task_run_state(
+            state=Running(), inputs={"x": Result(1)}, timeout_handler=None
+        )
+        assert new_state.is_successful()
+        assert new_state.result == 2
+
+    def test_coroutine_run_methods_can_raise_signals(self):
+        @prefect.task
+        async def fn():
+            raise signals.SKIP()
+
+        new_state = TaskRunner(task=fn).get_task_run_state(
+            state=Running(), inputs={}, timeout_handler=None
+        )
+        assert isinstance(new_state, Skipped)
+
+    def test_coroutine_run_methods_time_out(self):
+        @prefect.task(timeout=1)
+        async def fn():
+            await asyncio.sleep(10)
+
+        new_state = TaskRunner(task=fn).get_task_run_state(
+            state=Running(), inputs={}, timeout_handler=None
+        )
+        assert isinstance(new_state, TimedOut)
+
     def test_invalid_inputs(self):
         @prefect.task
         def fn(x):
@@ -1218,7 +1253,62 @@ class TestCacheResultStep:
         assert isinstance(new_state, Cached)
         assert new_state.message == "hello"
         assert new_state.result == 2
-        assert new_state.cached_inputs == {"x": Result(5)}
+        assert new_state.cached_inputs is None
+        assert new_state.cached_input_fingerprints == {"x": fingerprint(5)}
+
+    def test_success_state_with_cache_for_and_unfingerprintable_inputs(self):
+        @prefect.task(cache_for=timedelta(minutes=10))
+        def fn(x):
+            return 1
+
+        lock = threading.Lock()
+        new_state = TaskRunner(task=fn).cache_result(
+            state=Success(result=1), inputs={"x": Result(lock)}
+        )
+        assert isinstance(new_state, Cached)
+        assert new_state.cached_inputs == {"x": Result(lock)}
+        assert new_state.cached_input_fingerprints is None
+
+    def test_success_state_with_cache_for_and_strided_buffer_inputs(self):
+        @prefect.task(cache_for=timedelta(minutes=10))
+        def fn(x):
+            return 1
+
+        view = memoryview(bytearray(b"abcd"))[::2]
+        new_state = TaskRunner(task=fn).cache_result(
+            state=Success(result=1), inputs={"x": Result(view)}
+        )
+        assert isinstance(new_state, Cached)
+        assert new_state.cached_input_fingerprints == {"x": fingerprint(b"ac")}
+
+    def test_success_state_with_cache_for_and_recursive_inputs(self):
+        @prefect.task(cache_for=timedelta(minutes=10))
+        def fn(x):
+            return 1
+
+        value = [1]
+        value.append(value)
+        new_state = TaskRunner(task=fn).cache_result(
+            state=Success(result=1), inputs={"x": Result(value)}
+        )
+        assert isinstance(new_state, Cached)
+        assert new_state.cached_inputs == {"x": Result(value)}
+        assert new_state.cached_input_fingerprints is None
+
+    def test_cached_task_runs_with_strided_buffer_inputs(self):
+        @prefect.task(cache_for=timedelta(minutes=10))
+        def fn(x):
+            return bytes(x)
+
+        state = TaskRunner(task=fn).run(
+            upstream_states={
+                Edge(Task(), fn, key="x"): Success(
+                    result=memoryview(bytearray(b"abcd"))[::2]
+                )
+            }
+        )
+        assert isinstance(state, Cached)
+        assert state.result == b"ac"
 
 
 class TestCheckScheduledStep:
@@ -1488,8 +1578,8 @@ class TestRunMappedStep:
         assert state.is_mapped()
 
         one, two = state.map_states
-        assert one.cached_inputs["foo"] == Result(1, result_handler=JSONResultHandler())
-        assert two.cached_inputs["foo"] == Result(2, result_handler=JSONResultHandler())
+        assert one.cached_input_fingerprints == {"foo": fingerprint(1)}
+        assert two.cached_input_fingerprints == {"foo": fingerprint(2)}
 
     def test_run_mapped_preserves_context(self):
         @prefect.task
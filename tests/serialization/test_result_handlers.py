@@ -120,6 +120,20 @@ class TestLocalResultHandler:
         assert obj.logger.name == "prefect.LocalResultHandler"
         assert obj.dir == dir
 
+    def test_roundtrip_content_addressed_compressed_handler(self):
+        schema = ResultHandlerSchema()
+        handler = LocalResultHandler(content_addressed=True, compression="gzip")
+        obj = schema.load(schema.dump(handler))
+        assert obj.content_addressed is True
+        assert obj.compression == "gzip"
+
+    def test_roundtrip_handler_with_serializers(self):
+        schema = ResultHandlerSchema()
+        handler = LocalResultHandler(serializers=["npy", "pickle5"])
+        obj = schema.load(schema.dump(handler))
+        assert obj.serializers == ["npy", "pickle5"]
+        assert obj == handler
+
 
 @pytest.mark.xfail(raises=ImportError, reason="google extras not installed.")
 class TestGCSResultHandler:
@@ -184,6 +198,15 @@ class TestS3ResultHandler:
         assert serialized["bucket"] == "my-bucket"
         assert serialized["aws_credentials_secret"] == "FOO"
 
+    def test_roundtrip_transfer_settings(self):
+        schema = ResultHandlerSchema()
+        handler = S3ResultHandler(
+            bucket="foo", part_size=16 * 1024 * 1024, max_concurrency=2
+        )
+        obj = schema.load(schema.dump(handler))
+        assert obj.part_size == 16 * 1024 * 1024
+        assert obj.max_concurrency == 2
+
     def test_deserialize_from_dict(self):
         handler = ResultHandlerSchema().load(
             {"type": "S3ResultHandler", "bucket": "foo-bar"}
@@ -146,6 +146,14 @@ def test_serialize_mapped():
     assert serialized["__version__"] == prefect.__version__
 
 
+def test_serialize_mapped_includes_state_counts():
+    map_states = [state.Success(), state.Success(), state.Failed(), None]
+    for states in [map_states, state.MappedStates(map_states)]:
+        serialized = StateSchema().dump(state.Mapped(map_states=states))
+        assert serialized["map_state_counts"] == {"Success": 2, "Failed": 1}
+        assert StateSchema().load(serialized).map_states == [None] * 4
+
+
 @pytest.mark.parametrize("cls", [s for s in all_states if s is not state.Mapped])
 def test_deserialize_state(cls):
     s = cls(message="message")
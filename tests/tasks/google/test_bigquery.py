@@ -1,9 +1,13 @@
+import json
+import threading
 from unittest.mock import MagicMock
 
 import pytest
-from google.cloud.exceptions import NotFound
+import requests
+from google.cloud.exceptions import BadRequest, NotFound, ServiceUnavailable
 
 import prefect
+import prefect.tasks.google.bigquery as bigquery_tasks
 from prefect.tasks.google import (
     BigQueryStreamingInsert,
     BigQueryTask,
@@ -12,6 +16,29 @@ from prefect.tasks.google import (
 from prefect.utilities.configuration import set_temporary_config
 
 
+@pytest.fixture(autouse=True)
+def clients(monkeypatch):
+    monkeypatch.setattr(bigquery_tasks, "_clients", {})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = MagicMock()
+    client.insert_rows_json.return_value = []
+    monkeypatch.setattr("prefect.tasks.google.bigquery.Credentials", MagicMock())
+    monkeypatch.setattr(
+        "prefect.tasks.google.bigquery.bigquery.Client", MagicMock(return_value=client)
+    )
+    monkeypatch.setattr(bigquery_tasks, "_RETRY_DELAY", 0)
+    with set_temporary_config({"cloud.use_local_secrets": True}):
+        with prefect.context(secrets=dict(GOOGLE_APPLICATION_CREDENTIALS={})):
+            yield client
+
+
+def inserted_rows(client):
+    return [c[1]["json_rows"] for c in client.insert_rows_json.call_args_list]
+
+
 class TestBigQueryInitialization:
     def test_initializes_with_nothing_and_sets_defaults(self):
         task = BigQueryTask()
@@ -223,6 +250,208 @@ class TestBigQueryStreamingInsertCredentialsandProjects:
         assert z[1]["project"] == "run-time"  ## pulled from run kwarg
 
 
+class TestBigQueryClients:
+    def test_clients_are_shared_across_runs_and_tasks(self, client):
+        BigQueryStreamingInsert(dataset_id="id", table="table").run(records=[])
+        BigQueryStreamingInsert(dataset_id="id", table="table").run(records=[])
+        BigQueryTask().run(query="SELECT *")
+        assert bigquery_tasks.bigquery.Client.call_count == 1
+        assert bigquery_tasks.Credentials.from_service_account_info.call_count == 1
+
+    def test_clients_are_keyed_by_project_and_secret(self, client):
+        with prefect.context(secrets=dict(GOOGLE_APPLICATION_CREDENTIALS={}, OTHER={})):
+            BigQueryTask().run(query="SELECT *")
+            BigQueryTask(project="other").run(query="SELECT *")
+            BigQueryTask(credentials_secret="OTHER").run(query="SELECT *")
+        assert bigquery_tasks.bigquery.Client.call_count == 3
+
+
+class TestBigQueryStreamingInsertChunking:
+    def test_records_are_split_by_row_count(self, client):
+        task = BigQueryStreamingInsert(
+            dataset_id="id", table="table", max_rows_per_request=2
+        )
+        records = [dict(x=i) for i in range(5)]
+        assert task.run(records=records) == []
+        chunks = sorted(inserted_rows(client), key=lambda rows: rows[0]["x"])
+        assert chunks == [records[0:2], records[2:4], records[4:5]]
+
+    def test_records_are_split_by_size(self, client):
+        task = BigQueryStreamingInsert(
+            dataset_id="id", table="table", max_bytes_per_request=400
+        )
+        task.run(records=[dict(x="a" * 100) for _ in range(5)])
+        assert sorted(len(rows) for rows in inserted_rows(client)) == [1, 2, 2]
+
+    def test_rows_larger_than_the_limit_are_sent_alone(self):
+        assert bigquery_tasks._chunk_rows([0, 1, 2], [10, 100, 10], 10, 50) == [
+            [0],
+            [1],
+            [2],
+        ]
+
+    def test_chunks_are_sent_concurrently(self, client):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def insert_rows_json(**kwargs):
+            barrier.wait()
+            return []
+
+        client.insert_rows_json.side_effect = insert_rows_json
+        task = BigQueryStreamingInsert(
+            dataset_id="id", table="table", max_rows_per_request=1, max_concurrency=2
+        )
+        task.run(records=[dict(x=1), dict(x=2)])
+        assert client.insert_rows_json.call_count == 2
+
+    def test_kwargs_are_passed_to_insert(self, client):
+        task = BigQueryStreamingInsert(dataset_id="id", table="table")
+        task.run(records=[dict(x=1)], skip_invalid_rows=True, row_ids=["a"])
+        kwargs = client.insert_rows_json.call_args[1]
+        assert kwargs["skip_invalid_rows"] is True
+        assert kwargs["row_ids"] == ["a"]
+
+
+class TestBigQueryStreamingInsertRetries:
+    def test_only_failed_rows_are_sent_again(self, client):
+        client.insert_rows_json.side_effect = [
+            [dict(index=1, errors=[dict(reason="backendError")])],
+            [],
+        ]
+        task = BigQueryStreamingInsert(dataset_id="id", table="table")
+        assert task.run(records=[dict(x=1), dict(x=2), dict(x=3)]) == []
+
+        first, second = client.insert_rows_json.call_args_list
+        assert second[1]["json_rows"] == [dict(x=2)]
+        assert second[1]["row_ids"] == first[1]["row_ids"][1:2]
+
+    def test_invalid_rows_are_not_sent_again(self, client):
+        invalid = [dict(reason="invalid", message="no such field")]
+        client.insert_rows_json.side_effect = [
+            [
+                dict(index=0, errors=invalid),
+                dict(index=1, errors=[dict(reason="stopped")]),
+            ],
+            [],
+        ]
+        task = BigQueryStreamingInsert(dataset_id="id", table="table")
+        with pytest.raises(ValueError) as exc:
+            task.run(records=[dict(y=1), dict(x=2)])
+        assert str(exc.value) == str([invalid])
+        assert inserted_rows(client)[1] == [dict(x=2)]
+
+    def test_rows_of_failed_requests_are_sent_again(self, client):
+        client.insert_rows_json.side_effect = [
+            ServiceUnavailable("try again"),
+            requests.exceptions.ConnectionError(),
+            [],
+            [],
+        ]
+        task = BigQueryStreamingInsert(
+            dataset_id="id", table="table", max_rows_per_request=2, max_concurrency=1
+        )
+        assert task.run(records=[dict(x=1), dict(x=2), dict(x=3)]) == []
+
+        calls = [c[1] for c in client.insert_rows_json.call_args_list]
+        assert [c["json_rows"] for c in calls] == [
+            [dict(x=1), dict(x=2)],
+            [dict(x=3)],
+            [dict(x=1), dict(x=2)],
+            [dict(x=3)],
+        ]
+        assert calls[2]["row_ids"] == calls[0]["row_ids"]
+        assert calls[3]["row_ids"] == calls[1]["row_ids"]
+
+    def test_other_request_errors_are_raised(self, client):
+        client.insert_rows_json.side_effect = BadRequest("no such table")
+        task = BigQueryStreamingInsert(dataset_id="id", table="table")
+        with pytest.raises(BadRequest):
+            task.run(records=[dict(x=1)])
+        assert client.insert_rows_json.call_count == 1
+
+    def test_row_ids_are_kept_across_task_run_retries(self, client):
+        task = BigQueryStreamingInsert(dataset_id="id", table="table")
+        with prefect.context(task_run_id="run-id"):
+            task.run(records=[dict(x=1), dict(x=2)])
+            task.run(records=[dict(x=1), dict(x=2)])
+        first, second = client.insert_rows_json.call_args_list
+        assert first[1]["row_ids"] == second[1]["row_ids"] == ["run-id-0", "run-id-1"]
+
+    def test_row_ids_are_random_outside_of_task_runs_with_ids(self, client):
+        task = BigQueryStreamingInsert(dataset_id="id", table="table")
+        task.run(records=[dict(x=1)])
+        task.run(records=[dict(x=1)])
+        first, second = client.insert_rows_json.call_args_list
+        assert first[1]["row_ids"] != second[1]["row_ids"]
+
+    def test_retries_are_limited(self, client):
+        client.insert_rows_json.return_value = [
+            dict(index=0, errors=[dict(reason="timeout")])
+        ]
+        task = BigQueryStreamingInsert(
+            dataset_id="id", table="table", max_row_retries=2
+        )
+        with pytest.raises(ValueError) as exc:
+            task.run(records=[dict(x=1)])
+        assert str(exc.value) == str([[dict(reason="timeout")]])
+        assert client.insert_rows_json.call_count == 3
+
+
+class TestBigQueryStreamingInsertLoadJobs:
+    def test_bad_load_job_format_raises(self):
+        task = BigQueryStreamingInsert(
+            dataset_id="id", table="table", load_job_format="CSV"
+        )
+        with pytest.raises(ValueError) as exc:
+            task.run(records=[])
+        assert "load_job_format" in str(exc.value)
+
+    def test_large_record_sets_are_loaded_as_json(self, client):
+        uploads = []
+
+        def load_table_from_file(file, table_ref, rewind, **kwargs):
+            file.seek(0)
+            uploads.append((file.read(), kwargs))
+            return MagicMock()
+
+        client.load_table_from_file.side_effect = load_table_from_file
+        task = BigQueryStreamingInsert(
+            dataset_id="id", table="table", load_job_min_records=2
+        )
+        task.run(records=[dict(x=1)])
+        task.run(records=[dict(x=1), dict(x=2)], ignore_unknown_values=True)
+
+        assert client.insert_rows_json.call_count == 1
+        (data, kwargs), = uploads
+        assert [json.loads(line) for line in data.splitlines()] == [
+            dict(x=1),
+            dict(x=2),
+        ]
+        assert kwargs["location"] == "US"
+        assert kwargs["job_config"].source_format == "NEWLINE_DELIMITED_JSON"
+        assert kwargs["job_config"].ignore_unknown_values is True
+        assert client.load_table_from_file.return_value.result.called is False
+
+    def test_large_record_sets_are_loaded_as_parquet(self, client):
+        parquet = pytest.importorskip("pyarrow.parquet")
+        tables = []
+
+        def load_table_from_file(file, table_ref, rewind, **kwargs):
+            file.seek(0)
+            tables.append(parquet.read_table(file))
+            return MagicMock()
+
+        client.load_table_from_file.side_effect = load_table_from_file
+        task = BigQueryStreamingInsert(
+            dataset_id="id",
+            table="table",
+            load_job_min_records=1,
+            load_job_format="PARQUET",
+        )
+        task.run(records=[dict(x=1), dict(x=2, y="b")])
+        assert tables[0].to_pydict() == dict(x=[1, 2], y=[None, "b"])
+
+
 class TestDryRuns:
     def test_dry_run_doesnt_raise_if_limit_not_exceeded(self, monkeypatch):
         task = BigQueryTask(dry_run_max_bytes=1200)
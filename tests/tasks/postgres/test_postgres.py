@@ -1,6 +1,37 @@
+import io
+from unittest.mock import MagicMock
+
 import pytest
+from psycopg2 import sql
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR
+
+import prefect.tasks.postgres.postgres as postgres
+from prefect.tasks.postgres import PostgresCopy, PostgresExecute, PostgresFetch
+
+CREDENTIALS = dict(db_name="test", user="test", password="test", host="test")
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """
+    Patches `psycopg2.connect`, returning the list of connections it opens.
+    """
+    monkeypatch.setattr(postgres, "_pools", {})
+    connections = []
 
-from prefect.tasks.postgres import PostgresExecute, PostgresFetch
+    def connect(dsn):
+        conn = MagicMock(closed=0, dsn=dsn)
+        conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+        conn.cursor.return_value.__enter__.return_value.rowcount = 3
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(postgres.pg, "connect", connect)
+    return connections
+
+
+def cursor_of(conn):
+    return conn.cursor.return_value.__enter__.return_value
 
 
 class TestPostgresExecute:
@@ -18,6 +49,14 @@ class TestPostgresExecute:
             task.run()
         assert "A query string must be provided" == str(exc.value)
 
+    def test_executes_query(self, connections):
+        task = PostgresExecute(**CREDENTIALS)
+        task.run(query="DELETE FROM t WHERE x = %s", data=(1,))
+        (conn,) = connections
+        cursor_of(conn).execute.assert_called_once_with(
+            query="DELETE FROM t WHERE x = %s", vars=(1,)
+        )
+
 
 class TestPostgresFetch:
     def test_construction(self):
@@ -35,6 +74,185 @@ class TestPostgresFetch:
         with pytest.raises(ValueError) as exc:
             task.run(query="SELECT * FROM some_table", fetch="not a valid parameter")
         assert (
-            "The 'fetch' parameter must be one of the following - ('one', 'many', 'all')"
+            "The 'fetch' parameter must be one of the following - ('one', 'many', 'all', 'batches')"
             == str(exc.value)
         )
+
+    def test_fetch_all(self, connections):
+        task = PostgresFetch(fetch="all", **CREDENTIALS)
+        task.run(query="SELECT 1")
+        assert cursor_of(connections[0]).fetchall.called
+
+    def test_fetch_batches_uses_a_server_side_cursor(self, connections):
+        task = PostgresFetch(fetch="batches", fetch_count=2, **CREDENTIALS)
+        batches = task.run(query="SELECT x FROM t")
+        (conn,) = connections
+
+        assert conn.cursor.call_args[1]["name"].startswith("prefect_")
+        cursor = cursor_of(conn)
+        cursor.execute.assert_called_once_with(query="SELECT x FROM t", vars=None)
+        assert cursor.itersize == 2
+        # the connection is held until the batches are consumed
+        assert not conn.close.called
+
+        cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        assert list(batches) == [[(1,), (2,)], [(3,)]]
+        assert conn.close.called
+
+    def test_closing_fetched_batches_closes_the_connection(self, connections):
+        task = PostgresFetch(fetch="batches", **CREDENTIALS)
+        batches = task.run(query="SELECT x FROM t")
+        batches.close()
+        (conn,) = connections
+        assert conn.close.called
+
+    def test_fetched_batches_dont_take_pooled_connections(self, connections):
+        task = PostgresFetch(fetch="batches", max_connections=1, **CREDENTIALS)
+        unconsumed = [task.run(query="SELECT x FROM t") for _ in range(3)]
+        assert postgres._pools == {}
+        # pooled task runs don't wait for the batches to be consumed
+        PostgresFetch(max_connections=1, **CREDENTIALS).run(query="SELECT 1")
+        assert len(connections) == 4
+        for batches in unconsumed:
+            batches.close()
+
+    def test_fetch_batches_raises_query_errors(self, connections, monkeypatch):
+        class QueryError(Exception):
+            pass
+
+        task = PostgresFetch(fetch="batches", **CREDENTIALS)
+        monkeypatch.setattr(
+            postgres.pg,
+            "connect",
+            lambda dsn: MagicMock(
+                **{
+                    "cursor.return_value.__enter__.return_value.execute.side_effect": QueryError()
+                }
+            ),
+        )
+        with pytest.raises(QueryError):
+            task.run(query="SELECT x FROM t")
+
+
+class TestConnectionPool:
+    def test_connections_are_reused_across_tasks(self, connections):
+        PostgresFetch(**CREDENTIALS).run(query="SELECT 1")
+        PostgresExecute(**CREDENTIALS).run(query="SELECT 1")
+        PostgresFetch(**CREDENTIALS).run(query="SELECT 1")
+        assert len(connections) == 1
+        assert "dbname=test" in connections[0].dsn
+
+    def test_pools_are_keyed_by_database(self, connections):
+        PostgresFetch(**CREDENTIALS).run(query="SELECT 1")
+        PostgresFetch(**dict(CREDENTIALS, db_name="other")).run(query="SELECT 1")
+        assert len(connections) == 2
+        assert len(postgres._pools) == 2
+
+    def test_closed_connections_are_replaced(self, connections):
+        PostgresFetch(**CREDENTIALS).run(query="SELECT 1")
+        connections[0].closed = 1
+        PostgresFetch(**CREDENTIALS).run(query="SELECT 1")
+        assert len(connections) == 2
+
+    def test_failed_transactions_are_rolled_back(self, connections):
+        pool = postgres._get_pool("dbname=test", 1)
+        with pool.connection() as conn:
+            conn.info.transaction_status = TRANSACTION_STATUS_INERROR
+        assert conn.rollback.called
+        assert [c for c, _ in pool._idle] == [conn]
+
+    def test_idle_connections_are_checked(self, connections, monkeypatch):
+        monkeypatch.setattr(postgres, "_CHECK_AFTER_IDLE", 0)
+        pool = postgres._get_pool("dbname=test", 1)
+        with pool.connection() as conn:
+            pass
+        cursor_of(conn).execute.side_effect = postgres.pg.OperationalError()
+        with pool.connection() as new_conn:
+            pass
+        assert conn.close.called
+        assert new_conn is not conn
+
+    def test_pool_limits_connections(self, connections):
+        pool = postgres._get_pool("dbname=test", 1)
+        with pool.connection():
+            assert not pool._slots.acquire(blocking=False)
+
+
+class TestPostgresCopy:
+    def test_construction(self):
+        task = PostgresCopy(table="t", **CREDENTIALS)
+        assert task.direction == "from"
+        assert task.format == "csv"
+
+    @pytest.mark.parametrize(
+        "kwargs,message",
+        [
+            (dict(direction="sideways"), "'direction' parameter"),
+            (dict(format="xml"), "'format' parameter"),
+            (dict(query="SELECT 1", data="x"), "only be copied from a query"),
+            (dict(data="x", table=None), "A table or query must be provided"),
+            (dict(), "Data must be provided"),
+        ],
+    )
+    def test_bad_params_raise(self, kwargs, message):
+        task = PostgresCopy(table="t", **CREDENTIALS)
+        with pytest.raises(ValueError, match=message):
+            task.run(**kwargs)
+
+    def test_copies_data_into_a_table(self, connections):
+        task = PostgresCopy(table="public.t", columns=["a", "b"], **CREDENTIALS)
+        assert task.run(data="1,2\n") == 3
+        (conn,) = connections
+        statement, data = cursor_of(conn).copy_expert.call_args[0]
+        assert isinstance(statement, sql.Composed)
+        assert sql.Identifier("public", "t") in statement.seq[1].seq
+        assert data.read() == "1,2\n"
+
+    def test_copies_rows_into_a_table_as_text(self, connections):
+        task = PostgresCopy(table="t", **CREDENTIALS)
+        task.run(data=[(1, "a"), (2, None)])
+        statement, data = cursor_of(connections[0]).copy_expert.call_args[0]
+        assert sql.SQL("text") in statement.seq
+        assert data.read() == "1\ta\n2\t\\N\n"
+
+    def test_exports_data(self, connections):
+        def copy_expert(statement, file):
+            file.write(b"1,2\n")
+
+        task = PostgresCopy(table="t", direction="to", **CREDENTIALS)
+        connections_before = len(connections)
+        PostgresCopy(table="t", **CREDENTIALS).run(data=b"")
+        cursor_of(connections[0]).copy_expert.side_effect = copy_expert
+        assert task.run() == b"1,2\n"
+        assert len(connections) == connections_before + 1
+
+    def test_exports_query_results_to_a_file(self, connections):
+        task = PostgresCopy(direction="to", query="SELECT 1", **CREDENTIALS)
+        out = io.BytesIO()
+        assert task.run(data=out) == 3
+        statement, file = cursor_of(connections[0]).copy_expert.call_args[0]
+        assert file is out
+        assert sql.SQL("TO STDOUT") in statement.seq
+
+
+class TestRowReader:
+    def test_formats_rows(self):
+        reader = postgres._RowReader(
+            [(1, None, "tab\there", "line\nbreak", "back\\slash"), (True, b"\x00\xff")]
+        )
+        assert reader.read() == (
+            "1\t\\N\ttab\\there\tline\\nbreak\tback\\\\slash\n" "True\t\\\\x00ff\n"
+        )
+        assert reader.read() == ""
+
+    def test_reads_in_chunks(self):
+        rows = [(i, "x" * 10) for i in range(1000)]
+        reader = postgres._RowReader(iter(rows))
+        chunks = []
+        while True:
+            chunk = reader.read(100)
+            if not chunk:
+                break
+            assert len(chunk) <= 100
+            chunks.append(chunk)
+        assert "".join(chunks) == postgres._RowReader(rows).read()
@@ -3,10 +3,36 @@ from unittest.mock import MagicMock
 import pytest
 
 import prefect
-from prefect.tasks.redis import RedisExecute, RedisGet, RedisSet
+import prefect.tasks.redis.redis_tasks as redis_tasks
+from prefect.tasks.redis import (
+    RedisExecute,
+    RedisGet,
+    RedisMGet,
+    RedisMSet,
+    RedisPipeline,
+    RedisSet,
+)
 from prefect.utilities.configuration import set_temporary_config
 
 
+@pytest.fixture(autouse=True)
+def clients(monkeypatch):
+    monkeypatch.setattr(redis_tasks, "_clients", {})
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = MagicMock()
+    monkeypatch.setattr("prefect.tasks.redis.redis_tasks.redis.Redis", redis)
+    with set_temporary_config({"cloud.use_local_secrets": True}):
+        with prefect.context(secrets=dict(REDIS_PASSWORD="42")):
+            yield redis
+
+
+def pipeline_of(redis):
+    return redis.return_value.pipeline.return_value
+
+
 class TestRedisSet:
     def test_construction(self):
         task = RedisSet()
@@ -108,3 +134,132 @@ class TestRedisExecute:
             with prefect.context(secrets=dict(REDIS_PASSWORD="42")):
                 task.run(redis_cmd="GET foo")
         assert redis.call_args[1]["custom_parameter"] == "value"
+
+
+class TestClients:
+    def test_clients_are_shared_across_tasks(self, redis):
+        RedisSet().run(redis_key="foo", redis_val="bar")
+        RedisGet().run(redis_key="foo")
+        RedisMGet().run(redis_keys=["foo"])
+        assert redis.call_count == 1
+
+    def test_secret_is_read_once(self, redis, monkeypatch):
+        secret = MagicMock(return_value=MagicMock(get=MagicMock(return_value="42")))
+        monkeypatch.setattr("prefect.tasks.redis.redis_tasks.Secret", secret)
+        RedisGet().run(redis_key="foo")
+        RedisGet().run(redis_key="foo")
+        assert secret.call_count == 1
+
+    def test_clients_are_keyed_by_database_and_params(self, redis):
+        RedisGet().run(redis_key="foo")
+        RedisGet(db=1).run(redis_key="foo")
+        RedisGet(redis_connection_params={"socket_timeout": 5}).run(redis_key="foo")
+        RedisGet(db=1).run(redis_key="foo")
+        assert redis.call_count == 3
+
+    def test_unhashable_params_are_not_cached(self, redis):
+        task = RedisGet(redis_connection_params={"custom_parameter": ["value"]})
+        task.run(redis_key="foo")
+        task.run(redis_key="foo")
+        assert redis.call_count == 2
+
+    def test_authentication_errors_drop_the_client(self, redis):
+        import redis as redis_lib
+
+        redis.return_value.get.side_effect = redis_lib.exceptions.AuthenticationError()
+        with pytest.raises(redis_lib.exceptions.AuthenticationError):
+            RedisGet().run(redis_key="foo")
+        assert redis_tasks._clients == {}
+
+
+class TestRedisMSet:
+    def test_construction(self):
+        task = RedisMSet()
+        assert task.host == "localhost"
+        assert task.batch_size == 1000
+
+    def test_raises_keys_vals_not_provided(self):
+        task = RedisMSet()
+        with pytest.raises(ValueError) as exc:
+            task.run(redis_keys=["foo"])
+        assert "redis_keys and redis_vals must be provided" == str(exc.value)
+
+    def test_raises_keys_vals_different_lengths(self):
+        task = RedisMSet()
+        with pytest.raises(ValueError) as exc:
+            task.run(redis_keys=["foo"], redis_vals=[1, 2])
+        assert "redis_keys and redis_vals must have the same length" == str(exc.value)
+
+    def test_sets_pairs_in_batches(self, redis):
+        task = RedisMSet(batch_size=2)
+        result = task.run(redis_keys=["a", "b", "c"], redis_vals=[1, 2, 3])
+        assert result == [True, True, True]
+        pipeline = pipeline_of(redis)
+        redis.return_value.pipeline.assert_called_once_with(transaction=False)
+        assert [c[0][0] for c in pipeline.mset.call_args_list] == [
+            {"a": 1, "b": 2},
+            {"c": 3},
+        ]
+        assert pipeline.execute.call_count == 1
+
+    def test_sets_pairs_with_options_one_by_one(self, redis):
+        pipeline_of(redis).execute.return_value = [True, None]
+        task = RedisMSet(ex=10, nx=True)
+        assert task.run(redis_keys=["a", "b"], redis_vals=[1, 2]) == [True, False]
+        assert pipeline_of(redis).set.call_args_list[1][1] == dict(
+            name="b", value=2, ex=10, px=None, nx=True, xx=False
+        )
+
+    def test_no_keys_does_not_connect(self, redis):
+        assert RedisMSet().run(redis_keys=[], redis_vals=[]) == []
+        assert not redis.called
+
+
+class TestRedisMGet:
+    def test_construction(self):
+        task = RedisMGet()
+        assert task.host == "localhost"
+
+    def test_raises_keys_not_provided(self):
+        task = RedisMGet()
+        with pytest.raises(ValueError) as exc:
+            task.run()
+        assert "redis_keys must be provided" == str(exc.value)
+
+    def test_gets_keys_in_batches(self, redis):
+        pipeline_of(redis).execute.return_value = [[b"1", b"2"], [None]]
+        task = RedisMGet(batch_size=2)
+        assert task.run(redis_keys=["a", "b", "c"]) == [b"1", b"2", None]
+        assert [c[0][0] for c in pipeline_of(redis).mget.call_args_list] == [
+            ["a", "b"],
+            ["c"],
+        ]
+
+    def test_redis_params_passed_to_connection(self, redis):
+        task = RedisMGet(redis_connection_params={"custom_parameter": "value"})
+        task.run(redis_keys=["foo"])
+        assert redis.call_args[1]["custom_parameter"] == "value"
+        assert redis.call_args[1]["password"] == 42
+
+
+class TestRedisPipeline:
+    def test_construction(self):
+        task = RedisPipeline()
+        assert task.transaction is False
+
+    def test_raises_if_commands_not_provided(self):
+        task = RedisPipeline()
+        with pytest.raises(ValueError) as exc:
+            task.run()
+        assert "A list of redis commands must be specified" == str(exc.value)
+
+    def test_executes_commands_in_one_pipeline(self, redis):
+        task = RedisPipeline(transaction=True)
+        task.run(redis_cmds=["GET foo", ("SET", "foo", 1)])
+        pipeline = pipeline_of(redis)
+        redis.return_value.pipeline.assert_called_once_with(transaction=True)
+        assert [c[0] for c in pipeline.execute_command.call_args_list] == [
+            ("GET foo",),
+            ("SET", "foo", 1),
+        ]
+        pipeline.execute.assert_called_once_with(raise_on_error=True)
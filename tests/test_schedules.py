@@ -1,3 +1,4 @@
+import itertools
 from datetime import time, timedelta
 
 import pendulum
@@ -27,6 +28,23 @@ def test_base_schedule_next_no_implemented():
         s.next(1)
 
 
+def test_base_schedule_iter_no_implemented():
+    s = schedules.Schedule()
+    with pytest.raises(NotImplementedError):
+        s.iter()
+
+
+def test_schedules_which_only_implement_next_can_be_iterated():
+    class EveryDay(schedules.Schedule):
+        def next(self, n, after=None):
+            return [after.add(days=i + 1) for i in range(n)]
+
+    dates = list(itertools.islice(EveryDay().iter(after=START_DATE), 300))
+    assert len(dates) == 300
+    assert dates[:2] == DATES[1:3]
+    assert dates == sorted(set(dates))
+
+
 def serialize_fmt(dt):
     p_dt = pendulum.instance(dt)
     return dict(dt=p_dt.naive().to_iso8601_string(), tz=p_dt.tzinfo.name)
@@ -241,6 +259,117 @@ class TestIntervalScheduleDaylightSavingsTime:
         assert [t.in_tz("UTC").hour for t in next_4] == [13, 13, 14, 14]
 
 
+class TestIntervalScheduleGeneration:
+    @pytest.mark.parametrize(
+        "tz", ["UTC", "America/New_York", "Australia/Lord_Howe", "America/St_Johns"]
+    )
+    @pytest.mark.parametrize(
+        "interval",
+        [
+            timedelta(minutes=7),
+            timedelta(hours=1),
+            timedelta(days=1),
+            timedelta(days=2, hours=3),
+        ],
+    )
+    def test_dates_match_pendulum_across_dst(self, tz, interval):
+        start_date = pendulum.datetime(2018, 1, 1, 0, 30, tz=tz)
+        s = schedules.IntervalSchedule(start_date, interval)
+        for after in [
+            pendulum.datetime(2018, 3, 9, tz=tz),
+            pendulum.datetime(2018, 10, 6, tz=tz),
+            pendulum.datetime(2018, 11, 3, tz=tz),
+        ]:
+            dates = s.next(500, after=after)
+            i = s._first_index(after)
+            expected = [s._date(k) for k in range(i, i + 500)]
+            assert [d.isoformat() for d in dates] == [d.isoformat() for d in expected]
+
+    @pytest.mark.parametrize("tz", ["America/New_York", "Australia/Lord_Howe"])
+    def test_short_intervals_follow_utc_after_the_first_day(self, tz):
+        start_date = pendulum.datetime(2018, 1, 1, tz=tz)
+        s = schedules.IntervalSchedule(start_date, timedelta(minutes=5))
+        for after in [
+            pendulum.datetime(2018, 3, 10, tz=tz),
+            pendulum.datetime(2018, 11, 3, tz=tz),
+        ]:
+            dates = [d.in_tz("UTC") for d in s.next(1000, after=after)]
+            assert all(
+                later - earlier == timedelta(minutes=5)
+                for earlier, later in zip(dates, dates[1:])
+            )
+
+    def test_next_is_after_the_given_date_across_dst(self):
+        start_date = pendulum.datetime(2019, 1, 1, 9, tz="America/New_York")
+        daily = schedules.IntervalSchedule(start_date, timedelta(days=1))
+        after = pendulum.datetime(2019, 7, 1, 9, tz="America/New_York")
+        assert daily.next(1, after=after) == [after.add(days=1)]
+        assert daily.next(1, after=after.add(seconds=-1)) == [after]
+
+        minutely = schedules.IntervalSchedule(start_date, timedelta(minutes=1))
+        assert minutely.next(1, after=after) == [after.add(minutes=1)]
+
+    def test_next_respects_end_date(self):
+        s = schedules.IntervalSchedule(
+            START_DATE, timedelta(minutes=1), end_date=START_DATE.add(days=2)
+        )
+        dates = s.next(10000, after=START_DATE)
+        assert len(dates) == 2 * 24 * 60
+        assert dates[-1] == START_DATE.add(days=2)
+
+
+class TestBackfill:
+    def test_interval_backfill_includes_both_ends(self):
+        s = schedules.IntervalSchedule(START_DATE, timedelta(days=1))
+        assert s.backfill(DATES[1], DATES[4]) == DATES[1:5]
+
+    def test_interval_backfill_between_dates(self):
+        s = schedules.IntervalSchedule(START_DATE, timedelta(days=1))
+        assert (
+            s.backfill(DATES[1].add(minutes=1), DATES[4].add(minutes=-1)) == DATES[2:4]
+        )
+
+    def test_interval_backfill_of_minutes_across_dst(self):
+        s = schedules.IntervalSchedule(
+            pendulum.datetime(2018, 1, 1, tz="America/New_York"), timedelta(minutes=1)
+        )
+        dates = s.backfill(
+            pendulum.datetime(2018, 3, 1, tz="America/New_York"),
+            pendulum.datetime(2018, 4, 1, tz="America/New_York"),
+        )
+        # the hour skipped by daylight saving time has no runs
+        assert len(dates) == (31 * 24 - 1) * 60 + 1
+        assert len(set(d.in_tz("UTC") for d in dates)) == len(dates)
+
+    def test_interval_backfill_respects_end_date(self):
+        s = schedules.IntervalSchedule(START_DATE, timedelta(days=1), end_date=DATES[2])
+        assert s.backfill(START_DATE, DATES[-1]) == DATES[:3]
+
+    def test_interval_backfill_of_repeated_hour(self):
+        dt = pendulum.datetime(2018, 11, 4, 0, 30, tz="America/New_York")
+        s = schedules.IntervalSchedule(dt, timedelta(minutes=30))
+        dates = s.backfill(dt, dt.add(hours=2))
+        assert [d.in_tz("UTC").hour for d in dates] == [4, 5, 5, 6, 6]
+        assert [d.hour for d in dates] == [0, 1, 1, 1, 1]
+
+    def test_interval_backfill_before_start(self):
+        s = schedules.IntervalSchedule(START_DATE, timedelta(days=1))
+        assert s.backfill(START_DATE.add(days=-5), START_DATE.add(days=-1)) == []
+
+    def test_cron_backfill(self):
+        s = schedules.CronSchedule("0 0 * * *")
+        assert s.backfill(DATES[1], DATES[4]) == DATES[1:5]
+
+    def test_union_backfill(self):
+        s = schedules.UnionSchedule(
+            [
+                schedules.CronSchedule("0 0 * * *"),
+                schedules.IntervalSchedule(START_DATE, timedelta(days=2)),
+            ]
+        )
+        assert s.backfill(DATES[0], DATES[5]) == DATES
+
+
 class TestCronSchedule:
     def test_create_cron_schedule(self):
         assert schedules.CronSchedule("* * * * *")
@@ -605,3 +734,70 @@ class TestUnionSchedule:
         ]
 
         assert main.next(4, after=after) == expected
+
+    def test_next_n_with_exhausted_schedules(self):
+        s = schedules.OneTimeSchedule(START_DATE)
+        t = schedules.OneTimeSchedule(START_DATE.add(days=1))
+        main = schedules.UnionSchedule([s, t])
+        assert main.next(3, after=START_DATE.add(days=-1)) == DATES[:2]
+
+    def test_next_n_without_start_dates(self):
+        main = schedules.UnionSchedule([schedules.CronSchedule("0 0 * * *")])
+        assert main.next(2, after=START_DATE) == DATES[1:3]
+
+    def test_iter_merges_schedules_lazily(self):
+        s = schedules.IntervalSchedule(START_DATE, timedelta(days=2))
+        t = schedules.CronSchedule("0 0 * * *", start_date=START_DATE)
+        main = schedules.UnionSchedule([s, t, s])
+        dates = main.iter(after=START_DATE.add(days=-1))
+        assert list(itertools.islice(dates, 6)) == DATES
+        assert next(dates) == START_DATE.add(days=6)
+
+    def test_next_advances_each_schedule_once(self, monkeypatch):
+        s = schedules.CronSchedule("0 0 * * *", start_date=START_DATE)
+        t = schedules.CronSchedule("0 12 * * *", start_date=START_DATE)
+        iter_calls = []
+        original_iter = schedules.CronSchedule.iter
+        monkeypatch.setattr(
+            schedules.CronSchedule,
+            "iter",
+            lambda self, after=None: iter_calls.append(self)
+            or original_iter(self, after),
+        )
+        main = schedules.UnionSchedule([s, t])
+        dates = main.next(100, after=START_DATE)
+        assert len(dates) == 100
+        assert dates == sorted(dates)
+        assert len(iter_calls) == 2
+
+
+class TestIter:
+    @pytest.mark.parametrize(
+        "schedule",
+        [
+            schedules.IntervalSchedule(START_DATE, timedelta(hours=7)),
+            schedules.CronSchedule("*/13 * * * *", start_date=START_DATE),
+            schedules.OneTimeSchedule(START_DATE.add(days=3)),
+            schedules.UnionSchedule(
+                [
+                    schedules.IntervalSchedule(START_DATE, timedelta(hours=7)),
+                    schedules.CronSchedule("0 9 * * 1-5"),
+                ]
+            ),
+        ],
+    )
+    def test_iter_matches_next(self, schedule):
+        after = START_DATE.add(minutes=1)
+        assert list(itertools.islice(schedule.iter(after=after), 50)) == schedule.next(
+            50, after=after
+        )
+
+    def test_iter_ends_at_end_date(self):
+        s = schedules.CronSchedule(
+            "0 0 * * *", start_date=START_DATE, end_date=START_DATE.add(days=5)
+        )
+        assert list(s.iter(after=START_DATE.add(days=-1))) == DATES
+
+    def test_iter_defaults_to_now(self):
+        s = schedules.IntervalSchedule(START_DATE, timedelta(days=1))
+        assert next(s.iter()) > pendulum.now("utc")
@@ -1,30 +1,124 @@
+import asyncio
 import multiprocessing
+import os
 import threading
 import time
 from datetime import timedelta
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 import prefect
-from prefect.utilities.executors import Heartbeat, timeout_handler
+from prefect.utilities.configuration import set_temporary_config
+from prefect.utilities.executors import (
+    HeartbeatRegistry,
+    TimeoutPool,
+    defer_heartbeat,
+    get_heartbeat_registry,
+    get_timeout_pool,
+    run_with_heartbeat,
+    shutdown_timeout_pool,
+    timeout_handler,
+)
+
+
+def test_heartbeat_registry_uses_one_thread_for_every_runner():
+    class Runner:
+        def __init__(self):
+            self.threads = set()
 
+        def _heartbeat(self):
+            self.threads.add(threading.current_thread())
 
-def test_heartbeat_calls_function_on_interval():
-    class A:
-        def __init__(self):
-            self.called = 0
+    registry = HeartbeatRegistry()
+    runners = [Runner() for _ in range(20)]
+    for runner in runners:
+        registry.register(runner, 0.05)
+    time.sleep(0.3)
+    for runner in runners:
+        registry.unregister(runner)
+
+    threads = set.union(*(runner.threads for runner in runners))
+    assert threads == {registry._thread}
 
-        def __call__(self):
-            self.called += 1
 
-    a = A()
-    timer = Heartbeat(0.09, a)
-    timer.start()
+def test_heartbeat_registry_stops_heartbeating_unregistered_runners():
+    runner = MagicMock()
+    registry = HeartbeatRegistry()
+    registry.register(runner, 0.05)
     time.sleep(0.2)
-    timer.cancel()
-    timer.join()
-    assert a.called == 2
+    registry.unregister(runner)
+    calls = runner._heartbeat.call_count
+    time.sleep(0.2)
+    assert calls >= 2
+    # a heartbeat which was already due may still be called
+    assert runner._heartbeat.call_count <= calls + 1
+
+
+def test_heartbeat_registry_calls_heartbeats_without_the_lock():
+    started, release = threading.Event(), threading.Event()
+
+    class SlowRunner:
+        def _heartbeat(self):
+            started.set()
+            release.wait(5)
+
+    registry = HeartbeatRegistry()
+    slow = SlowRunner()
+    registry.register(slow, 0.05)
+    try:
+        assert started.wait(2)
+        unregistered = threading.Thread(target=registry.unregister, args=(slow,))
+        unregistered.start()
+        unregistered.join(1)
+        assert not unregistered.is_alive()
+    finally:
+        release.set()
+
+
+def test_heartbeat_registry_batches_deferred_heartbeats():
+    client = MagicMock(graphql_server="server", token="token")
+
+    class Runner:
+        def __init__(self, run_id):
+            self.run_id = run_id
+
+        def _heartbeat(self):
+            if not defer_heartbeat(client, "task_run", self.run_id):
+                client.update_task_run_heartbeat(self.run_id)
+
+    registry = HeartbeatRegistry()
+    runners = [Runner(str(i)) for i in range(5)]
+    with patch("prefect.utilities.executors.get_heartbeat_registry", lambda: registry):
+        # outside of the registry's thread, heartbeats are sent right away
+        runners[0]._heartbeat()
+        assert client.update_task_run_heartbeat.call_count == 1
+
+        for runner in runners:
+            registry.register(runner, 0.1)
+        time.sleep(0.15)
+        for runner in runners:
+            registry.unregister(runner)
+
+    assert client.update_task_run_heartbeat.call_count == 1
+    kwargs = client.update_heartbeats.call_args_list[0][1]
+    assert kwargs == dict(flow_run_ids=[], task_run_ids=["0", "1", "2", "3", "4"])
+
+
+def test_run_with_heartbeat_registers_and_unregisters_the_runner():
+    registry = get_heartbeat_registry()
+
+    class Runner:
+        def _heartbeat(self):
+            pass
+
+        @run_with_heartbeat
+        def run(self):
+            return id(self) in registry._runners
+
+    runner = Runner()
+    assert runner.run() is True
+    assert id(runner) not in registry._runners
 
 
 def test_timeout_handler_times_out():
@@ -83,12 +177,89 @@ def test_timeout_handler_allows_function_to_spawn_new_thread():
 
 
 def test_timeout_handler_doesnt_do_anything_if_no_timeout(monkeypatch):
-    monkeypatch.delattr(prefect.utilities.executors, "ThreadPoolExecutor")
+    monkeypatch.delattr(prefect.utilities.executors, "get_timeout_pool")
     with pytest.raises(NameError):  # to test the test's usefulness...
         timeout_handler(lambda: 4, timeout=1)
     assert timeout_handler(lambda: 4) == 4
 
 
+def test_timeout_handler_reuses_a_shared_pool():
+    shutdown_timeout_pool()
+    names = [timeout_handler(lambda: threading.current_thread().name, timeout=1)]
+    pool = get_timeout_pool()
+    names.append(timeout_handler(lambda: threading.current_thread().name, timeout=1))
+
+    assert get_timeout_pool() is pool
+    assert all(name.startswith("PrefectTimeout") for name in names)
+    assert pool.stats()["submitted"] == 2
+
+
+def test_shutdown_timeout_pool_creates_a_new_pool_on_next_use():
+    pool = get_timeout_pool()
+    shutdown_timeout_pool(wait=True)
+    assert get_timeout_pool() is not pool
+
+
+def test_timeout_pool_max_workers_is_configurable():
+    shutdown_timeout_pool()
+    with set_temporary_config({"engine.timeouts.max_workers": 3}):
+        assert get_timeout_pool().max_workers == 3
+    shutdown_timeout_pool()
+
+
+def test_timeout_pool_reports_saturation():
+    pool = TimeoutPool(max_workers=1)
+    release = threading.Event()
+    try:
+        with pytest.raises(TimeoutError):
+            pool.run(release.wait, timeout=0.1)
+        stats = pool.stats()
+        assert stats["active"] == 1
+        assert stats["peak_active"] == 1
+
+        # the only thread is busy, so this call times out without ever running
+        calls = []
+        with pytest.raises(TimeoutError):
+            pool.run(lambda: calls.append(1), timeout=0.1)
+        assert calls == []
+        stats = pool.stats()
+        assert stats["submitted"] == 2
+        assert stats["saturated"] == 1
+        assert stats["timed_out"] == 2
+        assert stats["queued"] == 0
+    finally:
+        release.set()
+        pool.shutdown()
+    assert pool.stats()["active"] == 0
+
+
+def test_timeout_handler_process_mode_kills_runaway_functions():
+    def spin():
+        while True:
+            pass
+
+    with set_temporary_config({"engine.timeouts.mode": "process"}):
+        with pytest.raises(TimeoutError):
+            timeout_handler(spin, timeout=0.5)
+    assert get_timeout_pool().stats()["active_processes"] == 0
+
+
+def test_timeout_handler_process_mode_returns_and_reraises():
+    def fn(x, y=None):
+        if x is None:
+            raise ValueError("test")
+        return (os.getpid(), x, y, prefect.context.get("test_key"))
+
+    with set_temporary_config({"engine.timeouts.mode": "process"}):
+        with prefect.context(test_key=42):
+            pid, x, y, key = timeout_handler(fn, 1, y=2, timeout=5)
+        with pytest.raises(ValueError, match="test"):
+            timeout_handler(fn, None, timeout=5)
+
+    assert pid != os.getpid()
+    assert (x, y, key) == (1, 2, 42)
+
+
 def test_timeout_handler_preserves_context():
     def my_fun(x, **kwargs):
         return prefect.context.get("test_key")
@@ -99,6 +270,25 @@ def test_timeout_handler_preserves_context():
     assert res == 42
 
 
+def test_timeout_handler_runs_coroutine_functions():
+    async def my_fun(x, y):
+        await asyncio.sleep(0)
+        return (x, y, prefect.context.get("test_key"))
+
+    with prefect.context(test_key=42):
+        assert timeout_handler(my_fun, 1, y=2) == (1, 2, 42)
+        assert timeout_handler(my_fun, 1, timeout=1, y=2) == (1, 2, 42)
+
+
+def test_timeout_handler_times_out_coroutine_functions():
+    async def slow_fn():
+        await asyncio.sleep(10)
+
+    with pytest.raises(TimeoutError) as exc:
+        timeout_handler(slow_fn, timeout=1)
+    assert "Execution timed out" in str(exc.value)
+
+
 def test_timeout_handler_preserves_logging(caplog):
     timeout_handler(prefect.Flow("logs").run, timeout=2)
     assert len(caplog.records) >= 2  # 1 INFO to start, 1 INFO to end
@@ -0,0 +1,151 @@
+import decimal
+import threading
+
+import pytest
+
+from prefect.utilities.hashing import fingerprint
+
+
+@pytest.mark.parametrize(
+    "obj", [None, 1, 2.5, "a", b"a", [1, 2], (1, 2), {"a": 1}, {1, 2}]
+)
+def test_fingerprint_is_a_hex_digest(obj):
+    fp = fingerprint(obj)
+    assert isinstance(fp, str)
+    assert len(fp) == 64
+    assert fp == fingerprint(obj)
+
+
+def test_fingerprint_ignores_dict_and_set_order():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"x", "y", "z"}) == fingerprint({"z", "y", "x"})
+
+
+def test_equal_numbers_share_a_fingerprint():
+    assert fingerprint(1) == fingerprint(1.0) == fingerprint(True)
+    assert fingerprint(0) != fingerprint(None)
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        ("1", 1),
+        ("a", b"a"),
+        ([1, 2], (1, 2)),
+        ([1, 2], [2, 1]),
+        (["ab"], ["a", "b"]),
+        ({"a": 1}, {"a": 2}),
+        ({"a": 1}, [("a", 1)]),
+    ],
+)
+def test_different_values_have_different_fingerprints(a, b):
+    assert fingerprint(a) != fingerprint(b)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        decimal.Decimal("1.5"),
+        object,
+        threading.Lock(),
+        [1, object()],
+        {"a": {1: decimal.Decimal("1")}},
+        {object(): 1},
+    ],
+)
+def test_objects_without_a_canonical_encoding_have_no_fingerprint(obj):
+    assert fingerprint(obj) is None
+
+
+def test_bytes_like_objects_share_a_fingerprint():
+    assert fingerprint(b"abc") == fingerprint(bytearray(b"abc"))
+    assert fingerprint(b"abc") == fingerprint(memoryview(b"abc"))
+    assert fingerprint(b"abc") != fingerprint("abc")
+
+
+def test_fingerprint_of_large_bytes():
+    data = bytes(range(256)) * 10000
+    assert fingerprint(data) == fingerprint(bytearray(data))
+    assert fingerprint(data) != fingerprint(data[:-1])
+
+
+def test_strided_buffers_are_fingerprinted_by_their_contents():
+    view = memoryview(bytearray(b"abcd"))[::2]
+    assert not view.c_contiguous
+    assert fingerprint(view) == fingerprint(b"ac")
+    assert fingerprint(memoryview(b"abcd")[::-1]) == fingerprint(b"dcba")
+
+
+def test_containers_which_hold_themselves_have_no_fingerprint():
+    value = [1]
+    value.append(value)
+    mapping = {}
+    mapping["self"] = mapping
+    assert fingerprint(value) is None
+    assert fingerprint(mapping) is None
+    assert fingerprint([1, [2, [3]]]) is not None
+
+
+def test_nested_containers():
+    obj = {"a": [1, {"b": (2, 3)}], "c": {"d": {4, 5}}}
+    same = {"c": {"d": {5, 4}}, "a": [1, {"b": (2, 3)}]}
+    assert fingerprint(obj) == fingerprint(same)
+    assert fingerprint(obj) != fingerprint(
+        {"a": [1, {"b": (2, 4)}], "c": {"d": {4, 5}}}
+    )
+
+
+class TestNumpy:
+    def test_arrays(self):
+        np = pytest.importorskip("numpy")
+        a = np.arange(12, dtype="int64").reshape(3, 4)
+        assert fingerprint(a) == fingerprint(a.copy())
+        assert fingerprint(a) != fingerprint(a.reshape(4, 3))
+        assert fingerprint(a) != fingerprint(a.astype("int32"))
+        assert fingerprint(a.T) == fingerprint(np.ascontiguousarray(a.T))
+        assert fingerprint(a.T) != fingerprint(a)
+
+    def test_scalars_share_a_fingerprint_with_python_scalars(self):
+        np = pytest.importorskip("numpy")
+        assert fingerprint(np.int64(3)) == fingerprint(3)
+        assert fingerprint(np.bool_(True)) == fingerprint(True)
+        assert fingerprint(np.float32(0.5)) == fingerprint(0.5)
+
+    def test_object_arrays_have_no_fingerprint(self):
+        np = pytest.importorskip("numpy")
+        assert fingerprint(np.array([{"a": 1}, None], dtype=object)) is None
+        assert fingerprint([np.array(["a"], dtype=object)]) is None
+
+
+class TestPandas:
+    def test_data_frames(self):
+        pd = pytest.importorskip("pandas")
+        df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+        assert fingerprint(df) == fingerprint(df.copy())
+        assert fingerprint(df) != fingerprint(df.rename(columns={"b": "c"}))
+        assert fingerprint(df) != fingerprint(df.iloc[::-1])
+        assert fingerprint(df) != fingerprint(df.astype({"a": "float64"}))
+
+    def test_series_and_indexes(self):
+        pd = pytest.importorskip("pandas")
+        s = pd.Series([1, 2, 3], name="s")
+        assert fingerprint(s) == fingerprint(s.copy())
+        assert fingerprint(s) != fingerprint(s.rename("t"))
+        assert fingerprint(pd.Index([1, 2])) != fingerprint(pd.Index([2, 1]))
+
+    def test_string_columns_and_categories(self):
+        pd = pytest.importorskip("pandas")
+        df = pd.DataFrame({"a": ["x", None], "b": pd.Categorical(["u", "v"])})
+        assert fingerprint(df) == fingerprint(df.copy())
+        assert fingerprint(df) != fingerprint(df.assign(b=pd.Categorical(["u", "w"])))
+
+    @pytest.mark.parametrize(
+        "column", [[[1], [2]], [{"a": 1}, None], [decimal.Decimal("1"), "1"]]
+    )
+    def test_object_cells_other_than_strings_have_no_fingerprint(self, column):
+        pd = pytest.importorskip("pandas")
+        assert fingerprint(pd.DataFrame({"a": column})) is None
+        assert fingerprint(pd.Series(column)) is None
+        assert (
+            fingerprint(pd.Series([1, 2], index=pd.Index(column, dtype=object))) is None
+        )
@@ -1,6 +1,10 @@
+import json
 import logging
+import threading
+import time
 from unittest.mock import MagicMock
 
+import prefect
 from prefect import utilities
 
 
@@ -44,6 +48,7 @@ def test_remote_handler_captures_errors_and_logs_them(caplog):
             assert hasattr(logger.handlers[-1], "client")
             child_logger = logger.getChild("sub-test")
             child_logger.critical("this should raise an error in the handler")
+            logger.handlers[-1].flush()
 
             critical_logs = [r for r in caplog.records if r.levelname == "CRITICAL"]
             assert len(critical_logs) == 2
@@ -60,6 +65,132 @@ def test_remote_handler_captures_errors_and_logs_them(caplog):
         logger.handlers = []
 
 
+def test_remote_handler_sends_logs_in_batches():
+    with utilities.configuration.set_temporary_config(
+        {"logging.cloud_batch_size": 3, "logging.cloud_flush_interval": 10}
+    ):
+        handler = utilities.logging.CloudHandler()
+    handler.client = MagicMock()
+    logger = logging.getLogger("prefect-test-batches")
+    logger.addHandler(handler)
+    try:
+        with prefect.context(flow_run_id="fr", task_run_id="tr"):
+            for i in range(5):
+                logger.warning("log %s", i)
+        handler.flush()
+    finally:
+        logger.removeHandler(handler)
+
+    batches = [c[0][0] for c in handler.client.write_run_logs.call_args_list]
+    assert [len(batch) for batch in batches] == [3, 2]
+    assert [log["message"] for batch in batches for log in batch] == [
+        "log {}".format(i) for i in range(5)
+    ]
+    assert all(
+        log["flowRunId"] == "fr"
+        and log["taskRunId"] == "tr"
+        and log["level"] == "WARNING"
+        for batch in batches
+        for log in batch
+    )
+
+
+def test_remote_handler_sends_logs_after_flush_interval():
+    with utilities.configuration.set_temporary_config(
+        {"logging.cloud_flush_interval": 0.1}
+    ):
+        handler = utilities.logging.CloudHandler()
+    handler.client = MagicMock()
+    handler.emit(logging.makeLogRecord(dict(msg="hi", message="hi")))
+
+    time.sleep(0.5)
+    assert handler.client.write_run_logs.call_count == 1
+
+
+def test_remote_handler_drops_logs_when_queue_is_full(caplog):
+    with utilities.configuration.set_temporary_config(
+        {"logging.cloud_max_queue_size": 2}
+    ):
+        handler = utilities.logging.CloudHandler()
+    sending = threading.Event()
+    release = threading.Event()
+
+    def write_run_logs(logs):
+        sending.set()
+        release.wait()
+
+    handler.client = MagicMock(write_run_logs=write_run_logs)
+    handler.emit(logging.makeLogRecord(dict(msg="first")))
+    handler.flush(timeout=0.1)
+    assert sending.wait(1)
+
+    # the first log is being sent, so the queue can take two more
+    for i in range(4):
+        handler.emit(logging.makeLogRecord(dict(msg=str(i))))
+    release.set()
+
+    assert handler.dropped == 2
+    assert "new logs are being dropped" in caplog.text
+
+
+def serializing_client():
+    sent = []
+
+    def write_run_logs(logs):
+        # the client serializes its variables with `json.dumps`
+        sent.append(json.loads(json.dumps(logs)))
+
+    return MagicMock(write_run_logs=write_run_logs), sent
+
+
+def test_remote_handler_sends_exceptions_and_unserializable_arguments():
+    handler = utilities.logging.CloudHandler()
+    handler.client, sent = serializing_client()
+    logger = logging.getLogger("prefect-test-exceptions")
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("log %s", i)
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            logger.exception("failed with %s", object())
+        for i in range(5, 8):
+            logger.warning("log %s", i)
+        handler.flush()
+    finally:
+        logger.removeHandler(handler)
+
+    logs = [log for batch in sent for log in batch]
+    assert len(logs) == 9
+    assert logs[5]["message"].startswith("failed with <object object")
+    assert "ValueError: bad value" in logs[5]["info"]["exc_info"]
+
+
+def test_remote_handler_sends_the_logs_of_unserializable_batches_one_at_a_time(caplog,):
+    with utilities.configuration.set_temporary_config(
+        {"logging.cloud_batch_size": 10, "logging.cloud_flush_interval": 10}
+    ):
+        handler = utilities.logging.CloudHandler()
+    handler.client, sent = serializing_client()
+    for i in range(3):
+        handler.emit(logging.makeLogRecord(dict(msg=str(i))))
+    # a log which was queued without being made serializable
+    handler._queue.put(dict(message="bad", info=dict(obj=object())))
+    handler.emit(logging.makeLogRecord(dict(msg="3")))
+    handler.flush()
+
+    assert [log["message"] for batch in sent for log in batch] == ["0", "1", "2", "3"]
+    assert "Failed to write log with error" in caplog.text
+
+
+def test_flow_runs_flush_cloud_logs(monkeypatch):
+    flush = MagicMock()
+    monkeypatch.setattr(utilities.logging, "flush_cloud_logs", flush)
+    prefect.Flow("flush").run()
+    assert flush.call_count == 1
+
+
 def test_get_logger_returns_root_logger():
     assert utilities.logging.get_logger() is logging.getLogger("prefect")
 